@@ -0,0 +1,64 @@
+import os
+import sys
+import json
+import numpy as np
+import pandas as pd
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import allocation  # noqa: E402
+
+# Record columns the allocation works on
+RESOURCE_COLUMN = "lineItem/ResourceId"
+SERVICE_COLUMN = "lineItem/ProductCode"
+
+
+def fixed_allocation_shares(df_tags):
+    """
+    Fixed percentages from AllocationPercentages tags.
+
+    Returns:
+        DataFrame of resource id, allocated_entity and allocation_share (summing to 1 per resource)
+    """
+    tags = df_tags[df_tags['key'] == 'AllocationPercentages']
+    tags = tags.drop_duplicates('resourceId', keep='last')
+    resources = tags['resourceId'].astype(object).values
+    values = tags['value'].astype(object).values
+
+    # Only the distinct JSON payloads are parsed
+    parsed = {value: list(json.loads(value).items()) for value in pd.unique(values)}
+    pairs = pd.Series([parsed[value] for value in values], index=resources, dtype=object).explode()
+    pairs = pairs.dropna()
+
+    shares = pd.DataFrame({
+        RESOURCE_COLUMN: pairs.index.values,
+        'allocated_entity': [pair[0] for pair in pairs.values],
+        'allocation_share': np.array([pair[1] for pair in pairs.values], dtype=float)
+    })
+    return allocation.normalize_shares(shares, RESOURCE_COLUMN)
+
+
+def allocate_shared_costs(df, df_tags, allocation_rules, cost_columns, tiers=None):
+    """
+    Expand shared line items into one allocated row per receiving entity.
+
+    Items with AllocationPercentages tags are split by those fixed
+    percentages, other shared items across the entities of their service's
+    allocation rule as finops_common.allocation describes.
+
+    Args:
+        df: Records or cost cube with month, chargeback_entity and allocation_method
+        df_tags: Tags frame
+        allocation_rules: COST_ALLOCATION_RULES of the generator
+        cost_columns: Cost columns to split
+
+    Returns:
+        DataFrame with the input columns plus allocation_rule, allocated_entity,
+        allocation_share, and cost_columns multiplied by the share
+    """
+    fixed = fixed_allocation_shares(df_tags)
+    return allocation.allocate_shared_costs(df, fixed, allocation_rules, cost_columns, RESOURCE_COLUMN,
+                                            SERVICE_COLUMN, tiers)
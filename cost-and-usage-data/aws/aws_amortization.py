@@ -0,0 +1,353 @@
+import json
+import time
+import uuid
+import numpy as np
+import pandas as pd
+
+from aws_loader import RECORD_FLOAT_COLUMNS, load_records
+
+# Commitment settings. Reservations and savings plans are modelled as All
+# Upfront purchases, so their fee line items carry no unblended cost and the
+# whole commitment shows up in the amortization columns. Their discounts
+# come from the generator's RI_DISCOUNT_MAPPING (service -> usage account ->
+# discount factor), see commitment_discounts().
+AMORTIZATION_SETTINGS = {
+    "reservation_utilization": 0.90,  # Share of each reservation used per billing period
+    "savings_plan_utilization": 0.95  # Share of each Savings Plan commitment used per billing period
+}
+
+RESERVATION_COLUMNS = [
+    "reservation/ReservationARN",
+    "reservation/EffectiveCost",
+    "reservation/AmortizedUpfrontFeeForBillingPeriod",
+    "reservation/UnusedAmortizedUpfrontFeeForBillingPeriod"
+]
+
+SAVINGS_PLAN_COLUMNS = [
+    "savingsPlan/SavingsPlanARN",
+    "savingsPlan/SavingsPlanRate",
+    "savingsPlan/SavingsPlanEffectiveCost",
+    "savingsPlan/AmortizedUpfrontCommitmentForBillingPeriod",
+    "savingsPlan/TotalCommitmentToDate",
+    "savingsPlan/UsedCommitment"
+]
+
+# CUR columns added by the amortizer
+AMORTIZATION_COLUMNS = RESERVATION_COLUMNS + SAVINGS_PLAN_COLUMNS
+ARN_COLUMNS = ["reservation/ReservationARN", "savingsPlan/SavingsPlanARN"]
+
+# Fee line items written once per commitment and billing period
+FEE_LINE_ITEM_TYPES = {
+    "reservation/ReservationARN": "RIFee",
+    "savingsPlan/SavingsPlanARN": "SavingsPlanRecurringFee"
+}
+
+# Usage type and operation of the fee line items
+FEE_USAGE_TYPES = {
+    "reservation/ReservationARN": "HeavyUsage:AllUpfront",
+    "savingsPlan/SavingsPlanARN": "ComputeSP:1yrAllUpfront"
+}
+FEE_OPERATIONS = {
+    "reservation/ReservationARN": "RIFee",
+    "savingsPlan/SavingsPlanARN": "SavingsPlanRecurringFee"
+}
+
+# Product of the Savings Plan fees; a Compute Savings Plan is not tied to
+# the services or regions it covers
+SAVINGS_PLAN_PRODUCT = "ComputeSavingsPlans"
+
+# Columns a fee line item takes from the usage its commitment covered in
+# the billing period. All of them are the same for every such line item:
+# the billing ones per period and account, the product ones per
+# reservation (its ARN names the service and region).
+FEE_BILLING_COLUMNS = [
+    "bill/InvoiceId", "bill/BillingEntity", "bill/BillType", "bill/PayerAccountId",
+    "bill/BillingPeriodStartDate", "bill/BillingPeriodEndDate",
+    "lineItem/UsageAccountId", "lineItem/CurrencyCode"
+]
+FEE_PRODUCT_COLUMNS = ["lineItem/ProductCode", "product/ProductName", "product/servicecode", "product/region"]
+
+# Fixed namespace so fee line item ids are stable across runs
+FEE_ID_NAMESPACE = uuid.UUID("6f1c7a52-3d0b-4c8e-9a51-2b7e4f0d9c13")
+
+
+def commitment_arns(df_records):
+    """
+    Reservation and Savings Plan ARN of every covered line item.
+
+    One reservation per account, service and region covers the
+    DiscountedUsage items; one Compute Savings Plan per account covers the
+    SavingsPlanCoveredUsage items. Other line items get "".
+    """
+    line_item_types = df_records['lineItem/LineItemType'].astype(object).to_numpy()
+    accounts = df_records['lineItem/UsageAccountId'].astype(object).astype(str)
+    regions = df_records['product/region'].astype(object).astype(str)
+    services = df_records['product/servicecode'].astype(object).astype(str)
+
+    reservation_arns = ("arn:aws:" + services + ":" + regions + ":" + accounts +
+                        ":reserved-instances/" + services + "-" + regions).to_numpy()
+    savings_plan_arns = ("arn:aws:savingsplans::" + accounts +
+                         ":savingsplan/compute-" + accounts).to_numpy()
+
+    return (np.where(line_item_types == "DiscountedUsage", reservation_arns, ""),
+            np.where(line_item_types == "SavingsPlanCoveredUsage", savings_plan_arns, ""))
+
+
+def mapped_discounts(discount_mapping):
+    """
+    Service, usage account and RI discount of every mapping entry with a discount.
+
+    Factors of 1 or more are a premium paid by accounts using shared RIs,
+    not a discount, and are left out.
+    """
+    return pd.DataFrame(
+        [(service, account, 1.0 - factor) for service, accounts in discount_mapping.items()
+         for account, factor in accounts.items() if factor < 1.0],
+        columns=["lineItem/ProductCode", "lineItem/UsageAccountId", "discount"])
+
+
+def default_discount(discount_mapping):
+    """Average RI discount of the mapping, for services and accounts it does not discount"""
+    discounts = mapped_discounts(discount_mapping)["discount"]
+    return float(discounts.mean()) if len(discounts) else 0.0
+
+
+def commitment_discounts(df_records, discount_mapping):
+    """
+    Reservation and Savings Plan discount of every line item.
+
+    A reservation gets the discount of its service and account in the
+    mapping. A Compute Savings Plan covers every service of its account, so
+    it gets the average of the account's discounts. Services and accounts
+    the mapping does not discount get its average discount.
+    """
+    discounts = mapped_discounts(discount_mapping)
+    default = default_discount(discount_mapping)
+    keys = df_records[["lineItem/ProductCode", "lineItem/UsageAccountId"]].astype(object).astype(str)
+
+    reservation = keys.merge(discounts, on=["lineItem/ProductCode", "lineItem/UsageAccountId"],
+                             how="left")["discount"]
+    account_discounts = discounts.groupby("lineItem/UsageAccountId")["discount"].mean().reset_index()
+    savings_plan = keys[["lineItem/UsageAccountId"]].merge(
+        account_discounts, on="lineItem/UsageAccountId", how="left")["discount"]
+    return (reservation.fillna(default).to_numpy(dtype=float),
+            savings_plan.fillna(default).to_numpy(dtype=float))
+
+
+def amortize_covered_usage(df_records, discount_mapping):
+    """
+    Fill the amortization columns of the usage line items, in place.
+
+    Covered usage is priced at the on-demand cost less the commitment
+    discount; everything else gets zeros and empty ARNs.
+    """
+    reservation_arns, savings_plan_arns = commitment_arns(df_records)
+    reservation_discounts, savings_plan_discounts = commitment_discounts(df_records, discount_mapping)
+    on_demand = df_records['pricing/publicOnDemandCost'].to_numpy(dtype=float)
+    rates = df_records['lineItem/UnblendedRate'].to_numpy(dtype=float)
+    is_reserved = reservation_arns != ""
+    is_savings_plan = savings_plan_arns != ""
+
+    for col in AMORTIZATION_COLUMNS:
+        df_records[col] = 0.0
+    df_records['reservation/ReservationARN'] = reservation_arns
+    df_records['savingsPlan/SavingsPlanARN'] = savings_plan_arns
+
+    df_records['reservation/EffectiveCost'] = np.where(
+        is_reserved, on_demand * (1 - reservation_discounts), 0.0)
+    df_records['savingsPlan/SavingsPlanEffectiveCost'] = np.where(
+        is_savings_plan, on_demand * (1 - savings_plan_discounts), 0.0)
+    df_records['savingsPlan/SavingsPlanRate'] = np.where(
+        is_savings_plan, rates * (1 - savings_plan_discounts), 0.0)
+    return df_records
+
+
+def commitment_fees(df_records, arn_column, effective_cost_column, utilization):
+    """
+    One fee line item per commitment and billing period.
+
+    The period's amortized commitment is the effective cost of the usage it
+    covered divided by the utilization, so the unused remainder is what the
+    commitment cost without covering any usage. Fee line items are built
+    from the commitment alone: the billing columns of the period, the
+    reservation's product, the fee's usage type and operation and zero
+    usage and cost. Resource, availability zone and the other columns of
+    the covered usage are left blank, their numeric columns zero.
+    """
+    period_column = 'bill/BillingPeriodStartDate'
+    is_reservation = arn_column == 'reservation/ReservationARN'
+    covered = df_records[df_records[arn_column].astype(object) != ""]
+
+    taken_columns = [col for col in FEE_BILLING_COLUMNS + (FEE_PRODUCT_COLUMNS if is_reservation else [])
+                     if col in df_records.columns and col != period_column]
+    aggregations = {col: (col, "first") for col in taken_columns}
+    aggregations["used"] = (effective_cost_column, "sum")
+    periods = covered.astype({arn_column: object, period_column: object}).groupby(
+        [arn_column, period_column], sort=False).agg(**aggregations).reset_index()
+
+    used = periods.pop("used").to_numpy(dtype=float)
+    commitment = used / utilization
+    arns = periods[arn_column].to_numpy(dtype=object)
+    period_starts = periods[period_column].astype(str).to_numpy()
+
+    line_item_type = FEE_LINE_ITEM_TYPES[arn_column]
+    fees = periods
+    fees['identity/LineItemId'] = [str(uuid.uuid5(FEE_ID_NAMESPACE, f"{arn}/{period}"))
+                                   for arn, period in zip(arns, period_starts)]
+    fees['identity/TimeInterval'] = (fees[period_column].astype(str) + "/" +
+                                     fees['bill/BillingPeriodEndDate'].astype(str))
+    fees['lineItem/LineItemType'] = line_item_type
+    fees['lineItem/UsageStartDate'] = fees[period_column]
+    fees['lineItem/UsageEndDate'] = fees['bill/BillingPeriodEndDate']
+    fees['lineItem/UsageType'] = FEE_USAGE_TYPES[arn_column]
+    fees['lineItem/Operation'] = FEE_OPERATIONS[arn_column]
+    if not is_reservation:
+        fees['lineItem/ProductCode'] = SAVINGS_PLAN_PRODUCT
+        fees['product/ProductName'] = SAVINGS_PLAN_PRODUCT
+        fees['product/servicecode'] = SAVINGS_PLAN_PRODUCT
+    fees['lineItem/LineItemDescription'] = fees['lineItem/ProductCode'].astype(str) + " " + line_item_type
+    for col in ['lineItem/UsageAmount', 'lineItem/NormalizedUsageAmount', 'lineItem/UnblendedRate',
+                'lineItem/UnblendedCost', 'lineItem/BlendedRate', 'lineItem/BlendedCost',
+                'pricing/publicOnDemandCost', 'pricing/publicOnDemandRate']:
+        fees[col] = 0.0
+    for col in AMORTIZATION_COLUMNS:
+        if col not in ARN_COLUMNS:
+            fees[col] = 0.0
+
+    if is_reservation:
+        fees['reservation/AmortizedUpfrontFeeForBillingPeriod'] = commitment
+        fees['reservation/UnusedAmortizedUpfrontFeeForBillingPeriod'] = commitment - used
+        fees['savingsPlan/SavingsPlanARN'] = ""
+        fees['pricing/term'] = "Reserved"
+    else:
+        fees['savingsPlan/AmortizedUpfrontCommitmentForBillingPeriod'] = commitment
+        fees['savingsPlan/TotalCommitmentToDate'] = commitment
+        fees['savingsPlan/UsedCommitment'] = used
+        fees['reservation/ReservationARN'] = ""
+        fees['pricing/term'] = "SavingsPlan"
+
+    # Every other record column is blank: zero where the loader reads numbers
+    # (it does not parse "" as a float), empty text otherwise
+    fees = fees.reindex(columns=df_records.columns)
+    unset = [col for col in fees.columns if fees[col].isna().all()]
+    numeric = [col for col in unset
+               if col in RECORD_FLOAT_COLUMNS or pd.api.types.is_numeric_dtype(df_records[col])]
+    fees[numeric] = 0.0
+    fees[[col for col in unset if col not in numeric and df_records[col].dtype == object]] = ""
+    return fees
+
+
+def add_commitment_line_items(df_records, discount_mapping, settings=None):
+    """
+    Amortize reservations and savings plans per billing period.
+
+    Fills the reservation/* and savingsPlan/* columns of the covered usage
+    and appends the matching RIFee and SavingsPlanRecurringFee line items.
+    Everything is a groupby over (commitment, billing period), so it runs at
+    scan speed on large CURs.
+
+    Args:
+        discount_mapping: RI discount factors, service -> usage account -> factor
+
+    Returns:
+        The records followed by the fee line items
+    """
+    settings = settings or AMORTIZATION_SETTINGS
+    amortize_covered_usage(df_records, discount_mapping)
+
+    reservation_fees = commitment_fees(df_records, 'reservation/ReservationARN',
+                                       'reservation/EffectiveCost',
+                                       settings["reservation_utilization"])
+    savings_plan_fees = commitment_fees(df_records, 'savingsPlan/SavingsPlanARN',
+                                        'savingsPlan/SavingsPlanEffectiveCost',
+                                        settings["savings_plan_utilization"])
+
+    # Empty parts are left out so they do not affect the result dtypes
+    parts = [part for part in (df_records, reservation_fees, savings_plan_fees) if len(part)]
+    if len(parts) == 1:
+        return df_records
+    return pd.concat(parts, ignore_index=True)
+
+
+def amortized_costs(df_records):
+    """
+    Amortized cost of every line item, as in the CUR amortized cost view.
+
+    Covered usage costs its effective cost, fee line items cost their unused
+    commitment, and everything else its unblended cost.
+    """
+    line_item_types = df_records['lineItem/LineItemType'].astype(object).to_numpy()
+    return np.select(
+        [line_item_types == "DiscountedUsage",
+         line_item_types == "RIFee",
+         line_item_types == "SavingsPlanCoveredUsage",
+         line_item_types == "SavingsPlanRecurringFee"],
+        [df_records['reservation/EffectiveCost'].to_numpy(dtype=float),
+         df_records['reservation/UnusedAmortizedUpfrontFeeForBillingPeriod'].to_numpy(dtype=float),
+         df_records['savingsPlan/SavingsPlanEffectiveCost'].to_numpy(dtype=float),
+         (df_records['savingsPlan/TotalCommitmentToDate'].to_numpy(dtype=float) -
+          df_records['savingsPlan/UsedCommitment'].to_numpy(dtype=float))],
+        default=df_records['lineItem/UnblendedCost'].to_numpy(dtype=float))
+
+
+def write_amortization_reports(df_records, output_dir):
+    """Write unblended vs amortized cost by account and service, and a summary"""
+    costs = pd.DataFrame({
+        'month': pd.to_datetime(df_records['lineItem/UsageStartDate']).dt.strftime('%Y-%m').values,
+        'lineItem/UsageAccountId': df_records['lineItem/UsageAccountId'].astype(object).values,
+        'lineItem/ProductCode': df_records['lineItem/ProductCode'].astype(object).values,
+        'on_demand_cost': df_records['pricing/publicOnDemandCost'].to_numpy(dtype=float),
+        'unblended_cost': df_records['lineItem/UnblendedCost'].to_numpy(dtype=float),
+        'amortized_cost': amortized_costs(df_records)
+    })
+    measures = ['on_demand_cost', 'unblended_cost', 'amortized_cost']
+
+    by_account = costs.groupby(['month', 'lineItem/UsageAccountId'])[measures].sum().reset_index()
+    by_account.to_csv(f"{output_dir}/amortized_cost_by_account.csv", index=False)
+
+    by_service = costs.groupby(['month', 'lineItem/ProductCode'])[measures].sum().reset_index()
+    by_service.to_csv(f"{output_dir}/amortized_cost_by_service.csv", index=False)
+
+    line_item_types = df_records['lineItem/LineItemType'].astype(object)
+    is_reservation_fee = (line_item_types == "RIFee").to_numpy()
+    is_savings_plan_fee = (line_item_types == "SavingsPlanRecurringFee").to_numpy()
+
+    summary_stats = {
+        'total_unblended_cost': float(costs['unblended_cost'].sum()),
+        'total_amortized_cost': float(costs['amortized_cost'].sum()),
+        'reservation_fees': int(is_reservation_fee.sum()),
+        'savings_plan_fees': int(is_savings_plan_fee.sum()),
+        'reservation_commitment': float(df_records.loc[
+            is_reservation_fee, 'reservation/AmortizedUpfrontFeeForBillingPeriod'].sum()),
+        'reservation_unused': float(df_records.loc[
+            is_reservation_fee, 'reservation/UnusedAmortizedUpfrontFeeForBillingPeriod'].sum()),
+        'savings_plan_commitment': float(df_records.loc[
+            is_savings_plan_fee, 'savingsPlan/TotalCommitmentToDate'].sum()),
+        'savings_plan_used': float(df_records.loc[
+            is_savings_plan_fee, 'savingsPlan/UsedCommitment'].sum())
+    }
+
+    with open(f"{output_dir}/amortization_summary.json", 'w') as f:
+        json.dump(summary_stats, f, indent=2)
+
+    return summary_stats
+
+
+def main():
+    """Rewrite the amortized cost reports of an existing output directory"""
+    output_dir = "output"
+
+    start_time = time.time()
+    df_records = load_records(output_dir, columns=[
+        'lineItem/UsageStartDate', 'lineItem/UsageAccountId', 'lineItem/ProductCode',
+        'lineItem/LineItemType', 'lineItem/UnblendedCost', 'pricing/publicOnDemandCost'
+    ] + [col for col in AMORTIZATION_COLUMNS if col not in ARN_COLUMNS])
+
+    summary = write_amortization_reports(df_records, output_dir)
+    print(f"Amortized {len(df_records)} line items in {time.time() - start_time:.2f} seconds. "
+          f"Unblended: ${summary['total_unblended_cost']:.2f}, "
+          f"amortized: ${summary['total_amortized_cost']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
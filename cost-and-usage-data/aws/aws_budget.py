@@ -0,0 +1,58 @@
+import os
+import sys
+
+from aws_config import CONFIG
+from aws_loader import load_records, load_tags, load_lifecycle_mapping
+from aws_forecast import FORECAST_RECORD_COLUMNS, daily_cost_series
+from aws_chunked_reports import lifecycle_business_units
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import budget  # noqa: E402
+
+
+def project_daily_costs(df_records, df_tags, project_business_units):
+    """Daily unblended cost per business unit and project"""
+    daily = daily_cost_series(df_records, df_tags, project_business_units)
+    return daily.groupby(['date', 'business_unit', 'project'], sort=True)['cost'].sum().reset_index()
+
+
+def project_budgets(project_names, project_annual_budget=None):
+    """Annual budget of each project, CONFIG's annual budget shared evenly by default"""
+    return budget.project_budgets(CONFIG["annual_budget"], project_names, project_annual_budget)
+
+
+def write_budget_reports(df_records, df_tags, project_business_units, output_dir, budgets=None,
+                         org_budget=None, settings=None, resume=True):
+    """
+    Update the budget tracker with the records' new days and write its outputs.
+
+    Without budgets every project of the lifecycle mapping gets an even
+    share of the annual budget.
+    """
+    daily = project_daily_costs(df_records, df_tags, project_business_units)
+    if budgets is None:
+        budgets = project_budgets(sorted(set(project_business_units)))
+    org_budget = CONFIG["annual_budget"] if org_budget is None else org_budget
+    return budget.write_budget_reports(daily, output_dir, budgets, org_budget, settings, resume)
+
+
+def main():
+    """Update the budget tracker from an existing output directory"""
+    output_dir = "output"
+
+    df_records = load_records(output_dir, columns=FORECAST_RECORD_COLUMNS)
+    df_tags = load_tags(output_dir, keys=["Project"])
+    project_to_bu = lifecycle_business_units(load_lifecycle_mapping(output_dir))
+
+    summary = write_budget_reports(df_records, df_tags, project_to_bu, output_dir)
+    print(f"Tracked {summary['days_tracked']} days for {summary['entities']} entities in "
+          f"{summary['tracking_seconds']:.2f} seconds. Projected year end: "
+          f"${summary['projected_year_end']:.2f} ({summary['new_crossings']} new threshold crossings)")
+
+
+if __name__ == "__main__":
+    main()
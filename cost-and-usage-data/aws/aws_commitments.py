@@ -0,0 +1,98 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+from aws_loader import TIMESTAMP_FORMAT, load_records
+from aws_amortization import default_discount
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import commitments  # noqa: E402
+
+# Commitment sizing settings. A commitment is an amount of on-demand
+# equivalent spend per period, paid at (1 - discount) whether it is used or
+# not; usage above it is paid on demand.
+COMMITMENT_SETTINGS = {
+    "interval": "D",  # Period of the usage series: "D" (daily) or "h" (hourly)
+    "services": None,  # Services to size (default: every service in the discount mapping)
+    "default_discount": None,  # For accounts without a mapped discount (default: the mapping's average)
+    "sweep_quantiles": [i / 20 for i in range(21)]  # Usage quantiles reported as sweep levels
+}
+
+# A family is one service in one region of one usage account
+FAMILY_COLUMNS = ["lineItem/ProductCode", "product/region", "lineItem/UsageAccountId"]
+
+# Line items that are usage a commitment could cover
+USAGE_LINE_ITEM_TYPES = ["Usage", "DiscountedUsage", "SavingsPlanCoveredUsage"]
+
+# Record columns the usage series are built from
+COMMITMENT_RECORD_COLUMNS = ["lineItem/UsageStartDate", "lineItem/LineItemType"] + FAMILY_COLUMNS + [
+    "pricing/publicOnDemandCost"]
+
+
+def usage_periods(dates, interval):
+    """Usage periods as datetime64 of the interval, from CUR strings or loader timestamps"""
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates.astype(object), format=TIMESTAMP_FORMAT)
+    elif dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates.to_numpy().astype(f'datetime64[{interval}]')
+
+
+def usage_series(df_records, services, interval):
+    """
+    On-demand equivalent usage per family and period, as a dense matrix.
+
+    Only periods with any usage in the records are kept: the generator
+    samples every sampling_interval days, and a commitment is only charged
+    over the periods the data covers.
+
+    Returns:
+        Tuple of (families DataFrame of FAMILY_COLUMNS, periods, families x
+        periods usage matrix)
+    """
+    line_item_types = df_records['lineItem/LineItemType'].astype(object).to_numpy()
+    usage = np.isin(line_item_types, USAGE_LINE_ITEM_TYPES)
+    usage &= df_records['lineItem/ProductCode'].astype(object).isin(list(services)).to_numpy()
+
+    rows = pd.DataFrame({col: df_records[col].astype(object).to_numpy()[usage] for col in FAMILY_COLUMNS})
+    rows['period'] = usage_periods(df_records['lineItem/UsageStartDate'], interval)[usage]
+    rows['cost'] = df_records['pricing/publicOnDemandCost'].to_numpy(dtype=float)[usage]
+
+    all_periods = np.unique(usage_periods(df_records['lineItem/UsageStartDate'], interval))
+    families, matrix = commitments.family_matrix(rows, all_periods, FAMILY_COLUMNS)
+    return families, all_periods, matrix
+
+
+def write_commitment_reports(df_records, discount_mapping, output_dir, settings=None):
+    """Write commitment_recommendations.csv, commitment_sweep.csv and commitment_summary.json"""
+    settings = settings or COMMITMENT_SETTINGS
+    services = settings["services"] or list(discount_mapping)
+
+    families, periods, matrix = usage_series(df_records, services, settings["interval"])
+    default = settings["default_discount"]
+    if default is None:
+        default = default_discount(discount_mapping)
+    discounts = commitments.family_discounts(families, discount_mapping, default)
+    return commitments.write_commitment_reports(families, periods, matrix, discounts, output_dir, settings)
+
+
+def main():
+    """Size commitments from the records of an existing output directory"""
+    from aws_cur_data_generator import RI_DISCOUNT_MAPPING
+
+    output_dir = "output"
+
+    df_records = load_records(output_dir, columns=COMMITMENT_RECORD_COLUMNS)
+    summary = write_commitment_reports(df_records, RI_DISCOUNT_MAPPING, output_dir)
+    print(f"Swept commitment levels of {summary['families']} families over {summary['periods']} periods "
+          f"in {summary['sweep_seconds']:.2f} seconds. Savings: ${summary['savings']:.2f} "
+          f"({summary['coverage']:.1%} coverage)")
+
+
+if __name__ == "__main__":
+    main()
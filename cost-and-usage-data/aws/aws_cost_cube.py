@@ -0,0 +1,78 @@
+import pandas as pd
+
+from aws_tag_resolver import resolve_tag_attributes
+
+# Finest grain the reports need. Project, business unit, chargeback entity and
+# allocation method all follow from the resource, so they are attached to the
+# cube afterwards instead of being grouped on.
+CUBE_DIMENSIONS = [
+    "month",
+    "lineItem/UsageAccountId",
+    "lineItem/ProductCode",
+    "lineItem/ResourceId"
+]
+
+CUBE_MEASURES = [
+    "lineItem/UnblendedCost",
+    "lineItem/BlendedCost"
+]
+
+# Record columns the cube is built from
+RECORD_COLUMNS = ["lineItem/UsageStartDate"] + CUBE_DIMENSIONS[1:] + CUBE_MEASURES
+
+
+def record_months(df_records):
+    """YYYY-MM month of each record, reusing an existing 'month' column"""
+    if 'month' in df_records.columns:
+        return df_records['month'].astype(object)
+    return pd.to_datetime(df_records['lineItem/UsageStartDate']).dt.strftime('%Y-%m')
+
+
+def aggregate_records(df_records):
+    """
+    Partial cube of a set of records: CUBE_MEASURES summed by CUBE_DIMENSIONS.
+
+    Partial cubes of different chunks or months combine with combine_cubes().
+    df_records is not modified.
+    """
+    data = df_records[CUBE_DIMENSIONS[1:] + CUBE_MEASURES].assign(month=record_months(df_records))
+
+    cube = data.groupby(CUBE_DIMENSIONS, observed=True, dropna=False, sort=False)[
+        CUBE_MEASURES].sum().reset_index()
+
+    # Rollups group on these again; plain values avoid categorical cross products
+    for col in CUBE_DIMENSIONS:
+        if isinstance(cube[col].dtype, pd.CategoricalDtype):
+            cube[col] = cube[col].astype(object)
+
+    return cube
+
+
+def combine_cubes(cubes):
+    """Merge partial cubes into one, summing measures that share dimensions"""
+    cubes = [cube[CUBE_DIMENSIONS + CUBE_MEASURES] for cube in cubes if len(cube)]
+    if not cubes:
+        return pd.DataFrame(columns=CUBE_DIMENSIONS + CUBE_MEASURES)
+    return pd.concat(cubes, ignore_index=True).groupby(
+        CUBE_DIMENSIONS, dropna=False, sort=False)[CUBE_MEASURES].sum().reset_index()
+
+
+def finish_cube(cube, df_tags=None, project_business_units=None):
+    """Attach the tag attributes to an aggregated cube (in place)"""
+    if df_tags is not None:
+        resolve_tag_attributes(cube, df_tags, project_business_units=project_business_units)
+    return cube
+
+
+def build_cost_cube(df_records, df_tags=None, project_business_units=None):
+    """
+    Aggregate the CUR records once at month x account x service x resource grain.
+
+    df_records is not modified. With df_tags the cube also carries project,
+    chargeback_entity and allocation_method (and business_unit when
+    project_business_units is given), so every report is a rollup of the cube.
+
+    Returns:
+        DataFrame with CUBE_DIMENSIONS, the tag attributes and summed CUBE_MEASURES
+    """
+    return finish_cube(aggregate_records(df_records), df_tags, project_business_units)
@@ -0,0 +1,169 @@
+import importlib.util
+import json
+import os
+import sys
+import time
+import pandas as pd
+
+from aws_config import CONFIG
+from aws_loader import load_records, load_tags
+from aws_tag_resolver import pivot_tags
+from aws_commitments import USAGE_LINE_ITEM_TYPES
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common.cross_cloud import (translation_columns, price_translation_table, price_lines,  # noqa: E402
+                                       comparison, unit_mismatches)
+
+# Config modules of the other clouds: cloud -> (directory, file name). The
+# AWS to GCP mapping lives in configGCP.py and the GCP to Azure mapping in
+# configAzure.py, so an AWS service reaches Azure through its GCP equivalent.
+SIBLING_CONFIGS = {"gcp": ("gcp", "configGCP.py"), "azure": ("azure", "configAzure.py")}
+
+CLOUDS = ["aws", "gcp", "azure"]
+
+# Record attribute resolved from tags: tag key, default when untagged
+PROJECT_TAG = ("Project", "Unknown")
+
+CROSS_CLOUD_RECORD_COLUMNS = ["lineItem/LineItemType", "lineItem/ResourceId", "lineItem/ProductCode",
+                              "lineItem/UsageAmount", "lineItem/UnblendedCost"]
+
+TRANSLATION_COLUMNS = translation_columns(CLOUDS)
+
+COMPARISON_COLUMNS = ["line_items", "usage_amount", "actual_cost", "aws_cost", "gcp_cost", "azure_cost",
+                      "gcp_unmapped_cost", "azure_unmapped_cost"]
+
+
+def load_config(cloud):
+    """Import another cloud's config module from its sibling directory and return its CONFIG"""
+    directory, file_name = SIBLING_CONFIGS[cloud]
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), directory, file_name)
+    spec = importlib.util.spec_from_file_location(os.path.splitext(file_name)[0], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.CONFIG
+
+
+def translation_table(aws_services, catalogs, aws_to_gcp, gcp_to_azure):
+    """
+    Equivalent GCP and Azure service, unit and base rate of every AWS service.
+
+    Services mapped to a service the target catalog does not list get the
+    generator's default rate; services without an equivalent keep a NaN
+    service and rate. The unit factors convert usage into each equivalent's
+    unit, and are NaN where the two units measure different quantities.
+
+    Args:
+        aws_services: Distinct AWS service codes
+        catalogs: Cloud -> services dict of that cloud's config
+
+    Returns:
+        DataFrame with TRANSLATION_COLUMNS, indexed by AWS service
+    """
+    table = pd.DataFrame({"aws_service": pd.Series(aws_services, dtype=object)})
+    table["gcp_service"] = table["aws_service"].map(aws_to_gcp)
+    table["azure_service"] = table["gcp_service"].map(gcp_to_azure)
+    return price_translation_table(table, catalogs, CLOUDS)
+
+
+def translate_records(df_records, df_tags, table):
+    """
+    Usage lines with their cost at each cloud's base rate.
+
+    Each line's usage amount is converted into the target service's unit
+    and priced at its base rate. Rates and unit factors are looked up by the
+    line's position in the translation table, so the lines are translated
+    with array indexing rather than a per-line join. A line without an
+    equivalent in a cloud, or whose equivalent is billed in an incompatible
+    unit, keeps its AWS cost there and is counted as unmapped.
+
+    Returns:
+        DataFrame of usage lines with project, aws_service, usage_amount,
+        actual_cost, one cost column per cloud and the unmapped costs
+    """
+    usage = (df_records['lineItem/LineItemType'].astype(object).isin(USAGE_LINE_ITEM_TYPES) &
+             df_records['lineItem/ProductCode'].notna()).to_numpy()
+    services = df_records['lineItem/ProductCode'].astype(object).to_numpy()[usage]
+    codes = pd.Categorical(services, categories=table.index).codes
+    amount = df_records['lineItem/UsageAmount'].to_numpy(dtype=float)[usage]
+
+    key, default = PROJECT_TAG
+    projects = pivot_tags(df_tags, [key])[key]
+    lines = pd.DataFrame({
+        'project': pd.Series(df_records['lineItem/ResourceId'].astype(object).to_numpy()[usage]).map(projects)
+        .fillna(default).to_numpy(),
+        'aws_service': services,
+        'usage_amount': amount,
+        'actual_cost': df_records['lineItem/UnblendedCost'].to_numpy(dtype=float)[usage]
+    })
+
+    return price_lines(lines, amount, codes, table, CLOUDS)
+
+
+def write_cross_cloud_reports(df_records, df_tags, output_dir, catalogs=None, aws_to_gcp=None, gcp_to_azure=None):
+    """
+    Write cross_cloud_by_project.csv, cross_cloud_by_service.csv and cross_cloud_summary.json.
+
+    Args:
+        catalogs: Cloud -> services dict (default: each cloud's config)
+        aws_to_gcp: AWS -> GCP service mapping (default: AWS_TO_GCP_SERVICE_MAPPING)
+        gcp_to_azure: GCP -> Azure service mapping (default: GCP_TO_AZURE_SERVICE_MAPPING)
+    """
+    if catalogs is None or aws_to_gcp is None or gcp_to_azure is None:
+        gcp_config, azure_config = load_config("gcp"), load_config("azure")
+        catalogs = catalogs or {"aws": CONFIG["services"], "gcp": gcp_config["services"],
+                                "azure": azure_config["services"]}
+        aws_to_gcp = aws_to_gcp if aws_to_gcp is not None else gcp_config["aws_to_gcp_mapping"]
+        gcp_to_azure = gcp_to_azure if gcp_to_azure is not None else azure_config["gcp_to_azure_mapping"]
+
+    start_time = time.time()
+    services = df_records['lineItem/ProductCode'].astype(object).dropna().unique()
+    table = translation_table(services, catalogs, aws_to_gcp, gcp_to_azure)
+    lines = translate_records(df_records, df_tags, table)
+    by_project = comparison(lines, ['project'], COMPARISON_COLUMNS)
+    by_service = table.reset_index(drop=True).merge(
+        comparison(lines, ['aws_service'], COMPARISON_COLUMNS), on='aws_service', how='inner')
+    elapsed = time.time() - start_time
+
+    by_project.to_csv(f"{output_dir}/cross_cloud_by_project.csv", index=False)
+    by_service.to_csv(f"{output_dir}/cross_cloud_by_service.csv", index=False)
+
+    totals = {cloud: float(lines[f"{cloud}_cost"].sum()) for cloud in CLOUDS}
+    summary_stats = {
+        'line_items': int(len(lines)),
+        'projects': int(len(by_project)),
+        'services': int(len(by_service)),
+        'services_without_gcp': sorted(by_service.loc[by_service["gcp_service"].isna(), "aws_service"]),
+        'services_without_azure': sorted(by_service.loc[by_service["azure_service"].isna(), "aws_service"]),
+        'gcp_unit_mismatches': unit_mismatches(by_service, "aws", "gcp"),
+        'azure_unit_mismatches': unit_mismatches(by_service, "aws", "azure"),
+        'actual_cost': float(lines['actual_cost'].sum()),
+        'aws_cost': totals["aws"],
+        'gcp_cost': totals["gcp"],
+        'azure_cost': totals["azure"],
+        'cheapest_cloud': min(totals, key=totals.get),
+        'translation_seconds': round(elapsed, 3)
+    }
+    with open(f"{output_dir}/cross_cloud_summary.json", 'w') as f:
+        json.dump(summary_stats, f, indent=2)
+
+    return summary_stats
+
+
+def main():
+    """Price the usage of an existing output directory on GCP and Azure"""
+    output_dir = "output"
+
+    df_records = load_records(output_dir, columns=CROSS_CLOUD_RECORD_COLUMNS)
+    df_tags = load_tags(output_dir, keys=[PROJECT_TAG[0]])
+    summary = write_cross_cloud_reports(df_records, df_tags, output_dir)
+    print(f"Translated {summary['line_items']} usage line items of {summary['services']} services in "
+          f"{summary['translation_seconds']:.2f} seconds. At base rates: AWS ${summary['aws_cost']:.2f}, "
+          f"GCP ${summary['gcp_cost']:.2f}, Azure ${summary['azure_cost']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
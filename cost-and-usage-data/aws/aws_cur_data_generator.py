@@ -14,6 +14,20 @@ from tqdm import tqdm
 
 # Import configuration
 from aws_config import CONFIG
+from aws_warehouse import export_to_warehouse, default_warehouse_path
+from aws_partitions import write_partitioned_records
+from aws_cost_cube import build_cost_cube
+from aws_allocation import allocate_shared_costs
+from aws_amortization import AMORTIZATION_COLUMNS, add_commitment_line_items, write_amortization_reports
+from aws_topk import top_k_rows
+from aws_distinct import aggregate_sketches, add_distinct_counts
+from aws_forecast import write_forecast_reports
+from aws_anomalies import write_anomaly_reports
+from aws_scenarios import scenario_projects, write_scenario_reports
+from aws_budget import project_budgets, write_budget_reports
+from aws_commitments import write_commitment_reports
+from aws_rightsizing import write_rightsizing_reports
+from aws_metrics import add_stages, run_stage, snapshot, stage_metrics, start_run_metrics, write_run_metrics
 
 # Set random seed for reproducibility
 # the answer to life, universe and everything (#DOUGADAMS, IYKYK)
@@ -44,6 +58,14 @@ DATA_VOLUME_SETTINGS = {
     "volatility_factor": 0.02,        # +/- 2% cost volatility by default
 }
 
+# Optional export targets written next to the CSV files
+OUTPUT_SETTINGS = {
+    "warehouse_engine": None,  # None for CSV only, "duckdb" or "sqlite"
+    "partitioned_records": False,  # Also write month partitions with _stats.json sidecars
+    "analysis_reports": False,  # Also write forecast, anomaly, scenario, budget, commitment and rightsizing reports
+    "run_metrics": False,  # Also write per-stage wall time, CPU time and RSS deltas to run_metrics.json
+}
+
 # Tag categories for more realistic tagging
 TAG_CATEGORIES = {
     "Technical": [
@@ -271,7 +293,7 @@ CUR_COLUMNS = [
     "pricing/publicOnDemandRate",
     "pricing/term",
     "pricing/offeringClass"
-]
+] + AMORTIZATION_COLUMNS  # reservation/* and savingsPlan/*, filled by the amortizer
 
 # Resource Tags columns
 RESOURCE_TAGS_COLUMNS = [
@@ -1145,21 +1167,27 @@ def generate_usage_data(project_name, project_data, day_count, start_date, daily
 
 
 def process_project(args):
-    """Process a single project - for parallel execution"""
+    """
+    Process a single project - for parallel execution
+
+    Returns:
+        Tuple of (records, tags, generation stage metrics of this worker)
+    """
     project_name, project_data, day_count, start_date, daily_budget = args
     try:
         start_time = time.time()
+        before = snapshot()
 
         # Validate project data
         if not project_data.get("services"):
             print(
                 f"Warning: Project {project_name} has no services defined. Skipping.")
-            return [], []
+            return [], [], None
 
         if not project_data.get("stages"):
             print(
                 f"Warning: Project {project_name} has no stages defined. Skipping.")
-            return [], []
+            return [], [], None
 
         # Ensure lifecycle is valid
         if project_data.get("lifecycle") not in CONFIG["project_lifecycles"]:
@@ -1172,12 +1200,12 @@ def process_project(args):
         end_time = time.time()
         print(
             f"Generated {len(results)} records for project {project_name} in {end_time - start_time:.2f} seconds")
-        return results, tags
+        return results, tags, stage_metrics("generation", before, project=project_name, records=len(results))
     except Exception as e:
         import traceback
         print(f"Error processing project {project_name}: {e}")
         print(traceback.format_exc())
-        return [], []
+        return [], [], None
 
 
 def generate_project_lifecycle_mapping(selected_projects):
@@ -1216,40 +1244,27 @@ def generate_project_lifecycle_mapping(selected_projects):
     return pd.DataFrame(project_details)
 
 
-def generate_chargeback_reports(df_records, df_tags, output_dir):
+def generate_chargeback_reports(df_records, df_tags, output_dir, cube=None):
     """Generate chargeback and showback reports based on cost data and tags"""
 
-    # Create mapping from resource IDs to their chargeback entities
-    resource_to_entity = {}
-    resource_allocation_method = {}
-
-    for _, tag in df_tags.iterrows():
-        if tag['key'] == 'ChargebackEntity':
-            resource_to_entity[tag['resourceId']] = tag['value']
-        if tag['key'] == 'AllocationMethod':
-            resource_allocation_method[tag['resourceId']] = tag['value']
-
-    # Apply the mapping to get chargeback entity for each record
-    df_records['chargeback_entity'] = df_records['lineItem/ResourceId'].map(
-        resource_to_entity).fillna("Unallocated")
-
-    df_records['allocation_method'] = df_records['lineItem/ResourceId'].map(
-        resource_allocation_method).fillna("direct")
+    # All reports are rollups of the cost cube; build it unless main() already did
+    if cube is None:
+        cube = build_cost_cube(df_records, df_tags)
 
     # 1. Direct Chargeback Report - what each entity should be charged
-    chargeback_summary = df_records.groupby(['month', 'chargeback_entity'])[
+    chargeback_summary = cube.groupby(['month', 'chargeback_entity'], observed=True)[
         'lineItem/UnblendedCost'].sum().reset_index()
     chargeback_summary.to_csv(
         f"{output_dir}/chargeback_by_entity.csv", index=False)
 
     # 2. Generate by Service and Entity
-    service_entity_summary = df_records.groupby(
-        ['month', 'chargeback_entity', 'lineItem/ProductCode'])['lineItem/UnblendedCost'].sum().reset_index()
+    service_entity_summary = cube.groupby(
+        ['month', 'chargeback_entity', 'lineItem/ProductCode'], observed=True)['lineItem/UnblendedCost'].sum().reset_index()
     service_entity_summary.to_csv(
         f"{output_dir}/chargeback_by_service_entity.csv", index=False)
 
     # 3. Compare Blended vs Unblended for proper showback
-    showback_comparison = df_records.groupby(['month', 'chargeback_entity'])[
+    showback_comparison = cube.groupby(['month', 'chargeback_entity'], observed=True)[
         ['lineItem/UnblendedCost', 'lineItem/BlendedCost']].sum().reset_index()
     showback_comparison['cost_difference'] = showback_comparison['lineItem/BlendedCost'] - \
         showback_comparison['lineItem/UnblendedCost']
@@ -1259,11 +1274,19 @@ def generate_chargeback_reports(df_records, df_tags, output_dir):
         f"{output_dir}/showback_blended_comparison.csv", index=False)
 
     # 4. Allocation Methods Report
-    allocation_summary = df_records.groupby(['month', 'allocation_method'])[
+    allocation_summary = cube.groupby(['month', 'allocation_method'], observed=True)[
         'lineItem/UnblendedCost'].sum().reset_index()
     allocation_summary.to_csv(
         f"{output_dir}/cost_by_allocation_method.csv", index=False)
 
+    # 5. Allocated Chargeback Report - shared costs split across receiving entities
+    allocated = allocate_shared_costs(
+        cube, df_tags, COST_ALLOCATION_RULES, ['lineItem/UnblendedCost'])
+    allocated_summary = allocated.groupby(['month', 'allocated_entity'], observed=True)[
+        'lineItem/UnblendedCost'].sum().reset_index()
+    allocated_summary.to_csv(
+        f"{output_dir}/chargeback_allocated_by_entity.csv", index=False)
+
     return {
         'chargeback_total': chargeback_summary['lineItem/UnblendedCost'].sum(),
         'direct_allocation': allocation_summary[allocation_summary['allocation_method'] == 'direct']['lineItem/UnblendedCost'].sum(),
@@ -1271,16 +1294,17 @@ def generate_chargeback_reports(df_records, df_tags, output_dir):
     }
 
 
-def analyze_blended_unblended_impact(df_records, output_dir):
+def analyze_blended_unblended_impact(df_records, output_dir, cube=None):
     """Analyze the impact of blended vs unblended costs"""
 
+    if cube is None:
+        cube = build_cost_cube(df_records)
+
     # Calculate the difference between blended and unblended costs
-    df_records['cost_difference'] = df_records['lineItem/BlendedCost'] - \
-        df_records['lineItem/UnblendedCost']
-    df_records['is_discounted'] = df_records['cost_difference'] < 0
+    cube = cube.assign(cost_difference=cube['lineItem/BlendedCost'] - cube['lineItem/UnblendedCost'])
 
     # Summary by account
-    account_summary = df_records.groupby(['lineItem/UsageAccountId'])[
+    account_summary = cube.groupby(['lineItem/UsageAccountId'], observed=True)[
         ['lineItem/UnblendedCost', 'lineItem/BlendedCost', 'cost_difference']].sum().reset_index()
     account_summary['discount_percent'] = (account_summary['cost_difference'] /
                                            account_summary['lineItem/UnblendedCost']) * 100
@@ -1288,7 +1312,7 @@ def analyze_blended_unblended_impact(df_records, output_dir):
         f"{output_dir}/blended_unblended_by_account.csv", index=False)
 
     # Summary by service
-    service_summary = df_records.groupby(['lineItem/ProductCode'])[
+    service_summary = cube.groupby(['lineItem/ProductCode'], observed=True)[
         ['lineItem/UnblendedCost', 'lineItem/BlendedCost', 'cost_difference']].sum().reset_index()
     service_summary['discount_percent'] = (service_summary['cost_difference'] /
                                            service_summary['lineItem/UnblendedCost']) * 100
@@ -1296,17 +1320,15 @@ def analyze_blended_unblended_impact(df_records, output_dir):
         f"{output_dir}/blended_unblended_by_service.csv", index=False)
 
     # Find resources with the largest differences
-    resource_summary = df_records.groupby(['lineItem/ResourceId'])[
+    resource_summary = cube.groupby(['lineItem/ResourceId'], observed=True)[
         ['lineItem/UnblendedCost', 'lineItem/BlendedCost', 'cost_difference']].sum().reset_index()
-    resource_summary = resource_summary.sort_values(
-        'cost_difference', ascending=False)
-    top_resources = resource_summary.head(20)
+    top_resources = top_k_rows(resource_summary, 'cost_difference')
     top_resources.to_csv(
         f"{output_dir}/top_blended_unblended_impact_resources.csv", index=False)
 
     # Overall statistics
-    total_unblended = df_records['lineItem/UnblendedCost'].sum()
-    total_blended = df_records['lineItem/BlendedCost'].sum()
+    total_unblended = cube['lineItem/UnblendedCost'].sum()
+    total_blended = cube['lineItem/BlendedCost'].sum()
     total_difference = total_blended - total_unblended
     percent_difference = (total_difference / total_unblended) * \
         100 if total_unblended > 0 else 0
@@ -1327,6 +1349,51 @@ def analyze_blended_unblended_impact(df_records, output_dir):
     return summary_stats
 
 
+def generate_cost_reports(cube, df_tags, output_dir, sketches=None):
+    """
+    Write the cost summaries and the chargeback and blended/unblended reports from a cost cube.
+
+    With the cube's distinct-count sketches (aws_distinct), the project and
+    service summaries also get exact distinct resource and approximate
+    usage type counts.
+    """
+    # Generate monthly cost summary by project
+    summary = cube.groupby(['month', 'project'])[
+        'lineItem/UnblendedCost'].sum().reset_index()
+    if sketches is not None:
+        add_distinct_counts(summary, sketches, ['month', 'project'], cube)
+    summary.to_csv(
+        f"{output_dir}/cost_summary_by_project.csv", index=False)
+
+    # Also generate summary by service
+    service_summary = cube.groupby(
+        ['month', 'lineItem/ProductCode'])['lineItem/UnblendedCost'].sum().reset_index()
+    if sketches is not None:
+        add_distinct_counts(service_summary, sketches, ['month', 'lineItem/ProductCode'], cube)
+    service_summary.to_csv(
+        f"{output_dir}/cost_summary_by_service.csv", index=False)
+
+    # Generate monthly cost summary by business unit
+    bu_summary = cube.groupby(['month', 'business_unit'])[
+        'lineItem/UnblendedCost'].sum().reset_index()
+    bu_summary.to_csv(
+        f"{output_dir}/cost_summary_by_business_unit.csv", index=False)
+
+    # Generate chargeback/showback reports
+    chargeback_stats = generate_chargeback_reports(
+        None, df_tags, output_dir, cube)
+    print(
+        f"Generated chargeback/showback reports. Total chargeback: ${chargeback_stats['chargeback_total']:.2f}")
+
+    # Analyze blended vs unblended costs
+    blended_impact = analyze_blended_unblended_impact(
+        None, output_dir, cube)
+    print(f"Analyzed blended vs unblended costs. Difference: ${blended_impact['total_difference']:.2f} " +
+          f"({blended_impact['percent_difference']:.2f}%)")
+
+    return chargeback_stats, blended_impact
+
+
 def main():
     print("AWS Cost and Usage Report Generator")
     print("Data Volume Settings:")
@@ -1335,6 +1402,10 @@ def main():
 
     start_time = time.time()
 
+    # Opt-in per-stage wall time, CPU time and RSS deltas; run_stage() is a
+    # no-op while metrics is None
+    metrics = start_run_metrics() if OUTPUT_SETTINGS["run_metrics"] else None
+
     # Calculate daily budget
     daily_budget = calculate_daily_budget()
     print(f"Daily budget: ${daily_budget:.2f}")
@@ -1350,17 +1421,18 @@ def main():
     print(
         f"Using volatility factor of {DATA_VOLUME_SETTINGS['volatility_factor']} (±{DATA_VOLUME_SETTINGS['volatility_factor']*100}%)")
 
-    # Pick representative projects with diverse lifecycles
-    selected_projects = pick_representative_projects()
-    print(f"Selected projects: {', '.join(selected_projects)}")
+    with run_stage(metrics, "project_selection"):
+        # Pick representative projects with diverse lifecycles
+        selected_projects = pick_representative_projects()
+        print(f"Selected projects: {', '.join(selected_projects)}")
 
-    # Generate project-lifecycle mapping
-    project_lifecycle_df = generate_project_lifecycle_mapping(
-        selected_projects)
-    print("Generated project lifecycle mapping")
+        # Generate project-lifecycle mapping
+        project_lifecycle_df = generate_project_lifecycle_mapping(
+            selected_projects)
+        print("Generated project lifecycle mapping")
 
-    # Check for missing services
-    missing_services = find_missing_services()
+        # Check for missing services
+        missing_services = find_missing_services()
     if missing_services:
         print(
             f"WARNING: Found services in projects that are not defined in AWS_SERVICES: {', '.join(missing_services)}")
@@ -1376,71 +1448,75 @@ def main():
     all_records = []
     all_tags = []
 
-    with multiprocessing.Pool(processes=min(len(project_args), multiprocessing.cpu_count())) as pool:
-        results = pool.map(process_project, project_args)
+    # The parent's generation stage also covers pickling the workers'
+    # records back; each worker reports its own generation stage
+    with run_stage(metrics, "generation", projects=len(project_args)):
+        with multiprocessing.Pool(processes=min(len(project_args), multiprocessing.cpu_count())) as pool:
+            results = pool.map(process_project, project_args)
+    add_stages(metrics, [worker_stage for _, _, worker_stage in results])
 
-        for records, tags in results:
+    with run_stage(metrics, "concatenation"):
+        for records, tags, _ in results:
             all_records.extend(records)
             all_tags.extend(tags)
 
     print(
         f"Generated {len(all_records)} total records and {len(all_tags)} tags")
 
-    # Convert to DataFrames
-    df_records = pd.DataFrame(all_records)
-    df_tags = pd.DataFrame(all_tags)
+    with run_stage(metrics, "dataframe_build"):
+        # Convert to DataFrames
+        df_records = pd.DataFrame(all_records)
+        df_tags = pd.DataFrame(all_tags)
 
-    # Ensure all columns exist in the DataFrame
-    for col in CUR_COLUMNS:
-        if col not in df_records.columns:
-            df_records[col] = ""
+        # Ensure all columns exist in the DataFrame
+        for col in CUR_COLUMNS:
+            if col not in df_records.columns:
+                df_records[col] = ""
 
-    for col in RESOURCE_TAGS_COLUMNS:
-        if col not in df_tags.columns:
-            df_tags[col] = ""
+        for col in RESOURCE_TAGS_COLUMNS:
+            if col not in df_tags.columns:
+                df_tags[col] = ""
+
+    # Amortize RIs and Savings Plans per billing period and add their
+    # RIFee / SavingsPlanRecurringFee line items
+    if not df_records.empty:
+        with run_stage(metrics, "commitment_line_items"):
+            df_records = add_commitment_line_items(df_records, RI_DISCOUNT_MAPPING)
 
     # Save to CSV
     output_dir = "output"
     os.makedirs(output_dir, exist_ok=True)
 
-    df_records.to_csv(f"{output_dir}/cost_and_usage_report.csv", index=False)
-    df_tags.to_csv(f"{output_dir}/resource_tags.csv", index=False)
+    with run_stage(metrics, "csv_write", file="cost_and_usage_report.csv", rows=len(df_records)):
+        df_records.to_csv(f"{output_dir}/cost_and_usage_report.csv", index=False)
+    with run_stage(metrics, "csv_write", file="resource_tags.csv", rows=len(df_tags)):
+        df_tags.to_csv(f"{output_dir}/resource_tags.csv", index=False)
 
     # Save the project lifecycle mapping
-    project_lifecycle_df.to_csv(
-        f"{output_dir}/project_lifecycle_mapping.csv", index=False)
+    with run_stage(metrics, "csv_write", file="project_lifecycle_mapping.csv", rows=len(project_lifecycle_df)):
+        project_lifecycle_df.to_csv(
+            f"{output_dir}/project_lifecycle_mapping.csv", index=False)
     print(
         f"Saved project lifecycle mapping to {output_dir}/project_lifecycle_mapping.csv")
 
+    # Optionally load the same frames into a local DuckDB/SQLite warehouse
+    warehouse_engine = OUTPUT_SETTINGS["warehouse_engine"]
+    if warehouse_engine:
+        with run_stage(metrics, "warehouse_export", engine=warehouse_engine):
+            warehouse_path = export_to_warehouse(
+                df_records, df_tags, project_lifecycle_df,
+                path=default_warehouse_path(output_dir, warehouse_engine), engine=warehouse_engine)
+        print(f"Saved warehouse tables to {warehouse_path}")
+
+    # Optionally write the records as pruned-scan partitions
+    if OUTPUT_SETTINGS["partitioned_records"]:
+        dataset_dir = f"{output_dir}/cost_and_usage_report"
+        with run_stage(metrics, "partitioned_records"):
+            partitions = write_partitioned_records(df_records, dataset_dir, df_tags)
+        print(f"Saved {len(partitions)} record partitions to {dataset_dir}")
+
     # Generate a summary per project per month
     if not df_records.empty:
-        # Convert timestamps to datetime
-        df_records['month'] = pd.to_datetime(
-            df_records['lineItem/UsageStartDate']).dt.strftime('%Y-%m')
-
-        # Create a mapping of resource ID to project using tags
-        resource_to_project = {}
-        for _, tag in df_tags.iterrows():
-            if tag['key'] == 'Project':
-                resource_to_project[tag['resourceId']] = tag['value']
-
-        # Apply mapping to get project for each record
-        df_records['project'] = df_records['lineItem/ResourceId'].map(
-            resource_to_project).fillna("Unknown")
-
-        # Generate monthly cost summary by project
-        summary = df_records.groupby(['month', 'project'])[
-            'lineItem/UnblendedCost'].sum().reset_index()
-        summary.to_csv(
-            f"{output_dir}/cost_summary_by_project.csv", index=False)
-
-        # Also generate summary by service
-        service_summary = df_records.groupby(
-            ['month', 'lineItem/ProductCode'])['lineItem/UnblendedCost'].sum().reset_index()
-        service_summary.to_csv(
-            f"{output_dir}/cost_summary_by_service.csv", index=False)
-
-        # Generate summary by business unit
         # Create a mapping of project to business unit
         project_to_bu = {}
         for project_name in selected_projects:
@@ -1448,30 +1524,77 @@ def main():
             project_to_bu[project_name] = project_data.get(
                 "business_unit", "Unknown")
 
-        # Apply mapping to get business unit for each record
-        df_records['business_unit'] = df_records['project'].map(
-            project_to_bu).fillna("Unknown")
-
-        # Generate monthly cost summary by business unit
-        bu_summary = df_records.groupby(['month', 'business_unit'])[
-            'lineItem/UnblendedCost'].sum().reset_index()
-        bu_summary.to_csv(
-            f"{output_dir}/cost_summary_by_business_unit.csv", index=False)
-
-        # Generate chargeback/showback reports
-        chargeback_stats = generate_chargeback_reports(
-            df_records, df_tags, output_dir)
-        print(
-            f"Generated chargeback/showback reports. Total chargeback: ${chargeback_stats['chargeback_total']:.2f}")
-
-        # Analyze blended vs unblended costs
-        blended_impact = analyze_blended_unblended_impact(
-            df_records, output_dir)
-        print(f"Analyzed blended vs unblended costs. Difference: ${blended_impact['total_difference']:.2f} " +
-              f"({blended_impact['percent_difference']:.2f}%)")
+        # Aggregate once; project, business unit, chargeback entity and
+        # allocation method are resolved from the tags on the cube
+        with run_stage(metrics, "aggregation", function="build_cost_cube"):
+            cube = build_cost_cube(df_records, df_tags, project_business_units=project_to_bu)
+
+        # Distinct resource and usage type sketches for the same cube cells
+        with run_stage(metrics, "aggregation", function="aggregate_sketches"):
+            sketches = aggregate_sketches(df_records)
+
+        # Write every summary and chargeback report from the cube
+        with run_stage(metrics, "report", function="generate_cost_reports"):
+            generate_cost_reports(cube, df_tags, output_dir, sketches)
+
+        # Unblended vs amortized cost of the RI and Savings Plan commitments
+        with run_stage(metrics, "report", function="write_amortization_reports"):
+            amortization = write_amortization_reports(df_records, output_dir)
+        print(f"Added {amortization['reservation_fees']} RI fees and "
+              f"{amortization['savings_plan_fees']} Savings Plan fees. "
+              f"Amortized cost: ${amortization['total_amortized_cost']:.2f}")
+
+        # Forecast, anomaly, scenario, budget, commitment and rightsizing reports
+        if OUTPUT_SETTINGS["analysis_reports"]:
+            # Daily cost forecasts per project, service and account, reconciled
+            # up to business units and the org
+            with run_stage(metrics, "report", function="write_forecast_reports"):
+                forecast = write_forecast_reports(df_records, df_tags, project_to_bu, output_dir)
+            print(f"Forecast {forecast['series']} cost series {forecast['horizon_days']} days ahead "
+                  f"in {forecast['fit_seconds']:.2f} seconds. Total: ${forecast['total_forecast']:.2f}")
+
+            # Daily cost anomalies per account and service, from a fresh detector state
+            with run_stage(metrics, "report", function="write_anomaly_reports"):
+                anomalies = write_anomaly_reports(df_records, output_dir, resume=False)
+            print(f"Flagged {anomalies['new_anomalies']} cost anomalies across {anomalies['series']} series")
+
+            # Monte Carlo spend bands of the selected projects over the same days,
+            # each with the daily budget process_project() gives it
+            project_budget = daily_budget / 7
+            with run_stage(metrics, "report", function="write_scenario_reports"):
+                scenario = write_scenario_reports(
+                    scenario_projects(selected_projects, project_budget), start_date, day_count, output_dir,
+                    volatility_factor=DATA_VOLUME_SETTINGS["volatility_factor"])
+            print(f"Simulated {scenario['paths']} spend paths per project in {scenario['simulation_seconds']:.2f} "
+                  f"seconds. Annual spend p50: ${scenario['annual_spend']['p50']:.2f}")
+
+            # Burn rate and projected overrun against the annual budget, from a
+            # fresh tracker state
+            with run_stage(metrics, "report", function="write_budget_reports"):
+                budget = write_budget_reports(
+                    df_records, df_tags, project_to_bu, output_dir,
+                    budgets=project_budgets(selected_projects, project_budget * 365), resume=False)
+            print(f"Projected year-end spend: ${budget['projected_year_end']:.2f} against a budget of "
+                  f"${budget['annual_budget']:.2f} ({budget['new_crossings']} budget threshold crossings)")
+
+            # Savings-maximizing RI / Savings Plan commitment per service, region and account
+            with run_stage(metrics, "report", function="write_commitment_reports"):
+                commitments = write_commitment_reports(df_records, RI_DISCOUNT_MAPPING, output_dir)
+            print(f"Sized commitments for {commitments['families']} service families in "
+                  f"{commitments['sweep_seconds']:.2f} seconds. Savings: ${commitments['savings']:.2f}")
+
+            # Cheapest catalog instance type fitting each tagged resource's usage
+            with run_stage(metrics, "report", function="write_rightsizing_reports"):
+                rightsizing = write_rightsizing_reports(df_records, df_tags, output_dir)
+            print(f"Rightsized {rightsizing['resources']} resources in {rightsizing['sizing_seconds']:.2f} seconds "
+                  f"({rightsizing['resources_resized']} resized). Savings: ${rightsizing['savings']:.2f}")
 
     end_time = time.time()
     print(f"Generated AWS CUR data in {end_time - start_time:.2f} seconds")
+
+    if metrics is not None:
+        metrics_path = write_run_metrics(metrics, output_dir)
+        print(f"Saved run metrics for {len(metrics['stages'])} stages to {metrics_path}")
     print(f"Data saved to {output_dir}/")
 
 
@@ -0,0 +1,80 @@
+import os
+import sys
+import pandas as pd
+
+from aws_loader import TIMESTAMP_FORMAT, load_records, load_tags, load_lifecycle_mapping
+from aws_tag_resolver import resolve_tag_attributes
+from aws_chunked_reports import lifecycle_business_units
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import forecast  # noqa: E402
+
+# Record columns the daily series are built from. The stage of a series is
+# the usage account and the business unit follows from the project.
+FORECAST_RECORD_COLUMNS = [
+    "lineItem/UsageStartDate",
+    "lineItem/UsageAccountId",
+    "lineItem/ProductCode",
+    "lineItem/ResourceId",
+    "lineItem/UnblendedCost"
+]
+
+
+def record_days(dates):
+    """Dates as datetime64[D], from CUR strings or loader timestamps"""
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates.astype(object), format=TIMESTAMP_FORMAT)
+    elif dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates.to_numpy().astype('datetime64[D]')
+
+
+def daily_cost_series(df_records, df_tags, project_business_units):
+    """
+    Daily unblended cost per business unit, project, service and usage account.
+
+    Records are summed per day and resource first, so the tags are resolved
+    once per resource-day instead of once per line item.
+
+    Returns:
+        DataFrame of date, SERIES_COLUMNS and cost
+    """
+    resources = pd.DataFrame({
+        'date': record_days(df_records['lineItem/UsageStartDate']),
+        'stage': df_records['lineItem/UsageAccountId'].astype(object).values,
+        'service': df_records['lineItem/ProductCode'].astype(object).values,
+        'lineItem/ResourceId': df_records['lineItem/ResourceId'].astype(object).values,
+        'cost': df_records['lineItem/UnblendedCost'].to_numpy(dtype=float)
+    }).groupby(['date', 'stage', 'service', 'lineItem/ResourceId'], sort=False)['cost'].sum().reset_index()
+
+    resolve_tag_attributes(resources, df_tags, attributes=["project"],
+                           project_business_units=project_business_units)
+    return resources.groupby(['date'] + forecast.SERIES_COLUMNS, sort=True)['cost'].sum().reset_index()
+
+
+def write_forecast_reports(df_records, df_tags, project_business_units, output_dir, settings=None):
+    """Write cost_forecast.csv and cost_forecast_summary.json"""
+    daily = daily_cost_series(df_records, df_tags, project_business_units)
+    return forecast.write_forecast_reports(daily, output_dir, settings)
+
+
+def main():
+    """Forecast the daily cost series of an existing output directory"""
+    output_dir = "output"
+
+    df_records = load_records(output_dir, columns=FORECAST_RECORD_COLUMNS)
+    df_tags = load_tags(output_dir, keys=["Project"])
+    project_to_bu = lifecycle_business_units(load_lifecycle_mapping(output_dir))
+
+    summary = write_forecast_reports(df_records, df_tags, project_to_bu, output_dir)
+    print(f"Forecast {summary['series']} series and {summary['aggregates']} aggregates "
+          f"{summary['horizon_days']} days ahead in {summary['fit_seconds']:.2f} seconds. "
+          f"Total forecast: ${summary['total_forecast']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+import os
+import sys
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common.metrics import (  # noqa: E402
+    RUN_METRICS_FILE, STAGE_FIELDS, rss_mb, peak_rss_mb, snapshot, stage_metrics, start_run_metrics, run_stage,
+    add_stages, write_run_metrics
+)
+
+# The generator imports the stage helpers from here
+__all__ = ["RUN_METRICS_FILE", "STAGE_FIELDS", "rss_mb", "peak_rss_mb", "snapshot", "stage_metrics",
+           "start_run_metrics", "run_stage", "add_stages", "write_run_metrics"]
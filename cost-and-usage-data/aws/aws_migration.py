@@ -0,0 +1,189 @@
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from aws_config import CONFIG
+from aws_loader import load_records, load_tags
+from aws_tag_resolver import pivot_tags
+from aws_cost_cube import record_months
+
+# Migration settings. A plan is {"name": ..., "moves": [move, ...]}; a move
+# is {"from_region": ..., "to_region": ...} narrowed by any of "project",
+# "environment" and "account", e.g. {"project": "AviationSafety",
+# "environment": "Production", "from_region": "ap-south-1", "to_region":
+# "us-east-1"}. The moves of one plan should not overlap.
+MIGRATION_SETTINGS = {
+    "plans_file": "migration_plans.json"  # Plans to evaluate, in the output directory (default: every placement)
+}
+
+# Record attributes resolved from tags: column -> (tag key, default when untagged)
+SCOPE_TAGS = {
+    "project": ("Project", "Unknown"),
+    "environment": ("Environment", "Unknown")
+}
+
+ACCOUNT_COLUMN = "lineItem/UsageAccountId"
+REGION_COLUMN = "product/region"
+
+# Move keys narrowing a move, and the cube column each one matches
+MOVE_SCOPES = {"project": "project", "environment": "environment", "account": ACCOUNT_COLUMN}
+
+MIGRATION_RECORD_COLUMNS = ["lineItem/UsageStartDate", "lineItem/ResourceId", ACCOUNT_COLUMN, REGION_COLUMN,
+                            "lineItem/UnblendedCost"]
+
+DELTA_COLUMNS = ["plan", "month", "moved_cost", "migrated_cost", "delta"]
+RANKING_COLUMNS = ["rank", "plan", "moves", "moved_cost", "migrated_cost", "delta", "delta_percent"]
+
+
+def placement_cube(df_records, df_tags):
+    """
+    Unblended cost by month, project, environment, account and region.
+
+    Every plan is evaluated against this cube, so the records are scanned once.
+    """
+    wide = pivot_tags(df_tags, [key for key, _ in SCOPE_TAGS.values()])
+    wide.columns = list(SCOPE_TAGS)
+    cube = pd.DataFrame({
+        'month': record_months(df_records).to_numpy(),
+        'lineItem/ResourceId': df_records['lineItem/ResourceId'].astype(object).to_numpy(),
+        ACCOUNT_COLUMN: df_records[ACCOUNT_COLUMN].astype(object).astype(str).to_numpy(),
+        REGION_COLUMN: df_records[REGION_COLUMN].astype(object).to_numpy(),
+        'cost': df_records['lineItem/UnblendedCost'].to_numpy(dtype=float)
+    }).merge(wide, how='left', left_on='lineItem/ResourceId', right_index=True)
+    for col, (_, default) in SCOPE_TAGS.items():
+        cube[col] = cube[col].fillna(default)
+
+    keys = ['month'] + list(MOVE_SCOPES.values()) + [REGION_COLUMN]
+    return cube.groupby(keys, sort=True)['cost'].sum().reset_index()
+
+
+def candidate_plans(cube, regions):
+    """One plan per project, current region and target region: the project's whole footprint there moves"""
+    footprints = cube[["project", REGION_COLUMN]].drop_duplicates().sort_values(["project", REGION_COLUMN])
+    return [{"name": f"{project}: {from_region} -> {to_region}",
+             "moves": [{"project": project, "from_region": from_region, "to_region": to_region}]}
+            for project, from_region in footprints.itertuples(index=False)
+            for to_region in regions if to_region != from_region]
+
+
+def evaluate_plans(cube, plans, regional_factors):
+    """
+    Monthly cost delta of every plan, from one pass over the cube.
+
+    Each moved row is repriced by the ratio of the target region's cost
+    factor to the source region's (1.0 for regions without a factor). All
+    moves of all plans are matched against the cube cells with one boolean
+    matrix; a moves x months matrix of moved cost comes from one product
+    with the cells x months cost matrix, and a 0/1 plans x moves incidence
+    matrix sums the moves into their plans.
+
+    Returns:
+        Tuple of (monthly deltas DataFrame with DELTA_COLUMNS, ranking
+        DataFrame with RANKING_COLUMNS, cheapest plan first)
+    """
+    moves = pd.DataFrame([dict(move, plan=i) for i, plan in enumerate(plans) for move in plan["moves"]],
+                         columns=["plan", "from_region", "to_region"] + list(MOVE_SCOPES))
+
+    cells = cube.pivot_table(index=list(MOVE_SCOPES.values()) + [REGION_COLUMN], columns='month',
+                             values='cost', aggfunc='sum', fill_value=0.0)
+    months = list(cells.columns)
+    cell_keys = cells.index.to_frame(index=False)
+
+    match = (moves["from_region"].to_numpy(dtype=object)[:, None] ==
+             cell_keys[REGION_COLUMN].to_numpy(dtype=object)[None, :])
+    for key, col in MOVE_SCOPES.items():
+        wanted = moves[key].astype(object)
+        match &= (wanted.isna().to_numpy()[:, None] |
+                  (wanted.astype(str).to_numpy(dtype=object)[:, None] ==
+                   cell_keys[col].astype(str).to_numpy(dtype=object)[None, :]))
+
+    moved = match.astype(float) @ cells.to_numpy(dtype=float)
+    factors = {region: float(factor) for region, factor in regional_factors.items()}
+    ratios = (moves["to_region"].map(lambda region: factors.get(region, 1.0)).to_numpy(dtype=float) /
+              moves["from_region"].map(lambda region: factors.get(region, 1.0)).to_numpy(dtype=float))
+
+    incidence = np.zeros((len(plans), len(moves)))
+    incidence[moves["plan"].to_numpy(dtype=np.int64), np.arange(len(moves))] = 1.0
+    plan_moved = incidence @ moved
+    plan_delta = incidence @ (moved * (ratios - 1.0)[:, None])
+
+    names = [plan["name"] for plan in plans]
+    deltas = pd.DataFrame({
+        "plan": np.repeat(names, len(months)),
+        "month": np.tile(months, len(plans)),
+        "moved_cost": plan_moved.ravel(),
+        "migrated_cost": (plan_moved + plan_delta).ravel(),
+        "delta": plan_delta.ravel()
+    })
+
+    ranking = pd.DataFrame({
+        "plan": names,
+        "moves": [len(plan["moves"]) for plan in plans],
+        "moved_cost": plan_moved.sum(axis=1),
+        "migrated_cost": (plan_moved + plan_delta).sum(axis=1),
+        "delta": plan_delta.sum(axis=1)
+    })
+    moved_cost = ranking["moved_cost"].to_numpy(dtype=float)
+    ranking["delta_percent"] = np.divide(ranking["delta"].to_numpy(dtype=float) * 100, moved_cost,
+                                         out=np.zeros(len(ranking)), where=moved_cost > 0)
+    ranking = ranking.sort_values(["delta", "plan"]).reset_index(drop=True)
+    ranking["rank"] = np.arange(1, len(ranking) + 1)
+    return deltas[DELTA_COLUMNS], ranking[RANKING_COLUMNS]
+
+
+def write_migration_reports(df_records, df_tags, output_dir, plans=None, regional_factors=None):
+    """
+    Write migration_deltas_by_month.csv, migration_plan_ranking.csv and migration_summary.json.
+
+    Args:
+        plans: Plans to evaluate (default: candidate_plans() over every
+            region with a cost factor)
+        regional_factors: Region -> cost factor (default: REGIONAL_COST_FACTORS)
+    """
+    regional_factors = regional_factors or CONFIG["REGIONAL_COST_FACTORS"]
+
+    start_time = time.time()
+    cube = placement_cube(df_records, df_tags)
+    plans = plans or candidate_plans(cube, list(regional_factors))
+    deltas, ranking = evaluate_plans(cube, plans, regional_factors)
+    elapsed = time.time() - start_time
+
+    deltas.to_csv(f"{output_dir}/migration_deltas_by_month.csv", index=False)
+    ranking.to_csv(f"{output_dir}/migration_plan_ranking.csv", index=False)
+
+    summary_stats = {
+        'plans': int(len(plans)),
+        'moves': int(sum(len(plan["moves"]) for plan in plans)),
+        'months': int(deltas["month"].nunique()),
+        'cheapest_plan': ranking["plan"].iloc[0] if len(ranking) else None,
+        'cheapest_delta': float(ranking["delta"].iloc[0]) if len(ranking) else 0.0,
+        'evaluation_seconds': round(elapsed, 3)
+    }
+    with open(f"{output_dir}/migration_summary.json", 'w') as f:
+        json.dump(summary_stats, f, indent=2)
+
+    return summary_stats
+
+
+def main():
+    """Evaluate region migration plans against an existing output directory"""
+    output_dir = "output"
+
+    plans = None
+    plans_path = os.path.join(output_dir, MIGRATION_SETTINGS["plans_file"])
+    if os.path.exists(plans_path):
+        with open(plans_path) as f:
+            plans = json.load(f)
+
+    df_records = load_records(output_dir, columns=MIGRATION_RECORD_COLUMNS)
+    df_tags = load_tags(output_dir, keys=[key for key, _ in SCOPE_TAGS.values()])
+    summary = write_migration_reports(df_records, df_tags, output_dir, plans=plans)
+    print(f"Evaluated {summary['plans']} migration plans over {summary['months']} months in "
+          f"{summary['evaluation_seconds']:.2f} seconds. Cheapest: {summary['cheapest_plan']} "
+          f"(${summary['cheapest_delta']:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+import os
+import sys
+import json
+import time
+import datetime
+import shutil
+import pandas as pd
+
+from aws_loader import (load_outputs, read_typed_csv, record_dtypes, compact_categories,
+                        filter_date_range, RECORD_TIMESTAMP_COLUMNS,
+                        TIMESTAMP_FORMAT, USAGE_DATE_COLUMN)
+
+# Parquet needs pyarrow; without it partitions are written as CSV
+try:
+    import pyarrow  # noqa: F401
+    DEFAULT_FORMAT = "parquet"
+except ImportError:
+    DEFAULT_FORMAT = "csv"
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import partitions  # noqa: E402
+from finops_common.partitions import (STATS_FILE, build_bloom_filter, sorted_distinct,  # noqa: E402
+                                      replace_dataset, read_partition_stats, as_list)
+
+# Partitioning settings - one directory per month and usage account
+PARTITION_SETTINGS = {
+    "format": DEFAULT_FORMAT,
+    "account_column": "lineItem/UsageAccountId",
+    "bloom_false_positive_rate": 0.01,  # 1% false positives per partition
+}
+
+# Key columns summarised in each partition's sidecar
+SERVICE_COLUMN = "lineItem/ProductCode"
+ACCOUNT_COLUMN = "lineItem/UsageAccountId"
+REGION_COLUMN = "product/region"
+RESOURCE_COLUMN = "lineItem/ResourceId"
+COST_COLUMN = "lineItem/UnblendedCost"
+
+
+def coerce_record_types(df_records):
+    """Give generator frames the loader dtypes so every partition has one schema"""
+    # Report columns such as 'month' are derived, not stored
+    df = df_records.drop(columns=["month"], errors="ignore").copy()
+    for col in RECORD_TIMESTAMP_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], format=TIMESTAMP_FORMAT, utc=True)
+    for col, kind in record_dtypes().items():
+        if col in df.columns and kind != "object":
+            df[col] = df[col].astype(kind)
+    return df
+
+
+def resource_projects(df_tags):
+    """Map resource id -> Project tag value"""
+    if df_tags is None:
+        return None
+    project_tags = df_tags[df_tags['key'] == 'Project']
+    project_tags = project_tags.drop_duplicates('resourceId', keep='last')
+    return pd.Series(project_tags['value'].astype(object).values,
+                     index=project_tags['resourceId'].astype(object).values)
+
+
+def partition_stats(df_part, resource_to_project=None, false_positive_rate=0.01):
+    """Stats sidecar for one partition"""
+    usage_dates = df_part[USAGE_DATE_COLUMN]
+    stats = {
+        "row_count": int(len(df_part)),
+        "min_usage_date": usage_dates.min().isoformat(),
+        "max_usage_date": usage_dates.max().isoformat(),
+        "cost_sum": float(df_part[COST_COLUMN].sum()),
+        "services": sorted_distinct(df_part[SERVICE_COLUMN]),
+        "accounts": sorted_distinct(df_part[ACCOUNT_COLUMN]),
+        "regions": sorted_distinct(df_part[REGION_COLUMN]),
+        "resource_bloom": build_bloom_filter(df_part[RESOURCE_COLUMN].astype(object),
+                                             false_positive_rate)
+    }
+    if resource_to_project is not None:
+        projects = df_part[RESOURCE_COLUMN].astype(object).map(resource_to_project)
+        stats["projects"] = sorted_distinct(projects.dropna())
+    return stats
+
+
+def partition_path(dataset_dir, month, account, batch=None):
+    """Directory of one month/account partition, or of one appended batch of it"""
+    part_dir = os.path.join(dataset_dir, f"month={month}", f"account={account}")
+    return part_dir if batch is None else os.path.join(part_dir, f"batch={batch}")
+
+
+def write_partitions(df_records, root_dir, df_tags=None, file_format=None, batch=None):
+    """Write month/account partitions and their sidecars under root_dir; returns their directories"""
+    file_format = file_format or PARTITION_SETTINGS["format"]
+    false_positive_rate = PARTITION_SETTINGS["bloom_false_positive_rate"]
+    resource_to_project = resource_projects(df_tags)
+
+    df = coerce_record_types(df_records)
+    months = df[USAGE_DATE_COLUMN].dt.strftime('%Y-%m')
+    accounts = df[PARTITION_SETTINGS["account_column"]].astype(object)
+
+    written = []
+    for (month, account), index in df.groupby([months, accounts], sort=True).groups.items():
+        df_part = compact_categories(df.loc[index].reset_index(drop=True))
+        part_dir = partition_path(root_dir, month, account, batch)
+        os.makedirs(part_dir, exist_ok=True)
+
+        if file_format == "parquet":
+            df_part.to_parquet(os.path.join(part_dir, "part-00000.parquet"), index=False)
+        else:
+            df_part.to_csv(os.path.join(part_dir, "part-00000.csv"), index=False,
+                           date_format=TIMESTAMP_FORMAT)
+
+        stats = partition_stats(df_part, resource_to_project, false_positive_rate)
+        stats["month"] = month
+        stats["account"] = account
+        stats["format"] = file_format
+        if batch is not None:
+            stats["batch"] = batch
+        with open(os.path.join(part_dir, STATS_FILE), "w") as f:
+            json.dump(stats, f, indent=2)
+
+        written.append(part_dir)
+
+    return written
+
+
+def write_partitioned_records(df_records, dataset_dir, df_tags=None, file_format=None):
+    """
+    Write CUR records as month/account partitions, each with a _stats.json sidecar.
+
+    Partitions of an earlier run are replaced: the new ones are written to a
+    staging directory that is swapped in once complete.
+
+    Args:
+        df_records: CUR frame (generator or loader output)
+        dataset_dir: Root directory of the partitioned dataset
+        df_tags: Optional tags frame; adds distinct projects to the sidecars
+        file_format: "parquet" or "csv", defaults to PARTITION_SETTINGS["format"]
+
+    Returns:
+        List of partition directories written
+    """
+    dataset_dir = os.path.normpath(dataset_dir)
+    staging_dir = f"{dataset_dir}.staging"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+    written = write_partitions(df_records, staging_dir, df_tags, file_format)
+    replace_dataset(staging_dir, dataset_dir)
+    return [dataset_dir + part_dir[len(staging_dir):] for part_dir in written]
+
+
+def append_partitioned_records(df_records, dataset_dir, df_tags=None, file_format=None):
+    """
+    Add newly arrived CUR records to a dataset, leaving its partitions untouched.
+
+    The records are written as a new batch=<id> partition under each
+    month/account directory they fall in, so an append costs O(new data).
+    Readers find the batches through their sidecars like any partition.
+
+    Args:
+        df_tags: Optional tags frame; adds distinct projects to the sidecars
+        file_format: "parquet" or "csv", defaults to PARTITION_SETTINGS["format"]
+
+    Returns:
+        List of partition directories written
+    """
+    batch = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    return write_partitions(df_records, os.path.normpath(dataset_dir), df_tags, file_format, batch)
+
+
+def partition_matches(stats, start_date=None, end_date=None, accounts=None, services=None,
+                      regions=None, projects=None, resource_ids=None):
+    """
+    Decide from the sidecar alone whether a partition can hold matching rows.
+
+    Dates are half-open [start_date, end_date) like the loader filters. A
+    partition without project stats is never pruned on projects.
+    """
+    return partitions.partition_matches(
+        stats, start_date, end_date,
+        values={"accounts": accounts, "services": services, "regions": regions, "projects": projects},
+        blooms={"resource_bloom": resource_ids})
+
+
+def prune_partitions(dataset_dir, **filters):
+    """Partition directories that may contain rows matching the filters"""
+    return partitions.prune_partitions(dataset_dir, partition_matches, **filters)
+
+
+def read_partition(part_dir, columns=None):
+    """Read the data file of one partition"""
+    parquet_path = os.path.join(part_dir, "part-00000.parquet")
+    if os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path, columns=columns)
+    return read_typed_csv(os.path.join(part_dir, "part-00000.csv"), record_dtypes(),
+                          columns=columns, timestamp_columns=RECORD_TIMESTAMP_COLUMNS,
+                          timestamp_format=TIMESTAMP_FORMAT)
+
+
+def load_partitioned_records(dataset_dir, columns=None, start_date=None, end_date=None,
+                             accounts=None, services=None, regions=None, projects=None,
+                             resource_ids=None, df_tags=None, add_month=False):
+    """
+    Load only the partitions that can match, then apply the filters row by row.
+
+    Project filters need df_tags to be applied to rows; without it they only
+    prune partitions. add_month adds the categorical 'month' column the
+    report functions group on, as in aws_loader.load_records().
+
+    Returns:
+        DataFrame with the loader dtypes
+    """
+    part_dirs = prune_partitions(dataset_dir, start_date=start_date, end_date=end_date,
+                                 accounts=accounts, services=services, regions=regions,
+                                 projects=projects, resource_ids=resource_ids)
+
+    # Filter columns must be read even when not projected
+    date_needed = start_date is not None or end_date is not None or add_month
+    filter_columns = {USAGE_DATE_COLUMN: date_needed,
+                      ACCOUNT_COLUMN: accounts is not None,
+                      SERVICE_COLUMN: services is not None,
+                      REGION_COLUMN: regions is not None,
+                      RESOURCE_COLUMN: resource_ids is not None or projects is not None}
+    read_columns = columns
+    if columns is not None:
+        extra = [col for col, needed in filter_columns.items() if needed and col not in columns]
+        read_columns = list(columns) + extra
+
+    frames = [read_partition(part_dir, read_columns) for part_dir in part_dirs]
+    if not frames:
+        return pd.DataFrame(columns=columns or [])
+    df = pd.concat(frames, ignore_index=True)
+
+    df = filter_date_range(df, USAGE_DATE_COLUMN, start_date, end_date)
+    for wanted, col in ((accounts, ACCOUNT_COLUMN), (services, SERVICE_COLUMN),
+                        (regions, REGION_COLUMN), (resource_ids, RESOURCE_COLUMN)):
+        wanted = as_list(wanted)
+        if wanted is not None:
+            df = df[df[col].isin(wanted)]
+    if projects is not None and df_tags is not None:
+        project_of = df[RESOURCE_COLUMN].astype(object).map(resource_projects(df_tags))
+        df = df[project_of.isin(as_list(projects))]
+
+    if add_month:
+        df = df.assign(month=df[USAGE_DATE_COLUMN].dt.strftime('%Y-%m').astype("category"))
+
+    if read_columns is not columns:
+        df = df[list(columns) + (['month'] if add_month else [])]
+
+    # Categoricals differ per partition; concat leaves them as objects
+    for col, kind in record_dtypes().items():
+        if col in df.columns and kind == "category":
+            df[col] = df[col].astype("category")
+
+    return compact_categories(df.reset_index(drop=True))
+
+
+def main():
+    """Partition the CUR output by month and account and show partition pruning"""
+    output_dir = "output"
+    dataset_dir = f"{output_dir}/cost_and_usage_report"
+
+    df_records, df_tags, _ = load_outputs(output_dir)
+
+    start_time = time.time()
+    written = write_partitioned_records(df_records, dataset_dir, df_tags)
+    print(f"Wrote {len(written)} partitions to {dataset_dir} in {time.time() - start_time:.2f} seconds")
+
+    # Example point and range lookups
+    partitions = read_partition_stats(dataset_dir)
+    sample_stats = partitions[0][1]
+    first_month = sample_stats["month"]
+    month_end = (pd.Timestamp(first_month + "-01") + pd.offsets.MonthBegin(1)).strftime('%Y-%m-%d')
+    sample_resource = df_records[RESOURCE_COLUMN].iloc[0]
+
+    for label, filters in (
+            (f"month {first_month}", {"start_date": first_month + "-01", "end_date": month_end}),
+            (f"resource {sample_resource}", {"resource_ids": sample_resource})):
+        matched = prune_partitions(dataset_dir, **filters)
+        print(f"  {label}: {len(matched)} of {len(partitions)} partitions to scan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from aws_loader import OUTPUT_FILES
+
+# Repricing settings. The alternative mapping has the shape of
+# RI_DISCOUNT_MAPPING: service -> usage account -> discount factor.
+REPRICING_SETTINGS = {
+    "mapping_file": "alternative_discount_mapping.json",  # Alternative mapping, in the output directory
+    "records_file": "cost_and_usage_report_repriced.csv",  # Repriced CUR; None to skip writing it
+}
+
+# Line items the generator prices as usage amount times the account's
+# discounted rate. Tax, fee line items and the amortization columns keep
+# their generated values.
+REPRICED_LINE_ITEM_TYPES = ["Usage", "DiscountedUsage", "SavingsPlanCoveredUsage", "Credit"]
+
+# Discount factors are keyed on service and usage account
+KEY_COLUMNS = ["lineItem/ProductCode", "lineItem/UsageAccountId"]
+
+UNBLENDED_COLUMNS = ["lineItem/UnblendedRate", "lineItem/UnblendedCost"]
+BLENDED_COLUMNS = ["lineItem/BlendedRate", "lineItem/BlendedCost"]
+
+DIFF_COLUMNS = KEY_COLUMNS + [
+    "old_factor", "new_factor", "line_items", "old_unblended_cost", "new_unblended_cost", "unblended_delta",
+    "old_blended_cost", "new_blended_cost", "blended_delta"]
+
+
+def mapping_factors(keys, discount_mapping):
+    """Discount factor of each row's service and account, 1.0 where unmapped"""
+    mapped = pd.DataFrame(
+        [(service, account, factor) for service, accounts in discount_mapping.items()
+         for account, factor in accounts.items()],
+        columns=KEY_COLUMNS + ["factor"])
+    factors = keys[KEY_COLUMNS].astype(object).astype(str).merge(
+        mapped, on=KEY_COLUMNS, how='left')["factor"].to_numpy(dtype=float)
+    return np.where(np.isnan(factors), 1.0, factors)
+
+
+def blended_factors(factors):
+    """
+    Blended rate factor of each discount factor, as the generator derives it.
+
+    Accounts with a discount keep half of it; accounts paying a premium have
+    most of it removed.
+    """
+    return np.where(factors < 1.0, 1.0 - (1.0 - factors) * 0.5, 1.0 - (factors - 1.0) * 0.7)
+
+
+def repricing_ratios(df_records, discount_mapping, new_mapping):
+    """
+    Unblended and blended price ratios of every line item.
+
+    The generator's list rate is the unblended rate over the account's
+    factor, so a line item reprices by new factor over old factor. Only the
+    distinct service and account pairs are looked up in the mappings; the
+    line items pick their pair's ratios up with one join.
+
+    Returns:
+        Tuple of (unblended ratios, blended ratios), 1.0 for line items
+        outside REPRICED_LINE_ITEM_TYPES
+    """
+    repriced = df_records['lineItem/LineItemType'].astype(object).isin(REPRICED_LINE_ITEM_TYPES).to_numpy()
+    keys = pd.DataFrame({col: df_records[col].astype(object).to_numpy() for col in KEY_COLUMNS})
+    pairs = keys.drop_duplicates().reset_index(drop=True)
+
+    old_factors = mapping_factors(pairs, discount_mapping)
+    new_factors = mapping_factors(pairs, new_mapping)
+    pairs["unblended"] = new_factors / old_factors
+    pairs["blended"] = blended_factors(new_factors) / blended_factors(old_factors)
+
+    ratios = keys.merge(pairs, on=KEY_COLUMNS, how='left')
+    return (np.where(repriced, ratios["unblended"].to_numpy(dtype=float), 1.0),
+            np.where(repriced, ratios["blended"].to_numpy(dtype=float), 1.0))
+
+
+def reprice_records(df_records, discount_mapping, new_mapping):
+    """
+    Copy of the records with rates and costs under the new mapping.
+
+    Usage amounts and every other column are left untouched.
+    """
+    unblended, blended = repricing_ratios(df_records, discount_mapping, new_mapping)
+    repriced = df_records.copy()
+    for col in UNBLENDED_COLUMNS:
+        repriced[col] = df_records[col].to_numpy(dtype=float) * unblended
+    for col in BLENDED_COLUMNS:
+        repriced[col] = df_records[col].to_numpy(dtype=float) * blended
+    return repriced
+
+
+def repricing_diff(df_records, repriced, discount_mapping, new_mapping):
+    """
+    Old and new unblended and blended cost per service and account whose factor changed.
+
+    Returns:
+        DataFrame with DIFF_COLUMNS, ranked by unblended delta
+    """
+    costs = pd.DataFrame({col: df_records[col].astype(object).to_numpy() for col in KEY_COLUMNS})
+    costs["old_unblended_cost"] = df_records["lineItem/UnblendedCost"].to_numpy(dtype=float)
+    costs["new_unblended_cost"] = repriced["lineItem/UnblendedCost"].to_numpy(dtype=float)
+    costs["old_blended_cost"] = df_records["lineItem/BlendedCost"].to_numpy(dtype=float)
+    costs["new_blended_cost"] = repriced["lineItem/BlendedCost"].to_numpy(dtype=float)
+    costs["line_items"] = df_records['lineItem/LineItemType'].astype(object).isin(
+        REPRICED_LINE_ITEM_TYPES).to_numpy().astype(np.int64)
+
+    diff = costs.groupby(KEY_COLUMNS, sort=False).sum().reset_index()
+    diff["old_factor"] = mapping_factors(diff, discount_mapping)
+    diff["new_factor"] = mapping_factors(diff, new_mapping)
+    diff = diff[(diff["old_factor"] != diff["new_factor"]) & (diff["line_items"] > 0)].copy()
+
+    diff["unblended_delta"] = diff["new_unblended_cost"] - diff["old_unblended_cost"]
+    diff["blended_delta"] = diff["new_blended_cost"] - diff["old_blended_cost"]
+    diff = diff.sort_values(["unblended_delta"] + KEY_COLUMNS)
+    return diff[DIFF_COLUMNS].reset_index(drop=True)
+
+
+def write_repricing_reports(df_records, discount_mapping, new_mapping, output_dir, settings=None):
+    """
+    Reprice the records under new_mapping and write repricing_diff.csv and repricing_summary.json.
+
+    The repriced records are written to the settings' records_file.
+    """
+    settings = settings or REPRICING_SETTINGS
+
+    start_time = time.time()
+    repriced = reprice_records(df_records, discount_mapping, new_mapping)
+    diff = repricing_diff(df_records, repriced, discount_mapping, new_mapping)
+    elapsed = time.time() - start_time
+
+    diff.to_csv(f"{output_dir}/repricing_diff.csv", index=False)
+    if settings["records_file"]:
+        repriced.to_csv(f"{output_dir}/{settings['records_file']}", index=False)
+
+    old_unblended = float(df_records["lineItem/UnblendedCost"].sum())
+    new_unblended = float(repriced["lineItem/UnblendedCost"].sum())
+    summary_stats = {
+        'line_items': int(len(df_records)),
+        'line_items_repriced': int(diff["line_items"].sum()),
+        'pairs_repriced': int(len(diff)),
+        'old_unblended_cost': old_unblended,
+        'new_unblended_cost': new_unblended,
+        'unblended_delta': new_unblended - old_unblended,
+        'old_blended_cost': float(df_records["lineItem/BlendedCost"].sum()),
+        'new_blended_cost': float(repriced["lineItem/BlendedCost"].sum()),
+        'repricing_seconds': round(elapsed, 3)
+    }
+    with open(f"{output_dir}/repricing_summary.json", 'w') as f:
+        json.dump(summary_stats, f, indent=2)
+
+    return summary_stats
+
+
+def main():
+    """Reprice an existing output directory under the alternative discount mapping"""
+    from aws_cur_data_generator import RI_DISCOUNT_MAPPING
+
+    output_dir = "output"
+
+    mapping_path = os.path.join(output_dir, REPRICING_SETTINGS["mapping_file"])
+    if not os.path.exists(mapping_path):
+        print(f"No alternative discount mapping at {mapping_path}")
+        return
+    with open(mapping_path) as f:
+        new_mapping = json.load(f)
+
+    # The raw CUR is read as written, so the repriced copy keeps its formats
+    df_records = pd.read_csv(os.path.join(output_dir, OUTPUT_FILES["records"]),
+                             dtype={col: str for col in KEY_COLUMNS}, float_precision="round_trip",
+                             low_memory=False)
+    summary = write_repricing_reports(df_records, RI_DISCOUNT_MAPPING, new_mapping, output_dir)
+    print(f"Repriced {summary['line_items_repriced']} line items of {summary['pairs_repriced']} service "
+          f"and account pairs in {summary['repricing_seconds']:.2f} seconds. Unblended cost: "
+          f"${summary['old_unblended_cost']:.2f} -> ${summary['new_unblended_cost']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
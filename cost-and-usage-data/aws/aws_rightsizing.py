@@ -0,0 +1,107 @@
+import re
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+from aws_config import CONFIG
+from aws_loader import load_records, load_tags
+from aws_tag_resolver import pivot_tags
+from aws_commitments import USAGE_LINE_ITEM_TYPES, usage_periods
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import rightsizing  # noqa: E402
+
+# Tag carrying a resource's instance type, and the service catalog key listing the sizes
+SIZE_TAG = "InstanceType"
+CATALOG_KEY = "instance_types"
+
+# Normalization factors of instance sizes, as in lineItem/NormalizationFactor;
+# an Nxlarge is N xlarges
+SIZE_NORMALIZATION_FACTORS = {
+    "nano": 0.25, "micro": 0.5, "small": 1.0, "medium": 2.0, "large": 4.0, "xlarge": 8.0, "xlplus": 8.0
+}
+MULTIPLE_XLARGE = re.compile(r"^(\d+)xlarge$")
+
+# A resource is one resource id of one service in one region of one usage account
+RESOURCE_COLUMNS = ["lineItem/ProductCode", "lineItem/ResourceId", "lineItem/UsageAccountId", "product/region"]
+
+# Record columns the usage profiles are built from
+RIGHTSIZING_RECORD_COLUMNS = ["lineItem/UsageStartDate", "lineItem/LineItemType"] + RESOURCE_COLUMNS + [
+    "lineItem/UsageAmount", "lineItem/UnblendedCost"]
+
+CATALOG_COLUMNS = ["lineItem/ProductCode", "instance_type", "family", "capacity"]
+
+
+def instance_size(instance_type):
+    """
+    Family and normalization factor of an instance type, e.g. ("db.m5", 8.0) for db.m5.xlarge.
+
+    Returns (instance_type, NaN) when no part of the name is a known size.
+    """
+    parts = instance_type.split('.')
+    for i, part in enumerate(parts):
+        multiple = MULTIPLE_XLARGE.match(part)
+        factor = float(multiple.group(1)) * SIZE_NORMALIZATION_FACTORS["xlarge"] if multiple \
+            else SIZE_NORMALIZATION_FACTORS.get(part)
+        if factor is not None:
+            return '.'.join(parts[:i] + parts[i + 1:]), factor
+    return instance_type, np.nan
+
+
+def size_catalog(services=None):
+    """
+    Instance types of every service with a catalog, with their family and capacity.
+
+    Capacity is the normalization factor; the price of a size is taken to be
+    proportional to it within a family.
+    """
+    return rightsizing.size_catalog(services or CONFIG["services"], CATALOG_KEY, instance_size, CATALOG_COLUMNS)
+
+
+def usage_rows(df_records, df_tags, catalog):
+    """
+    Usage line items of every resource tagged with an instance type of a catalog service.
+
+    Returns:
+        DataFrame with RESOURCE_COLUMNS, current_type, day, amount and cost
+    """
+    usage = np.isin(df_records['lineItem/LineItemType'].astype(object).to_numpy(), USAGE_LINE_ITEM_TYPES)
+    usage &= df_records['lineItem/ProductCode'].astype(object).isin(catalog["lineItem/ProductCode"]).to_numpy()
+
+    rows = pd.DataFrame({col: df_records[col].astype(object).to_numpy()[usage] for col in RESOURCE_COLUMNS})
+    rows['day'] = usage_periods(df_records['lineItem/UsageStartDate'], 'D')[usage]
+    rows['amount'] = df_records['lineItem/UsageAmount'].to_numpy(dtype=float)[usage]
+    rows['cost'] = df_records['lineItem/UnblendedCost'].to_numpy(dtype=float)[usage]
+
+    sizes = pivot_tags(df_tags, [SIZE_TAG]).dropna().reset_index()
+    sizes.columns = ["lineItem/ResourceId", "current_type"]
+    return rows.merge(sizes, on="lineItem/ResourceId", how='inner')
+
+
+def write_rightsizing_reports(df_records, df_tags, output_dir, settings=None):
+    """Write rightsizing_recommendations.csv and rightsizing_summary.json"""
+    catalog = size_catalog()
+    return rightsizing.write_rightsizing_reports(usage_rows(df_records, df_tags, catalog), RESOURCE_COLUMNS,
+                                                 catalog, output_dir, settings)
+
+
+def main():
+    """Rightsize the tagged resources of an existing output directory"""
+    output_dir = "output"
+
+    df_records = load_records(output_dir, columns=RIGHTSIZING_RECORD_COLUMNS)
+    df_tags = load_tags(output_dir, keys=[SIZE_TAG])
+    summary = write_rightsizing_reports(df_records, df_tags, output_dir)
+    print(f"Matched {summary['resources']} resources against {summary['catalog_sizes']} catalog sizes in "
+          f"{summary['sizing_seconds']:.2f} seconds. {summary['resources_downsized']} downsized and "
+          f"{summary['resources_upsized']} upsized, savings: ${summary['savings']:.2f} "
+          f"({summary['savings_percent']:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import pandas as pd
+
+# Record column the tags are keyed on
+RESOURCE_COLUMN = "lineItem/ResourceId"
+
+# Record attributes resolved from tags: column -> (tag key, default when untagged)
+TAG_ATTRIBUTES = {
+    "project": ("Project", "Unknown"),
+    "chargeback_entity": ("ChargebackEntity", "Unallocated"),
+    "allocation_method": ("AllocationMethod", "direct")
+}
+
+
+def pivot_tags(df_tags, keys):
+    """
+    Pivot long-format tags into one row per resource and one column per key.
+
+    When a resource carries the same key more than once the last value wins,
+    matching the dict-building loops this replaces.
+    """
+    tags = df_tags[df_tags['key'].isin(keys)]
+    tags = pd.DataFrame({
+        'resourceId': tags['resourceId'].astype(object).values,
+        'key': tags['key'].astype(object).values,
+        'value': tags['value'].astype(object).values
+    })
+    tags = tags.drop_duplicates(['resourceId', 'key'], keep='last')
+
+    wide = tags.pivot(index='resourceId', columns='key', values='value')
+    return wide.reindex(columns=list(keys))
+
+
+def resolve_tag_attributes(df_records, df_tags, attributes=None, project_business_units=None):
+    """
+    Attach tag-derived attributes to the records with a single join.
+
+    Args:
+        df_records: CUR frame, updated in place
+        df_tags: Tags frame with resourceId, key and value columns
+        attributes: Columns from TAG_ATTRIBUTES to attach (default: all of them)
+        project_business_units: Optional project -> business unit dict; adds a
+            'business_unit' column ("Unknown" for unmapped projects)
+
+    Returns:
+        df_records
+    """
+    attributes = list(attributes or TAG_ATTRIBUTES)
+    if project_business_units is not None and "project" not in attributes:
+        attributes.append("project")
+
+    wide = pivot_tags(df_tags, [TAG_ATTRIBUTES[col][0] for col in attributes])
+    wide.columns = attributes
+    for col in attributes:
+        wide[col] = wide[col].fillna(TAG_ATTRIBUTES[col][1])
+    if project_business_units is not None:
+        wide['business_unit'] = wide['project'].map(project_business_units)
+
+    resources = pd.DataFrame({RESOURCE_COLUMN: df_records[RESOURCE_COLUMN].astype(object).values})
+    resolved = resources.merge(wide, how='left', left_on=RESOURCE_COLUMN, right_index=True,
+                               validate='many_to_one')
+
+    # Untagged resources get the defaults
+    for col in attributes:
+        df_records[col] = resolved[col].fillna(TAG_ATTRIBUTES[col][1]).values
+    if project_business_units is not None:
+        df_records['business_unit'] = resolved['business_unit'].fillna("Unknown").values
+
+    return df_records
@@ -0,0 +1,221 @@
+import os
+import json
+import time
+import shutil
+import numpy as np
+import pandas as pd
+
+from aws_config import CONFIG
+from aws_loader import OUTPUT_FILES, TIMESTAMP_FORMAT, load_tags
+from aws_partitions import DEFAULT_FORMAT
+from aws_amortization import amortized_costs
+
+# Normalization settings. Each provider is written under provider=<name>/
+# month=<YYYY-MM>/ of the unified dataset, one part file per chunk and month.
+UNIFIED_SETTINGS = {
+    "chunk_rows": 250000,  # CUR rows read and normalized at a time
+    "format": DEFAULT_FORMAT
+}
+
+PROVIDER = "aws"
+PROVIDER_NAME = "AWS"
+
+# Common schema shared by the AWS, GCP and Azure normalizers, after the FOCUS
+# column names. Tags is a JSON object of the resource's tags.
+UNIFIED_COLUMNS = [
+    "ProviderName", "BillingAccountId", "SubAccountId", "ChargePeriodStart", "ChargeCategory",
+    "ServiceCategory", "ServiceName", "RegionId", "ResourceId", "ConsumedQuantity", "ConsumedUnit",
+    "BilledCost", "EffectiveCost", "BillingCurrency", "Tags"
+]
+UNIFIED_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# CUR column -> unified column, for the columns copied as they are
+COLUMN_MAPPING = {
+    "bill/PayerAccountId": "BillingAccountId",
+    "lineItem/UsageAccountId": "SubAccountId",
+    "lineItem/ProductCode": "ServiceName",
+    "product/region": "RegionId",
+    "lineItem/ResourceId": "ResourceId",
+    "lineItem/UsageAmount": "ConsumedQuantity",
+    "pricing/unit": "ConsumedUnit",
+    "lineItem/UnblendedCost": "BilledCost",
+    "lineItem/CurrencyCode": "BillingCurrency"
+}
+
+# Line item type -> FOCUS charge category (anything else is an Adjustment)
+CHARGE_CATEGORIES = {
+    "Usage": "Usage",
+    "DiscountedUsage": "Usage",
+    "SavingsPlanCoveredUsage": "Usage",
+    "Tax": "Tax",
+    "Credit": "Credit",
+    "RIFee": "Purchase",
+    "SavingsPlanRecurringFee": "Purchase"
+}
+
+# AWS_SERVICES category -> FOCUS service category. Services missing from the
+# catalog are added to Management & Governance by the generator.
+SERVICE_CATEGORIES = {
+    "Analytics": "Analytics",
+    "Application Integration": "Integration",
+    "Compute": "Compute",
+    "Database": "Databases",
+    "Developer Tools": "Developer Tools",
+    "Machine Learning": "AI and Machine Learning",
+    "Management & Governance": "Management and Governance",
+    "Networking": "Networking",
+    "Observability": "Management and Governance",
+    "Security": "Security",
+    "Storage": "Storage",
+    "IoT": "Internet of Things",
+    "Media": "Media",
+    "Healthcare": "Other",
+    "Location": "Other"
+}
+DEFAULT_SERVICE_CATEGORY = SERVICE_CATEGORIES["Management & Governance"]
+
+# CUR columns amortized_costs() reads for the effective cost
+EFFECTIVE_COST_COLUMNS = [
+    "reservation/EffectiveCost",
+    "reservation/UnusedAmortizedUpfrontFeeForBillingPeriod",
+    "savingsPlan/SavingsPlanEffectiveCost",
+    "savingsPlan/TotalCommitmentToDate",
+    "savingsPlan/UsedCommitment"
+]
+
+UNIFIED_RECORD_COLUMNS = (list(COLUMN_MAPPING) + ["lineItem/UsageStartDate", "lineItem/LineItemType"] +
+                          EFFECTIVE_COST_COLUMNS)
+FLOAT_COLUMNS = ["lineItem/UsageAmount", "lineItem/UnblendedCost"] + EFFECTIVE_COST_COLUMNS
+
+
+def iter_record_chunks(output_dir="output", chunk_rows=None):
+    """Yield the columns the normalizer needs from cost_and_usage_report.csv, chunk by chunk"""
+    reader = pd.read_csv(
+        os.path.join(output_dir, OUTPUT_FILES["records"]),
+        usecols=UNIFIED_RECORD_COLUMNS,
+        dtype={col: "float64" if col in FLOAT_COLUMNS else object for col in UNIFIED_RECORD_COLUMNS},
+        keep_default_na=False,
+        na_values={col: [""] for col in FLOAT_COLUMNS},
+        float_precision="round_trip",
+        chunksize=chunk_rows or UNIFIED_SETTINGS["chunk_rows"]
+    )
+    with reader:
+        for chunk in reader:
+            chunk[FLOAT_COLUMNS] = chunk[FLOAT_COLUMNS].fillna(0.0)
+            yield chunk
+
+
+def service_categories(services=None):
+    """FOCUS service category of every catalog service"""
+    services = services or CONFIG["services"]
+    return {service: SERVICE_CATEGORIES.get(category, "Other")
+            for category, details in services.items() for service in details}
+
+
+def resource_tag_maps(df_tags):
+    """
+    Tags of every resource as a JSON object string.
+
+    The strings are built once per resource, not per line item; when a
+    resource carries the same key more than once the last value wins.
+    """
+    tags = pd.DataFrame({col: df_tags[col].astype(object).to_numpy() for col in ["resourceId", "key", "value"]})
+    tags = tags.drop_duplicates(["resourceId", "key"], keep="last").sort_values(["resourceId", "key"], kind="stable")
+
+    resources, starts = np.unique(tags["resourceId"].to_numpy(dtype=object), return_index=True)
+    keys = tags["key"].to_numpy(dtype=object)
+    values = tags["value"].to_numpy(dtype=object)
+    ends = np.append(starts[1:], len(tags))
+    maps = [json.dumps(dict(zip(keys[start:end], values[start:end]))) for start, end in zip(starts, ends)]
+    return pd.Series(maps, index=resources, dtype=object)
+
+
+def normalize_chunk(chunk, tag_maps, categories):
+    """
+    CUR rows in the unified schema.
+
+    Every column is mapped with one vectorized operation over the chunk:
+    copies and renames, dictionary lookups for the charge and service
+    categories and the tag maps, and the amortized cost view for the
+    effective cost.
+
+    Returns:
+        DataFrame with UNIFIED_COLUMNS
+    """
+    unified = pd.DataFrame({target: chunk[source].to_numpy() for source, target in COLUMN_MAPPING.items()})
+    unified.insert(0, "ProviderName", PROVIDER_NAME)
+    unified["ChargePeriodStart"] = pd.to_datetime(chunk["lineItem/UsageStartDate"].to_numpy(dtype=object),
+                                                  format=TIMESTAMP_FORMAT, utc=True)
+    unified["ChargeCategory"] = chunk["lineItem/LineItemType"].map(CHARGE_CATEGORIES).fillna("Adjustment").to_numpy()
+    unified["ServiceCategory"] = (chunk["lineItem/ProductCode"].map(categories)
+                                  .fillna(DEFAULT_SERVICE_CATEGORY).to_numpy())
+    unified["EffectiveCost"] = amortized_costs(chunk)
+    unified["Tags"] = chunk["lineItem/ResourceId"].map(tag_maps).fillna("{}").to_numpy()
+    return unified[UNIFIED_COLUMNS]
+
+
+def write_part(df_part, part_dir, part, file_format):
+    """Write one part file of the unified dataset"""
+    os.makedirs(part_dir, exist_ok=True)
+    if file_format == "parquet":
+        df_part.to_parquet(os.path.join(part_dir, f"part-{part:05d}.parquet"), index=False)
+    else:
+        df_part.to_csv(os.path.join(part_dir, f"part-{part:05d}.csv"), index=False,
+                       date_format=UNIFIED_TIMESTAMP_FORMAT)
+
+
+def write_unified_partitions(output_dir, dataset_dir, chunk_rows=None, file_format=None):
+    """
+    Stream the CUR into the provider=aws partitions of the unified dataset.
+
+    One chunk is held in memory at a time. Partitions of an earlier run are
+    replaced.
+
+    Returns:
+        Summary dict with rows, parts, months, billed and effective cost
+    """
+    file_format = file_format or UNIFIED_SETTINGS["format"]
+    provider_dir = os.path.join(dataset_dir, f"provider={PROVIDER}")
+    shutil.rmtree(provider_dir, ignore_errors=True)
+
+    start_time = time.time()
+    tag_maps = resource_tag_maps(load_tags(output_dir))
+    categories = service_categories()
+
+    rows = parts = 0
+    months = set()
+    billed_cost = effective_cost = 0.0
+    for part, chunk in enumerate(iter_record_chunks(output_dir, chunk_rows)):
+        unified = normalize_chunk(chunk, tag_maps, categories)
+        chunk_months = unified["ChargePeriodStart"].dt.tz_localize(None).to_numpy().astype("datetime64[M]")
+        for month, index in unified.groupby(chunk_months.astype(str), sort=True).indices.items():
+            write_part(unified.iloc[index], os.path.join(provider_dir, f"month={month}"), part, file_format)
+            months.add(month)
+            parts += 1
+        rows += len(unified)
+        billed_cost += float(unified["BilledCost"].sum())
+        effective_cost += float(unified["EffectiveCost"].sum())
+
+    return {
+        "provider": PROVIDER,
+        "rows": rows,
+        "parts": parts,
+        "months": sorted(months),
+        "billed_cost": billed_cost,
+        "effective_cost": effective_cost,
+        "seconds": round(time.time() - start_time, 3)
+    }
+
+
+def main():
+    """Normalize the CUR output into the unified dataset"""
+    output_dir = "output"
+    dataset_dir = f"{output_dir}/unified_cost_dataset"
+
+    summary = write_unified_partitions(output_dir, dataset_dir)
+    print(f"Normalized {summary['rows']} CUR rows into {summary['parts']} parts under {dataset_dir} "
+          f"in {summary['seconds']:.2f} seconds")
+
+
+if __name__ == "__main__":
+    main()
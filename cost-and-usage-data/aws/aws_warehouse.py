@@ -0,0 +1,262 @@
+import os
+import time
+import sqlite3
+import pandas as pd
+
+from aws_loader import load_outputs, RECORD_TIMESTAMP_COLUMNS, TIMESTAMP_FORMAT, USAGE_DATE_COLUMN
+
+# DuckDB is optional; SQLite ships with Python and is the fallback
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# Table names match the CSV outputs
+RECORDS_TABLE = "cost_and_usage_report"
+TAGS_TABLE = "resource_tags"
+LIFECYCLE_TABLE = "project_lifecycle_mapping"
+
+# Sort keys for the fact table. DuckDB keeps min/max zone maps per row group,
+# so sorting on these is what makes month/service/account filters cheap.
+RECORDS_SORT_KEYS = ["month", "lineItem/ProductCode", "lineItem/UsageAccountId",
+                     "lineItem/ResourceId"]
+
+# Secondary indexes built in SQLite
+RECORDS_INDEXES = {
+    "idx_cur_month_service": ["month", "lineItem/ProductCode"],
+    "idx_cur_account": ["lineItem/UsageAccountId", "month"],
+    "idx_cur_resource": ["lineItem/ResourceId"]
+}
+
+# DuckDB only needs an ART index for point lookups; ranges use the sort order
+DUCKDB_RECORDS_INDEXES = {
+    "idx_cur_resource": ["lineItem/ResourceId"]
+}
+
+TAGS_INDEXES = {
+    "idx_tags_resource_key": ["resourceId", "key"],
+    "idx_tags_key_value": ["key", "value"]
+}
+
+# Example queries; plain SQL with quoted CUR column names runs on both engines
+EXAMPLE_QUERIES = {
+    "monthly_cost_by_service": """
+        SELECT month, "lineItem/ProductCode", SUM("lineItem/UnblendedCost") AS total_cost
+        FROM cost_and_usage_report
+        GROUP BY month, "lineItem/ProductCode"
+        ORDER BY month, total_cost DESC
+    """,
+    "top_accounts": """
+        SELECT "lineItem/UsageAccountId", SUM("lineItem/UnblendedCost") AS total_cost
+        FROM cost_and_usage_report
+        WHERE month = (SELECT MAX(month) FROM cost_and_usage_report)
+        GROUP BY "lineItem/UsageAccountId"
+        ORDER BY total_cost DESC
+        LIMIT 10
+    """,
+    "cost_by_line_item_type": """
+        SELECT month, "lineItem/LineItemType",
+               SUM("lineItem/UnblendedCost") AS unblended_cost,
+               SUM("lineItem/BlendedCost") AS blended_cost
+        FROM cost_and_usage_report
+        GROUP BY month, "lineItem/LineItemType"
+        ORDER BY month, unblended_cost DESC
+    """,
+    "cost_by_tag": """
+        SELECT c.month, t.value AS environment, SUM(c."lineItem/UnblendedCost") AS total_cost
+        FROM cost_and_usage_report c
+        JOIN resource_tags t
+          ON c."lineItem/ResourceId" = t."resourceId" AND t.key = 'Environment'
+        GROUP BY c.month, t.value
+        ORDER BY c.month, total_cost DESC
+    """,
+    "resource_level_chargeback": """
+        SELECT c.month, p.value AS project, r1.value AS chargeback_entity,
+               r2.value AS cost_center, SUM(c."lineItem/UnblendedCost") AS total_cost
+        FROM cost_and_usage_report c
+        JOIN resource_tags r1
+          ON c."lineItem/ResourceId" = r1."resourceId" AND r1.key = 'ChargebackEntity'
+        LEFT JOIN resource_tags r2
+          ON c."lineItem/ResourceId" = r2."resourceId" AND r2.key = 'CostCenter'
+        LEFT JOIN resource_tags p
+          ON c."lineItem/ResourceId" = p."resourceId" AND p.key = 'Project'
+        GROUP BY 1, 2, 3, 4
+        ORDER BY 1, total_cost DESC
+    """,
+    "daily_cost_anomalies": """
+        WITH daily AS (
+            SELECT usage_date, "lineItem/UsageAccountId" AS account_id,
+                   "lineItem/ProductCode" AS service_name,
+                   SUM("lineItem/UnblendedCost") AS daily_cost
+            FROM cost_and_usage_report
+            GROUP BY 1, 2, 3
+        ), scored AS (
+            SELECT *, AVG(daily_cost) OVER (
+                       PARTITION BY account_id, service_name ORDER BY usage_date
+                       ROWS BETWEEN 7 PRECEDING AND 1 PRECEDING) AS avg_previous_7_days
+            FROM daily
+        )
+        SELECT *, daily_cost / avg_previous_7_days AS ratio_to_average
+        FROM scored
+        WHERE daily_cost / avg_previous_7_days > 3 AND daily_cost > 100
+        ORDER BY ratio_to_average DESC
+    """
+}
+
+
+def default_engine():
+    """Use DuckDB when it is installed, otherwise SQLite"""
+    return "duckdb" if duckdb is not None else "sqlite"
+
+
+def default_warehouse_path(output_dir="output", engine=None):
+    """Default warehouse file next to the CSV outputs"""
+    engine = engine or default_engine()
+    extension = "duckdb" if engine == "duckdb" else "sqlite"
+    return os.path.join(output_dir, f"aws_cur.{extension}")
+
+
+def connect_warehouse(path, engine=None):
+    """Open (or create) a warehouse file and return the connection"""
+    engine = engine or default_engine()
+    if engine == "duckdb":
+        if duckdb is None:
+            raise ImportError("duckdb is not installed; use engine='sqlite'")
+        return duckdb.connect(path)
+    return sqlite3.connect(path)
+
+
+def normalize_frame(df, timestamp_columns=None, timestamp_format=None):
+    """
+    Give a frame warehouse-friendly types.
+
+    Frames straight from the generator carry timestamps as strings; frames
+    from the loader carry categoricals and arrow strings. Both end up as
+    plain object strings, floats and naive UTC datetimes.
+    """
+    df = df.copy()
+    for col in timestamp_columns or []:
+        if col not in df.columns:
+            continue
+        if not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], format=timestamp_format)
+        if df[col].dt.tz is not None:
+            df[col] = df[col].dt.tz_convert("UTC").dt.tz_localize(None)
+
+    for col in df.columns:
+        if isinstance(df[col].dtype, (pd.CategoricalDtype, pd.StringDtype)):
+            df[col] = df[col].astype(object)
+
+    return df
+
+
+def add_date_columns(df_records):
+    """Add the text 'month' (YYYY-MM) and 'usage_date' (YYYY-MM-DD) query columns"""
+    usage_start = df_records[USAGE_DATE_COLUMN]
+    df_records['month'] = usage_start.dt.strftime('%Y-%m')
+    df_records['usage_date'] = usage_start.dt.strftime('%Y-%m-%d')
+    return df_records
+
+
+def write_table(con, engine, table_name, df, sort_keys=None, indexes=None):
+    """Replace a warehouse table with the contents of a frame, sorted and indexed"""
+    sort_keys = [key for key in (sort_keys or []) if key in df.columns]
+
+    if engine == "duckdb":
+        order_by = ""
+        if sort_keys:
+            order_by = " ORDER BY " + ", ".join(f'"{key}"' for key in sort_keys)
+        con.register("staging_frame", df)
+        con.execute(f"CREATE OR REPLACE TABLE {table_name} AS "
+                    f"SELECT * FROM staging_frame{order_by}")
+        con.unregister("staging_frame")
+    else:
+        # SQLite: insert in sort order, timestamps as ISO text
+        if sort_keys:
+            df = df.sort_values(sort_keys, kind="stable")
+        for col in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = df[col].dt.strftime("%Y-%m-%d %H:%M:%S")
+        df.to_sql(table_name, con, if_exists="replace", index=False, chunksize=50000)
+
+    for index_name, index_columns in (indexes or {}).items():
+        if all(col in df.columns for col in index_columns):
+            column_list = ", ".join(f'"{col}"' for col in index_columns)
+            con.execute(f"CREATE INDEX IF NOT EXISTS {index_name} "
+                        f"ON {table_name} ({column_list})")
+    con.commit()
+
+
+def export_to_warehouse(df_records, df_tags, df_lifecycle, path=None, engine=None):
+    """
+    Load CUR records, resource tags and the lifecycle mapping into a local
+    DuckDB or SQLite file.
+
+    Args:
+        df_records: CUR frame (generator or loader output)
+        df_tags: Resource tags frame
+        df_lifecycle: Project lifecycle mapping frame
+        path: Warehouse file, defaults to output/aws_cur.<engine>
+        engine: "duckdb" or "sqlite", defaults to DuckDB when installed
+
+    Returns:
+        Path of the warehouse file
+    """
+    engine = engine or default_engine()
+    path = path or default_warehouse_path(engine=engine)
+
+    df_records = normalize_frame(df_records, RECORD_TIMESTAMP_COLUMNS, TIMESTAMP_FORMAT)
+    df_records = add_date_columns(df_records)
+    # A resource name reused across stages carries its tags once per stage;
+    # keep the last value of each key, as the tag resolver does, so joins
+    # on resource and key match a single row
+    df_tags = normalize_frame(df_tags).drop_duplicates(["resourceId", "key"], keep="last")
+    df_lifecycle = normalize_frame(df_lifecycle)
+
+    records_indexes = DUCKDB_RECORDS_INDEXES if engine == "duckdb" else RECORDS_INDEXES
+
+    con = connect_warehouse(path, engine)
+    try:
+        write_table(con, engine, RECORDS_TABLE, df_records,
+                    sort_keys=RECORDS_SORT_KEYS, indexes=records_indexes)
+        write_table(con, engine, TAGS_TABLE, df_tags,
+                    sort_keys=["resourceId", "key"], indexes=TAGS_INDEXES)
+        write_table(con, engine, LIFECYCLE_TABLE, df_lifecycle)
+    finally:
+        con.close()
+
+    return path
+
+
+def run_query(con, sql):
+    """Run a query against an open warehouse connection and return a DataFrame"""
+    if duckdb is not None and isinstance(con, duckdb.DuckDBPyConnection):
+        return con.execute(sql).fetchdf()
+    return pd.read_sql_query(sql, con)
+
+
+def main():
+    """Build the warehouse from the CSV outputs and time the example queries"""
+    output_dir = "output"
+    engine = default_engine()
+
+    df_records, df_tags, df_lifecycle = load_outputs(output_dir)
+
+    start_time = time.time()
+    path = export_to_warehouse(df_records, df_tags, df_lifecycle,
+                               path=default_warehouse_path(output_dir, engine), engine=engine)
+    print(f"Loaded {len(df_records)} records and {len(df_tags)} tags into {path} "
+          f"({engine}) in {time.time() - start_time:.2f} seconds")
+
+    con = connect_warehouse(path, engine)
+    try:
+        for name, sql in EXAMPLE_QUERIES.items():
+            query_start = time.time()
+            result = run_query(con, sql)
+            print(f"  {name}: {len(result)} rows in {(time.time() - query_start) * 1000:.1f} ms")
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,20 @@ import hashlib
 import time
 from tqdm import tqdm
 from configAzure import CONFIG
+from azure_warehouse import export_to_warehouse, default_warehouse_path
+from azure_partitions import write_partitioned_records
+from azure_cost_cube import build_cost_cube
+from azure_allocation import allocate_shared_costs
+from azure_amortization import build_benefit_purchases, write_amortization_reports
+from azure_topk import top_k_rows
+from azure_distinct import aggregate_sketches, add_distinct_counts
+from azure_forecast import write_forecast_reports
+from azure_anomalies import write_anomaly_reports
+from azure_scenarios import scenario_projects, write_scenario_reports
+from azure_budget import project_budgets, write_budget_reports
+from azure_commitments import write_commitment_reports
+from azure_rightsizing import write_rightsizing_reports
+from azure_metrics import add_stages, run_stage, snapshot, stage_metrics, start_run_metrics, write_run_metrics
 
 
 def get_azure_offer_id(subscription_id, subscription_name):
@@ -285,6 +299,14 @@ DATA_VOLUME_SETTINGS = {
     "volatility_factor": 0.02,                # +/- 2% cost volatility by default
 }
 
+# Optional export targets written next to the CSV files
+OUTPUT_SETTINGS = {
+    "warehouse_engine": None,  # None for CSV only, "duckdb" or "sqlite"
+    "partitioned_records": False,  # Also write month partitions with _stats.json sidecars
+    "analysis_reports": False,  # Also write forecast, anomaly, scenario, budget, commitment and rightsizing reports
+    "run_metrics": False,  # Also write per-stage wall time, CPU time and RSS deltas to run_metrics.json
+}
+
 # Tag categories for more realistic tagging
 TAG_CATEGORIES = {
     "Technical": [
@@ -533,6 +555,7 @@ COST_MANAGEMENT_COLUMNS = [
     "BenefitId",
     "BenefitName",
     "Term",
+    "BenefitAmount",
     "CostAllocationRuleName",
     "Tags",
     "AdditionalInfo",
@@ -1065,6 +1088,11 @@ def calculate_effective_price(service_name, subscription_id, base_price):
     return effective_price
 
 
+def benefit_order_key(subscription_id, service_name, benefit_label):
+    """Stable hex key, so one subscription's benefit on a service is a single order over time"""
+    return uuid.uuid5(uuid.NAMESPACE_URL, f"{subscription_id}/{service_name}/{benefit_label}").hex
+
+
 def generate_benefits(service_name, cost, subscription_id):
     """Generate benefit information if applicable"""
     benefits = []
@@ -1072,29 +1100,35 @@ def generate_benefits(service_name, cost, subscription_id):
     # Only generate benefit information for certain conditions
     # Reserved Instances, Savings Plans, Azure Hybrid Benefit
     if cost > 10 and random.random() < 0.3:  # 30% chance for high-cost items
+        # Reservations and savings plans are bought once per subscription and
+        # service, so every record they cover shares the same order
+        ri_1y_key = benefit_order_key(subscription_id, service_name, "RI-P1Y")
+        ri_3y_key = benefit_order_key(subscription_id, service_name, "RI-P3Y")
+        sp_key = benefit_order_key(subscription_id, service_name, "SP-P1Y")
+
         benefit_types = [
             {
                 "name": "Reserved Instance",
-                "id": f"RI-{uuid.uuid4().hex[:8]}",
+                "id": f"RI-{ri_1y_key[:8]}",
                 "full_name": "Reserved Instance: 1 year",
                 "term": "P1Y",
-                "order_id": f"RI-Order-{uuid.uuid4().hex[:6]}",
+                "order_id": f"RI-Order-{ri_1y_key[8:14]}",
                 "order_name": "Annual Reserved Instance Purchase"
             },
             {
                 "name": "Reserved Instance",
-                "id": f"RI-{uuid.uuid4().hex[:8]}",
+                "id": f"RI-{ri_3y_key[:8]}",
                 "full_name": "Reserved Instance: 3 year",
                 "term": "P3Y",
-                "order_id": f"RI-Order-{uuid.uuid4().hex[:6]}",
+                "order_id": f"RI-Order-{ri_3y_key[8:14]}",
                 "order_name": "Three Year Reserved Instance Purchase"
             },
             {
                 "name": "Savings Plan",
-                "id": f"SP-{uuid.uuid4().hex[:8]}",
+                "id": f"SP-{sp_key[:8]}",
                 "full_name": "Compute Savings Plan",
                 "term": "P1Y",
-                "order_id": f"SP-Order-{uuid.uuid4().hex[:6]}",
+                "order_id": f"SP-Order-{sp_key[8:14]}",
                 "order_name": "Annual Compute Savings Plan"
             },
             {
@@ -1511,6 +1545,7 @@ def generate_usage_data(project_name, project_data, day_count, start_date, daily
                             term = ""
                             product_order_id = ""
                             product_order_name = ""
+                            benefit_amount = 0.0
                             if benefit_info:
                                 benefit_id = benefit_info[0]["id"]
                                 benefit_name = benefit_info[0]["full_name"]
@@ -1519,6 +1554,7 @@ def generate_usage_data(project_name, project_data, day_count, start_date, daily
                                     "order_id", "")
                                 product_order_name = benefit_info[0].get(
                                     "order_name", "")
+                                benefit_amount = benefit_info[0]["amount"]
 
                             # Determine pricing model
                             pricing_model = service_details.get(
@@ -1580,6 +1616,7 @@ def generate_usage_data(project_name, project_data, day_count, start_date, daily
                                 "BenefitId": benefit_id,
                                 "BenefitName": benefit_name,
                                 "Term": term,
+                                "BenefitAmount": benefit_amount,
                                 "CostAllocationRuleName": cost_allocation_rule,
                                 "Tags": tags_str,
                                 "AdditionalInfo": additional_info,
@@ -1804,21 +1841,27 @@ def find_missing_services():
 
 
 def process_project(args):
-    """Process a single project - for parallel execution"""
+    """
+    Process a single project - for parallel execution
+
+    Returns:
+        Tuple of (records, tags, generation stage metrics of this worker)
+    """
     project_name, project_data, day_count, start_date, daily_budget = args
     try:
         start_time = time.time()
+        before = snapshot()
 
         # Validate project data
         if not project_data.get("services"):
             print(
                 f"Warning: Project {project_name} has no services defined. Skipping.")
-            return [], []
+            return [], [], None
 
         if not project_data.get("stages"):
             print(
                 f"Warning: Project {project_name} has no stages defined. Skipping.")
-            return [], []
+            return [], [], None
 
         # Ensure lifecycle is valid
         if project_data.get("lifecycle") not in CONFIG["project_lifecycles"]:
@@ -1831,12 +1874,12 @@ def process_project(args):
         end_time = time.time()
         print(
             f"Generated {len(results)} records for project {project_name} in {end_time - start_time:.2f} seconds")
-        return results, tags
+        return results, tags, stage_metrics("generation", before, project=project_name, records=len(results))
     except Exception as e:
         import traceback
         print(f"Error processing project {project_name}: {e}")
         print(traceback.format_exc())
-        return [], []
+        return [], [], None
 
 
 def generate_project_lifecycle_mapping(selected_projects):
@@ -1875,56 +1918,38 @@ def generate_project_lifecycle_mapping(selected_projects):
     return pd.DataFrame(project_details)
 
 
-def generate_chargeback_reports(df_records, df_tags, output_dir):
+def generate_chargeback_reports(df_records, df_tags, output_dir, cube=None):
     """Generate chargeback and showback reports based on cost data and tags"""
 
-    # First, merge the tags data with the billing data
-    # Extract resource IDs
-    df_records['resource_id'] = df_records['ResourceId']
-
-    # Create a mapping of resources to chargeback entities
-    resource_to_entity = {}
-    resource_allocation_method = {}
-
-    for _, tag in df_tags.iterrows():
-        if tag['key'] == 'chargeback-entity':
-            resource_to_entity[tag['resource_id']] = tag['value']
-        if tag['key'] == 'allocation-method':
-            resource_allocation_method[tag['resource_id']] = tag['value']
-
-    # Apply mapping to get chargeback entity for each record
-    df_records['chargeback_entity'] = df_records['resource_id'].map(
-        resource_to_entity).fillna("Unallocated")
-
-    df_records['allocation_method'] = df_records['resource_id'].map(
-        resource_allocation_method).fillna("direct")
-
-    # Convert invoice date to a simpler format
-    df_records['month'] = pd.to_datetime(
-        df_records['Date']).dt.strftime('%Y-%m')
+    # All reports are rollups of the cost cube; build it unless main() already did
+    if cube is None:
+        cube = build_cost_cube(df_records, df_tags)
 
     # 1. Direct Chargeback Report - what each entity should be charged
-    chargeback_summary = df_records.groupby(['month', 'chargeback_entity'])[
+    chargeback_summary = cube.groupby(['month', 'chargeback_entity'], observed=True)[
         'Cost'].sum().reset_index()
     chargeback_summary.to_csv(
         f"{output_dir}/chargeback_by_entity.csv", index=False)
 
     # 2. Generate by Service and Entity
-    service_entity_summary = df_records.groupby(
-        ['month', 'chargeback_entity', 'ServiceName'])['Cost'].sum().reset_index()
+    service_entity_summary = cube.groupby(
+        ['month', 'chargeback_entity', 'ServiceName'], observed=True)['Cost'].sum().reset_index()
     service_entity_summary.to_csv(
         f"{output_dir}/chargeback_by_service_entity.csv", index=False)
 
-    # 3. Credit Impact Analysis
-    # Extract benefits from the BenefitName column
-    total_costs = df_records['Cost'].sum()
-
     # 4. Allocation Methods Report
-    allocation_summary = df_records.groupby(['month', 'allocation_method'])[
+    allocation_summary = cube.groupby(['month', 'allocation_method'], observed=True)[
         'Cost'].sum().reset_index()
     allocation_summary.to_csv(
         f"{output_dir}/cost_by_allocation_method.csv", index=False)
 
+    # 5. Allocated Chargeback Report - shared costs split across receiving entities
+    allocated = allocate_shared_costs(cube, df_tags, COST_ALLOCATION_RULES, ['Cost'])
+    allocated_summary = allocated.groupby(['month', 'allocated_entity'], observed=True)[
+        'Cost'].sum().reset_index()
+    allocated_summary.to_csv(
+        f"{output_dir}/chargeback_allocated_by_entity.csv", index=False)
+
     return {
         'chargeback_total': chargeback_summary['Cost'].sum(),
         'direct_allocation': allocation_summary[allocation_summary['allocation_method'] == 'direct']['Cost'].sum(),
@@ -1932,42 +1957,42 @@ def generate_chargeback_reports(df_records, df_tags, output_dir):
     }
 
 
-def analyze_discount_impact(df_records, output_dir):
+def analyze_discount_impact(df_records, output_dir, cube=None):
     """Analyze the impact of discounts and benefits on costs"""
 
+    if cube is None:
+        cube = build_cost_cube(df_records)
+
     # Extract benefit information
-    benefit_records = df_records[df_records['BenefitName'] != ""]
-    no_benefit_records = df_records[df_records['BenefitName'] == ""]
+    benefit_records = cube[cube['BenefitName'] != ""]
+    no_benefit_records = cube[cube['BenefitName'] == ""]
 
     # Calculate effective costs with and without benefits
-    total_cost = df_records['Cost'].sum()
+    total_cost = cube['Cost'].sum()
     cost_with_benefits = benefit_records['Cost'].sum()
     cost_without_benefits = no_benefit_records['Cost'].sum()
 
-    # Estimate benefit amount - this is an approximation as the raw benefit amount is not directly available
-    # In a real Azure Cost Management export, this would be based on the amortized cost difference
-    estimated_benefit_amount = cost_with_benefits * - \
-        0.25  # Assuming 25% average discount
+    # Benefit amounts are carried on the export (negative = savings)
+    estimated_benefit_amount = benefit_records['BenefitAmount'].sum()
 
     # Calculate effective cost after benefits
     effective_cost = total_cost + estimated_benefit_amount
 
     # Summary by subscription
-    subscription_summary = df_records.groupby(['SubscriptionId', 'SubscriptionName'])[
+    subscription_summary = cube.groupby(['SubscriptionId', 'SubscriptionName'], observed=True)[
         ['Cost']].sum().reset_index()
 
     # Add benefit info per subscription
     benefit_by_sub = benefit_records.groupby(
-        ['SubscriptionId'])[['Cost']].sum()
-    no_benefit_by_sub = no_benefit_records.groupby(['SubscriptionId'])[
+        ['SubscriptionId'], observed=True)[['Cost', 'BenefitAmount']].sum()
+    no_benefit_by_sub = no_benefit_records.groupby(['SubscriptionId'], observed=True)[
         ['Cost']].sum()
 
     # Merge into subscription summary
     subscription_summary = subscription_summary.set_index('SubscriptionId')
     subscription_summary['BenefitCost'] = benefit_by_sub['Cost'] if not benefit_by_sub.empty else 0
     subscription_summary['NonBenefitCost'] = no_benefit_by_sub['Cost'] if not no_benefit_by_sub.empty else 0
-    # Assuming 25% savings
-    subscription_summary['EstimatedSavings'] = subscription_summary['BenefitCost'] * 0.25
+    subscription_summary['EstimatedSavings'] = -benefit_by_sub['BenefitAmount'] if not benefit_by_sub.empty else 0
     subscription_summary['BenefitPercentage'] = (subscription_summary['EstimatedSavings'] /
                                                  subscription_summary['Cost'] * 100).fillna(0)
     subscription_summary = subscription_summary.reset_index()
@@ -1976,21 +2001,20 @@ def analyze_discount_impact(df_records, output_dir):
         f"{output_dir}/benefit_impact_by_subscription.csv", index=False)
 
     # Summary by service
-    service_summary = df_records.groupby(['ServiceName'])[
+    service_summary = cube.groupby(['ServiceName'], observed=True)[
         ['Cost']].sum().reset_index()
 
     # Add benefit info per service
-    benefit_by_service = benefit_records.groupby(['ServiceName'])[
-        ['Cost']].sum()
-    no_benefit_by_service = no_benefit_records.groupby(['ServiceName'])[
+    benefit_by_service = benefit_records.groupby(['ServiceName'], observed=True)[
+        ['Cost', 'BenefitAmount']].sum()
+    no_benefit_by_service = no_benefit_records.groupby(['ServiceName'], observed=True)[
         ['Cost']].sum()
 
     # Merge into service summary
     service_summary = service_summary.set_index('ServiceName')
     service_summary['BenefitCost'] = benefit_by_service['Cost'] if not benefit_by_service.empty else 0
     service_summary['NonBenefitCost'] = no_benefit_by_service['Cost'] if not no_benefit_by_service.empty else 0
-    # Assuming 25% savings
-    service_summary['EstimatedSavings'] = service_summary['BenefitCost'] * 0.25
+    service_summary['EstimatedSavings'] = -benefit_by_service['BenefitAmount'] if not benefit_by_service.empty else 0
     service_summary['BenefitPercentage'] = (service_summary['EstimatedSavings'] /
                                             service_summary['Cost'] * 100).fillna(0)
     service_summary = service_summary.reset_index()
@@ -2000,20 +2024,17 @@ def analyze_discount_impact(df_records, output_dir):
 
     # Find resources with the largest benefit amounts
     # Group by resource and sum costs
-    resource_summary = df_records.groupby(['ResourceId', 'ResourceName', 'BenefitName'])[
-        ['Cost']].sum().reset_index()
+    resource_summary = cube.groupby(['ResourceId', 'ResourceName', 'BenefitName'], observed=True)[
+        ['Cost', 'BenefitAmount']].sum().reset_index()
 
     # Keep only records with benefits
-    resource_summary_with_benefits = resource_summary[resource_summary['BenefitName'] != ""]
+    resource_summary_with_benefits = resource_summary[resource_summary['BenefitName'] != ""].copy()
 
-    # Calculate estimated savings
-    resource_summary_with_benefits['EstimatedSavings'] = resource_summary_with_benefits['Cost'] * 0.25
+    # Savings are the benefit amounts with the sign flipped
+    resource_summary_with_benefits['EstimatedSavings'] = -resource_summary_with_benefits['BenefitAmount']
 
-    # Sort by estimated savings (largest savings first)
-    resource_summary_with_benefits = resource_summary_with_benefits.sort_values(
-        'EstimatedSavings', ascending=False)
-
-    top_resources = resource_summary_with_benefits.head(20)
+    # Largest estimated savings first
+    top_resources = top_k_rows(resource_summary_with_benefits, 'EstimatedSavings')
     top_resources.to_csv(
         f"{output_dir}/top_benefit_impact_resources.csv", index=False)
 
@@ -2035,6 +2056,50 @@ def analyze_discount_impact(df_records, output_dir):
     return summary_stats
 
 
+def generate_cost_reports(cube, df_tags, output_dir, sketches=None):
+    """
+    Write the cost summaries and the chargeback and benefit reports from a cost cube.
+
+    With the cube's distinct-count sketches (azure_distinct), the subscription
+    and service summaries also get exact distinct resource and approximate
+    meter counts.
+    """
+    # Create subscription summary
+    subscription_summary = cube.groupby(['month', 'SubscriptionName'])[
+        'Cost'].sum().reset_index()
+    if sketches is not None:
+        add_distinct_counts(subscription_summary, sketches, ['month', 'SubscriptionName'], cube)
+    subscription_summary.to_csv(
+        f"{output_dir}/cost_summary_by_subscription.csv", index=False)
+
+    # Generate summary by service
+    service_summary = cube.groupby(['month', 'ServiceName'])[
+        'Cost'].sum().reset_index()
+    if sketches is not None:
+        add_distinct_counts(service_summary, sketches, ['month', 'ServiceName'], cube)
+    service_summary.to_csv(
+        f"{output_dir}/cost_summary_by_service.csv", index=False)
+
+    # Generate monthly cost summary by business unit
+    bu_summary = cube.groupby(['month', 'business_unit'])[
+        'Cost'].sum().reset_index()
+    bu_summary.to_csv(
+        f"{output_dir}/cost_summary_by_business_unit.csv", index=False)
+
+    # Generate chargeback/showback reports
+    chargeback_stats = generate_chargeback_reports(
+        None, df_tags, output_dir, cube)
+    print(
+        f"Generated chargeback/showback reports. Total chargeback: ${chargeback_stats['chargeback_total']:.2f}")
+
+    # Analyze benefit impact
+    benefit_impact = analyze_discount_impact(None, output_dir, cube)
+    print(f"Analyzed benefit impact. Estimated savings: ${benefit_impact['estimated_benefit_amount']:.2f} " +
+          f"({benefit_impact['percent_discount']:.2f}%)")
+
+    return chargeback_stats, benefit_impact
+
+
 def main():
     print("Azure Cost Management Data Generator")
     print("Data Volume Settings:")
@@ -2043,6 +2108,10 @@ def main():
 
     start_time = time.time()
 
+    # Opt-in per-stage wall time, CPU time and RSS deltas; run_stage() is a
+    # no-op while metrics is None
+    metrics = start_run_metrics() if OUTPUT_SETTINGS["run_metrics"] else None
+
     # Calculate daily budget
     daily_budget = calculate_daily_budget()
     print(f"Daily budget: ${daily_budget:.2f}")
@@ -2058,17 +2127,18 @@ def main():
     print(
         f"Using volatility factor of {DATA_VOLUME_SETTINGS['volatility_factor']} (±{DATA_VOLUME_SETTINGS['volatility_factor']*100}%)")
 
-    # Pick representative projects with diverse lifecycles
-    selected_projects = pick_representative_projects()
-    print(f"Selected projects: {', '.join(selected_projects)}")
+    with run_stage(metrics, "project_selection"):
+        # Pick representative projects with diverse lifecycles
+        selected_projects = pick_representative_projects()
+        print(f"Selected projects: {', '.join(selected_projects)}")
 
-    # Generate project-lifecycle mapping
-    project_lifecycle_df = generate_project_lifecycle_mapping(
-        selected_projects)
-    print("Generated project lifecycle mapping")
+        # Generate project-lifecycle mapping
+        project_lifecycle_df = generate_project_lifecycle_mapping(
+            selected_projects)
+        print("Generated project lifecycle mapping")
 
-    # Check for missing services
-    missing_services = find_missing_services()
+        # Check for missing services
+        missing_services = find_missing_services()
     if missing_services:
         print(
             f"WARNING: Found services in projects that are not defined in AZURE_SERVICES: {', '.join(missing_services)}")
@@ -2084,92 +2154,150 @@ def main():
     all_records = []
     all_tags = []
 
-    with multiprocessing.Pool(processes=min(len(project_args), multiprocessing.cpu_count())) as pool:
-        results = pool.map(process_project, project_args)
+    # The parent's generation stage also covers pickling the workers'
+    # records back; each worker reports its own generation stage
+    with run_stage(metrics, "generation", projects=len(project_args)):
+        with multiprocessing.Pool(processes=min(len(project_args), multiprocessing.cpu_count())) as pool:
+            results = pool.map(process_project, project_args)
+    add_stages(metrics, [worker_stage for _, _, worker_stage in results])
 
-        for records, tags in results:
+    with run_stage(metrics, "concatenation"):
+        for records, tags, _ in results:
             all_records.extend(records)
             all_tags.extend(tags)
 
     print(
         f"Generated {len(all_records)} total records and {len(all_tags)} tags")
 
-    # Convert to DataFrames
-    df_records = pd.DataFrame(all_records)
-    df_tags = pd.DataFrame(all_tags)
+    with run_stage(metrics, "dataframe_build"):
+        # Convert to DataFrames
+        df_records = pd.DataFrame(all_records)
+        df_tags = pd.DataFrame(all_tags)
 
-    # Ensure all columns exist in the DataFrame
-    for col in COST_MANAGEMENT_COLUMNS:
-        if col not in df_records.columns:
-            df_records[col] = ""
+        # Ensure all columns exist in the DataFrame
+        for col in COST_MANAGEMENT_COLUMNS:
+            if col not in df_records.columns:
+                df_records[col] = ""
 
-    for col in RESOURCE_TAGS_COLUMNS:
-        if col not in df_tags.columns:
-            df_tags[col] = ""
+        for col in RESOURCE_TAGS_COLUMNS:
+            if col not in df_tags.columns:
+                df_tags[col] = ""
 
     # Save to CSV
     output_dir = "output"
     os.makedirs(output_dir, exist_ok=True)
 
-    df_records.to_csv(
-        f"{output_dir}/azure_cost_management_export.csv", index=False)
-    df_tags.to_csv(f"{output_dir}/resource_tags.csv", index=False)
+    with run_stage(metrics, "csv_write", file="azure_cost_management_export.csv", rows=len(df_records)):
+        df_records.to_csv(
+            f"{output_dir}/azure_cost_management_export.csv", index=False)
+    with run_stage(metrics, "csv_write", file="resource_tags.csv", rows=len(df_tags)):
+        df_tags.to_csv(f"{output_dir}/resource_tags.csv", index=False)
+
+    # Save one upfront purchase per reservation / savings plan order
+    with run_stage(metrics, "benefit_purchases"):
+        df_purchases = build_benefit_purchases(df_records)
+    with run_stage(metrics, "csv_write", file="benefit_purchases.csv", rows=len(df_purchases)):
+        df_purchases.to_csv(f"{output_dir}/benefit_purchases.csv", index=False)
+    print(f"Saved {len(df_purchases)} benefit purchases to {output_dir}/benefit_purchases.csv")
 
     # Save the project lifecycle mapping
-    project_lifecycle_df.to_csv(
-        f"{output_dir}/project_lifecycle_mapping.csv", index=False)
+    with run_stage(metrics, "csv_write", file="project_lifecycle_mapping.csv", rows=len(project_lifecycle_df)):
+        project_lifecycle_df.to_csv(
+            f"{output_dir}/project_lifecycle_mapping.csv", index=False)
     print(
         f"Saved project lifecycle mapping to {output_dir}/project_lifecycle_mapping.csv")
 
+    # Optionally load the same frames into a local DuckDB/SQLite warehouse
+    warehouse_engine = OUTPUT_SETTINGS["warehouse_engine"]
+    if warehouse_engine:
+        with run_stage(metrics, "warehouse_export", engine=warehouse_engine):
+            warehouse_path = export_to_warehouse(
+                df_records, df_tags, project_lifecycle_df,
+                path=default_warehouse_path(output_dir, warehouse_engine), engine=warehouse_engine)
+        print(f"Saved warehouse tables to {warehouse_path}")
+
+    # Optionally write the records as pruned-scan partitions
+    if OUTPUT_SETTINGS["partitioned_records"]:
+        dataset_dir = f"{output_dir}/azure_cost_management_export"
+        with run_stage(metrics, "partitioned_records"):
+            partitions = write_partitioned_records(df_records, dataset_dir, df_tags)
+        print(f"Saved {len(partitions)} record partitions to {dataset_dir}")
+
     # Generate a summary per subscription per month
     if not df_records.empty:
-        # Extract month from Date column
-        df_records['month'] = pd.to_datetime(
-            df_records['Date']).dt.strftime('%Y-%m')
-
-        # Create subscription summary
-        subscription_summary = df_records.groupby(['month', 'SubscriptionName'])[
-            'Cost'].sum().reset_index()
-        subscription_summary.to_csv(
-            f"{output_dir}/cost_summary_by_subscription.csv", index=False)
-
-        # Generate summary by service
-        service_summary = df_records.groupby(['month', 'ServiceName'])[
-            'Cost'].sum().reset_index()
-        service_summary.to_csv(
-            f"{output_dir}/cost_summary_by_service.csv", index=False)
-
-        # Map project names to business units using tags
-        # First create a mapping from ResourceId to business unit
-        resource_to_bu = {}
-        for _, tag in df_tags.iterrows():
-            if tag['key'] == 'business-unit':
-                resource_to_bu[tag['resource_id']] = tag['value']
-
-        # Apply mapping to get business unit
-        df_records['business_unit'] = df_records['ResourceId'].map(
-            resource_to_bu).fillna("Unknown")
-
-        # Generate monthly cost summary by business unit
-        bu_summary = df_records.groupby(['month', 'business_unit'])[
-            'Cost'].sum().reset_index()
-        bu_summary.to_csv(
-            f"{output_dir}/cost_summary_by_business_unit.csv", index=False)
-
-        # Generate chargeback/showback reports
-        chargeback_stats = generate_chargeback_reports(
-            df_records, df_tags, output_dir)
-        print(
-            f"Generated chargeback/showback reports. Total chargeback: ${chargeback_stats['chargeback_total']:.2f}")
-
-        # Analyze benefit impact
-        benefit_impact = analyze_discount_impact(df_records, output_dir)
-        print(f"Analyzed benefit impact. Estimated savings: ${benefit_impact['estimated_benefit_amount']:.2f} " +
-              f"({benefit_impact['percent_discount']:.2f}%)")
+        # Aggregate once; business unit, chargeback entity and allocation
+        # method are resolved from the tags on the cube
+        with run_stage(metrics, "aggregation", function="build_cost_cube"):
+            cube = build_cost_cube(df_records, df_tags)
+
+        # Distinct resource and meter sketches for the same cube cells
+        with run_stage(metrics, "aggregation", function="aggregate_sketches"):
+            sketches = aggregate_sketches(df_records)
+
+        # Write every summary and chargeback report from the cube
+        with run_stage(metrics, "report", function="generate_cost_reports"):
+            generate_cost_reports(cube, df_tags, output_dir, sketches)
+
+        # Actual vs amortized views of the commitment purchases
+        with run_stage(metrics, "report", function="write_amortization_reports"):
+            amortization = write_amortization_reports(df_records, df_purchases, output_dir)
+        print(f"Amortized {amortization['benefit_orders']} benefit orders "
+              f"({amortization['commitment_utilization']:.0%} utilized). "
+              f"Actual: ${amortization['actual_cost']:.2f}, amortized: ${amortization['amortized_cost']:.2f}")
+
+        # Forecast, anomaly, scenario, budget, commitment and rightsizing reports
+        if OUTPUT_SETTINGS["analysis_reports"]:
+            # Daily cost forecasts per project, service and subscription,
+            # reconciled up to business units and the org
+            with run_stage(metrics, "report", function="write_forecast_reports"):
+                forecast = write_forecast_reports(df_records, df_tags, output_dir)
+            print(f"Forecast {forecast['series']} cost series {forecast['horizon_days']} days ahead "
+                  f"in {forecast['fit_seconds']:.2f} seconds. Total: ${forecast['total_forecast']:.2f}")
+
+            # Daily cost anomalies per subscription and service, from a fresh detector state
+            with run_stage(metrics, "report", function="write_anomaly_reports"):
+                anomalies = write_anomaly_reports(df_records, output_dir, resume=False)
+            print(f"Flagged {anomalies['new_anomalies']} cost anomalies across {anomalies['series']} series")
+
+            # Monte Carlo spend bands of the selected projects over the same days,
+            # each with the daily budget process_project() gives it
+            project_budget = daily_budget / DATA_VOLUME_SETTINGS["maximum_projects_to_be_picked"]
+            with run_stage(metrics, "report", function="write_scenario_reports"):
+                scenario = write_scenario_reports(
+                    scenario_projects(selected_projects, project_budget), start_date, day_count, output_dir,
+                    volatility_factor=DATA_VOLUME_SETTINGS["volatility_factor"])
+            print(f"Simulated {scenario['paths']} spend paths per project in {scenario['simulation_seconds']:.2f} "
+                  f"seconds. Annual spend p50: ${scenario['annual_spend']['p50']:.2f}")
+
+            # Burn rate and projected overrun against the annual budget, from a
+            # fresh tracker state
+            with run_stage(metrics, "report", function="write_budget_reports"):
+                budget = write_budget_reports(
+                    df_records, df_tags, output_dir,
+                    budgets=project_budgets(selected_projects, project_budget * 365), resume=False)
+            print(f"Projected year-end spend: ${budget['projected_year_end']:.2f} against a budget of "
+                  f"${budget['annual_budget']:.2f} ({budget['new_crossings']} budget threshold crossings)")
+
+            # Savings-maximizing reservation / savings plan commitment per
+            # service, region and subscription
+            with run_stage(metrics, "report", function="write_commitment_reports"):
+                commitments = write_commitment_reports(df_records, BENEFIT_DISCOUNT_MAPPING, output_dir)
+            print(f"Sized commitments for {commitments['families']} service families in "
+                  f"{commitments['sweep_seconds']:.2f} seconds. Savings: ${commitments['savings']:.2f}")
+
+            # Cheapest catalog VM size fitting each tagged resource's usage
+            with run_stage(metrics, "report", function="write_rightsizing_reports"):
+                rightsizing = write_rightsizing_reports(df_records, df_tags, output_dir)
+            print(f"Rightsized {rightsizing['resources']} resources in {rightsizing['sizing_seconds']:.2f} seconds "
+                  f"({rightsizing['resources_resized']} resized). Savings: ${rightsizing['savings']:.2f}")
 
     end_time = time.time()
     print(
         f"Generated Azure Cost Management data in {end_time - start_time:.2f} seconds")
+
+    if metrics is not None:
+        metrics_path = write_run_metrics(metrics, output_dir)
+        print(f"Saved run metrics for {len(metrics['stages'])} stages to {metrics_path}")
     print(f"Data saved to {output_dir}/")
 
 
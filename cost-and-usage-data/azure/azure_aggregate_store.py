@@ -0,0 +1,162 @@
+import os
+import sys
+
+from azure_loader import load_tags
+from azure_partitions import read_partition, append_partitioned_records
+from azure_cost_cube import (RECORD_COLUMNS, CUBE_DIMENSIONS, CUBE_MEASURES, aggregate_records,
+                             combine_cubes, finish_cube)
+from azure_chunked_reports import load_generator
+from azure_distinct import DISTINCT_RECORD_COLUMNS, SKETCH_COLUMNS, aggregate_sketches, combine_sketches
+
+# Parquet needs pyarrow; without it month aggregates are stored as CSV
+try:
+    import pyarrow  # noqa: F401
+    DEFAULT_FORMAT = "parquet"
+except ImportError:
+    DEFAULT_FORMAT = "csv"
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common.aggregate_store import (read_manifest, write_manifest, write_store_frame,  # noqa: E402
+                                           read_store_frame, remove_month, month_partitions, plan_refresh)
+
+# Aggregate store settings - one partial cube per usage month
+STORE_SETTINGS = {
+    "format": DEFAULT_FORMAT
+}
+
+# Record columns read for a month's cube and distinct-count sketches
+STORE_RECORD_COLUMNS = list(dict.fromkeys(RECORD_COLUMNS + DISTINCT_RECORD_COLUMNS))
+
+
+def write_month_cube(store_dir, month, cube, file_format=None):
+    """Store the partial cube of one month, returning its file name"""
+    return write_store_frame(store_dir, f"month={month}", cube[CUBE_DIMENSIONS + CUBE_MEASURES],
+                             file_format or STORE_SETTINGS["format"])
+
+
+def read_month_cube(store_dir, entry):
+    """Load the partial cube a manifest entry points to"""
+    dtype = {col: "float64" if col in CUBE_MEASURES else object
+             for col in CUBE_DIMENSIONS + CUBE_MEASURES}
+    return read_store_frame(store_dir, entry["file"], dtype)
+
+
+def write_month_sketches(store_dir, month, sketches, file_format=None):
+    """Store the distinct-count sketches of one month, returning their file name"""
+    return write_store_frame(store_dir, f"month={month}.hll", sketches[SKETCH_COLUMNS],
+                             file_format or STORE_SETTINGS["format"])
+
+
+def read_month_sketches(store_dir, entry):
+    """Load the distinct-count sketches a manifest entry points to"""
+    dtype = {col: object for col in SKETCH_COLUMNS}
+    dtype.update({"register": "int32", "rank": "int8"})
+    return read_store_frame(store_dir, entry["sketch_file"], dtype)
+
+
+def refresh_store(dataset_dir, store_dir):
+    """
+    Bring the stored month aggregates up to date with a partitioned dataset.
+
+    The dataset is the only source of the store. Partitions added to a month
+    since the last refresh (such as append_records() batches) are read and
+    folded into its stored cube and sketches. A month with a rewritten or
+    removed partition is re-aggregated from all its partitions, and months
+    that no longer have partitions are dropped.
+
+    Returns:
+        (refreshed months, removed months)
+    """
+    manifest = read_manifest(store_dir)
+    months = month_partitions(dataset_dir)
+    plan, removed = plan_refresh(manifest, months)
+
+    for month, (rebuild, part_paths) in sorted(plan.items()):
+        cubes, sketches = [], []
+        if not rebuild:
+            cubes.append(read_month_cube(store_dir, manifest[month]))
+            sketches.append(read_month_sketches(store_dir, manifest[month]))
+        for part_path in part_paths:
+            df_part = read_partition(os.path.join(dataset_dir, part_path), STORE_RECORD_COLUMNS)
+            cubes.append(aggregate_records(df_part))
+            sketches.append(aggregate_sketches(df_part))
+        cube = combine_cubes(cubes)
+        manifest[month] = {
+            "file": write_month_cube(store_dir, month, cube),
+            "sketch_file": write_month_sketches(store_dir, month, combine_sketches(sketches)),
+            "records": months[month]["records"],
+            "cube_rows": len(cube),
+            "partitions": months[month]["partitions"]
+        }
+
+    for month in removed:
+        remove_month(store_dir, manifest, month)
+
+    write_manifest(store_dir, manifest)
+    return sorted(plan), removed
+
+
+def append_records(df_new_records, dataset_dir, store_dir, df_tags=None):
+    """
+    Add newly arrived cost records to the partitioned dataset and the stored month aggregates.
+
+    The records are written as new partitions next to the existing ones,
+    which refresh_store() then folds into the stored months, so an append
+    costs O(new data) plus the stored aggregates of the months it touches,
+    and a later refresh_store() keeps them.
+
+    Returns:
+        Sorted list of the months that changed
+    """
+    append_partitioned_records(df_new_records, dataset_dir, df_tags)
+    refreshed, _ = refresh_store(dataset_dir, store_dir)
+    return refreshed
+
+
+def build_store_cube(store_dir, df_tags=None):
+    """
+    The full cost cube, combined from the stored month aggregates.
+
+    Returns:
+        The same cube build_cost_cube() returns for every stored record
+    """
+    manifest = read_manifest(store_dir)
+    cubes = [read_month_cube(store_dir, manifest[month]) for month in sorted(manifest)]
+    return finish_cube(combine_cubes(cubes), df_tags)
+
+
+def build_store_sketches(store_dir):
+    """The distinct-count sketches of every stored month, merged into one table"""
+    manifest = read_manifest(store_dir)
+    return combine_sketches([read_month_sketches(store_dir, manifest[month])
+                             for month in sorted(manifest) if "sketch_file" in manifest[month]])
+
+
+def main():
+    """Refresh the aggregate store from the partitioned cost export and rewrite the reports from it"""
+    generate_cost_reports = load_generator().generate_cost_reports
+
+    output_dir = "output"
+    dataset_dir = f"{output_dir}/azure_cost_management_export"
+    store_dir = f"{output_dir}/aggregate_store"
+
+    if not os.path.isdir(dataset_dir):
+        print(f"No partitioned records in {dataset_dir}; "
+              "set OUTPUT_SETTINGS['partitioned_records'] in the generator")
+        return
+
+    refreshed, removed = refresh_store(dataset_dir, store_dir)
+    print(f"Refreshed {len(refreshed)} month(s) {refreshed}, removed {len(removed)} {removed}")
+
+    df_tags = load_tags(output_dir)
+    cube = build_store_cube(store_dir, df_tags)
+    generate_cost_reports(cube, df_tags, output_dir, build_store_sketches(store_dir))
+    print(f"Rewrote reports from {len(read_manifest(store_dir))} stored month(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import os
+import sys
+import pandas as pd
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import allocation  # noqa: E402
+
+# Record columns the allocation works on
+RESOURCE_COLUMN = "ResourceId"
+SERVICE_COLUMN = "ServiceName"
+
+
+def fixed_allocation_shares(df_tags, allocation_rules):
+    """
+    Fixed percentages from allocation-<entity> tags (e.g. allocation-finance = 15).
+
+    Tag keys carry the entity in lower case; it is mapped back to the
+    entity name used in the allocation rules where there is one.
+
+    Returns:
+        DataFrame of resource, allocated_entity and allocation_share (summing to 1 per resource)
+    """
+    keys = df_tags['key'].astype(object)
+    tags = df_tags[keys.str.startswith('allocation-') & (keys != 'allocation-method')]
+    tags = tags.drop_duplicates(['resource_id', 'key'], keep='last')
+
+    entity_names = {entity.lower(): entity for rule_data in allocation_rules.values()
+                    for entity in rule_data["entities"]}
+    entities = tags['key'].astype(object).str[len('allocation-'):]
+
+    shares = pd.DataFrame({
+        RESOURCE_COLUMN: tags['resource_id'].astype(object).values,
+        'allocated_entity': entities.map(entity_names).fillna(entities).values,
+        'allocation_share': pd.to_numeric(tags['value'].astype(object), errors='coerce').values
+    })
+    shares = shares[shares['allocation_share'] > 0]
+    return allocation.normalize_shares(shares, RESOURCE_COLUMN)
+
+
+def allocate_shared_costs(df, df_tags, allocation_rules, cost_columns, tiers=None):
+    """
+    Expand shared line items into one allocated row per receiving entity.
+
+    Items with allocation-<entity> tags are split by those fixed
+    percentages, other shared items across the entities of their service's
+    allocation rule as finops_common.allocation describes.
+
+    Args:
+        df: Records or cost cube with month, chargeback_entity and allocation_method
+        df_tags: Tags frame
+        allocation_rules: COST_ALLOCATION_RULES of the generator
+        cost_columns: Cost columns to split
+
+    Returns:
+        DataFrame with the input columns plus allocation_rule, allocated_entity,
+        allocation_share, and cost_columns multiplied by the share
+    """
+    fixed = fixed_allocation_shares(df_tags, allocation_rules)
+    return allocation.allocate_shared_costs(df, fixed, allocation_rules, cost_columns, RESOURCE_COLUMN,
+                                            SERVICE_COLUMN, tiers)
@@ -0,0 +1,301 @@
+import os
+import json
+import time
+import numpy as np
+import pandas as pd
+
+from azure_loader import OUTPUT_FILES, TIMESTAMP_FORMAT, load_records, load_purchases
+
+# Commitment terms and the number of days a purchase is amortized over
+TERM_DAYS = {
+    "P1Y": 365,
+    "P3Y": 1095
+}
+
+# Benefit order sizing, fixed when an order is bought rather than taken from
+# the usage it later covers. An order buys quantity units of its benefit at
+# the daily unit price for every day of its term; commitment the covered
+# usage does not consume is unused.
+BENEFIT_ORDER_SETTINGS = {
+    "quantity": {
+        "Reserved Instance: 1 year": 4,
+        "Reserved Instance: 3 year": 4,
+        "Compute Savings Plan": 1
+    },
+    "daily_unit_price": {  # Committed net cost per unit and day
+        "Reserved Instance: 1 year": 40.0,
+        "Reserved Instance: 3 year": 30.0,
+        "Compute Savings Plan": 150.0
+    }
+}
+
+# Attributes of a benefit order, carried onto its purchase and amortization rows
+ORDER_COLUMNS = [
+    "ProductOrderId",
+    "BillingAccountId",
+    "SubscriptionId",
+    "SubscriptionName",
+    "ServiceName",
+    "ProductOrderName",
+    "BenefitId",
+    "BenefitName",
+    "Term",
+    "PricingModel"
+]
+
+# benefit_purchases.csv schema
+PURCHASE_COLUMNS = ["Date"] + ORDER_COLUMNS + ["ChargeType", "Frequency", "Quantity", "Cost"]
+
+# Grain of the actual vs amortized cost views
+VIEW_DIMENSIONS = ["Date", "SubscriptionId", "SubscriptionName", "ServiceName"]
+
+# benefit_utilization_by_order.csv schema
+UTILIZATION_COLUMNS = ORDER_COLUMNS + ["Date", "Quantity", "CommittedCost", "UsedCommitment",
+                                       "UnusedCommitment", "Utilization"]
+
+VIEW_MEASURES = [
+    "OnDemandCost",  # Usage cost before any benefit
+    "BenefitAmount",  # Benefit amounts on the usage (negative = savings)
+    "UsageCost",  # Usage paid as it occurs, i.e. not covered by a commitment
+    "PurchaseCost",  # Upfront commitment purchases, on the purchase day
+    "AmortizedCommitmentCost"  # Commitment purchases spread daily over their term
+]
+
+
+def record_days(dates):
+    """Dates as datetime64[D], from export strings or loader timestamps"""
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates.astype(object), format=TIMESTAMP_FORMAT)
+    elif dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates.to_numpy().astype('datetime64[D]')
+
+
+def commitment_mask(df):
+    """Rows covered by a reservation or savings plan order (Hybrid Benefit has no term)"""
+    has_term = df['Term'].astype(object).isin(list(TERM_DAYS)).to_numpy()
+    has_order = (df['ProductOrderId'].astype(object) != "").to_numpy()
+    return has_term & has_order
+
+
+def build_benefit_purchases(df_records, settings=None):
+    """
+    One upfront purchase record per reservation or savings plan order.
+
+    An order is bought on the first day it covers usage. Its quantity and
+    daily unit price come from the order settings of its benefit, and it is
+    paid for every day of its term however much usage it then covers.
+
+    Returns:
+        DataFrame with PURCHASE_COLUMNS, Date formatted like the export
+    """
+    settings = settings or BENEFIT_ORDER_SETTINGS
+    covered = df_records[commitment_mask(df_records)]
+    if covered.empty:
+        return pd.DataFrame(columns=PURCHASE_COLUMNS)
+
+    orders = pd.DataFrame({col: covered[col].astype(object).values for col in ORDER_COLUMNS})
+    orders['Day'] = record_days(covered['Date'])
+
+    grouped = orders.groupby('ProductOrderId', sort=True)
+    purchases = grouped[ORDER_COLUMNS[1:]].first()
+    purchases['Date'] = pd.to_datetime(grouped['Day'].min()).dt.strftime(TIMESTAMP_FORMAT)
+
+    benefits = purchases['BenefitName']
+    purchases['Quantity'] = benefits.map(settings["quantity"]).fillna(1).astype(float)
+    unit_prices = benefits.map(settings["daily_unit_price"]).fillna(0.0).astype(float)
+    purchases['Cost'] = purchases['Quantity'] * unit_prices * purchases['Term'].map(TERM_DAYS)
+    purchases['ChargeType'] = "Purchase"
+    purchases['Frequency'] = "OneTime"
+
+    return purchases.reset_index()[PURCHASE_COLUMNS]
+
+
+def amortize_purchases(df_purchases, start_date=None, end_date=None):
+    """
+    Spread each purchase evenly over the days of its term.
+
+    The order x day expansion is built with numpy in one pass: each order
+    contributes one row per day of its term that falls in [start_date,
+    end_date), so a long term does not materialise days outside the window.
+
+    Returns:
+        DataFrame of Date, ORDER_COLUMNS and AmortizedCost per order and day
+    """
+    purchases = df_purchases[df_purchases['Term'].astype(object).isin(list(TERM_DAYS))]
+
+    term_days = purchases['Term'].astype(object).map(TERM_DAYS).to_numpy(dtype=np.int64)
+    daily_cost = purchases['Cost'].to_numpy(dtype=float) / np.maximum(term_days, 1)
+
+    first = record_days(purchases['Date'])
+    last = first + (term_days - 1).astype('timedelta64[D]')
+    if start_date is not None:
+        first = np.maximum(first, np.datetime64(pd.Timestamp(start_date).date(), 'D'))
+    if end_date is not None:
+        last = np.minimum(last, np.datetime64(pd.Timestamp(end_date).date(), 'D') - 1)
+
+    counts = np.maximum((last - first).astype(np.int64) + 1, 0)
+    order_index = np.repeat(np.arange(len(purchases)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    amortized = pd.DataFrame({'Date': first[order_index] + offsets.astype('timedelta64[D]')})
+    for col in ORDER_COLUMNS:
+        amortized[col] = purchases[col].astype(object).to_numpy()[order_index]
+    amortized['AmortizedCost'] = daily_cost[order_index]
+    return amortized
+
+
+def order_utilization(df_records, df_purchases, end_date=None):
+    """
+    Commitment used and left unused by each order, from its purchase to end_date.
+
+    The committed cost is the part of the purchase amortized up to end_date
+    (default: the day after the last day of data). The covered usage uses it
+    up at its net cost (Cost + BenefitAmount), at most the whole commitment.
+
+    Returns:
+        DataFrame with UTILIZATION_COLUMNS, Date (of purchase) formatted like the export
+    """
+    if end_date is None:
+        end_date = pd.Timestamp(record_days(df_records['Date']).max()) + pd.Timedelta(days=1)
+    end_day = np.datetime64(pd.Timestamp(end_date).date(), 'D')
+
+    committed = amortize_purchases(df_purchases, end_date=end_date).groupby(
+        'ProductOrderId', sort=False)['AmortizedCost'].sum()
+
+    covered = df_records[commitment_mask(df_records) & (record_days(df_records['Date']) < end_day)]
+    used = pd.Series(covered['Cost'].to_numpy(dtype=float) + covered['BenefitAmount'].to_numpy(dtype=float),
+                     index=covered['ProductOrderId'].astype(object).values).groupby(level=0).sum()
+
+    orders = df_purchases[ORDER_COLUMNS + ['Quantity']].astype({col: object for col in ORDER_COLUMNS})
+    orders['Date'] = pd.to_datetime(record_days(df_purchases['Date'])).strftime(TIMESTAMP_FORMAT)
+    committed_cost = orders['ProductOrderId'].map(committed).fillna(0.0).to_numpy(dtype=float)
+    used_commitment = np.minimum(orders['ProductOrderId'].map(used).fillna(0.0).to_numpy(dtype=float),
+                                 committed_cost)
+    orders['CommittedCost'] = committed_cost
+    orders['UsedCommitment'] = used_commitment
+    orders['UnusedCommitment'] = committed_cost - used_commitment
+    orders['Utilization'] = np.divide(used_commitment, committed_cost, out=np.zeros_like(committed_cost),
+                                      where=committed_cost > 0)
+    return orders[UTILIZATION_COLUMNS].reset_index(drop=True)
+
+
+def cost_views(df_records, df_purchases, start_date=None, end_date=None):
+    """
+    Actual and amortized cost per day, subscription and service.
+
+    Usage covered by a commitment was paid for by the purchase, so it costs
+    nothing as it occurs. The actual view charges purchases on the day they
+    were bought; the amortized view spreads them over their term instead.
+    Other usage is charged net of its benefit amount (e.g. Hybrid Benefit)
+    in both views.
+
+    Args:
+        start_date, end_date: Half-open day window, defaulting to the days
+            covered by df_records
+
+    Returns:
+        DataFrame with VIEW_DIMENSIONS, VIEW_MEASURES, ActualCost and AmortizedCost
+    """
+    days = record_days(df_records['Date'])
+    start = np.datetime64(pd.Timestamp(start_date).date(), 'D') if start_date is not None else days.min()
+    end = np.datetime64(pd.Timestamp(end_date).date(), 'D') if end_date is not None else days.max() + 1
+
+    cost = df_records['Cost'].to_numpy(dtype=float)
+    benefit = df_records['BenefitAmount'].to_numpy(dtype=float)
+    usage = pd.DataFrame({
+        'Date': days,
+        'SubscriptionId': df_records['SubscriptionId'].astype(object).values,
+        'SubscriptionName': df_records['SubscriptionName'].astype(object).values,
+        'ServiceName': df_records['ServiceName'].astype(object).values,
+        'OnDemandCost': cost,
+        'BenefitAmount': benefit,
+        'UsageCost': np.where(commitment_mask(df_records), 0.0, cost + benefit)
+    })
+    usage = usage[(usage['Date'] >= start) & (usage['Date'] < end)]
+
+    purchases = pd.DataFrame({col: df_purchases[col].astype(object).values
+                              for col in VIEW_DIMENSIONS[1:]})
+    purchases['Date'] = record_days(df_purchases['Date'])
+    purchases['PurchaseCost'] = df_purchases['Cost'].to_numpy(dtype=float)
+    purchases = purchases[(purchases['Date'] >= start) & (purchases['Date'] < end)]
+
+    amortized = amortize_purchases(df_purchases, start, end)
+    amortized = amortized[VIEW_DIMENSIONS + ['AmortizedCost']].rename(
+        columns={'AmortizedCost': 'AmortizedCommitmentCost'})
+
+    # Empty parts are left out so they do not affect the result dtypes
+    parts = [part for part in (usage, purchases, amortized) if len(part)] or [usage]
+    combined = pd.concat(parts, ignore_index=True)
+    for col in VIEW_MEASURES:
+        if col not in combined.columns:
+            combined[col] = 0.0
+    combined[VIEW_MEASURES] = combined[VIEW_MEASURES].fillna(0.0)
+
+    views = combined.groupby(VIEW_DIMENSIONS, sort=True)[VIEW_MEASURES].sum().reset_index()
+    views['ActualCost'] = views['UsageCost'] + views['PurchaseCost']
+    views['AmortizedCost'] = views['UsageCost'] + views['AmortizedCommitmentCost']
+    return views
+
+
+def write_amortization_reports(df_records, df_purchases, output_dir):
+    """Write the daily and monthly actual vs amortized cost views, the order utilization and a summary"""
+    views = cost_views(df_records, df_purchases)
+
+    daily = views.assign(Date=pd.to_datetime(views['Date']).dt.strftime(TIMESTAMP_FORMAT))
+    daily.to_csv(f"{output_dir}/actual_vs_amortized_cost_by_day.csv", index=False)
+
+    monthly = views.assign(month=pd.to_datetime(views['Date']).dt.strftime('%Y-%m')).groupby(
+        ['month', 'SubscriptionName'])[['OnDemandCost', 'ActualCost', 'AmortizedCost']].sum().reset_index()
+    monthly.to_csv(f"{output_dir}/actual_vs_amortized_cost_by_subscription.csv", index=False)
+
+    # Commitment still to be amortized after the last day of data
+    purchase_cost = df_purchases['Cost'].sum()
+    amortized_to_date = 0.0
+    utilization = pd.DataFrame(columns=UTILIZATION_COLUMNS)
+    if len(views):
+        end_date = pd.Timestamp(views['Date'].max()) + pd.Timedelta(days=1)
+        amortized_to_date = amortize_purchases(df_purchases, end_date=end_date)['AmortizedCost'].sum()
+        utilization = order_utilization(df_records, df_purchases, end_date)
+    utilization.to_csv(f"{output_dir}/benefit_utilization_by_order.csv", index=False)
+    used_commitment = float(utilization['UsedCommitment'].sum())
+
+    summary_stats = {
+        'benefit_orders': int(len(df_purchases)),
+        'purchase_cost': float(purchase_cost),
+        'on_demand_cost': float(views['OnDemandCost'].sum()),
+        'benefit_amount': float(views['BenefitAmount'].sum()),
+        'actual_cost': float(views['ActualCost'].sum()),
+        'amortized_cost': float(views['AmortizedCost'].sum()),
+        'unamortized_commitment': float(purchase_cost - amortized_to_date),
+        'used_commitment': used_commitment,
+        'unused_commitment': float(amortized_to_date - used_commitment),
+        'commitment_utilization': float(used_commitment / amortized_to_date) if amortized_to_date > 0 else 0.0
+    }
+
+    with open(f"{output_dir}/amortization_summary.json", 'w') as f:
+        json.dump(summary_stats, f, indent=2)
+
+    return summary_stats
+
+
+def main():
+    """Amortize the benefit purchases of an existing output directory"""
+    output_dir = "output"
+
+    start_time = time.time()
+    df_records = load_records(output_dir, columns=["Date"] + ORDER_COLUMNS + ["Cost", "BenefitAmount"])
+
+    # Older outputs have no purchase file; derive it from the export
+    if os.path.exists(os.path.join(output_dir, OUTPUT_FILES["purchases"])):
+        df_purchases = load_purchases(output_dir)
+    else:
+        df_purchases = build_benefit_purchases(df_records)
+
+    summary = write_amortization_reports(df_records, df_purchases, output_dir)
+    print(f"Amortized {summary['benefit_orders']} benefit orders in {time.time() - start_time:.2f} seconds. "
+          f"Actual: ${summary['actual_cost']:.2f}, amortized: ${summary['amortized_cost']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import json
+import pandas as pd
+
+from azure_loader import load_records
+from azure_amortization import record_days
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import anomalies  # noqa: E402
+
+# A series is the daily cost of one service in one subscription
+SERIES_KEYS = ["SubscriptionName", "ServiceName"]
+
+# Record columns the daily costs are built from
+ANOMALY_RECORD_COLUMNS = ["Date"] + SERIES_KEYS + ["Cost"]
+
+
+def daily_costs(df_records):
+    """Daily cost (before benefits) per series, ordered by day"""
+    daily = pd.DataFrame({col: df_records[col].astype(object).values for col in SERIES_KEYS})
+    daily['date'] = record_days(df_records['Date'])
+    daily['cost'] = df_records['Cost'].to_numpy(dtype=float)
+    return anomalies.daily_series(daily, SERIES_KEYS)
+
+
+def pattern_validation(num_series=200, num_days=365, anomaly_rate=0.01, seed=0, settings=None):
+    """Check the detector against the weekday and month-end patterns the generator injects"""
+    from azure_chunked_reports import load_generator
+    from configAzure import CONFIG
+
+    generator = load_generator()
+    lifecycles = CONFIG["configurables"]["usage_growth_rate"]
+    return anomalies.pattern_validation(generator.START_DATE, generator.apply_lifecycle_pattern, lifecycles,
+                                        SERIES_KEYS, num_series, num_days, anomaly_rate, seed, settings)
+
+
+def write_anomaly_reports(df_records, output_dir, settings=None, resume=True):
+    """Update the detector with the records' new days and write cost_anomalies.csv and its state"""
+    return anomalies.write_anomaly_reports(daily_costs(df_records), output_dir, SERIES_KEYS, settings, resume)
+
+
+def main():
+    """Update the anomaly detector from an existing output directory and validate it"""
+    output_dir = "output"
+
+    df_records = load_records(output_dir, columns=ANOMALY_RECORD_COLUMNS)
+    summary = write_anomaly_reports(df_records, output_dir)
+    print(f"Scored {summary['series_updates']} series-days of {summary['series']} series: "
+          f"{summary['new_anomalies']} new anomalies ({summary['updates_per_second']:.0f} updates/s)")
+
+    validation = pattern_validation()
+    with open(os.path.join(output_dir, anomalies.ANOMALY_FILES["validation"]), 'w') as f:
+        json.dump(validation, f, indent=2)
+    print(f"Validation: {validation['detection_rate']:.1%} of injected anomalies detected, "
+          f"{validation['false_positive_rate']:.3%} false positives "
+          f"({validation['month_end_false_positive_rate']:.3%} at month end)")
+
+
+if __name__ == "__main__":
+    main()
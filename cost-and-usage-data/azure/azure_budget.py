@@ -0,0 +1,56 @@
+import os
+import sys
+
+from configAzure import CONFIG
+from azure_loader import load_records, load_tags
+from azure_forecast import FORECAST_RECORD_COLUMNS, PROJECT_TAG, daily_cost_series
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import budget  # noqa: E402
+
+
+def project_daily_costs(df_records, df_tags):
+    """Daily cost per business unit and project tag"""
+    daily = daily_cost_series(df_records, df_tags)
+    return daily.groupby(['date', 'business_unit', 'project'], sort=True)['cost'].sum().reset_index()
+
+
+def project_budgets(project_names, project_annual_budget=None):
+    """Annual budget of each project, CONFIG's annual budget shared evenly by default"""
+    return budget.project_budgets(CONFIG["annual_budget"], project_names, project_annual_budget)
+
+
+def write_budget_reports(df_records, df_tags, output_dir, budgets=None, org_budget=None, settings=None,
+                         resume=True):
+    """
+    Update the budget tracker with the records' new days and write its outputs.
+
+    Without budgets every tagged project in the records gets an even share
+    of the annual budget.
+    """
+    daily = project_daily_costs(df_records, df_tags)
+    if budgets is None:
+        budgets = project_budgets(sorted(set(daily["project"]) - {PROJECT_TAG[1]}))
+    org_budget = CONFIG["annual_budget"] if org_budget is None else org_budget
+    return budget.write_budget_reports(daily, output_dir, budgets, org_budget, settings, resume)
+
+
+def main():
+    """Update the budget tracker from an existing output directory"""
+    output_dir = "output"
+
+    df_records = load_records(output_dir, columns=FORECAST_RECORD_COLUMNS)
+    df_tags = load_tags(output_dir, keys=[PROJECT_TAG[0], "business-unit"])
+
+    summary = write_budget_reports(df_records, df_tags, output_dir)
+    print(f"Tracked {summary['days_tracked']} days for {summary['entities']} entities in "
+          f"{summary['tracking_seconds']:.2f} seconds. Projected year end: "
+          f"${summary['projected_year_end']:.2f} ({summary['new_crossings']} new threshold crossings)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+import importlib.util
+
+from azure_loader import OUTPUT_FILES, load_tags
+from azure_partitions import read_partition
+from azure_cost_cube import (RECORD_COLUMNS, CUBE_MEASURES, aggregate_records, combine_cubes,
+                             finish_cube)
+from azure_distinct import DISTINCT_RECORD_COLUMNS, aggregate_sketches, combine_sketches
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import chunked_reports  # noqa: E402
+
+
+def iter_csv_chunks(output_dir="output", chunk_rows=None, columns=None):
+    """Yield the cube columns (or other columns) of azure_cost_management_export.csv chunk by chunk"""
+    path = os.path.join(output_dir, OUTPUT_FILES["records"])
+    return chunked_reports.iter_csv_chunks(path, columns or RECORD_COLUMNS, CUBE_MEASURES, chunk_rows)
+
+
+def iter_partition_chunks(dataset_dir, columns=None):
+    """Yield the cube columns (or other columns) of each record partition in turn"""
+    return chunked_reports.iter_partition_chunks(dataset_dir, columns or RECORD_COLUMNS, read_partition)
+
+
+def build_cost_cube_chunked(chunks, df_tags=None, max_pending_rows=None, with_sketches=False):
+    """
+    Build the cost cube from record chunks with bounded memory.
+
+    Chunks are reduced to partial cubes and combined as they arrive, as
+    finops_common.chunked_reports.reduce_chunks() describes.
+
+    With with_sketches the chunks must also carry DISTINCT_RECORD_COLUMNS,
+    and the distinct-count sketches of the same cells are built alongside.
+
+    Returns:
+        The same cube build_cost_cube() returns for the full record table,
+        or (cube, sketches) with with_sketches
+    """
+    reducers = [(aggregate_records, combine_cubes)]
+    if with_sketches:
+        reducers.append((aggregate_sketches, combine_sketches))
+    results = chunked_reports.reduce_chunks(chunks, reducers, max_pending_rows)
+
+    cube = finish_cube(results[0], df_tags)
+    if with_sketches:
+        return cube, results[1]
+    return cube
+
+
+def load_generator():
+    """Import Azure-billing-data-generator.py, whose file name is not a module name"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "Azure-billing-data-generator.py")
+    spec = importlib.util.spec_from_file_location("azure_billing_data_generator", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    """Rebuild every report from the generator outputs, reading the records in chunks"""
+    generate_cost_reports = load_generator().generate_cost_reports
+
+    output_dir = "output"
+    dataset_dir = f"{output_dir}/azure_cost_management_export"
+
+    start_time = time.time()
+    df_tags = load_tags(output_dir)
+
+    # Prefer the partitioned records when the generator wrote them
+    columns = list(dict.fromkeys(RECORD_COLUMNS + DISTINCT_RECORD_COLUMNS))
+    if os.path.isdir(dataset_dir):
+        source = dataset_dir
+        chunks = iter_partition_chunks(dataset_dir, columns)
+    else:
+        source = os.path.join(output_dir, OUTPUT_FILES["records"])
+        chunks = iter_csv_chunks(output_dir, columns=columns)
+
+    cube, sketches = build_cost_cube_chunked(chunks, df_tags, with_sketches=True)
+    generate_cost_reports(cube, df_tags, output_dir, sketches)
+
+    print(f"Rebuilt reports from {source} in {time.time() - start_time:.2f} seconds "
+          f"({len(cube)} cube rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+from azure_loader import load_records
+from azure_amortization import record_days
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import commitments  # noqa: E402
+
+# Commitment sizing settings. A commitment is an amount of on-demand
+# equivalent spend per day, paid at (1 - discount) whether it is used or
+# not; usage above it is paid on demand. The export is daily, so days are
+# the only period.
+COMMITMENT_SETTINGS = {
+    "services": None,  # Services to size (default: every service in the discount mapping)
+    "default_discount": 0.40,  # 1-year reservation, for subscriptions without a mapped discount
+    "sweep_quantiles": [i / 20 for i in range(21)]  # Usage quantiles reported as sweep levels
+}
+
+# A family is one service in one region of one subscription
+FAMILY_COLUMNS = ["ServiceName", "ResourceLocation", "SubscriptionId"]
+
+# Charge type of the rows that are usage a commitment could cover
+USAGE_CHARGE_TYPE = "Usage"
+
+# Record columns the usage series are built from
+COMMITMENT_RECORD_COLUMNS = ["Date", "ChargeType"] + FAMILY_COLUMNS + ["Cost"]
+
+
+def usage_series(df_records, services, discount_mapping):
+    """
+    On-demand equivalent usage per family and day, as a dense matrix.
+
+    Usage is priced at pay-as-you-go: the benefit mapping's factor is
+    already in the cost of mapped subscriptions, so their cost is divided by
+    it. Only days with any usage in the records are kept: the generator
+    samples every sampling_interval days, and a commitment is only charged
+    over the days the data covers.
+
+    Returns:
+        Tuple of (families DataFrame of FAMILY_COLUMNS, days, families x days
+        usage matrix)
+    """
+    usage = ((df_records['ChargeType'].astype(object) == USAGE_CHARGE_TYPE) &
+             df_records['ServiceName'].astype(object).isin(list(services))).to_numpy()
+
+    rows = pd.DataFrame({col: df_records[col].astype(object).to_numpy()[usage] for col in FAMILY_COLUMNS})
+    rows['period'] = record_days(df_records['Date'])[usage]
+    factors = commitments.mapping_factors(rows, discount_mapping, FAMILY_COLUMNS)
+    rows['cost'] = df_records['Cost'].to_numpy(dtype=float)[usage] / np.where(np.isnan(factors), 1.0, factors)
+
+    all_periods = np.unique(record_days(df_records['Date']))
+    families, matrix = commitments.family_matrix(rows, all_periods, FAMILY_COLUMNS)
+    return families, all_periods, matrix
+
+
+def write_commitment_reports(df_records, discount_mapping, output_dir, settings=None):
+    """Write commitment_recommendations.csv, commitment_sweep.csv and commitment_summary.json"""
+    settings = settings or COMMITMENT_SETTINGS
+    services = settings["services"] or list(discount_mapping)
+
+    families, periods, matrix = usage_series(df_records, services, discount_mapping)
+    discounts = commitments.family_discounts(families, discount_mapping, settings["default_discount"])
+    return commitments.write_commitment_reports(families, periods, matrix, discounts, output_dir, settings)
+
+
+def main():
+    """Size commitments from the records of an existing output directory"""
+    from azure_chunked_reports import load_generator
+
+    output_dir = "output"
+
+    df_records = load_records(output_dir, columns=COMMITMENT_RECORD_COLUMNS)
+    summary = write_commitment_reports(df_records, load_generator().BENEFIT_DISCOUNT_MAPPING, output_dir)
+    print(f"Swept commitment levels of {summary['families']} families over {summary['periods']} periods "
+          f"in {summary['sweep_seconds']:.2f} seconds. Savings: ${summary['savings']:.2f} "
+          f"({summary['coverage']:.1%} coverage)")
+
+
+if __name__ == "__main__":
+    main()
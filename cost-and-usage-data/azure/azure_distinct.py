@@ -0,0 +1,57 @@
+import os
+import sys
+
+from azure_cost_cube import CUBE_DIMENSIONS, record_months
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import distinct  # noqa: E402
+from finops_common.distinct import SKETCH_VALUE_COLUMNS  # noqa: E402
+
+# Distinct-count columns and the record column each one counts
+DISTINCT_METRICS = {
+    "distinct_resources": "ResourceId",
+    "distinct_meters": "MeterId"
+}
+
+# Metrics counted exactly from a cube dimension, and the ones HyperLogLog
+# sketches estimate because the cube does not keep their values
+EXACT_METRICS, SKETCHED_METRICS = distinct.split_metrics(DISTINCT_METRICS, CUBE_DIMENSIONS)
+
+# Extra record columns the sketches are built from
+DISTINCT_RECORD_COLUMNS = list(SKETCHED_METRICS.values())
+
+# Sparse sketch table: the highest rank seen in each register of each
+# sketched metric, per cube cell. Registers never hit are not stored.
+SKETCH_COLUMNS = CUBE_DIMENSIONS + SKETCH_VALUE_COLUMNS
+
+
+def aggregate_sketches(df_records, precision=None):
+    """
+    Partial sketch table of a set of records, one sketch per cube cell and sketched metric.
+
+    Blank values are not counted. Partial tables of different chunks,
+    partitions or months merge with combine_sketches().
+    """
+    return distinct.aggregate_sketches(df_records, record_months(df_records), CUBE_DIMENSIONS,
+                                       SKETCHED_METRICS, precision)
+
+
+def combine_sketches(sketches):
+    """Merge partial sketch tables: the union of two sketches is the register-wise max"""
+    return distinct.combine_sketches(sketches, CUBE_DIMENSIONS)
+
+
+def add_distinct_counts(summary, sketches, group_columns, cube):
+    """
+    Left-join the distinct-count columns onto a summary grouped by group_columns.
+
+    Resources are counted exactly from the cube; meters are estimated from the
+    sketches. Group columns that are not cube dimensions (e.g. business_unit) are
+    looked up on the cube.
+    """
+    return distinct.add_distinct_counts(summary, sketches, group_columns, cube, CUBE_DIMENSIONS,
+                                        DISTINCT_METRICS)
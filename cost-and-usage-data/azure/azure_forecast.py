@@ -0,0 +1,75 @@
+import os
+import sys
+import pandas as pd
+
+from azure_loader import load_records, load_tags
+from azure_tag_resolver import pivot_tags, resolve_tag_attributes
+from azure_amortization import record_days
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import forecast  # noqa: E402
+
+# Record columns the daily series are built from. The project of a series
+# is the 'project' tag and the stage is the subscription. The business unit
+# is the 'business-unit' tag.
+FORECAST_RECORD_COLUMNS = [
+    "Date",
+    "SubscriptionName",
+    "ServiceName",
+    "ResourceId",
+    "Cost"
+]
+
+# Tag holding the application project of a resource, and its default
+PROJECT_TAG = ("project", "Unknown")
+
+
+def daily_cost_series(df_records, df_tags):
+    """
+    Daily cost per business unit, project tag, service and subscription.
+
+    Records are summed per day and resource first, so the tags are resolved
+    once per resource-day instead of once per row.
+
+    Returns:
+        DataFrame of date, SERIES_COLUMNS and cost
+    """
+    resources = pd.DataFrame({
+        'date': record_days(df_records['Date']),
+        'stage': df_records['SubscriptionName'].astype(object).values,
+        'service': df_records['ServiceName'].astype(object).values,
+        'ResourceId': df_records['ResourceId'].astype(object).values,
+        'cost': df_records['Cost'].to_numpy(dtype=float)
+    }).groupby(['date', 'stage', 'service', 'ResourceId'], sort=False)['cost'].sum().reset_index()
+
+    resolve_tag_attributes(resources, df_tags, attributes=["business_unit"])
+    projects = pivot_tags(df_tags, [PROJECT_TAG[0]])[PROJECT_TAG[0]]
+    resources['project'] = resources['ResourceId'].map(projects).fillna(PROJECT_TAG[1]).values
+    return resources.groupby(['date'] + forecast.SERIES_COLUMNS, sort=True)['cost'].sum().reset_index()
+
+
+def write_forecast_reports(df_records, df_tags, output_dir, settings=None):
+    """Write cost_forecast.csv and cost_forecast_summary.json"""
+    daily = daily_cost_series(df_records, df_tags)
+    return forecast.write_forecast_reports(daily, output_dir, settings)
+
+
+def main():
+    """Forecast the daily cost series of an existing output directory"""
+    output_dir = "output"
+
+    df_records = load_records(output_dir, columns=FORECAST_RECORD_COLUMNS)
+    df_tags = load_tags(output_dir, keys=[PROJECT_TAG[0], "business-unit"])
+
+    summary = write_forecast_reports(df_records, df_tags, output_dir)
+    print(f"Forecast {summary['series']} series and {summary['aggregates']} aggregates "
+          f"{summary['horizon_days']} days ahead in {summary['fit_seconds']:.2f} seconds. "
+          f"Total forecast: ${summary['total_forecast']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+import os
+import time
+import pandas as pd
+
+# pyarrow is optional; without it we fall back to the C parser and object strings
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = "pyarrow"
+    STRING_DTYPE = "string[pyarrow]"
+except ImportError:
+    CSV_ENGINE = "c"
+    STRING_DTYPE = "object"
+
+# Output files written by Azure-billing-data-generator.py
+OUTPUT_FILES = {
+    "records": "azure_cost_management_export.csv",
+    "tags": "resource_tags.csv",
+    "lifecycle": "project_lifecycle_mapping.csv",
+    "purchases": "benefit_purchases.csv"
+}
+
+# Column used for date-range filters
+USAGE_DATE_COLUMN = "Date"
+TIMESTAMP_FORMAT = "%Y-%m-%d"
+
+# Export dates, parsed once into datetimes
+RECORD_TIMESTAMP_COLUMNS = [
+    "BillingPeriodStartDate",
+    "BillingPeriodEndDate",
+    "Date"
+]
+
+# Numeric export columns
+RECORD_FLOAT_COLUMNS = [
+    "Quantity",
+    "EffectivePrice",
+    "Cost",
+    "CostInBillingCurrency",
+    "BenefitAmount"
+]
+
+# Low-cardinality export columns stored as categoricals. Subscription and
+# billing ids are kept as strings exactly as exported.
+RECORD_CATEGORY_COLUMNS = [
+    "BillingAccountId",
+    "BillingAccountName",
+    "BillingProfileId",
+    "BillingProfileName",
+    "AccountOwnerId",
+    "AccountName",
+    "SubscriptionId",
+    "SubscriptionName",
+    "Product",
+    "PartNumber",
+    "MeterId",
+    "ServiceFamily",
+    "MeterCategory",
+    "MeterSubCategory",
+    "MeterName",
+    "MeterRegion",
+    "UnitOfMeasure",
+    "CostCenter",
+    "ResourceLocation",
+    "ConsumedService",
+    "ServiceName",
+    "ServiceTier",
+    "ResourceGroupName",
+    "ResourceType",
+    "PublisherType",
+    "PublisherName",
+    "ReservationName",
+    "ProductOrderName",
+    "OfferId",
+    "BenefitName",
+    "Term",
+    "CostAllocationRuleName",
+    "Tags",
+    "ServiceInfo1",
+    "ServiceInfo2",
+    "PricingModel",
+    "ChargeType",
+    "Frequency",
+    "PricingCurrency"
+]
+
+# High-cardinality identifiers and JSON payloads. ResourceId stays a plain
+# string because the reports .map() it onto tag values.
+RECORD_STRING_COLUMNS = [
+    "ResourceId",
+    "ResourceName",
+    "ReservationId",
+    "ProductOrderId",
+    "BenefitId",
+    "AdditionalInfo"
+]
+
+TAG_DTYPES = {
+    "resource_id": "category",
+    "key": "category",
+    "value": "category"
+}
+
+# Reservation and savings plan purchases (Date is parsed as a timestamp)
+PURCHASE_DTYPES = {
+    "BillingAccountId": "category",
+    "SubscriptionId": "category",
+    "SubscriptionName": "category",
+    "ServiceName": "category",
+    "ProductOrderId": STRING_DTYPE,
+    "ProductOrderName": "category",
+    "BenefitId": STRING_DTYPE,
+    "BenefitName": "category",
+    "Term": "category",
+    "PricingModel": "category",
+    "ChargeType": "category",
+    "Frequency": "category",
+    "Quantity": "float64",
+    "Cost": "float64"
+}
+
+LIFECYCLE_DTYPES = {
+    "project_name": STRING_DTYPE,
+    "lifecycle": "category",
+    "business_unit": "category",
+    "use_case": "category",
+    "description": STRING_DTYPE,
+    "stages": STRING_DTYPE,
+    "services": STRING_DTYPE
+}
+
+
+def record_dtypes():
+    """Return the explicit dtype mapping for the export columns (timestamps excluded)"""
+    dtypes = {}
+    for col in RECORD_FLOAT_COLUMNS:
+        dtypes[col] = "float64"
+    for col in RECORD_CATEGORY_COLUMNS:
+        dtypes[col] = "category"
+    for col in RECORD_STRING_COLUMNS:
+        dtypes[col] = STRING_DTYPE
+    return dtypes
+
+
+def read_typed_csv(path, dtypes, columns=None, timestamp_columns=None,
+                   timestamp_format=None, engine=None):
+    """
+    Read one generator CSV with explicit dtypes and optional column projection.
+
+    Empty strings are kept as "" (not NaN) so the existing report functions
+    can keep comparing against "".
+    """
+    engine = engine or CSV_ENGINE
+    timestamp_columns = timestamp_columns or []
+
+    usecols = list(columns) if columns is not None else None
+    dtype = {col: kind for col, kind in dtypes.items()
+             if usecols is None or col in usecols}
+
+    # Categoricals are read as strings first: the pyarrow engine would
+    # otherwise infer integer categories for numeric-looking ids
+    category_columns = [col for col, kind in dtype.items() if kind == "category"]
+    for col in category_columns:
+        dtype[col] = STRING_DTYPE
+
+    kwargs = {}
+    if engine == "c":
+        # Round-trip parsing so costs match the pyarrow reader bit for bit
+        kwargs["float_precision"] = "round_trip"
+
+    df = pd.read_csv(
+        path,
+        engine=engine,
+        usecols=usecols,
+        dtype=dtype,
+        keep_default_na=False,
+        na_values=[],
+        **kwargs
+    )
+
+    for col in category_columns:
+        df[col] = df[col].astype("category")
+
+    # pyarrow infers ISO timestamps on its own, the C parser leaves strings
+    for col in timestamp_columns:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], format=timestamp_format, utc=True)
+
+    return df
+
+
+def filter_date_range(df, date_column, start_date=None, end_date=None):
+    """Keep rows with start_date <= date < end_date (both bounds optional)"""
+    if start_date is None and end_date is None:
+        return df
+
+    dates = df[date_column]
+    tz = dates.dt.tz
+    mask = pd.Series(True, index=df.index)
+
+    if start_date is not None:
+        mask &= dates >= date_bound(start_date, tz)
+    if end_date is not None:
+        mask &= dates < date_bound(end_date, tz)
+
+    return df[mask].reset_index(drop=True)
+
+
+def date_bound(value, tz):
+    """Turn a date-like bound into a Timestamp comparable with the date column"""
+    bound = pd.Timestamp(value)
+    if bound.tzinfo is None and tz is not None:
+        bound = bound.tz_localize(tz)
+    return bound
+
+
+def compact_categories(df):
+    """Drop categories that no longer occur after filtering"""
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].cat.remove_unused_categories()
+    return df
+
+
+def load_records(output_dir="output", columns=None, start_date=None, end_date=None,
+                 add_month=False, engine=None):
+    """
+    Load azure_cost_management_export.csv as a typed frame.
+
+    Args:
+        output_dir: Directory the generator wrote to
+        columns: Optional list of export columns to read
+        start_date: Optional inclusive lower bound on Date
+        end_date: Optional exclusive upper bound on Date
+        add_month: Add the categorical 'month' (YYYY-MM) column the reports group on
+
+    Returns:
+        DataFrame with float, categorical, string and datetime columns
+    """
+    path = os.path.join(output_dir, OUTPUT_FILES["records"])
+
+    # The date column has to be read for filtering even when not projected
+    read_columns = columns
+    filtering = start_date is not None or end_date is not None
+    if columns is not None and (filtering or add_month) and USAGE_DATE_COLUMN not in columns:
+        read_columns = list(columns) + [USAGE_DATE_COLUMN]
+
+    df = read_typed_csv(
+        path,
+        record_dtypes(),
+        columns=read_columns,
+        timestamp_columns=RECORD_TIMESTAMP_COLUMNS,
+        timestamp_format=TIMESTAMP_FORMAT,
+        engine=engine
+    )
+
+    if filtering:
+        df = filter_date_range(df, USAGE_DATE_COLUMN, start_date, end_date)
+
+    if add_month:
+        df['month'] = df[USAGE_DATE_COLUMN].dt.strftime('%Y-%m').astype("category")
+
+    if read_columns is not columns:
+        df = df.drop(columns=[USAGE_DATE_COLUMN])
+
+    return compact_categories(df)
+
+
+def load_tags(output_dir="output", keys=None, resource_ids=None, engine=None):
+    """
+    Load resource_tags.csv with categorical resource ids, keys and values.
+
+    Args:
+        keys: Optional list of tag keys to keep (e.g. ["project", "chargeback-entity"])
+        resource_ids: Optional iterable of resource ids to keep
+    """
+    path = os.path.join(output_dir, OUTPUT_FILES["tags"])
+    df = read_typed_csv(path, TAG_DTYPES, engine=engine)
+
+    if keys is not None:
+        df = df[df["key"].isin(keys)]
+    if resource_ids is not None:
+        df = df[df["resource_id"].isin(pd.unique(pd.Series(resource_ids)))]
+
+    return compact_categories(df.reset_index(drop=True))
+
+
+def load_lifecycle_mapping(output_dir="output", engine=None):
+    """Load project_lifecycle_mapping.csv"""
+    path = os.path.join(output_dir, OUTPUT_FILES["lifecycle"])
+    return read_typed_csv(path, LIFECYCLE_DTYPES, engine=engine)
+
+
+def load_purchases(output_dir="output", engine=None):
+    """Load benefit_purchases.csv, one upfront purchase per reservation or savings plan order"""
+    path = os.path.join(output_dir, OUTPUT_FILES["purchases"])
+    return read_typed_csv(path, PURCHASE_DTYPES, timestamp_columns=[USAGE_DATE_COLUMN],
+                          timestamp_format=TIMESTAMP_FORMAT, engine=engine)
+
+
+def load_outputs(output_dir="output", columns=None, start_date=None, end_date=None,
+                 tag_keys=None, engine=None):
+    """
+    Load records, tags and lifecycle mapping in one call.
+
+    Records carry the 'month' column, so the frames can go straight into
+    generate_chargeback_reports() and analyze_discount_impact().
+    Tags are restricted to the resources that survive the record filters, so
+    a one-month load does not drag the full tag table along.
+
+    Returns:
+        Tuple of (df_records, df_tags, df_lifecycle)
+    """
+    if columns is not None and "ResourceId" not in columns:
+        columns = list(columns) + ["ResourceId"]
+
+    df_records = load_records(output_dir, columns, start_date, end_date,
+                              add_month=True, engine=engine)
+
+    resource_ids = None
+    if start_date is not None or end_date is not None:
+        resource_ids = df_records["ResourceId"]
+    df_tags = load_tags(output_dir, keys=tag_keys, resource_ids=resource_ids, engine=engine)
+
+    df_lifecycle = load_lifecycle_mapping(output_dir, engine)
+
+    return df_records, df_tags, df_lifecycle
+
+
+def memory_usage_mb(df):
+    """Deep memory usage of a frame in MB"""
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+def main():
+    """Load the generator outputs and report load time and memory footprint"""
+    output_dir = "output"
+
+    start_time = time.time()
+    df_records, df_tags, df_lifecycle = load_outputs(output_dir)
+    elapsed = time.time() - start_time
+
+    print(f"Loaded outputs from {output_dir} in {elapsed:.2f} seconds ({CSV_ENGINE} engine)")
+    print(f"  {OUTPUT_FILES['records']}: {len(df_records)} rows, {memory_usage_mb(df_records):.1f} MB")
+    print(f"  {OUTPUT_FILES['tags']}: {len(df_tags)} rows, {memory_usage_mb(df_tags):.1f} MB")
+    print(f"  {OUTPUT_FILES['lifecycle']}: {len(df_lifecycle)} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import re
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+from configAzure import CONFIG
+from azure_loader import load_records, load_tags
+from azure_tag_resolver import pivot_tags
+from azure_amortization import record_days
+from azure_commitments import USAGE_CHARGE_TYPE
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import rightsizing  # noqa: E402
+
+# Tag carrying a resource's VM size, and the service catalog key listing the sizes
+SIZE_TAG = "vm-size"
+CATALOG_KEY = "vm_sizes"
+
+# Standard_<family letters><vCPUs><features>[_v<version>], e.g. Standard_D4s_v3
+VM_SIZE_PATTERN = re.compile(r"^Standard_([A-Z]+)(\d+)([a-z]*)(_v\d+)?$")
+
+# A resource is one resource id of one service in one location of one subscription
+RESOURCE_COLUMNS = ["ServiceName", "ResourceId", "SubscriptionId", "ResourceLocation"]
+
+# Record columns the usage profiles are built from
+RIGHTSIZING_RECORD_COLUMNS = ["Date", "ChargeType"] + RESOURCE_COLUMNS + ["Quantity", "Cost"]
+
+CATALOG_COLUMNS = ["ServiceName", "vm_size", "family", "capacity"]
+
+
+def vm_size(size):
+    """
+    Family and vCPU count of a VM size, e.g. ("Ds_v3", 4.0) for Standard_D4s_v3.
+
+    Returns (size, NaN) when the name does not follow the Standard_ naming.
+    """
+    match = VM_SIZE_PATTERN.match(size)
+    if not match:
+        return size, np.nan
+    letters, vcpus, features, version = match.groups()
+    return f"{letters}{features}{version or ''}", float(vcpus)
+
+
+def size_catalog(services=None):
+    """
+    VM sizes of every service with a catalog, with their family and capacity.
+
+    Capacity is the vCPU count; the price of a size is taken to be
+    proportional to it within a family.
+    """
+    return rightsizing.size_catalog(services or CONFIG["services"], CATALOG_KEY, vm_size, CATALOG_COLUMNS)
+
+
+def usage_rows(df_records, df_tags, catalog):
+    """
+    Usage charges of every resource tagged with a VM size of a catalog service.
+
+    Returns:
+        DataFrame with RESOURCE_COLUMNS, current_type, day, amount and cost
+    """
+    usage = ((df_records['ChargeType'].astype(object) == USAGE_CHARGE_TYPE) &
+             df_records['ServiceName'].astype(object).isin(catalog["ServiceName"])).to_numpy()
+
+    rows = pd.DataFrame({col: df_records[col].astype(object).to_numpy()[usage] for col in RESOURCE_COLUMNS})
+    rows['day'] = record_days(df_records['Date'])[usage]
+    rows['amount'] = df_records['Quantity'].to_numpy(dtype=float)[usage]
+    rows['cost'] = df_records['Cost'].to_numpy(dtype=float)[usage]
+
+    sizes = pivot_tags(df_tags, [SIZE_TAG]).dropna().reset_index()
+    sizes.columns = ["ResourceId", "current_type"]
+    return rows.merge(sizes, on="ResourceId", how='inner')
+
+
+def write_rightsizing_reports(df_records, df_tags, output_dir, settings=None):
+    """Write rightsizing_recommendations.csv and rightsizing_summary.json"""
+    catalog = size_catalog()
+    return rightsizing.write_rightsizing_reports(usage_rows(df_records, df_tags, catalog), RESOURCE_COLUMNS,
+                                                 catalog, output_dir, settings)
+
+
+def main():
+    """Rightsize the tagged resources of an existing output directory"""
+    output_dir = "output"
+
+    df_records = load_records(output_dir, columns=RIGHTSIZING_RECORD_COLUMNS)
+    df_tags = load_tags(output_dir, keys=[SIZE_TAG])
+    summary = write_rightsizing_reports(df_records, df_tags, output_dir)
+    print(f"Matched {summary['resources']} resources against {summary['catalog_sizes']} catalog sizes in "
+          f"{summary['sizing_seconds']:.2f} seconds. {summary['resources_downsized']} downsized and "
+          f"{summary['resources_upsized']} upsized, savings: ${summary['savings']:.2f} "
+          f"({summary['savings_percent']:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
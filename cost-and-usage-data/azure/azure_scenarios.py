@@ -0,0 +1,53 @@
+import os
+import sys
+import datetime
+
+from configAzure import CONFIG
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import scenarios  # noqa: E402
+
+
+def scenario_projects(project_names=None, daily_budget=None):
+    """
+    Projects to simulate with their lifecycle, business unit and daily budget.
+
+    Defaults to every project in CONFIG sharing the annual budget evenly, as
+    the generator splits it across the projects it picks.
+    """
+    return scenarios.scenario_projects(CONFIG, project_names, daily_budget)
+
+
+def simulate_spend(projects, start_date, num_days, settings=None, volatility_factor=0.02, spreads=None):
+    """Percentile bands of monthly and annual spend per project and business unit, around CONFIGURABLES"""
+    return scenarios.simulate_spend(projects, start_date, num_days, CONFIG["configurables"], settings,
+                                    volatility_factor, spreads)
+
+
+def write_scenario_reports(projects, start_date, num_days, output_dir, settings=None,
+                           volatility_factor=0.02, spreads=None):
+    """Write scenario_spend_by_project.csv, scenario_spend_by_business_unit.csv and scenario_summary.json"""
+    return scenarios.write_scenario_reports(projects, start_date, num_days, output_dir, CONFIG["configurables"],
+                                            settings, volatility_factor, spreads)
+
+
+def main():
+    """Simulate every project in CONFIG over the configured number of days"""
+    from azure_chunked_reports import load_generator
+
+    output_dir = "output"
+    start_date = datetime.date.today() - datetime.timedelta(days=CONFIG["number_of_days"])
+
+    summary = write_scenario_reports(scenario_projects(), start_date, CONFIG["number_of_days"], output_dir,
+                                     volatility_factor=load_generator().DATA_VOLUME_SETTINGS["volatility_factor"])
+    print(f"Simulated {summary['paths']} paths for {summary['projects']} projects in "
+          f"{summary['simulation_seconds']:.2f} seconds. Annual spend p5-p95: "
+          f"${summary['annual_spend']['p5']:.0f} - ${summary['annual_spend']['p95']:.0f}")
+
+
+if __name__ == "__main__":
+    main()
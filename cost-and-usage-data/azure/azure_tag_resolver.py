@@ -0,0 +1,58 @@
+import pandas as pd
+
+# Record column the tags are keyed on
+RESOURCE_COLUMN = "ResourceId"
+
+# Record attributes resolved from tags: column -> (tag key, default when untagged)
+TAG_ATTRIBUTES = {
+    "chargeback_entity": ("chargeback-entity", "Unallocated"),
+    "allocation_method": ("allocation-method", "direct"),
+    "business_unit": ("business-unit", "Unknown")
+}
+
+
+def pivot_tags(df_tags, keys):
+    """
+    Pivot long-format tags into one row per resource and one column per key.
+
+    When a resource carries the same key more than once the last value wins,
+    matching the dict-building loops this replaces.
+    """
+    tags = df_tags[df_tags['key'].isin(keys)]
+    tags = pd.DataFrame({
+        'resource_id': tags['resource_id'].astype(object).values,
+        'key': tags['key'].astype(object).values,
+        'value': tags['value'].astype(object).values
+    })
+    tags = tags.drop_duplicates(['resource_id', 'key'], keep='last')
+
+    wide = tags.pivot(index='resource_id', columns='key', values='value')
+    return wide.reindex(columns=list(keys))
+
+
+def resolve_tag_attributes(df_records, df_tags, attributes=None):
+    """
+    Attach tag-derived attributes to the records with a single join.
+
+    Args:
+        df_records: Cost export frame, updated in place
+        df_tags: Tags frame with resource_id, key and value columns
+        attributes: Columns from TAG_ATTRIBUTES to attach (default: all of them)
+
+    Returns:
+        df_records
+    """
+    attributes = list(attributes or TAG_ATTRIBUTES)
+
+    wide = pivot_tags(df_tags, [TAG_ATTRIBUTES[col][0] for col in attributes])
+    wide.columns = attributes
+
+    resources = pd.DataFrame({RESOURCE_COLUMN: df_records[RESOURCE_COLUMN].astype(object).values})
+    resolved = resources.merge(wide, how='left', left_on=RESOURCE_COLUMN, right_index=True,
+                               validate='many_to_one')
+
+    # Untagged resources get the defaults
+    for col in attributes:
+        df_records[col] = resolved[col].fillna(TAG_ATTRIBUTES[col][1]).values
+
+    return df_records
@@ -0,0 +1,6 @@
+"""
+Cloud-independent logic shared by the aws/, gcp/ and azure/ modules.
+
+The per-cloud modules keep their column names and import the logic from
+here, so a fix lands once for all three clouds.
+"""
@@ -0,0 +1,100 @@
+import os
+import json
+import hashlib
+import pandas as pd
+
+from finops_common.partitions import read_partition_stats
+
+MANIFEST_FILE = "_manifest.json"
+
+
+def read_manifest(store_dir):
+    """Month -> {file, sketch_file, records, cube_rows, partitions} for every stored month"""
+    path = os.path.join(store_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(store_dir, manifest):
+    """Save the manifest next to the month aggregates"""
+    os.makedirs(store_dir, exist_ok=True)
+    with open(os.path.join(store_dir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def write_store_frame(store_dir, file_name, df, file_format):
+    """Store one month aggregate as parquet or CSV, returning its file name"""
+    os.makedirs(store_dir, exist_ok=True)
+    file_name = f"{file_name}.{file_format}"
+    if file_format == "parquet":
+        df.to_parquet(os.path.join(store_dir, file_name), index=False)
+    else:
+        df.to_csv(os.path.join(store_dir, file_name), index=False)
+    return file_name
+
+
+def read_store_frame(store_dir, file_name, dtype):
+    """Load one month aggregate; dtype applies to CSV files, parquet keeps its own"""
+    path = os.path.join(store_dir, file_name)
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, dtype=dtype, keep_default_na=False, na_values=[],
+                       float_precision="round_trip")
+
+
+def remove_month(store_dir, manifest, month):
+    """Drop a month from the store and the manifest"""
+    for key in ("file", "sketch_file"):
+        path = os.path.join(store_dir, manifest[month].get(key, ""))
+        if os.path.isfile(path):
+            os.remove(path)
+    del manifest[month]
+
+
+def month_partitions(dataset_dir):
+    """
+    Group the partitions of a dataset by month, fingerprinting each partition.
+
+    The fingerprint is a hash of the partition's _stats.json sidecar, so a
+    rewritten partition changes it without reading data.
+
+    Returns:
+        Dict of month -> {"partitions": {partition path relative to dataset_dir:
+        fingerprint}, "records": row count}
+    """
+    months = {}
+    for part_dir, stats in read_partition_stats(dataset_dir):
+        month = months.setdefault(stats["month"], {"partitions": {}, "records": 0})
+        payload = json.dumps(stats, sort_keys=True).encode("utf-8")
+        month["partitions"][os.path.relpath(part_dir, dataset_dir)] = hashlib.sha1(payload).hexdigest()
+        month["records"] += stats["row_count"]
+    return months
+
+
+def plan_refresh(manifest, months):
+    """
+    Partitions each month has to read to bring the store up to date.
+
+    A month whose stored partitions are all unchanged only reads the
+    partitions added since, which are folded into its stored aggregates.
+    A month with a rewritten or removed partition, or stored without
+    sketches or partition fingerprints, is rebuilt from all its partitions.
+    Months without new partitions are left out.
+
+    Returns:
+        (dict of month -> (rebuild, partition paths to read), sorted months to remove)
+    """
+    plan = {}
+    for month, info in months.items():
+        entry = manifest.get(month, {})
+        stored = entry.get("partitions")
+        if stored is None or "sketch_file" not in entry or any(
+                info["partitions"].get(path) != fingerprint for path, fingerprint in stored.items()):
+            plan[month] = (True, sorted(info["partitions"]))
+        else:
+            added = sorted(set(info["partitions"]) - set(stored))
+            if added:
+                plan[month] = (False, added)
+    return plan, sorted(set(manifest) - set(months))
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+
+# Methods that split one shared cost across several entities
+SHARED_METHODS = ("equal", "proportional", "tiered")
+
+# Allocation settings
+ALLOCATION_SETTINGS = {
+    # Tiered allocation: marginal rate applied to each entity's monthly direct
+    # cost, as (lower bound, rate) pairs. Heavy consumers pay a lower rate on
+    # the usage above each bound.
+    "tiers": [(0, 1.0), (10000, 0.8), (50000, 0.6)]
+}
+
+
+def service_rules(services, allocation_rules):
+    """Allocation rule of each service: the first rule listing it, as the tag generator does"""
+    service_to_rule = {}
+    for rule_name, rule_data in allocation_rules.items():
+        for service in rule_data["services"]:
+            service_to_rule.setdefault(service, rule_name)
+    return pd.Series(services, dtype=object).map(service_to_rule)
+
+
+def normalize_shares(shares, resource_column):
+    """Scale fixed allocation shares to sum to 1 per resource"""
+    totals = shares.groupby(resource_column)['allocation_share'].transform('sum')
+    shares['allocation_share'] = shares['allocation_share'] / totals
+    return shares
+
+
+def tiered_usage(usage, tiers):
+    """Usage after marginal tier rates, for a whole array at once"""
+    lower = np.array([tier[0] for tier in tiers], dtype=float)
+    rates = np.array([tier[1] for tier in tiers], dtype=float)
+    upper = np.append(lower[1:], np.inf)
+    usage = np.asarray(usage, dtype=float)[:, None]
+    return (np.clip(usage - lower, 0, upper - lower) * rates).sum(axis=1)
+
+
+def entity_drivers(df, cost_column):
+    """Direct (unshared) cost per month and chargeback entity, the usage driver for splits"""
+    direct = df[~df['allocation_method'].isin(SHARED_METHODS)]
+    drivers = direct.groupby(['month', 'chargeback_entity'], observed=True)[
+        cost_column].sum().reset_index()
+    drivers.columns = ['month', 'allocated_entity', 'driver']
+    drivers['month'] = drivers['month'].astype(object)
+    drivers['allocated_entity'] = drivers['allocated_entity'].astype(object)
+    return drivers[drivers['driver'] > 0]
+
+
+def anti_join(left, right, keys):
+    """Rows of left whose keys do not occur in right"""
+    merged = left.merge(right[keys].drop_duplicates(), on=keys, how='left', indicator=True)
+    return merged[merged['_merge'] == 'left_only'].drop(columns='_merge')
+
+
+def allocation_weights(pools, drivers, allocation_rules, tiers):
+    """
+    Share of each entity in each shared cost pool (month x rule x method).
+
+    Candidates are the rule's entities that have direct cost that month; if
+    none do, every entity with direct cost that month; if there are none at
+    all, the rule's entities split equally.
+    """
+    pool_keys = ['month', 'allocation_rule', 'allocation_method']
+    rule_entities = pd.DataFrame(
+        [(rule_name, entity) for rule_name, rule_data in allocation_rules.items()
+         for entity in rule_data["entities"]],
+        columns=['allocation_rule', 'allocated_entity']).drop_duplicates()
+
+    # 1. Rule entities with usage that month
+    named = pools.merge(rule_entities, on='allocation_rule')
+    named = named.merge(drivers, on=['month', 'allocated_entity'], how='inner')
+
+    # 2. Otherwise every consuming entity that month
+    remaining = anti_join(pools, named, pool_keys)
+    consumers = remaining.merge(drivers, on='month', how='inner')
+
+    # 3. Otherwise the rule entities, equally
+    remaining = anti_join(remaining, consumers, pool_keys)
+    fallback = remaining.merge(rule_entities, on='allocation_rule').assign(driver=0.0)
+
+    candidates = pd.concat([named, consumers, fallback], ignore_index=True)
+    methods = candidates['allocation_method'].to_numpy()
+    weight = candidates['driver'].to_numpy(dtype=float, copy=True)
+    weight[methods == 'tiered'] = tiered_usage(weight[methods == 'tiered'], tiers)
+    weight[(methods == 'equal') | (weight <= 0)] = 1.0
+
+    totals = pd.Series(weight).groupby([candidates[key].values for key in pool_keys]).transform('sum')
+    candidates['allocation_share'] = weight / totals.to_numpy()
+    return candidates[pool_keys + ['allocated_entity', 'allocation_share']]
+
+
+def allocate_shared_costs(df, fixed, allocation_rules, cost_columns, resource_column, service_column,
+                          tiers=None):
+    """
+    Expand shared line items into one allocated row per receiving entity.
+
+    Direct items keep their chargeback entity with a share of 1. Items of
+    resources with fixed allocation percentages are split by them; other
+    equal/proportional/tiered items are split across the entities of their
+    service's allocation rule, proportional to each entity's direct cost that
+    month (tiered applies ALLOCATION_SETTINGS["tiers"] to it first). All
+    splits are joins, not per-row Python.
+
+    Args:
+        df: Records or cost cube with month, chargeback_entity and allocation_method
+        fixed: DataFrame of resource_column, allocated_entity and
+            allocation_share of the resources with fixed percentages
+        allocation_rules: COST_ALLOCATION_RULES of the generator
+        cost_columns: Cost columns to split
+        resource_column / service_column: Resource and service columns of df
+
+    Returns:
+        DataFrame with the input columns plus allocation_rule, allocated_entity,
+        allocation_share, and cost_columns multiplied by the share
+    """
+    tiers = tiers or ALLOCATION_SETTINGS["tiers"]
+    cost_columns = list(cost_columns)
+
+    df = df.assign(allocation_rule=service_rules(df[service_column].values, allocation_rules).values)
+
+    is_fixed = df[resource_column].isin(fixed[resource_column]).to_numpy()
+    is_pooled = (~is_fixed & df['allocation_method'].isin(SHARED_METHODS).to_numpy() &
+                 df['allocation_rule'].notna().to_numpy())
+
+    direct = df[~is_fixed & ~is_pooled].assign(
+        allocated_entity=lambda d: d['chargeback_entity'].astype(object), allocation_share=1.0)
+
+    fixed_rows = df[is_fixed].merge(fixed, on=resource_column, how='inner')
+
+    pooled = df[is_pooled]
+    pool_keys = ['month', 'allocation_rule', 'allocation_method']
+    pools = pooled[pool_keys].astype(object).drop_duplicates()
+    weights = allocation_weights(pools, entity_drivers(df, cost_columns[0]),
+                                 allocation_rules, tiers)
+    pooled_rows = pooled.astype({key: object for key in pool_keys}).merge(
+        weights, on=pool_keys, how='inner')
+
+    # Empty parts are left out so they do not affect the result dtypes
+    parts = [part for part in (direct, fixed_rows, pooled_rows) if len(part)] or [direct]
+    allocated = pd.concat(parts, ignore_index=True)
+    for col in cost_columns:
+        allocated[col] = allocated[col] * allocated['allocation_share']
+    return allocated
@@ -0,0 +1,326 @@
+import os
+import json
+import time
+import numpy as np
+import pandas as pd
+
+# Streaming anomaly detector settings. Costs are scored in log space, so the
+# weekday and month-end patterns are multiplicative offsets on the level.
+ANOMALY_SETTINGS = {
+    "level_alpha": 0.2,  # EWMA weight of a new day on the series level
+    "offset_gamma": 0.2,  # EWMA weight of a new day on its weekday / month-end offset
+    "variance_alpha": 0.05,  # EWMA weight of a new residual on the variance
+    "min_sigma": 0.05,  # Floor on the residual standard deviation (about 5%)
+    "threshold": 4.0,  # Standard deviations from the expected cost that are flagged
+    "min_cost_delta": 100.0,  # Smallest absolute cost difference worth flagging
+    "warmup_observations": 14,  # Days a series is observed before it is scored
+    "month_end_days": 3  # Last days of a month that share the month-end offset
+}
+
+# A series is the daily cost of one service in one account, keyed by the
+# cloud's (account, service) record columns. The state and anomaly tables
+# start with those keys.
+
+# Per-series state, saved between runs so new days update it incrementally.
+# Offsets of weekdays and month ends a series has not been seen on are blank.
+STATE_COLUMNS = ["level", "variance"] + [f"weekday_{day}" for day in range(7)] + [
+    "month_end", "observations", "last_date"]
+
+ANOMALY_COLUMNS = ["cost", "expected_cost", "zscore", "direction"]  # After the date and series keys
+
+# Files the detector keeps in the output directory
+ANOMALY_FILES = {
+    "anomalies": "cost_anomalies.csv",
+    "state": "anomaly_state.csv",
+    "summary": "anomaly_summary.json",
+    "validation": "anomaly_validation.json"
+}
+
+
+def day_weekdays(days):
+    """Weekday of datetime64[D] days, Monday = 0 (1970-01-01 was a Thursday)"""
+    return (days.astype(np.int64) + 3) % 7
+
+
+def day_month_ends(days, month_end_days):
+    """Whether each day is one of the last month_end_days days of its month"""
+    next_month = (days.astype('datetime64[M]') + 1).astype('datetime64[D]')
+    return (next_month - days).astype(np.int64) <= month_end_days
+
+
+def daily_series(daily, series_keys):
+    """Daily cost per series, ordered by day, from rows of the series keys, date and cost"""
+    return daily.groupby(['date'] + series_keys, sort=True)['cost'].sum().reset_index()
+
+
+def empty_state(series_keys):
+    """Detector state that has seen no series"""
+    return state_from_frame(pd.DataFrame(columns=series_keys + STATE_COLUMNS), series_keys)
+
+
+def state_from_frame(frame, series_keys):
+    """Detector state arrays from a state table (copies, as the detector updates them in place)"""
+    return {
+        "keys": frame[series_keys].astype(object).reset_index(drop=True),
+        "level": np.array(frame["level"], dtype=float),
+        "variance": np.array(frame["variance"], dtype=float),
+        "weekday": np.array(frame[[f"weekday_{day}" for day in range(7)]], dtype=float).reshape(-1, 7),
+        "month_end": np.array(frame["month_end"], dtype=float),
+        "observations": np.array(frame["observations"], dtype=np.int64),
+        "last_date": np.array(pd.to_datetime(frame["last_date"]), dtype='datetime64[D]')
+    }
+
+
+def state_frame(state):
+    """State table of the detector state, one row per series"""
+    frame = state["keys"].copy()
+    frame["level"] = state["level"]
+    frame["variance"] = state["variance"]
+    for day in range(7):
+        frame[f"weekday_{day}"] = state["weekday"][:, day]
+    frame["month_end"] = state["month_end"]
+    frame["observations"] = state["observations"]
+    frame["last_date"] = pd.to_datetime(state["last_date"]).strftime('%Y-%m-%d')
+    return frame[list(state["keys"].columns) + STATE_COLUMNS]
+
+
+def read_state(path, series_keys):
+    """Read a saved state table; floats are parsed exactly so a resumed run matches a full one"""
+    offsets = {col: [""] for col in STATE_COLUMNS if col.startswith("weekday_") or col == "month_end"}
+    return pd.read_csv(path, dtype={col: str for col in series_keys}, keep_default_na=False,
+                       na_values=offsets, float_precision='round_trip')
+
+
+def series_positions(state, keys):
+    """
+    Position of every key row in the state, adding unseen series.
+
+    Returns:
+        Tuple of (state, int64 positions aligned with keys)
+    """
+    series_keys = list(state["keys"].columns)
+    known = state["keys"].reset_index().rename(columns={"index": "position"})
+    positions = keys[series_keys].astype(object).merge(known, on=series_keys, how='left')["position"]
+
+    new_keys = keys.loc[positions.isna().to_numpy(), series_keys].astype(object).drop_duplicates()
+    if len(new_keys):
+        count = len(new_keys)
+        state = {
+            "keys": pd.concat([state["keys"], new_keys], ignore_index=True),
+            "level": np.concatenate([state["level"], np.zeros(count)]),
+            "variance": np.concatenate([state["variance"], np.zeros(count)]),
+            "weekday": np.vstack([state["weekday"], np.full((count, 7), np.nan)]),
+            "month_end": np.concatenate([state["month_end"], np.full(count, np.nan)]),
+            "observations": np.concatenate([state["observations"], np.zeros(count, dtype=np.int64)]),
+            "last_date": np.concatenate([state["last_date"], np.full(count, np.datetime64('NaT'), 'datetime64[D]')])
+        }
+        return series_positions(state, keys)
+
+    return state, positions.to_numpy(dtype=np.int64)
+
+
+def update_day(state, positions, day, costs, settings=None):
+    """
+    Score one day of costs against the state, then fold them into it.
+
+    Every step is a vector operation over the series observed that day, and
+    each series only touches its own level, variance and offsets. The first
+    time a series is seen on a weekday (or at a month end) that offset is
+    set from the day instead of being scored, and the day does not count as
+    an observation. Once a series is scored its residuals are clipped at
+    the threshold before updating, so an anomaly does not become the
+    baseline.
+
+    Returns:
+        Tuple of (flagged mask, expected cost, z-score), aligned with positions
+    """
+    settings = settings or ANOMALY_SETTINGS
+    weekday = day_weekdays(np.array([day], dtype='datetime64[D]'))[0]
+    month_end = day_month_ends(np.array([day], dtype='datetime64[D]'), settings["month_end_days"])[0]
+    values = np.log1p(np.maximum(costs, 0.0))
+
+    first = np.isnan(state["weekday"][positions]).all(axis=1)
+    level = np.where(first, values, state["level"][positions])
+    weekday_offset = state["weekday"][positions, weekday]
+    month_end_offset = state["month_end"][positions] if month_end else np.zeros(len(positions))
+
+    # Unseen offsets are set to whatever this day needs beyond the others
+    new_weekday = np.isnan(weekday_offset)
+    weekday_offset = np.where(new_weekday, values - level - np.nan_to_num(month_end_offset), weekday_offset)
+    new_month_end = np.isnan(month_end_offset)
+    month_end_offset = np.where(new_month_end, values - level - weekday_offset, month_end_offset)
+
+    expected = level + weekday_offset + month_end_offset
+    residual = values - expected
+    sigma = np.maximum(np.sqrt(state["variance"][positions]), settings["min_sigma"])
+    zscore = residual / sigma
+    expected_cost = np.expm1(expected)
+
+    learned = ~new_weekday & ~new_month_end
+    scored = learned & (state["observations"][positions] >= settings["warmup_observations"])
+    flagged = scored & (np.abs(zscore) > settings["threshold"]) & (
+        np.abs(costs - expected_cost) >= settings["min_cost_delta"])
+
+    # Fold the day in; the variance is a running mean until variance_alpha takes over
+    limit = settings["threshold"] * sigma
+    clipped = np.where(scored, np.clip(residual, -limit, limit), np.where(learned, residual, 0.0))
+    observations = state["observations"][positions] + learned
+    variance_weight = np.maximum(settings["variance_alpha"], 1.0 / np.maximum(observations, 1))
+
+    state["level"][positions] = level + settings["level_alpha"] * clipped
+    state["weekday"][positions, weekday] = weekday_offset + settings["offset_gamma"] * clipped
+    if month_end:
+        state["month_end"][positions] = month_end_offset + settings["offset_gamma"] * clipped
+    state["variance"][positions] = np.where(
+        learned, (1 - variance_weight) * state["variance"][positions] + variance_weight * clipped ** 2,
+        state["variance"][positions])
+    state["observations"][positions] = observations
+    state["last_date"][positions] = day
+
+    return flagged, expected_cost, zscore
+
+
+def detect_anomalies(state, daily, settings=None):
+    """
+    Stream daily costs through the detector, one day at a time.
+
+    Days not after the last day the state has seen are skipped, so running
+    the detector again over the same records changes nothing.
+
+    Returns:
+        Tuple of (state, DataFrame of the date, series keys and ANOMALY_COLUMNS,
+        series updates made)
+    """
+    settings = settings or ANOMALY_SETTINGS
+    if len(state["last_date"]) and not np.isnat(state["last_date"]).all():
+        last_day = state["last_date"][~np.isnat(state["last_date"])].max()
+        daily = daily[daily['date'].to_numpy().astype('datetime64[D]') > last_day]
+    daily = daily.sort_values('date', kind='stable').reset_index(drop=True)
+
+    state, positions = series_positions(state, daily)
+    days = daily['date'].to_numpy().astype('datetime64[D]')
+    costs = daily['cost'].to_numpy(dtype=float)
+    day_starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]]) if len(days) else np.array([], dtype=np.int64)
+    day_ends = np.r_[day_starts[1:], len(days)]
+
+    flagged = np.zeros(len(daily), dtype=bool)
+    expected_cost = np.zeros(len(daily))
+    zscore = np.zeros(len(daily))
+    for start, end in zip(day_starts, day_ends):
+        flagged[start:end], expected_cost[start:end], zscore[start:end] = update_day(
+            state, positions[start:end], days[start], costs[start:end], settings)
+
+    anomalies = daily[flagged].assign(expected_cost=expected_cost[flagged], zscore=zscore[flagged])
+    anomalies['direction'] = np.where(anomalies['zscore'] > 0, "spike", "drop")
+    anomalies['date'] = pd.to_datetime(anomalies['date']).dt.strftime('%Y-%m-%d')
+    columns = ["date"] + list(state["keys"].columns) + ANOMALY_COLUMNS
+    return state, anomalies[columns].reset_index(drop=True), len(daily)
+
+
+def pattern_validation(start_date, apply_lifecycle_pattern, lifecycles, series_keys, num_series=200,
+                       num_days=365, anomaly_rate=0.01, seed=0, settings=None):
+    """
+    Check the detector against the weekday and month-end patterns the generator injects.
+
+    Series are built from the generator's own apply_lifecycle_pattern() and
+    weekend reduction over every lifecycle, so the weekday and month-end
+    swings are exactly the ones in the generated data. A share of the days
+    after warm-up are then multiplied by 3 or 0.3. Flags on untouched days
+    are false positives.
+
+    Args:
+        start_date: First generated day
+        apply_lifecycle_pattern: The generator's apply_lifecycle_pattern()
+        lifecycles: Lifecycle names of the generator's CONFIGURABLES
+
+    Returns:
+        Dict of false positive rates (overall, weekend, month end) and the
+        share of injected anomalies detected
+    """
+    import random
+
+    settings = settings or ANOMALY_SETTINGS
+    random.seed(seed)
+    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
+
+    lifecycles = list(lifecycles)
+    days = np.datetime64(start_date, 'D') + np.arange(num_days)
+    weekend = day_weekdays(days) >= 5
+    costs = np.empty((num_series, num_days))
+    for series in range(num_series):
+        lifecycle = lifecycles[series % len(lifecycles)]
+        for day in range(num_days):
+            costs[series, day] = apply_lifecycle_pattern(day, num_days, lifecycle, 1.0)
+    costs *= np.where(weekend, 0.3, 1.0)[None, :] * rng.lognormal(np.log(2000), 1.0, num_series)[:, None]
+
+    injected = rng.random(costs.shape) < anomaly_rate
+    injected[:, :4 * settings["warmup_observations"]] = False
+    costs = np.where(injected, costs * np.where(rng.random(costs.shape) < 0.5, 3.0, 0.3), costs)
+
+    daily = pd.DataFrame({
+        series_keys[0]: "validation",
+        series_keys[1]: np.repeat(np.arange(num_series).astype(str), num_days).astype(object),
+        'date': np.tile(days, num_series),
+        'cost': costs.ravel()
+    })
+    _, anomalies, _ = detect_anomalies(empty_state(series_keys), daily, settings)
+
+    flagged = np.zeros(costs.shape, dtype=bool)
+    flagged[anomalies[series_keys[1]].astype(int).to_numpy(),
+            (pd.to_datetime(anomalies['date']).to_numpy().astype('datetime64[D]') - days[0]).astype(np.int64)] = True
+    clean = ~injected
+    month_end = day_month_ends(days, settings["month_end_days"])[None, :] & clean
+    return {
+        'series': int(num_series),
+        'days': int(num_days),
+        'injected_anomalies': int(injected.sum()),
+        'detected_anomalies': int((flagged & injected).sum()),
+        'detection_rate': float((flagged & injected).sum() / max(injected.sum(), 1)),
+        'false_positive_rate': float((flagged & clean).sum() / clean.sum()),
+        'weekend_false_positive_rate': float((flagged & clean & weekend[None, :]).sum() /
+                                             (clean & weekend[None, :]).sum()),
+        'month_end_false_positive_rate': float((flagged & month_end).sum() / max(month_end.sum(), 1))
+    }
+
+
+def write_anomaly_reports(daily, output_dir, series_keys, settings=None, resume=True):
+    """
+    Update the detector with new days of series costs and write its outputs.
+
+    With resume the state saved by the previous run is picked up, so only
+    days after it are scored and their anomalies appended to
+    cost_anomalies.csv. Without it the detector starts over.
+    """
+    state_path = os.path.join(output_dir, ANOMALY_FILES["state"])
+    anomalies_path = os.path.join(output_dir, ANOMALY_FILES["anomalies"])
+    incremental = resume and os.path.exists(state_path) and os.path.exists(anomalies_path)
+    if incremental:
+        state = state_from_frame(read_state(state_path, series_keys), series_keys)
+    else:
+        state = empty_state(series_keys)
+
+    start_time = time.time()
+    state, anomalies, updates = detect_anomalies(state, daily, settings)
+    elapsed = time.time() - start_time
+
+    if incremental:
+        anomalies.to_csv(anomalies_path, mode='a', header=False, index=False)
+    else:
+        anomalies.to_csv(anomalies_path, index=False)
+    state_frame(state).to_csv(state_path, index=False)
+
+    summary_stats = {
+        'series': int(len(state["keys"])),
+        'series_updates': int(updates),
+        'new_anomalies': int(len(anomalies)),
+        'spikes': int((anomalies['direction'] == "spike").sum()),
+        'drops': int((anomalies['direction'] == "drop").sum()),
+        'last_date': str(state["last_date"].max()) if len(state["last_date"]) else None,
+        'updates_per_second': float(updates / elapsed) if elapsed > 0 else 0.0
+    }
+    with open(os.path.join(output_dir, ANOMALY_FILES["summary"]), 'w') as f:
+        json.dump(summary_stats, f, indent=2)
+
+    return summary_stats
+
@@ -0,0 +1,397 @@
+import os
+import json
+import time
+import numpy as np
+import pandas as pd
+
+
+# Budget tracking settings. The annual budget runs over budget years of
+# year_days days, as calculate_daily_budget() spreads it, and each month
+# gets the share of its days.
+BUDGET_SETTINGS = {
+    "thresholds": [0.5, 0.8, 1.0],  # Shares of the period budget whose crossing is reported
+    "year_start": None,  # First day of the first budget year (default: first day of data)
+    "year_days": 365  # Days per budget year
+}
+
+# Tracked entities: org -> business unit -> project, and the columns each level keeps
+BUDGET_LEVELS = {
+    "org": [],
+    "business_unit": ["business_unit"],
+    "project": ["business_unit", "project"]
+}
+ENTITY_COLUMNS = ["level", "business_unit", "project"]
+
+# Running totals of every entity, saved between runs so new days are folded
+# in without revisiting old ones. Crossed columns count the thresholds the
+# current period's spend has already crossed.
+STATE_COLUMNS = ENTITY_COLUMNS + ["year_start", "year_to_date", "year_crossed", "month", "month_to_date",
+                                  "month_crossed", "last_date"]
+
+BURN_COLUMNS = ENTITY_COLUMNS + [
+    "month", "as_of", "month_budget", "month_to_date", "daily_burn_rate", "projected_month_end",
+    "projected_month_overrun", "annual_budget", "year_to_date", "projected_year_end", "projected_year_overrun"]
+
+CROSSING_COLUMNS = ENTITY_COLUMNS + ["period", "period_start", "threshold", "date", "spend", "budget"]
+
+# Files the tracker keeps in the output directory
+BUDGET_FILES = {
+    "burn": "budget_burn_by_month.csv",
+    "crossings": "budget_threshold_crossings.csv",
+    "state": "budget_state.csv",
+    "summary": "budget_summary.json"
+}
+
+
+def project_budgets(annual_budget, project_names, project_annual_budget=None):
+    """
+    Annual budget of each project.
+
+    Defaults to the annual budget shared evenly, as the generators split it
+    across the projects they pick.
+    """
+    project_names = list(project_names)
+    if project_annual_budget is None:
+        project_annual_budget = annual_budget / max(len(project_names), 1)
+    return {name: float(project_annual_budget) for name in project_names}
+
+
+def budget_entities(projects):
+    """
+    Entities of every level for a set of (business_unit, project) keys.
+
+    Returns:
+        Tuple of (entities DataFrame of ENTITY_COLUMNS, matrix of entities x
+        projects summing project costs into each entity, sorted projects)
+    """
+    projects = projects[["business_unit", "project"]].drop_duplicates().sort_values(
+        ["business_unit", "project"]).reset_index(drop=True)
+
+    entities = []
+    rows = []
+    for level, columns in BUDGET_LEVELS.items():
+        if columns:
+            groups = projects.groupby(columns, sort=True).indices
+        else:
+            groups = {(): np.arange(len(projects))}
+        for group, members in groups.items():
+            group = group if isinstance(group, tuple) else (group,)
+            entity = dict.fromkeys(ENTITY_COLUMNS[1:], "")
+            entity.update(zip(columns, group))
+            entities.append({"level": level, **entity})
+            row = np.zeros(len(projects))
+            row[members] = 1.0
+            rows.append(row)
+
+    aggregation = np.array(rows).reshape(len(entities), len(projects))
+    return pd.DataFrame(entities, columns=ENTITY_COLUMNS), aggregation, projects
+
+
+def entity_budgets(entities, budgets, org_budget):
+    """Annual budget of every entity: its projects' budgets, or the org budget"""
+    is_project = (entities["level"] == "project").to_numpy()
+    project_budget = entities["project"].map(budgets).fillna(0.0).to_numpy(dtype=float) * is_project
+    unit_budget = entities["business_unit"].map(
+        pd.Series(project_budget).groupby(entities["business_unit"].to_numpy()).sum()).to_numpy(dtype=float)
+    return np.select([entities["level"] == "org", entities["level"] == "business_unit"],
+                     [float(org_budget), unit_budget], project_budget)
+
+
+def empty_state():
+    """Tracker state that has seen no days"""
+    return state_from_frame(pd.DataFrame(columns=STATE_COLUMNS))
+
+
+def state_from_frame(frame):
+    """Tracker state arrays from a state table"""
+    return {
+        "entities": frame[ENTITY_COLUMNS].astype(object).fillna("").reset_index(drop=True),
+        "year_start": np.array(pd.to_datetime(frame["year_start"]), dtype='datetime64[D]'),
+        "year_to_date": np.array(frame["year_to_date"], dtype=float),
+        "year_crossed": np.array(frame["year_crossed"], dtype=np.int64),
+        "month": np.array(pd.to_datetime(frame["month"]), dtype='datetime64[M]'),
+        "month_to_date": np.array(frame["month_to_date"], dtype=float),
+        "month_crossed": np.array(frame["month_crossed"], dtype=np.int64),
+        "last_date": np.array(pd.to_datetime(frame["last_date"]), dtype='datetime64[D]')
+    }
+
+
+def state_frame(state):
+    """State table of the tracker state, one row per entity"""
+    frame = state["entities"].copy()
+    frame["year_start"] = pd.to_datetime(state["year_start"]).strftime('%Y-%m-%d')
+    frame["year_to_date"] = state["year_to_date"]
+    frame["year_crossed"] = state["year_crossed"]
+    frame["month"] = pd.to_datetime(state["month"]).strftime('%Y-%m')
+    frame["month_to_date"] = state["month_to_date"]
+    frame["month_crossed"] = state["month_crossed"]
+    frame["last_date"] = pd.to_datetime(state["last_date"]).strftime('%Y-%m-%d')
+    return frame[STATE_COLUMNS]
+
+
+def read_state(path):
+    """Read a saved state table; floats are parsed exactly so a resumed run matches a full one"""
+    return pd.read_csv(path, dtype={col: str for col in ENTITY_COLUMNS}, keep_default_na=False,
+                       float_precision='round_trip')
+
+
+def align_state(state, entities):
+    """Running totals of the state for each entity row, zero for entities it has not seen"""
+    known = state["entities"].reset_index().rename(columns={"index": "position"})
+    positions = entities.merge(known, on=ENTITY_COLUMNS, how='left')["position"]
+    seen = positions.notna().to_numpy()
+    positions = positions.fillna(0).to_numpy(dtype=np.int64)
+
+    def take(name, fill):
+        values = state[name][positions] if len(state[name]) else np.full(len(entities), fill)
+        return np.where(seen, values, fill)
+
+    return {name: take(name, 0) for name in ["year_to_date", "year_crossed", "month_to_date", "month_crossed"]}
+
+
+def period_curves(matrix, period_ids, carried, carried_crossed, budgets, thresholds):
+    """
+    Cumulative spend within each period and the thresholds it crosses.
+
+    A period is a run of days sharing a period id. Spend is the prefix sum of
+    the day columns since the period started, plus carried spend for a
+    period the state was already in (carried is zero otherwise). Each
+    threshold is reported once per period, on the first day spend reaches it.
+
+    Args:
+        matrix: entities x days daily spend
+        period_ids: Period of each day, non-decreasing
+        carried / carried_crossed: Spend and crossed thresholds already in the
+            first period, per entity
+        budgets: entities x periods budget of each period
+        thresholds: Budget shares to report
+
+    Returns:
+        Tuple of (entities x days cumulative spend, list of (entity, day,
+        threshold index) crossing arrays, thresholds crossed in the last
+        period per entity)
+    """
+    num_entities, num_days = matrix.shape
+    spend = np.zeros((num_entities, num_days))
+    crossings = []
+    starts = np.flatnonzero(np.r_[True, period_ids[1:] != period_ids[:-1]])
+    ends = np.r_[starts[1:], num_days]
+
+    for period, (start, end) in enumerate(zip(starts, ends)):
+        first = period == 0
+        offset = carried if first else np.zeros(num_entities)
+        spend[:, start:end] = np.cumsum(matrix[:, start:end], axis=1) + offset[:, None]
+
+        budget = budgets[:, period][:, None]
+        share = np.divide(spend[:, start:end], budget, out=np.zeros((num_entities, end - start)), where=budget > 0)
+        reached = (share[..., None] >= np.asarray(thresholds)).sum(axis=2)
+        initial = carried_crossed if first else np.zeros(num_entities, dtype=np.int64)
+        crossed = np.maximum.accumulate(np.maximum(reached, initial[:, None]), axis=1)
+        previous = np.column_stack([initial, crossed[:, :-1]])
+        for index in range(len(thresholds)):
+            entity, day = np.nonzero((previous <= index) & (crossed > index))
+            crossings.append((entity, day + start, np.full(len(entity), index)))
+
+    return spend, crossings, crossed[:, -1]
+
+
+def track_budget(state, daily, budgets, org_budget, settings=None):
+    """
+    Fold daily project spend into the tracker and report burn and crossings.
+
+    Spend curves are prefix sums over an entities x days matrix: one column
+    per calendar day after the last day the state has seen, business units
+    and the org summed from their projects with one matrix product. Carried
+    month-to-date and year-to-date totals seed the first period, so a day
+    appended later costs the same as any other, however long the history.
+    Burn rates are spend per elapsed calendar day of the period.
+
+    Returns:
+        Tuple of (state, burn DataFrame with BURN_COLUMNS, crossings DataFrame
+        with CROSSING_COLUMNS, days tracked)
+    """
+    settings = settings or BUDGET_SETTINGS
+    thresholds = np.asarray(settings["thresholds"], dtype=float)
+    year_days = settings["year_days"]
+
+    dates = daily['date'].to_numpy().astype('datetime64[D]')
+    last_seen = state["last_date"][~np.isnat(state["last_date"])].max() if (
+        len(state["last_date"]) and not np.isnat(state["last_date"]).all()) else None
+    if last_seen is not None:
+        daily = daily[dates > last_seen]
+        dates = dates[dates > last_seen]
+
+    projects = pd.concat([state["entities"].loc[state["entities"]["level"] == "project", ["business_unit", "project"]],
+                          daily[["business_unit", "project"]].astype(object)])
+    entities, aggregation, projects = budget_entities(projects)
+    carried = align_state(state, entities)
+    annual_budget = entity_budgets(entities, budgets, org_budget)
+
+    if not len(dates):
+        return state, pd.DataFrame(columns=BURN_COLUMNS), pd.DataFrame(columns=CROSSING_COLUMNS), 0
+
+    first_day = last_seen + 1 if last_seen is not None else dates.min()
+    days = np.arange(first_day, dates.max() + 1, dtype='datetime64[D]')
+
+    rows = daily[["business_unit", "project"]].astype(object).merge(
+        projects.reset_index(), on=["business_unit", "project"], how='left')["index"].to_numpy()
+    project_matrix = np.zeros((len(projects), len(days)))
+    np.add.at(project_matrix, (rows, (dates - days[0]).astype(np.int64)), daily['cost'].to_numpy(dtype=float))
+    matrix = aggregation @ project_matrix
+
+    # Budget years run year_days days from the configured or earliest start
+    if len(state["year_start"]) and not np.isnat(state["year_start"]).all():
+        year_origin = state["year_start"][~np.isnat(state["year_start"])].min()
+    elif settings["year_start"] is not None:
+        year_origin = np.datetime64(pd.Timestamp(settings["year_start"]).date(), 'D')
+    else:
+        year_origin = days[0]
+    year_ids = (days - year_origin).astype(np.int64) // year_days
+    months = days.astype('datetime64[M]')
+    month_ids = months.astype(np.int64)
+
+    state_year = state["year_start"][0] if len(state["year_start"]) else np.datetime64('NaT', 'D')
+    state_month = state["month"][0] if len(state["month"]) else np.datetime64('NaT', 'M')
+    continues_year = not np.isnat(state_year) and year_origin + year_ids[0] * year_days == state_year
+    continues_month = not np.isnat(state_month) and months[0] == state_month
+
+    zeros = np.zeros(len(entities))
+    no_crossings = np.zeros(len(entities), dtype=np.int64)
+    unique_years = np.unique(year_ids)
+    unique_months = np.unique(months)
+    month_days = ((unique_months + 1).astype('datetime64[D]') - unique_months.astype('datetime64[D]')).astype(np.int64)
+
+    year_budgets = np.repeat(annual_budget[:, None], len(unique_years), axis=1)
+    year_to_date, year_crossings, year_crossed = period_curves(
+        matrix, year_ids, carried["year_to_date"] if continues_year else zeros,
+        carried["year_crossed"] if continues_year else no_crossings, year_budgets, thresholds)
+    month_budgets = annual_budget[:, None] * month_days[None, :] / year_days
+    month_to_date, month_crossings, month_crossed = period_curves(
+        matrix, month_ids, carried["month_to_date"] if continues_month else zeros,
+        carried["month_crossed"] if continues_month else no_crossings, month_budgets, thresholds)
+
+    # Burn and projections as of the last tracked day of each month
+    as_of = np.r_[np.flatnonzero(months[1:] != months[:-1]), len(days) - 1]
+    day_of_month = (days[as_of] - months[as_of].astype('datetime64[D]')).astype(np.int64) + 1
+    year_start = year_origin + year_ids[as_of] * year_days
+    year_elapsed = (days[as_of] - year_start).astype(np.int64) + 1
+
+    mtd = month_to_date[:, as_of]
+    ytd = year_to_date[:, as_of]
+    burn_rate = mtd / day_of_month
+    projected_month = mtd + burn_rate * (month_days[None, :] - day_of_month)
+    projected_year = ytd + ytd / year_elapsed * (year_days - year_elapsed)
+
+    # One row per month and entity, months first
+    num_months = len(as_of)
+    burn = pd.DataFrame({col: np.tile(entities[col].to_numpy(), num_months) for col in ENTITY_COLUMNS})
+    burn["month"] = np.repeat([str(month) for month in unique_months], len(entities))
+    burn["as_of"] = np.repeat(pd.to_datetime(days[as_of]).strftime('%Y-%m-%d'), len(entities))
+    burn["month_budget"] = month_budgets.T.ravel()
+    burn["month_to_date"] = mtd.T.ravel()
+    burn["daily_burn_rate"] = burn_rate.T.ravel()
+    burn["projected_month_end"] = projected_month.T.ravel()
+    burn["projected_month_overrun"] = (projected_month - month_budgets).T.ravel()
+    burn["annual_budget"] = np.tile(annual_budget, num_months)
+    burn["year_to_date"] = ytd.T.ravel()
+    burn["projected_year_end"] = projected_year.T.ravel()
+    burn["projected_year_overrun"] = (projected_year - annual_budget[:, None]).T.ravel()
+
+    crossing_frames = []
+    for period, curves, crossings, budgets_by_period, period_index, period_starts in [
+            ("year", year_to_date, year_crossings, year_budgets, np.searchsorted(unique_years, year_ids),
+             year_origin + year_ids * year_days),
+            ("month", month_to_date, month_crossings, month_budgets, np.searchsorted(unique_months, months),
+             months.astype('datetime64[D]'))]:
+        for entity, day, index in crossings:
+            frame = entities.iloc[entity].reset_index(drop=True)
+            frame["period"] = period
+            frame["period_start"] = pd.to_datetime(period_starts[day]).strftime('%Y-%m-%d')
+            frame["threshold"] = thresholds[index]
+            frame["date"] = pd.to_datetime(days[day]).strftime('%Y-%m-%d')
+            frame["spend"] = curves[entity, day]
+            frame["budget"] = budgets_by_period[entity, period_index[day]]
+            crossing_frames.append(frame)
+    crossings = pd.concat(crossing_frames, ignore_index=True).sort_values(
+        ["date", "period", "level", "business_unit", "project", "threshold"]).reset_index(drop=True)
+
+    # Carry the last day's totals forward
+    last = len(days) - 1
+    state = {
+        "entities": entities,
+        "year_start": np.full(len(entities), year_origin + year_ids[last] * year_days),
+        "year_to_date": year_to_date[:, last],
+        "year_crossed": year_crossed,
+        "month": np.full(len(entities), months[last]),
+        "month_to_date": month_to_date[:, last],
+        "month_crossed": month_crossed,
+        "last_date": np.full(len(entities), days[last])
+    }
+
+    return state, burn[BURN_COLUMNS], crossings[CROSSING_COLUMNS], len(days)
+
+
+def merge_burn(previous, burn):
+    """Earlier monthly burn rows, with months the new rows cover replaced"""
+    previous = previous[~previous["month"].isin(burn["month"].unique())]
+    # Concatenating an empty frame is deprecated; the first run has no earlier
+    # rows and a run without new days no new ones
+    if previous.empty or burn.empty:
+        kept = burn if previous.empty else previous
+        return kept.sort_values("month", kind='stable').reset_index(drop=True)
+    return pd.concat([previous, burn], ignore_index=True).sort_values(
+        "month", kind='stable').reset_index(drop=True)
+
+
+def write_budget_reports(daily, output_dir, budgets, org_budget, settings=None, resume=True):
+    """
+    Update the budget tracker with new days of project spend and write its outputs.
+
+    With resume the state saved by the previous run is picked up, so only
+    days after it are added: their crossings are appended to the crossings
+    file and the months they touch replace the earlier burn rows.
+
+    Args:
+        daily: DataFrame of date, business_unit, project and cost, one row per
+            project and day
+        budgets: Project -> annual budget
+        org_budget: Annual budget of the org
+    """
+    state_path = os.path.join(output_dir, BUDGET_FILES["state"])
+    burn_path = os.path.join(output_dir, BUDGET_FILES["burn"])
+    crossings_path = os.path.join(output_dir, BUDGET_FILES["crossings"])
+    incremental = resume and all(os.path.exists(path) for path in [state_path, burn_path, crossings_path])
+    state = state_from_frame(read_state(state_path)) if incremental else empty_state()
+
+    start_time = time.time()
+    state, burn, crossings, days = track_budget(state, daily, budgets, org_budget, settings)
+    elapsed = time.time() - start_time
+
+    if incremental:
+        burn = merge_burn(pd.read_csv(burn_path, dtype={col: str for col in ENTITY_COLUMNS},
+                                      keep_default_na=False), burn)
+        crossings.to_csv(crossings_path, mode='a', header=False, index=False)
+    else:
+        crossings.to_csv(crossings_path, index=False)
+    burn.to_csv(burn_path, index=False)
+    state_frame(state).to_csv(state_path, index=False)
+
+    org = burn[(burn["level"] == "org") & (burn["month"] == burn["month"].max())]
+    summary_stats = {
+        'entities': int(len(state["entities"])),
+        'days_tracked': int(days),
+        'last_date': str(state["last_date"].max()) if len(state["last_date"]) else None,
+        'annual_budget': float(org["annual_budget"].iloc[0]) if len(org) else None,
+        'year_to_date': float(org["year_to_date"].iloc[0]) if len(org) else 0.0,
+        'projected_year_end': float(org["projected_year_end"].iloc[0]) if len(org) else 0.0,
+        'projected_year_overrun': float(org["projected_year_overrun"].iloc[0]) if len(org) else 0.0,
+        'new_crossings': int(len(crossings)),
+        'entities_over_annual_budget': int((burn.loc[burn["month"] == burn["month"].max(),
+                                                     "projected_year_overrun"] > 0).sum()),
+        'tracking_seconds': round(elapsed, 3)
+    }
+    with open(os.path.join(output_dir, BUDGET_FILES["summary"]), 'w') as f:
+        json.dump(summary_stats, f, indent=2)
+
+    return summary_stats
+
@@ -0,0 +1,72 @@
+import pandas as pd
+
+from finops_common.partitions import read_partition_stats
+
+# Chunked reporting settings
+CHUNK_SETTINGS = {
+    "chunk_rows": 250000,  # CSV rows read per chunk
+    "max_pending_rows": 1000000  # Partial cube rows held before they are combined
+}
+
+
+def iter_csv_chunks(path, columns, float_columns, chunk_rows=None):
+    """Yield columns of a record CSV chunk by chunk, floats for float_columns and strings otherwise"""
+    dtype = {col: "float64" if col in float_columns else object for col in columns}
+
+    reader = pd.read_csv(
+        path,
+        usecols=columns,
+        dtype=dtype,
+        keep_default_na=False,
+        na_values=[],
+        float_precision="round_trip",
+        chunksize=chunk_rows or CHUNK_SETTINGS["chunk_rows"]
+    )
+    with reader:
+        for chunk in reader:
+            yield chunk
+
+
+def iter_partition_chunks(dataset_dir, columns, read_partition):
+    """Yield columns of each record partition in turn, read with the cloud's read_partition()"""
+    for part_dir, _ in read_partition_stats(dataset_dir):
+        yield read_partition(part_dir, columns)
+
+
+def reduce_chunks(chunks, reducers, max_pending_rows=None):
+    """
+    Reduce record chunks with bounded memory.
+
+    Each chunk is reduced to partial results as soon as it is read, and the
+    partial results are combined whenever they grow past max_pending_rows,
+    so memory is bounded by one chunk plus the results rather than by the
+    number of records.
+
+    Args:
+        chunks: Iterable of record DataFrames
+        reducers: List of (aggregate, combine) pairs: aggregate(chunk) returns
+            a partial result and combine(list of partial results) merges them
+
+    Returns:
+        List with the combined result of each reducer
+    """
+    max_pending_rows = max_pending_rows or CHUNK_SETTINGS["max_pending_rows"]
+
+    pending = [[] for _ in reducers]
+    pending_rows = 0
+    for chunk in chunks:
+        for results, (aggregate, _) in zip(pending, reducers):
+            results.append(aggregate(chunk))
+            pending_rows += len(results[-1])
+
+        if pending_rows > max_pending_rows:
+            pending = [[combine(results)] for results, (_, combine) in zip(pending, reducers)]
+            pending_rows = sum(len(results[0]) for results in pending)
+
+    return [combine(results) for results, (_, combine) in zip(pending, reducers)]
+
+
+def lifecycle_business_units(df_lifecycle):
+    """Project -> business unit from the lifecycle mapping, as the generators build it from CONFIG"""
+    business_units = df_lifecycle['business_unit'].astype(object).replace("", "Unknown")
+    return dict(zip(df_lifecycle['project_name'].astype(object), business_units))
@@ -0,0 +1,170 @@
+import json
+import time
+import numpy as np
+import pandas as pd
+
+# A family is one service in one region of one account. Each cloud names
+# the (service, region, account) family columns after its record columns,
+# and the report tables start with them.
+RECOMMENDATION_COLUMNS = [
+    "discount", "periods", "on_demand_cost", "commitment", "commitment_cost", "on_demand_remaining",
+    "total_cost", "savings", "savings_percent", "coverage", "utilization"]
+
+SWEEP_COLUMNS = ["quantile", "commitment", "total_cost", "savings", "coverage", "utilization"]
+
+
+def family_matrix(rows, all_periods, family_columns):
+    """
+    Dense families x periods usage matrix from usage rows.
+
+    Args:
+        rows: DataFrame of the family columns, period and cost
+        all_periods: Sorted periods the records cover
+
+    Returns:
+        Tuple of (families DataFrame of the family columns, families x
+        periods usage matrix)
+    """
+    rows = rows.groupby(family_columns + ['period'], sort=False)['cost'].sum().reset_index()
+    families = rows[family_columns].drop_duplicates().sort_values(family_columns).reset_index(drop=True)
+
+    family_index = rows[family_columns].merge(families.reset_index(), on=family_columns, how='left')['index']
+    matrix = np.zeros((len(families), len(all_periods)))
+    matrix[family_index.to_numpy(), np.searchsorted(all_periods, rows['period'].to_numpy())] = rows['cost'].to_numpy()
+    return families, matrix
+
+
+def mapping_factors(keys, discount_mapping, family_columns):
+    """Discount mapping factor of each row's service and account, NaN where unmapped"""
+    service, account = family_columns[0], family_columns[2]
+    mapped = pd.DataFrame(
+        [(service_name, account_name, factor) for service_name, accounts in discount_mapping.items()
+         for account_name, factor in accounts.items()],
+        columns=[service, account, "factor"])
+    return keys[[service, account]].astype(str).merge(
+        mapped, on=[service, account], how='left')["factor"].to_numpy(dtype=float)
+
+
+def family_discounts(families, discount_mapping, default_discount):
+    """
+    Commitment discount of each family.
+
+    Accounts with a discount factor below 1 in the mapping get that
+    discount; every other family gets the default.
+    """
+    factors = mapping_factors(families, discount_mapping, list(families.columns))
+    return np.where(factors < 1.0, 1.0 - factors, default_discount)
+
+
+def sweep_commitments(matrix, discounts):
+    """
+    Cost, coverage and utilization of every candidate commitment level.
+
+    Total cost is piecewise linear in the commitment with breakpoints at the
+    usage values, so the best level is one of them. Each family's usage is
+    sorted once; with prefix sums of the sorted usage, the covered usage of
+    committing to the k-th smallest value is the sum of the k + 1 smallest
+    plus the commitment times the remaining periods. All levels of all
+    families are one array expression.
+
+    Returns:
+        Dict of families x periods arrays: commitment, covered, total_cost,
+        savings, coverage and utilization, one column per candidate level
+    """
+    num_families, num_periods = matrix.shape
+    ordered = np.sort(matrix, axis=1)
+    prefix = np.cumsum(ordered, axis=1)
+    total = prefix[:, -1:] if num_periods else np.zeros((num_families, 1))
+
+    remaining = num_periods - 1 - np.arange(num_periods)
+    covered = prefix + ordered * remaining
+    commitment_cost = ordered * (1.0 - discounts[:, None]) * num_periods
+    total_cost = commitment_cost + total - covered
+
+    return {
+        "commitment": ordered,
+        "covered": covered,
+        "commitment_cost": commitment_cost,
+        "total_cost": total_cost,
+        "savings": total - total_cost,
+        "coverage": np.divide(covered, total, out=np.zeros_like(covered), where=total > 0),
+        "utilization": np.divide(covered, ordered * num_periods, out=np.zeros_like(covered), where=ordered > 0)
+    }
+
+
+def recommend_commitments(families, matrix, discounts, settings):
+    """
+    Savings-maximizing commitment per family and the sweep at the usage quantiles.
+
+    A family whose best level saves nothing gets a zero commitment.
+
+    Returns:
+        Tuple of (recommendations DataFrame of the family columns and
+        RECOMMENDATION_COLUMNS, ranked by savings, sweep DataFrame of the
+        family columns and SWEEP_COLUMNS)
+    """
+    family_columns = list(families.columns)
+    num_families, num_periods = matrix.shape
+    sweep = sweep_commitments(matrix, discounts)
+    on_demand = matrix.sum(axis=1)
+    rows = np.arange(num_families)
+
+    best = np.argmax(sweep["savings"], axis=1) if num_periods else np.zeros(num_families, dtype=np.int64)
+    worthwhile = sweep["savings"][rows, best] > 0 if num_periods else np.zeros(num_families, dtype=bool)
+
+    def pick(name):
+        return np.where(worthwhile, sweep[name][rows, best], 0.0) if num_periods else np.zeros(num_families)
+
+    recommendations = families.copy()
+    recommendations["discount"] = discounts
+    recommendations["periods"] = num_periods
+    recommendations["on_demand_cost"] = on_demand
+    recommendations["commitment"] = pick("commitment")
+    recommendations["commitment_cost"] = pick("commitment_cost")
+    recommendations["on_demand_remaining"] = on_demand - pick("covered")
+    recommendations["total_cost"] = np.where(worthwhile, pick("total_cost"), on_demand)
+    recommendations["savings"] = pick("savings")
+    recommendations["savings_percent"] = np.divide(recommendations["savings"] * 100, on_demand,
+                                                   out=np.zeros(num_families), where=on_demand > 0)
+    recommendations["coverage"] = pick("coverage")
+    recommendations["utilization"] = pick("utilization")
+    recommendations = recommendations.sort_values(["savings"] + family_columns,
+                                                  ascending=[False] + [True] * len(family_columns))
+
+    quantiles = np.asarray(settings["sweep_quantiles"], dtype=float)
+    levels = np.rint(quantiles * max(num_periods - 1, 0)).astype(np.int64)
+    sweep_rows = families.loc[families.index.repeat(len(quantiles))].reset_index(drop=True)
+    sweep_rows["quantile"] = np.tile(quantiles, num_families)
+    for name in ["commitment", "total_cost", "savings", "coverage", "utilization"]:
+        sweep_rows[name] = sweep[name][:, levels].ravel() if num_periods else 0.0
+
+    return (recommendations[family_columns + RECOMMENDATION_COLUMNS].reset_index(drop=True),
+            sweep_rows[family_columns + SWEEP_COLUMNS])
+
+
+def write_commitment_reports(families, periods, matrix, discounts, output_dir, settings):
+    """Write commitment_recommendations.csv, commitment_sweep.csv and commitment_summary.json"""
+    start_time = time.time()
+    recommendations, sweep = recommend_commitments(families, matrix, discounts, settings)
+    elapsed = time.time() - start_time
+
+    recommendations.to_csv(f"{output_dir}/commitment_recommendations.csv", index=False)
+    sweep.to_csv(f"{output_dir}/commitment_sweep.csv", index=False)
+
+    on_demand = float(recommendations["on_demand_cost"].sum())
+    covered = on_demand - float(recommendations["on_demand_remaining"].sum())
+    summary_stats = {
+        'families': int(len(families)),
+        'families_with_commitment': int((recommendations["commitment"] > 0).sum()),
+        'interval': settings.get("interval", "D"),
+        'periods': int(len(periods)),
+        'on_demand_cost': on_demand,
+        'recommended_total_cost': float(recommendations["total_cost"].sum()),
+        'savings': float(recommendations["savings"].sum()),
+        'coverage': covered / on_demand if on_demand else 0.0,
+        'sweep_seconds': round(elapsed, 3)
+    }
+    with open(f"{output_dir}/commitment_summary.json", 'w') as f:
+        json.dump(summary_stats, f, indent=2)
+
+    return summary_stats
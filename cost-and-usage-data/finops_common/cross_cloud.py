@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+# Base rate and unit the generators give services that projects use but the
+# service catalog does not list
+DEFAULT_RATES = {"aws": (0.05, "Hrs"), "gcp": (0.05, "hour"), "azure": (0.05, "Hour")}
+
+# Catalog units by the quantity they measure: unit -> (quantity, amount of
+# the quantity's base unit in one unit). Units are matched case-insensitively.
+# A unit not listed here only converts to itself, so usage is never priced in
+# a unit that measures something else (asset counts at a monthly rate,
+# vCPU-seconds at an instance-hour rate).
+UNIT_QUANTITIES = {
+    # Running time of an instance, cluster, gateway or other resource
+    "hrs": ("hour", 1.0),
+    "hour": ("hour", 1.0),
+    "hours": ("hour", 1.0),
+    "clusters-hours": ("hour", 1.0),
+    "resources-hours": ("hour", 1.0),
+    "minute": ("hour", 1.0 / 60),
+    "minutes": ("hour", 1.0 / 60),
+    "buildminute": ("hour", 1.0 / 60),
+    # Compute capacity over time
+    "vcpu-seconds": ("vcpu-hour", 1.0 / 3600),
+    "vcpu-hour": ("vcpu-hour", 1.0),
+    "core-hour": ("vcpu-hour", 1.0),
+    "gb-seconds": ("gb-hour", 1.0 / 3600),
+    "gb-hour": ("gb-hour", 1.0),
+    # Stored data over time, in GB-months (1 GiB = 1.073741824 GB)
+    "gb-month": ("gb-month", 1.0),
+    "gib-month": ("gb-month", 1.073741824),
+    # Data transferred or processed, in GB
+    "mib": ("gb", 0.001048576),
+    "gb": ("gb", 1.0),
+    "gib": ("gb", 1.073741824),
+    "tib": ("gb", 1099.511627776),
+    # Monthly fees
+    "month": ("month", 1.0),
+    "months": ("month", 1.0),
+    "user-month": ("user-month", 1.0),
+    "users-month": ("user-month", 1.0),
+    # Requests and operations
+    "request": ("request", 1.0),
+    "requests": ("request", 1.0),
+    "apirequest": ("request", 1.0),
+    "1000requests": ("request", 1000.0),
+    "10000requests": ("request", 10000.0),
+    "1000 api calls": ("request", 1000.0),
+    "1000 transactions": ("request", 1000.0),
+    "operation": ("operation", 1.0),
+    "operations": ("operation", 1.0),
+    "million operations": ("operation", 1e6),
+    "1000 messages": ("message", 1000.0),
+    "million messages": ("message", 1e6)
+}
+
+
+def translation_columns(clouds):
+    """Service, unit and base rate in every cloud, then the unit factor into each other cloud"""
+    return ([f"{cloud}_{col}" for cloud in clouds for col in ["service", "unit", "base_rate"]] +
+            [f"{cloud}_unit_factor" for cloud in clouds[1:]])
+
+
+def service_catalog(services, cloud):
+    """Unit and base rate of every service of one cloud's catalog, prefixed with the cloud"""
+    rows = [(service, details.get("unit"), details.get("base_rate"))
+            for category in services.values()
+            for service, details in category.items()]
+    catalog = pd.DataFrame(rows, columns=["service", "unit", "base_rate"]).drop_duplicates("service")
+    return catalog.add_prefix(f"{cloud}_")
+
+
+def unit_quantity(unit):
+    """Quantity a unit measures and its size in the quantity's base unit"""
+    key = str(unit).strip().lower()
+    return UNIT_QUANTITIES.get(key, (key, 1.0))
+
+
+def unit_factor(source_unit, target_unit):
+    """Target units in one source unit, NaN when the two units measure different quantities"""
+    if pd.isna(source_unit) or pd.isna(target_unit):
+        return np.nan
+    source_quantity, source_size = unit_quantity(source_unit)
+    target_quantity, target_size = unit_quantity(target_unit)
+    return source_size / target_size if source_quantity == target_quantity else np.nan
+
+
+def price_translation_table(table, catalogs, clouds):
+    """
+    Add each cloud's unit and base rate, and the unit factors, to a table of equivalent services.
+
+    Services mapped to a service the target catalog does not list get the
+    generator's default rate and unit. A service whose equivalent is billed
+    in a unit measuring something else gets a NaN unit factor.
+
+    Args:
+        table: DataFrame with a {cloud}_service column per cloud, the source cloud first
+        catalogs: Cloud -> services dict of that cloud's config
+
+    Returns:
+        DataFrame with translation_columns(clouds), indexed by source service
+    """
+    for cloud in clouds:
+        table = table.merge(service_catalog(catalogs[cloud], cloud), on=f"{cloud}_service", how='left')
+        default_rate, default_unit = DEFAULT_RATES[cloud]
+        missing = table[f"{cloud}_service"].notna() & table[f"{cloud}_base_rate"].isna()
+        table.loc[missing, f"{cloud}_base_rate"] = default_rate
+        table.loc[missing, f"{cloud}_unit"] = default_unit
+
+    source = clouds[0]
+    for cloud in clouds[1:]:
+        table[f"{cloud}_unit_factor"] = [unit_factor(source_unit, target_unit) for source_unit, target_unit
+                                         in zip(table[f"{source}_unit"], table[f"{cloud}_unit"])]
+
+    return table[translation_columns(clouds)].set_index(f"{source}_service", drop=False)
+
+
+def price_lines(lines, amount, codes, table, clouds):
+    """
+    Cost of usage lines at each cloud's base rate.
+
+    Usage is converted into the target service's unit before it is priced.
+    A line whose service has no equivalent in a cloud, or an equivalent
+    billed in an incompatible unit, keeps its source cost there and is
+    counted as unmapped.
+
+    Args:
+        lines: DataFrame of the usage lines, extended in place
+        amount: Usage amount of every line, in its source service's unit
+        codes: Position of every line's service in the translation table
+    """
+    source = clouds[0]
+    lines[f"{source}_cost"] = amount * table[f"{source}_base_rate"].to_numpy(dtype=float)[codes]
+    for cloud in clouds[1:]:
+        rates = (table[f"{cloud}_base_rate"].to_numpy(dtype=float) *
+                 table[f"{cloud}_unit_factor"].to_numpy(dtype=float))
+        cost = amount * rates[codes]
+        unmapped = np.isnan(cost)
+        lines[f"{cloud}_cost"] = np.where(unmapped, lines[f"{source}_cost"], cost)
+        lines[f"{cloud}_unmapped_cost"] = np.where(unmapped, lines[f"{source}_cost"], 0.0)
+    return lines
+
+
+def comparison(lines, keys, columns):
+    """Line count, then the sum of the other columns, per keys"""
+    grouped = lines.groupby(keys, sort=True)
+    summary = grouped[columns[1:]].sum()
+    summary.insert(0, 'line_items', grouped.size())
+    return summary.reset_index()
+
+
+def unit_mismatches(by_service, source, cloud):
+    """Source services whose equivalent in cloud is billed in an incompatible unit"""
+    mismatched = by_service[f"{cloud}_service"].notna() & by_service[f"{cloud}_unit_factor"].isna()
+    return sorted(by_service.loc[mismatched, f"{source}_service"])
@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+
+# HyperLogLog settings. 2^12 registers give about 1.6% standard error; small
+# counts use linear counting instead of the raw estimate.
+HLL_SETTINGS = {
+    "precision": 12
+}
+
+# Fixed 16-byte key so registers hashed in different processes can be merged
+HLL_HASH_KEY = "finops-hll-key01"
+
+# Sketch table columns after the cube dimensions: the highest rank seen in
+# each register of each metric's sketch, per cube cell. Registers never hit
+# are not stored.
+SKETCH_VALUE_COLUMNS = ["metric", "register", "rank"]
+
+
+def bit_length(values):
+    """Bit length of each uint64, exact (split in 32-bit halves for float conversion)"""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    high_bits = np.frexp(high)[1]
+    low_bits = np.frexp(low)[1]
+    return np.where(high > 0, 32 + high_bits, low_bits)
+
+
+def hll_registers(values, precision=None):
+    """
+    Register and rank of each value in a HyperLogLog sketch.
+
+    The top precision bits of the 64-bit hash pick the register; the rank
+    is the position of the first set bit in the remaining bits.
+    """
+    precision = precision or HLL_SETTINGS["precision"]
+    hashed = pd.util.hash_array(np.asarray(values, dtype=object), hash_key=HLL_HASH_KEY)
+
+    remaining_bits = 64 - precision
+    registers = (hashed >> np.uint64(remaining_bits)).astype(np.int32)
+    remainder = hashed & np.uint64((1 << remaining_bits) - 1)
+    ranks = (remaining_bits - bit_length(remainder) + 1).astype(np.int8)
+    return registers, ranks
+
+
+def split_metrics(metrics, cube_dimensions):
+    """
+    Split distinct-count metrics into the ones the cube counts exactly and the sketched ones.
+
+    A metric whose record column is a cube dimension keeps every distinct
+    value in the cube, so it is counted there; only the others need sketches.
+    """
+    exact = {metric: column for metric, column in metrics.items() if column in cube_dimensions}
+    sketched = {metric: column for metric, column in metrics.items() if column not in cube_dimensions}
+    return exact, sketched
+
+
+def aggregate_sketches(df_records, months, cube_dimensions, metrics, precision=None):
+    """
+    Partial sketch table of a set of records, one sketch per cube cell and metric.
+
+    months holds the cube month of each record. Blank values are not
+    counted. Partial tables of different chunks, partitions or months merge
+    with combine_sketches().
+    """
+    months = np.asarray(months, dtype=object)
+    dimensions = {col: df_records[col].astype(object).to_numpy() for col in cube_dimensions[1:]}
+
+    parts = []
+    for metric, column in metrics.items():
+        values = df_records[column].astype(object).to_numpy()
+        counted = values != ""
+        registers, ranks = hll_registers(values[counted], precision)
+
+        part = pd.DataFrame({cube_dimensions[0]: months[counted]})
+        for col, dim_values in dimensions.items():
+            part[col] = dim_values[counted]
+        part["metric"] = metric
+        part["register"] = registers
+        part["rank"] = ranks
+        parts.append(part)
+
+    return combine_sketches(parts, cube_dimensions)
+
+
+def combine_sketches(sketches, cube_dimensions):
+    """Merge partial sketch tables: the union of two sketches is the register-wise max"""
+    columns = list(cube_dimensions) + SKETCH_VALUE_COLUMNS
+    sketches = [sketch[columns] for sketch in sketches if len(sketch)]
+    if not sketches:
+        return pd.DataFrame({col: pd.Series(dtype=object) for col in columns[:-2]}).assign(
+            register=pd.Series(dtype=np.int32), rank=pd.Series(dtype=np.int8))
+    return pd.concat(sketches, ignore_index=True).groupby(
+        columns[:-1], dropna=False, sort=False)["rank"].max().reset_index()
+
+
+def hll_estimate(num_registers, rank_sums, hit_registers):
+    """
+    HyperLogLog cardinality estimate, with linear counting for small sets.
+
+    Args:
+        num_registers: Registers per sketch (2^precision)
+        rank_sums: Sum of 2^-rank over the registers that were hit
+        hit_registers: Number of registers that were hit
+    """
+    empty_registers = num_registers - hit_registers
+    alpha = 0.7213 / (1 + 1.079 / num_registers)
+    raw = alpha * num_registers ** 2 / (rank_sums + empty_registers)
+
+    linear = num_registers * np.log(num_registers / np.maximum(empty_registers, 1))
+    use_linear = (raw <= 2.5 * num_registers) & (empty_registers > 0)
+    return np.where(use_linear, linear, raw)
+
+
+def distinct_counts(sketches, group_columns, cube_dimensions, metrics, cube=None, precision=None):
+    """
+    Approximate distinct counts of the sketched metrics, rolled up to group_columns.
+
+    Group columns that are not cube dimensions (e.g. business_unit) are looked up
+    on the cube rows of each cell.
+
+    Returns:
+        DataFrame of group_columns and one column per metric
+    """
+    precision = precision or HLL_SETTINGS["precision"]
+    group_columns = list(group_columns)
+    cube_dimensions = list(cube_dimensions)
+
+    extra_columns = [col for col in group_columns if col not in cube_dimensions]
+    if extra_columns:
+        cells = cube[cube_dimensions + extra_columns].astype(object).drop_duplicates(cube_dimensions)
+        sketches = sketches.merge(cells, on=cube_dimensions, how="left")
+
+    if sketches.empty:
+        return pd.DataFrame(columns=group_columns + list(metrics))
+
+    registers = sketches.groupby(group_columns + ["metric", "register"], dropna=False, sort=False)[
+        "rank"].max().reset_index()
+    registers["weight"] = np.exp2(-registers["rank"].to_numpy(dtype=float))
+
+    sums = registers.groupby(group_columns + ["metric"], dropna=False, sort=True).agg(
+        rank_sum=("weight", "sum"), hit=("register", "size")).reset_index()
+    sums["estimate"] = np.round(hll_estimate(
+        2 ** precision, sums["rank_sum"].to_numpy(), sums["hit"].to_numpy())).astype(np.int64)
+
+    counts = sums.pivot(index=group_columns, columns="metric", values="estimate")
+    counts = counts.reindex(columns=list(metrics)).fillna(0).astype(np.int64)
+    counts.columns.name = None
+    return counts.reset_index()
+
+
+def exact_distinct_counts(cube, group_columns, metrics):
+    """
+    Exact distinct counts of metrics whose column is a cube dimension, rolled up to group_columns.
+
+    Blank values are not counted.
+
+    Returns:
+        DataFrame of group_columns and one column per metric
+    """
+    group_columns = list(group_columns)
+    counts = cube[group_columns].astype(object)
+    for metric, column in metrics.items():
+        values = cube[column].astype(object)
+        counts[metric] = values.where(values != "")
+    return counts.groupby(group_columns, dropna=False, sort=True)[list(metrics)].nunique().reset_index()
+
+
+def add_distinct_counts(summary, sketches, group_columns, cube, cube_dimensions, metrics):
+    """
+    Left-join the distinct-count columns onto a summary grouped by group_columns.
+
+    Metrics whose column is a cube dimension are counted exactly from the
+    cube; the others are estimated from the sketches.
+    """
+    group_columns = list(group_columns)
+    exact, sketched = split_metrics(metrics, cube_dimensions)
+    counts = exact_distinct_counts(cube, group_columns, exact).merge(
+        distinct_counts(sketches, group_columns, cube_dimensions, sketched, cube).astype(
+            {col: object for col in group_columns}), on=group_columns, how="outer")
+
+    keys = summary[group_columns].astype(object)
+    merged = keys.merge(counts.astype({col: object for col in group_columns}), on=group_columns, how="left")
+    for metric in metrics:
+        summary[metric] = merged[metric].fillna(0).astype(np.int64).to_numpy()
+    return summary
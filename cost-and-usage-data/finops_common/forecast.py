@@ -0,0 +1,286 @@
+import json
+import time
+import warnings
+import itertools
+import numpy as np
+import pandas as pd
+
+# Forecast settings. Every series is fitted with each combination of the
+# smoothing grids at once and keeps the combination with the lowest
+# one-step-ahead squared error.
+FORECAST_SETTINGS = {
+    "horizon_days": 30,  # Days forecast past the last day of data
+    "season_length": 7,  # Weekly seasonality of daily cost
+    "alpha_grid": [0.05, 0.2, 0.5],  # Level smoothing
+    "beta_grid": [0.0, 0.05],  # Trend smoothing (0 keeps the initial trend)
+    "gamma_grid": [0.05, 0.3],  # Seasonal smoothing
+    "phi_grid": [0.9, 0.98],  # Trend damping
+    "interval_z": 1.645  # Two-sided 90% prediction interval
+}
+
+# Forecast grain: a (project, service, stage) series under a business unit.
+# Each cloud maps its records onto these columns.
+SERIES_COLUMNS = ["business_unit", "project", "service", "stage"]
+
+# Aggregate levels of the reconciliation hierarchy and the series columns
+# they keep: org -> business unit -> project -> series
+AGGREGATE_LEVELS = {
+    "org": [],
+    "business_unit": ["business_unit"],
+    "project": ["business_unit", "project"]
+}
+
+FORECAST_COLUMNS = ["level"] + SERIES_COLUMNS + ["date", "base_forecast", "forecast", "lower", "upper"]
+
+
+def series_matrix(daily):
+    """
+    Dense series x day cost matrix.
+
+    A series without cost on a day that has cost elsewhere is zero. Days
+    without any cost were not generated (the generator samples every
+    sampling_interval days) and are NaN, so the fit skips them.
+
+    Returns:
+        Tuple of (keys DataFrame of SERIES_COLUMNS, datetime64[D] days, matrix)
+    """
+    keys = daily[SERIES_COLUMNS].drop_duplicates().sort_values(SERIES_COLUMNS).reset_index(drop=True)
+    dates = daily['date'].to_numpy().astype('datetime64[D]')
+    days = np.arange(dates.min(), dates.max() + 1, dtype='datetime64[D]')
+
+    rows = daily[SERIES_COLUMNS].merge(keys.reset_index(), on=SERIES_COLUMNS, how='left')['index'].to_numpy()
+    cols = (dates - days[0]).astype(np.int64)
+    matrix = np.zeros((len(keys), len(days)))
+    np.add.at(matrix, (rows, cols), daily['cost'].to_numpy(dtype=float))
+    matrix[:, ~matrix.any(axis=0)] = np.nan
+    return keys, days, matrix
+
+
+def aggregation_matrix(keys):
+    """
+    Aggregate nodes of the hierarchy and the 0/1 matrix summing series into them.
+
+    Returns:
+        Tuple of (nodes DataFrame of level and SERIES_COLUMNS, matrix of
+        nodes x series)
+    """
+    nodes = []
+    rows = []
+    for level, columns in AGGREGATE_LEVELS.items():
+        if columns:
+            groups = keys.groupby(columns, sort=True).indices
+        else:
+            groups = {(): np.arange(len(keys))}
+        for group, members in groups.items():
+            group = group if isinstance(group, tuple) else (group,)
+            node = dict.fromkeys(SERIES_COLUMNS, "All")
+            node.update(zip(columns, group))
+            nodes.append(dict(node, level=level))
+            rows.append(members)
+
+    matrix = np.zeros((len(nodes), len(keys)))
+    for row, members in enumerate(rows):
+        matrix[row, members] = 1.0
+    return pd.DataFrame(nodes, columns=["level"] + SERIES_COLUMNS), matrix
+
+
+def fit_start_days(matrix, season_length):
+    """
+    First day each series is fitted from: its first day with cost, kept at
+    least two seasons before the end so every series can be initialised.
+    """
+    num_days = matrix.shape[1]
+    has_cost = np.nan_to_num(matrix) != 0
+    first = np.where(has_cost.any(axis=1), has_cost.argmax(axis=1), 0)
+    return np.clip(first, 0, max(num_days - 2 * season_length, 0))
+
+
+def initial_states(matrix, starts, season_length):
+    """
+    Level, trend and seasonal states from the first two seasons of each series.
+
+    Seasonal states are indexed by day % season_length, so a series that
+    starts late still shares the calendar alignment of the others. Days
+    that were not generated are left out of the means.
+    """
+    num_series = matrix.shape[0]
+    offsets = np.arange(season_length)
+    rows = np.arange(num_series)[:, None]
+    first = matrix[rows, starts[:, None] + offsets]
+    second = matrix[rows, np.minimum(starts[:, None] + season_length + offsets, matrix.shape[1] - 1)]
+
+    # Series whose first season was never generated start from zero
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        level = np.nan_to_num(np.nanmean(first, axis=1))
+        trend = np.nan_to_num((np.nanmean(second, axis=1) - level) / season_length)
+    seasonal = np.zeros((num_series, season_length))
+    seasonal[rows, (starts[:, None] + offsets) % season_length] = np.nan_to_num(first - level[:, None])
+    return level, trend, seasonal
+
+
+def fit_holt_winters(matrix, settings=None):
+    """
+    Additive damped-trend Holt-Winters (ETS A,Ad,A) fitted to every series at once.
+
+    The states of all series and all smoothing combinations are (grid x
+    series) arrays updated together, so the only Python loop is over days.
+    Each series keeps the combination with the lowest one-step-ahead
+    squared error over its fitted days. On days that were not generated
+    the states only advance by the damped trend.
+
+    Returns:
+        Dict of forecast (series x horizon), sigma, alpha, abs_error and
+        abs_actual per series
+    """
+    settings = settings or FORECAST_SETTINGS
+    num_series, num_days = matrix.shape
+    horizon = settings["horizon_days"]
+
+    # Too little history for a seasonal fit: level and trend only
+    season_length = settings["season_length"]
+    if num_days < 2 * season_length:
+        season_length = 1
+
+    grid = np.array(list(itertools.product(settings["alpha_grid"], settings["beta_grid"],
+                                           settings["gamma_grid"], settings["phi_grid"])))
+    alpha, beta, gamma, phi = (grid[:, i, None] for i in range(4))
+    if season_length == 1:
+        gamma = np.zeros_like(gamma)
+
+    starts = fit_start_days(matrix, season_length)
+    level0, trend0, seasonal0 = initial_states(matrix, starts, season_length)
+    level = np.repeat(level0[None, :], len(grid), axis=0)
+    trend = np.repeat(trend0[None, :], len(grid), axis=0)
+    seasonal = np.repeat(seasonal0[None, :, :], len(grid), axis=0)
+
+    squared_error = np.zeros_like(level)
+    abs_error = np.zeros_like(level)
+    for day in range(num_days):
+        # States start after the initialisation season of each series
+        active = (day >= starts + season_length)[None, :]
+        slot = day % season_length
+        actual = matrix[:, day][None, :]
+        damped_trend = phi * trend
+        if np.isnan(actual).all():
+            level = np.where(active, level + damped_trend, level)
+            trend = np.where(active, damped_trend, trend)
+            continue
+
+        error = actual - (level + damped_trend + seasonal[:, :, slot])
+        squared_error += np.where(active, error ** 2, 0.0)
+        abs_error += np.where(active, np.abs(error), 0.0)
+
+        new_level = alpha * (actual - seasonal[:, :, slot]) + (1 - alpha) * (level + damped_trend)
+        new_trend = beta * (new_level - level) + (1 - beta) * damped_trend
+        new_seasonal = gamma * (actual - new_level) + (1 - gamma) * seasonal[:, :, slot]
+        level = np.where(active, new_level, level)
+        trend = np.where(active, new_trend, trend)
+        seasonal[:, :, slot] = np.where(active, new_seasonal, seasonal[:, :, slot])
+
+    best = squared_error.argmin(axis=0)
+    series = np.arange(num_series)
+    level, trend, seasonal = level[best, series], trend[best, series], seasonal[best, series]
+    best_phi = phi[best, 0]
+
+    steps = np.arange(1, horizon + 1)
+    damping = np.cumsum(best_phi[:, None] ** steps[None, :], axis=1)
+    forecast = level[:, None] + damping * trend[:, None] + seasonal[:, (num_days - 1 + steps) % season_length]
+
+    fitted = (np.arange(num_days)[None, :] >= (starts + season_length)[:, None]) & ~np.isnan(matrix)
+    fitted_days = np.maximum(fitted.sum(axis=1), 1)
+    return {
+        "forecast": forecast,
+        "sigma": np.sqrt(squared_error[best, series] / fitted_days),
+        "alpha": alpha[best, 0],
+        "abs_error": abs_error[best, series],
+        "abs_actual": np.where(fitted, np.abs(np.nan_to_num(matrix)), 0.0).sum(axis=1)
+    }
+
+
+def reconcile_ols(bottom_forecast, aggregate_forecast, aggregation):
+    """
+    OLS reconciliation of base forecasts onto a coherent hierarchy.
+
+    With summing matrix S = [A; I] the reconciled series forecasts are
+    (S'S)^-1 S'y = (I + A'A)^-1 (y_series + A'y_aggregate). The Woodbury
+    identity turns the series x series inverse into an aggregate x
+    aggregate solve, which stays small for thousands of series. Negative
+    costs are clipped and aggregates re-summed from the series, so every
+    level adds up.
+
+    Returns:
+        Tuple of (series forecasts, aggregate forecasts)
+    """
+    combined = bottom_forecast + aggregation.T @ aggregate_forecast
+    inner = np.eye(len(aggregation)) + aggregation @ aggregation.T
+    reconciled = combined - aggregation.T @ np.linalg.solve(inner, aggregation @ combined)
+    reconciled = np.maximum(reconciled, 0.0)
+    return reconciled, aggregation @ reconciled
+
+
+def forecast_hierarchy(daily, settings=None):
+    """
+    Forecast every series and hierarchy aggregate, then reconcile them.
+
+    Base forecasts of the aggregates are fitted on the summed history in the
+    same batch as the series. Prediction intervals are the base forecast's
+    one-step error scaled by sqrt(1 + (h - 1) alpha^2), as for simple
+    exponential smoothing, centred on the reconciled forecast.
+
+    Returns:
+        Tuple of (DataFrame with FORECAST_COLUMNS, summary dict)
+    """
+    settings = settings or FORECAST_SETTINGS
+    keys, days, matrix = series_matrix(daily)
+    nodes, aggregation = aggregation_matrix(keys)
+
+    history = np.vstack([matrix, aggregation @ matrix])
+    fit = fit_holt_winters(history, settings)
+    base = np.maximum(fit["forecast"], 0.0)
+
+    num_series = len(keys)
+    series_forecast, aggregate_forecast = reconcile_ols(base[:num_series], base[num_series:], aggregation)
+    reconciled = np.vstack([series_forecast, aggregate_forecast])
+
+    horizon = settings["horizon_days"]
+    steps = np.arange(1, horizon + 1)
+    spread = settings["interval_z"] * fit["sigma"][:, None] * np.sqrt(
+        1 + (steps[None, :] - 1) * fit["alpha"][:, None] ** 2)
+
+    labels = pd.concat([keys.assign(level="series"), nodes], ignore_index=True)[["level"] + SERIES_COLUMNS]
+    forecast_days = days[-1] + steps.astype('timedelta64[D]')
+    forecast = labels.loc[labels.index.repeat(horizon)].reset_index(drop=True)
+    forecast['date'] = pd.to_datetime(np.tile(forecast_days, len(labels))).strftime('%Y-%m-%d')
+    forecast['base_forecast'] = base.ravel()
+    forecast['forecast'] = reconciled.ravel()
+    forecast['lower'] = np.maximum(reconciled - spread, 0.0).ravel()
+    forecast['upper'] = (reconciled + spread).ravel()
+
+    fitted_error = fit["abs_error"][:num_series].sum()
+    fitted_actual = fit["abs_actual"][:num_series].sum()
+    summary = {
+        'series': int(num_series),
+        'aggregates': int(len(nodes)),
+        'history_days': int(len(days)),
+        'horizon_days': int(horizon),
+        'first_forecast_date': str(forecast_days[0]),
+        'in_sample_wape': float(fitted_error / fitted_actual) if fitted_actual else 0.0,
+        'total_forecast': float(aggregate_forecast[0].sum()) if len(nodes) else 0.0,
+        'total_base_forecast': float(base[num_series].sum()) if len(nodes) else 0.0
+    }
+    return forecast[FORECAST_COLUMNS], summary
+
+
+def write_forecast_reports(daily, output_dir, settings=None):
+    """Write cost_forecast.csv and cost_forecast_summary.json for daily costs of SERIES_COLUMNS"""
+    start_time = time.time()
+    forecast, summary = forecast_hierarchy(daily, settings)
+    summary['fit_seconds'] = round(time.time() - start_time, 3)
+
+    forecast.to_csv(f"{output_dir}/cost_forecast.csv", index=False)
+    with open(f"{output_dir}/cost_forecast_summary.json", 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    return summary
+
@@ -0,0 +1,92 @@
+import os
+import json
+import time
+from contextlib import contextmanager
+
+# Peak RSS needs the resource module, which Windows does not have
+try:
+    import resource
+except ImportError:
+    resource = None
+
+RUN_METRICS_FILE = "run_metrics.json"
+
+STAGE_FIELDS = ["wall_seconds", "cpu_seconds", "rss_delta_mb"]
+
+
+def rss_mb():
+    """Current resident set size of this process in MB, 0.0 where it cannot be read"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (ru_maxrss is in KB on Linux)"""
+    if resource is None:
+        return 0.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def snapshot():
+    """Wall clock, CPU time and RSS of this process"""
+    return time.perf_counter(), time.process_time(), rss_mb()
+
+
+def stage_metrics(name, before, after=None, **details):
+    """Stage record of the wall time, CPU time and RSS change between two snapshots"""
+    after = after or snapshot()
+    record = {"stage": name, "pid": os.getpid()}
+    record.update(zip(STAGE_FIELDS, [round(b - a, 4) for a, b in zip(before, after)]))
+    record.update(details)
+    return record
+
+
+def start_run_metrics():
+    """Empty run metrics, started now"""
+    return {"started": snapshot(), "stages": []}
+
+
+@contextmanager
+def run_stage(metrics, name, **details):
+    """
+    Record the wall time, CPU time and RSS delta of the block as one stage.
+
+    Does nothing when metrics is None, so main() can instrument its stages
+    unconditionally and only pay for it when run metrics are switched on.
+    """
+    if metrics is None:
+        yield
+        return
+    before = snapshot()
+    try:
+        yield
+    finally:
+        metrics["stages"].append(stage_metrics(name, before, **details))
+
+
+def add_stages(metrics, stages):
+    """Add stage records measured elsewhere, e.g. in the pool workers"""
+    if metrics is not None:
+        metrics["stages"].extend(stage for stage in stages if stage)
+
+
+def write_run_metrics(metrics, output_dir):
+    """
+    Write run_metrics.json: every stage in run order and the run's totals.
+
+    The CPU time of the parent total does not include the pool workers;
+    their generation stages carry their own.
+    """
+    total = stage_metrics("total", metrics["started"])
+    run_metrics = {
+        "stages": metrics["stages"],
+        "total": {field: total[field] for field in STAGE_FIELDS},
+        "peak_rss_mb": round(peak_rss_mb(), 1)
+    }
+    path = os.path.join(output_dir, RUN_METRICS_FILE)
+    with open(path, "w") as f:
+        json.dump(run_metrics, f, indent=2)
+    return path
@@ -0,0 +1,152 @@
+import os
+import json
+import base64
+import shutil
+import numpy as np
+import pandas as pd
+
+STATS_FILE = "_stats.json"
+
+# Fixed 16-byte keys so Bloom filter bits are stable across processes
+BLOOM_HASH_KEYS = ("finops-bloom-h01", "finops-bloom-h02")
+
+
+def bloom_parameters(num_items, false_positive_rate):
+    """Optimal bit count and hash count for a Bloom filter"""
+    num_items = max(num_items, 1)
+    num_bits = int(np.ceil(-num_items * np.log(false_positive_rate) / (np.log(2) ** 2)))
+    num_bits = max(num_bits, 64)
+    num_hashes = max(1, int(round(num_bits / num_items * np.log(2))))
+    return num_bits, num_hashes
+
+
+def bloom_positions(values, num_bits, num_hashes):
+    """Bit positions for each value using double hashing (values x hashes)"""
+    values = np.asarray(values, dtype=object)
+    h1 = pd.util.hash_array(values, hash_key=BLOOM_HASH_KEYS[0])
+    h2 = pd.util.hash_array(values, hash_key=BLOOM_HASH_KEYS[1]) | np.uint64(1)
+    steps = np.arange(num_hashes, dtype=np.uint64)
+    return (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(num_bits)
+
+
+def build_bloom_filter(values, false_positive_rate=0.01):
+    """
+    Build a Bloom filter over distinct values.
+
+    Returns:
+        Dict with num_bits, num_hashes and the bit array as base64, ready for JSON
+    """
+    values = pd.unique(pd.Series(values, dtype=object))
+    values = values[values != ""]
+    num_bits, num_hashes = bloom_parameters(len(values), false_positive_rate)
+
+    bits = np.zeros(num_bits, dtype=bool)
+    if len(values):
+        bits[bloom_positions(values, num_bits, num_hashes).ravel()] = True
+
+    return {
+        "num_bits": num_bits,
+        "num_hashes": num_hashes,
+        "num_items": int(len(values)),
+        "bits": base64.b64encode(np.packbits(bits).tobytes()).decode("ascii")
+    }
+
+
+def bloom_might_contain(bloom, values):
+    """True if any of the values may be in the filter (False means definitely not)"""
+    values = [values] if isinstance(values, str) else list(values)
+    if not values:
+        return False
+    packed = np.frombuffer(base64.b64decode(bloom["bits"]), dtype=np.uint8)
+    bits = np.unpackbits(packed)[:bloom["num_bits"]].astype(bool)
+    positions = bloom_positions(values, bloom["num_bits"], bloom["num_hashes"])
+    return bool(bits[positions].all(axis=1).any())
+
+
+def sorted_distinct(series):
+    """Sorted list of distinct non-empty values, as plain strings"""
+    values = pd.unique(series.astype(object))
+    return sorted(str(v) for v in values if v != "" and not pd.isna(v))
+
+
+def replace_dataset(staging_dir, dataset_dir):
+    """
+    Swap a freshly written dataset in for dataset_dir.
+
+    Partitions of an earlier run are removed with it, so readers never mix
+    partitions of two runs. The old directory is only deleted once the new
+    one is in place.
+    """
+    old_dir = f"{dataset_dir}.old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(dataset_dir):
+        os.rename(dataset_dir, old_dir)
+    os.makedirs(staging_dir, exist_ok=True)
+    os.rename(staging_dir, dataset_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def read_partition_stats(dataset_dir):
+    """List (partition_dir, stats) for every partition under dataset_dir"""
+    partitions = []
+    for root, _, files in os.walk(dataset_dir):
+        if STATS_FILE in files:
+            with open(os.path.join(root, STATS_FILE)) as f:
+                partitions.append((root, json.load(f)))
+    return sorted(partitions, key=lambda item: item[0])
+
+
+def as_list(value):
+    """Accept a single value or an iterable of values"""
+    if value is None:
+        return None
+    return [value] if isinstance(value, str) else list(value)
+
+
+def date_bound(value, tz):
+    """Turn a date-like bound into a Timestamp comparable with the sidecar dates"""
+    bound = pd.Timestamp(value)
+    if bound.tzinfo is None and tz is not None:
+        bound = bound.tz_localize(tz)
+    return bound
+
+
+def partition_matches(stats, start_date=None, end_date=None, values=None, blooms=None):
+    """
+    Decide from the sidecar alone whether a partition can hold matching rows.
+
+    Dates are half-open [start_date, end_date) like the loader filters.
+
+    Args:
+        stats: Sidecar of the partition
+        values: Wanted values per sidecar value list, e.g. {"services": ["EC2"]}.
+            A tuple of lists matches on any of them; lists the sidecar does not
+            have never prune. None means no filter.
+        blooms: Wanted values per sidecar Bloom filter, e.g. {"resource_bloom": ids}
+    """
+    # Sidecar dates carry an offset only if the source timestamps did
+    min_date = pd.Timestamp(stats["min_usage_date"])
+    max_date = pd.Timestamp(stats["max_usage_date"])
+    if start_date is not None and max_date < date_bound(start_date, max_date.tz):
+        return False
+    if end_date is not None and min_date >= date_bound(end_date, min_date.tz):
+        return False
+
+    for keys, wanted in (values or {}).items():
+        wanted = as_list(wanted)
+        keys = [key for key in as_list(keys) if key in stats]
+        if wanted is not None and keys and not set(wanted) & {v for key in keys for v in stats[key]}:
+            return False
+
+    for key, wanted in (blooms or {}).items():
+        wanted = as_list(wanted)
+        if wanted is not None and not bloom_might_contain(stats[key], wanted):
+            return False
+
+    return True
+
+
+def prune_partitions(dataset_dir, matches, **filters):
+    """Partition directories whose sidecar passes matches(stats, **filters)"""
+    return [part_dir for part_dir, stats in read_partition_stats(dataset_dir)
+            if matches(stats, **filters)]
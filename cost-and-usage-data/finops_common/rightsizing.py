@@ -0,0 +1,158 @@
+import json
+import time
+import numpy as np
+import pandas as pd
+
+# Rightsizing settings. A resource's load on a day is its usage over the
+# capacity its current size provides in a day.
+RIGHTSIZING_SETTINGS = {
+    "load_quantile": 0.95,  # Daily load quantile the recommended size must fit
+    "min_days": 7  # Resources with usage on fewer days are not sized
+}
+
+# Sized services bill usage in hours at the rate of one unit of capacity, so
+# a size provides its capacity times this many usage hours a day
+HOURS_PER_DAY = 24.0
+
+# A resource is one resource of one service in one region of one account.
+# Each cloud names the resource columns after its record columns, and the
+# recommendation table starts with them. The catalog's service and size
+# columns are named after the cloud's service column and size name.
+RECOMMENDATION_COLUMNS = [
+    "current_type", "recommended_type", "current_capacity", "recommended_capacity", "days", "load",
+    "cost", "projected_cost", "savings", "savings_percent"]
+
+
+def size_catalog(services, catalog_key, parse_size, catalog_columns):
+    """
+    Sizes of every service with a catalog, with their family and capacity.
+
+    Price is taken to be proportional to capacity within a family.
+
+    Args:
+        services: Services dict of a cloud's config
+        catalog_key: Service key listing the sizes
+        parse_size: Function of a size name returning (family, capacity),
+            with a NaN capacity for names it cannot parse
+        catalog_columns: Service, size, family and capacity column names
+    """
+    rows = [(service, size) + parse_size(size)
+            for category in services.values()
+            for service, details in category.items()
+            for size in details.get(catalog_key) or []]
+    catalog = pd.DataFrame(rows, columns=catalog_columns)
+    return catalog[catalog["capacity"].notna()].drop_duplicates(catalog_columns[:2]).reset_index(drop=True)
+
+
+def usage_profiles(rows, resource_columns, catalog, settings=None):
+    """
+    Load profile of every resource with a catalog size.
+
+    Usage is summed per resource and day, over the days it has usage. The
+    load of a day is that usage over the HOURS_PER_DAY * current capacity a
+    day of the current size provides, and the profile keeps the
+    load_quantile of the daily loads. A load above 1 is more than the
+    current size provides.
+
+    Args:
+        rows: DataFrame of the resource columns, current_type, day, usage
+            amount in hours and cost of every usage row
+        catalog: DataFrame of service, size, family and capacity, as
+            size_catalog() builds it
+
+    Returns:
+        DataFrame with the resource columns, current_type, days, cost, load,
+        family and current_capacity
+    """
+    settings = settings or RIGHTSIZING_SETTINGS
+    service_column, size_column = catalog.columns[:2]
+    keys = resource_columns + ['current_type']
+
+    daily = rows.groupby(keys + ['day'], sort=False)[['amount', 'cost']].sum()
+    daily = daily[daily['amount'] > 0].reset_index()
+
+    grouped = daily.groupby(keys)
+    resources = grouped.agg(days=('day', 'size'), cost=('cost', 'sum')).reset_index()
+    resources['usage'] = grouped['amount'].quantile(settings["load_quantile"]).to_numpy()
+    resources = resources[resources['days'] >= settings["min_days"]]
+
+    resources = resources.merge(
+        catalog.rename(columns={size_column: "current_type", "capacity": "current_capacity"}),
+        on=[service_column, "current_type"], how='inner')
+    resources['load'] = resources['usage'] / (HOURS_PER_DAY * resources['current_capacity'])
+    return resources.drop(columns='usage').reset_index(drop=True)
+
+
+def recommend_sizes(resources, catalog, resource_columns):
+    """
+    Cheapest catalog size of the same service and family that fits each resource's load.
+
+    Every resource is matched against every catalog entry at once: entries
+    of another service or family, or smaller than the capacity the load
+    needs, are priced at infinity and the argmin over the rest is the
+    recommendation. A resource whose load no size of its family fits runs
+    as several instances, which billing data cannot tell apart, and keeps
+    its current size.
+
+    Returns:
+        DataFrame with the resource columns and RECOMMENDATION_COLUMNS,
+        ranked by savings
+    """
+    service_column, size_column = catalog.columns[:2]
+    required = resources["current_capacity"].to_numpy(dtype=float) * resources["load"].to_numpy(dtype=float)
+    capacity = catalog["capacity"].to_numpy(dtype=float)
+
+    fits = (resources[service_column].to_numpy(dtype=object)[:, None] ==
+            catalog[service_column].to_numpy(dtype=object)[None, :])
+    fits &= resources["family"].to_numpy(dtype=object)[:, None] == catalog["family"].to_numpy(dtype=object)[None, :]
+    fits &= capacity[None, :] >= required[:, None]
+    best = np.argmin(np.where(fits, capacity[None, :], np.inf), axis=1) if len(catalog) else \
+        np.zeros(len(resources), dtype=np.int64)
+    sized = fits.any(axis=1)
+
+    recommendations = resources.copy()
+    recommendations["recommended_type"] = np.where(
+        sized, catalog[size_column].to_numpy(dtype=object)[best], resources["current_type"].to_numpy(dtype=object))
+    recommendations["recommended_capacity"] = np.where(
+        sized, capacity[best], resources["current_capacity"].to_numpy(dtype=float))
+    ratio = recommendations["recommended_capacity"] / recommendations["current_capacity"]
+    recommendations["projected_cost"] = recommendations["cost"] * ratio
+    recommendations["savings"] = recommendations["cost"] - recommendations["projected_cost"]
+    cost = recommendations["cost"].to_numpy(dtype=float)
+    recommendations["savings_percent"] = np.divide(recommendations["savings"].to_numpy(dtype=float) * 100, cost,
+                                                   out=np.zeros(len(cost)), where=cost > 0)
+    recommendations = recommendations.sort_values(["savings"] + resource_columns,
+                                                  ascending=[False] + [True] * len(resource_columns))
+    return recommendations[resource_columns + RECOMMENDATION_COLUMNS].reset_index(drop=True)
+
+
+def write_rightsizing_reports(rows, resource_columns, catalog, output_dir, settings=None):
+    """Write rightsizing_recommendations.csv and rightsizing_summary.json from usage rows"""
+    settings = settings or RIGHTSIZING_SETTINGS
+
+    start_time = time.time()
+    resources = usage_profiles(rows, resource_columns, catalog, settings)
+    recommendations = recommend_sizes(resources, catalog, resource_columns)
+    elapsed = time.time() - start_time
+
+    recommendations.to_csv(f"{output_dir}/rightsizing_recommendations.csv", index=False)
+
+    cost = float(recommendations["cost"].sum())
+    change = recommendations["recommended_capacity"] - recommendations["current_capacity"]
+    summary_stats = {
+        'resources': int(len(recommendations)),
+        'resources_resized': int((recommendations["recommended_type"] != recommendations["current_type"]).sum()),
+        'resources_downsized': int((change < 0).sum()),
+        'resources_upsized': int((change > 0).sum()),
+        'catalog_sizes': int(len(catalog)),
+        'load_quantile': settings["load_quantile"],
+        'cost': cost,
+        'projected_cost': float(recommendations["projected_cost"].sum()),
+        'savings': float(recommendations["savings"].sum()),
+        'savings_percent': float(recommendations["savings"].sum()) * 100 / cost if cost else 0.0,
+        'sizing_seconds': round(elapsed, 3)
+    }
+    with open(f"{output_dir}/rightsizing_summary.json", 'w') as f:
+        json.dump(summary_stats, f, indent=2)
+
+    return summary_stats
@@ -0,0 +1,235 @@
+import json
+import time
+import numpy as np
+import pandas as pd
+
+# Monte Carlo settings
+SCENARIO_SETTINGS = {
+    "paths": 10000,  # Simulated budget trajectories per lifecycle
+    "percentiles": [5, 25, 50, 75, 95],  # Spend bands reported
+    "seed": 0
+}
+
+# How far each path's parameters stray from CONFIGURABLES and the
+# generator's volatility_factor
+PARAMETER_SPREADS = {
+    "usage_growth_rate": 0.0005,  # Std. dev. of the daily growth rate around its configured value
+    "sunset_decline_rate": 0.0005,  # Std. dev. of the daily decline rate after sunset
+    "sunset_start_day_ratio": 0.1,  # Half-width of the uniform range around the configured ratio
+    "peak_plateau_start_day_ratio": 0.1,  # Half-width of the uniform range around the configured ratio
+    "peak_plateau_duration_ratio": 0.1,  # Half-width of the uniform range around the configured ratio
+    "volatility_factor": 0.5  # Volatility is scaled by a uniform factor in [1 - 0.5, 1 + 0.5]
+}
+
+# Weekly pattern of apply_lifecycle_pattern: uniform multiplier range per
+# weekday (Monday = 0), and the generator's weekend budget reduction
+WEEKDAY_RANGES = [(0.9, 1.0), (1.0, 1.1), (1.0, 1.1), (1.0, 1.1), (0.9, 1.0), (0.7, 0.9), (0.7, 0.9)]
+WEEKEND_REDUCTION = 0.3
+
+# Month-end batch spike over the last MONTH_END_DAYS days of each month
+MONTH_END_RANGE = (1.1, 1.25)
+MONTH_END_DAYS = 3
+
+
+def scenario_projects(config, project_names=None, daily_budget=None):
+    """
+    Projects to simulate with their lifecycle, business unit and daily budget.
+
+    Defaults to every project in config sharing the annual budget evenly, as
+    the generator splits it across the projects it picks.
+    """
+    project_names = list(project_names or config["projects"])
+    if daily_budget is None:
+        daily_budget = config["annual_budget"] / 365.0 / max(len(project_names), 1)
+
+    projects = [config["projects"].get(name, {}) for name in project_names]
+    return pd.DataFrame({
+        "project": project_names,
+        "business_unit": [project.get("business_unit", "Unknown") for project in projects],
+        "lifecycle": [project.get("lifecycle", "unknown") for project in projects],
+        "daily_budget": float(daily_budget)
+    })
+
+
+def sample_parameters(lifecycle, num_paths, volatility_factor, rng, configurables, spreads=None):
+    """Lifecycle parameters of every path, drawn around the config's CONFIGURABLES"""
+    spreads = spreads or PARAMETER_SPREADS
+
+    def ratio(name):
+        value = configurables[name]
+        return np.clip(rng.uniform(value - spreads[name], value + spreads[name], num_paths), 0.0, 1.0)
+
+    growth_rate = configurables["usage_growth_rate"].get(lifecycle, 1.0)
+    return {
+        "growth_rate": rng.normal(growth_rate, spreads["usage_growth_rate"], num_paths),
+        "decline_rate": rng.normal(configurables["sunset_decline_rate"], spreads["sunset_decline_rate"], num_paths),
+        "sunset_start": ratio("sunset_start_day_ratio"),
+        "plateau_start": ratio("peak_plateau_start_day_ratio"),
+        "plateau_duration": ratio("peak_plateau_duration_ratio"),
+        "volatility": volatility_factor * rng.uniform(
+            1 - spreads["volatility_factor"], 1 + spreads["volatility_factor"], num_paths)
+    }
+
+
+def calendar_days(start_date, num_days):
+    """Simulated days as datetime64[D], starting at start_date"""
+    return np.datetime64(pd.Timestamp(start_date).date(), 'D') + np.arange(num_days)
+
+
+def lifecycle_trajectories(lifecycle, params, days, rng):
+    """
+    Daily spend factor of every path at unit budget (paths x days).
+
+    A vectorized apply_lifecycle_pattern(): the same lifecycle shapes,
+    volatility, weekday and month-end multipliers, with each path using its
+    own parameters, plus the weekend reduction the generator applies on top.
+    """
+    num_paths, num_days = len(params["growth_rate"]), len(days)
+    day_index = np.arange(num_days)[None, :]
+    growth = np.log(np.maximum(params["growth_rate"], 1e-9))[:, None]
+
+    if lifecycle in ("growing", "declining"):
+        pattern = np.exp(growth * day_index)
+    elif lifecycle == "growing_then_sunset":
+        sunset_day = (num_days * params["sunset_start"]).astype(np.int64)[:, None]
+        decline = np.log(np.maximum(params["decline_rate"], 1e-9))[:, None]
+        pattern = np.exp(np.where(day_index < sunset_day, growth * day_index,
+                                  growth * sunset_day + decline * (day_index - sunset_day)))
+    elif lifecycle == "just_started":
+        pattern = 0.1 * np.exp(2 * growth * day_index)
+    elif lifecycle == "steady_state":
+        pattern = np.exp(growth * day_index) * (0.95 + 0.1 * rng.random((num_paths, num_days)))
+    elif lifecycle == "peak_and_plateau":
+        plateau_start = (num_days * params["plateau_start"]).astype(np.int64)[:, None]
+        plateau_end = plateau_start + (num_days * params["plateau_duration"]).astype(np.int64)[:, None]
+        peak = np.exp(growth * plateau_start)
+        pattern = np.where(
+            day_index < plateau_start, np.exp(growth * day_index),
+            np.where(day_index <= plateau_end, peak * (0.98 + 0.04 * rng.random((num_paths, num_days))),
+                     peak * 0.999 ** (day_index - plateau_end)))
+    else:
+        pattern = np.ones((num_paths, num_days))
+
+    volatility = params["volatility"][:, None]
+    pattern *= 1.0 + volatility * rng.uniform(-1.0, 1.0, (num_paths, num_days))
+
+    weekdays = (days.astype(np.int64) + 3) % 7
+    low, high = np.array(WEEKDAY_RANGES)[weekdays].T
+    pattern *= low + (high - low) * rng.random((num_paths, num_days))
+    pattern *= np.where(weekdays >= 5, WEEKEND_REDUCTION, 1.0)
+
+    next_month = (days.astype('datetime64[M]') + 1).astype('datetime64[D]')
+    month_end = (next_month - days).astype(np.int64) <= MONTH_END_DAYS
+    spike = rng.uniform(*MONTH_END_RANGE, (num_paths, num_days))
+    pattern *= np.where(month_end, spike, 1.0)
+    return pattern
+
+
+def monthly_pools(lifecycles, days, configurables, settings=None, volatility_factor=0.02, spreads=None,
+                  rng=None):
+    """
+    Monthly spend of every path of every lifecycle, at unit daily budget.
+
+    Returns:
+        Tuple of (YYYY-MM month labels, dict of lifecycle -> paths x months)
+    """
+    settings = settings or SCENARIO_SETTINGS
+    rng = rng or np.random.default_rng(settings["seed"])
+
+    months = days.astype('datetime64[M]')
+    month_starts = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+    labels = [str(month) for month in months[month_starts]]
+
+    pools = {}
+    for lifecycle in sorted(set(lifecycles)):
+        params = sample_parameters(lifecycle, settings["paths"], volatility_factor, rng, configurables, spreads)
+        trajectories = lifecycle_trajectories(lifecycle, params, days, rng)
+        pools[lifecycle] = np.add.reduceat(trajectories, month_starts, axis=1)
+    return labels, pools
+
+
+def spend_bands(spend, percentiles):
+    """Mean and percentiles over paths of each column of a paths x periods array"""
+    return np.vstack([spend.mean(axis=0), np.percentile(spend, percentiles, axis=0)]).T
+
+
+def simulate_spend(projects, start_date, num_days, configurables, settings=None, volatility_factor=0.02,
+                   spreads=None):
+    """
+    Percentile bands of monthly and annual spend per project and business unit.
+
+    Paths are simulated once per lifecycle at unit budget. Each project
+    scales its lifecycle's paths by its daily budget in a random order of
+    its own, so projects vary independently and business unit totals are
+    sums of independent draws, without a projects x paths x days array.
+    Annual spend is the simulated total scaled to 365 days.
+
+    Returns:
+        Tuple of (project bands, business unit bands, org bands), each a
+        DataFrame with a period column (YYYY-MM or 'annual'), the mean and
+        one pN column per percentile
+    """
+    settings = settings or SCENARIO_SETTINGS
+    rng = np.random.default_rng(settings["seed"])
+    days = calendar_days(start_date, num_days)
+    labels, pools = monthly_pools(projects["lifecycle"], days, configurables, settings, volatility_factor,
+                                  spreads, rng)
+    periods = labels + ["annual"]
+    percentiles = settings["percentiles"]
+    band_columns = ["mean"] + [f"p{p}" for p in percentiles]
+
+    def with_annual(monthly):
+        return np.column_stack([monthly, monthly.sum(axis=1) * 365.0 / num_days])
+
+    project_rows = []
+    unit_totals = {}
+    for project in projects.itertuples(index=False):
+        pool = pools[project.lifecycle]
+        spend = pool[rng.permutation(len(pool))] * project.daily_budget
+        unit_totals[project.business_unit] = unit_totals.get(project.business_unit, 0.0) + spend
+
+        bands = pd.DataFrame(spend_bands(with_annual(spend), percentiles), columns=band_columns)
+        project_rows.append(bands.assign(project=project.project, business_unit=project.business_unit,
+                                         lifecycle=project.lifecycle, period=periods))
+
+    unit_rows = [pd.DataFrame(spend_bands(with_annual(spend), percentiles), columns=band_columns).assign(
+        business_unit=unit, period=periods) for unit, spend in sorted(unit_totals.items())]
+    org_spend = sum(unit_totals.values()) if unit_totals else np.zeros((settings["paths"], len(labels)))
+    org = pd.DataFrame(spend_bands(with_annual(org_spend), percentiles), columns=band_columns).assign(
+        period=periods)
+
+    project_bands = pd.concat(project_rows, ignore_index=True) if project_rows else pd.DataFrame(
+        columns=["project", "business_unit", "lifecycle", "period"] + band_columns)
+    unit_bands = pd.concat(unit_rows, ignore_index=True) if unit_rows else pd.DataFrame(
+        columns=["business_unit", "period"] + band_columns)
+    return (project_bands[["project", "business_unit", "lifecycle", "period"] + band_columns],
+            unit_bands[["business_unit", "period"] + band_columns],
+            org[["period"] + band_columns])
+
+
+def write_scenario_reports(projects, start_date, num_days, output_dir, configurables, settings=None,
+                           volatility_factor=0.02, spreads=None):
+    """Write scenario_spend_by_project.csv, scenario_spend_by_business_unit.csv and scenario_summary.json"""
+    settings = settings or SCENARIO_SETTINGS
+    start_time = time.time()
+    project_bands, unit_bands, org = simulate_spend(projects, start_date, num_days, configurables,
+                                                     settings, volatility_factor, spreads)
+    elapsed = time.time() - start_time
+
+    project_bands.to_csv(f"{output_dir}/scenario_spend_by_project.csv", index=False)
+    unit_bands.to_csv(f"{output_dir}/scenario_spend_by_business_unit.csv", index=False)
+
+    annual = org[org["period"] == "annual"].iloc[0]
+    summary_stats = {
+        'projects': int(len(projects)),
+        'business_units': int(projects["business_unit"].nunique()),
+        'paths': int(settings["paths"]),
+        'start_date': str(pd.Timestamp(start_date).date()),
+        'days': int(num_days),
+        'annual_spend': {col: float(annual[col]) for col in org.columns if col != "period"},
+        'simulation_seconds': round(elapsed, 3)
+    }
+    with open(f"{output_dir}/scenario_summary.json", 'w') as f:
+        json.dump(summary_stats, f, indent=2)
+
+    return summary_stats
@@ -0,0 +1,236 @@
+import numpy as np
+import pandas as pd
+
+# Streaming top-K settings
+TOPK_SETTINGS = {
+    "k": 20,  # Rows in each top-N report
+    "capacity": 2000,  # Space-saving counters kept per summary, well above k
+    "sketch_width": 8192,  # Count-Min counters per hash row
+    "sketch_depth": 4,  # Count-Min hash rows
+    "max_pending_rows": 1000000  # Record rows batched together before they are summarized
+}
+
+# Fixed 16-byte keys so sketches built in different processes can be merged
+SKETCH_HASH_KEYS = ("finops-topk-h001", "finops-topk-h002")
+
+
+def top_k_rows(df, score_column, k=None, ascending=False):
+    """
+    The k rows of df with the largest (or smallest) score_column, best first.
+
+    Partial selection rather than a full sort; ties keep their row order and
+    rows with a NaN score come last.
+    """
+    k = k or TOPK_SETTINGS["k"]
+    df = df.astype({score_column: float})
+    if ascending:
+        return df.nsmallest(k, score_column, keep="first")
+    return df.nlargest(k, score_column, keep="first")
+
+
+def sketch_positions(keys, width, depth):
+    """Count-Min bucket of every key row in every hash row (depth x rows)"""
+    keys = keys.astype(object)
+    h1 = pd.util.hash_pandas_object(keys, index=False, hash_key=SKETCH_HASH_KEYS[0]).to_numpy()
+    h2 = pd.util.hash_pandas_object(keys, index=False, hash_key=SKETCH_HASH_KEYS[1]).to_numpy() | np.uint64(1)
+    steps = np.arange(depth, dtype=np.uint64)
+    return ((h1[None, :] + steps[:, None] * h2[None, :]) % np.uint64(width)).astype(np.int64)
+
+
+def empty_summary(key_columns, capacity=None, sketch_width=None, sketch_depth=None):
+    """A heavy-hitter summary that has seen no data"""
+    shape = (sketch_depth or TOPK_SETTINGS["sketch_depth"], sketch_width or TOPK_SETTINGS["sketch_width"])
+    return {
+        "key_columns": list(key_columns),
+        "capacity": capacity or TOPK_SETTINGS["capacity"],
+        "counters": pd.DataFrame({col: pd.Series(dtype=object) for col in key_columns}).assign(
+            count=pd.Series(dtype=float), error=pd.Series(dtype=float)),
+        "sketch": np.zeros(shape),
+        "negative_sketch": np.zeros(shape)
+    }
+
+
+def counter_floor(counters, capacity):
+    """Upper bound on the score of any key a full summary no longer tracks"""
+    return float(counters["count"].min()) if len(counters) >= capacity else 0.0
+
+
+def truncate_counters(counters, capacity):
+    """Keep the capacity counters with the largest counts"""
+    if len(counters) <= capacity:
+        return counters.reset_index(drop=True)
+    return counters.nlargest(capacity, "count", keep="first").reset_index(drop=True)
+
+
+def merge_counters(counters, other, key_columns, capacity):
+    """
+    Space-saving merge of two counter sets.
+
+    A key missing from one side may still have scored up to that side's
+    floor there, so the floor is added to its count and error. Counts stay
+    upper bounds and count - error lower bounds of the key's positive score.
+    """
+    if other.empty:
+        return counters
+    if counters.empty:
+        return other
+
+    tagged = pd.concat([counters.assign(missing=counter_floor(other, capacity)),
+                        other.assign(missing=counter_floor(counters, capacity))], ignore_index=True)
+    merged = tagged.groupby(key_columns, sort=False, dropna=False).agg(
+        count=("count", "sum"), error=("error", "sum"), missing=("missing", "sum"),
+        sources=("count", "size")).reset_index()
+    missing = np.where(merged["sources"].to_numpy() > 1, 0.0, merged["missing"].to_numpy())
+    merged["count"] += missing
+    merged["error"] += missing
+    return truncate_counters(merged[key_columns + ["count", "error"]], capacity)
+
+
+def key_scores(df, key_columns, score_column, ascending=False):
+    """Score summed per key, negated when ranking ascending"""
+    scores = df[key_columns].astype(object).assign(
+        count=df[score_column].to_numpy(dtype=float) * (-1.0 if ascending else 1.0))
+    return scores.groupby(key_columns, sort=False, dropna=False)["count"].sum().reset_index()
+
+
+def summarize_chunk(df, key_columns, score_column, capacity=None, sketch_width=None,
+                    sketch_depth=None, ascending=False):
+    """
+    Heavy-hitter summary of one chunk or partition.
+
+    Scores are summed exactly per key within the chunk. Scores can be
+    negative (credits), which space-saving cannot count, so each key's sum is
+    split: the positive part feeds the counters and a Count-Min sketch, the
+    magnitude of the negative part a second Count-Min sketch. A key's score
+    is then at most its positive upper bound and at least its positive lower
+    bound less its negative estimate.
+    """
+    summary = empty_summary(key_columns, capacity, sketch_width, sketch_depth)
+    scores = key_scores(df, key_columns, score_column, ascending)
+    if scores.empty:
+        return summary
+
+    depth, width = summary["sketch"].shape
+    positions = sketch_positions(scores[key_columns], width, depth)
+    weights = scores["count"].to_numpy(dtype=float)
+    for sketch, part in (("sketch", np.maximum(weights, 0.0)), ("negative_sketch", np.maximum(-weights, 0.0))):
+        for row in range(depth):
+            summary[sketch][row] += np.bincount(positions[row], weights=part, minlength=width)
+
+    positive = scores[weights > 0]
+    summary["counters"] = truncate_counters(positive.assign(error=0.0), summary["capacity"])
+    return summary
+
+
+def merge_summaries(summaries):
+    """Merge summaries of disjoint chunks or partitions, in any order"""
+    summaries = list(summaries)
+    merged = dict(summaries[0], sketch=summaries[0]["sketch"].copy(),
+                  negative_sketch=summaries[0]["negative_sketch"].copy())
+    for summary in summaries[1:]:
+        merged["sketch"] += summary["sketch"]
+        merged["negative_sketch"] += summary["negative_sketch"]
+        merged["counters"] = merge_counters(merged["counters"], summary["counters"],
+                                            merged["key_columns"], merged["capacity"])
+    return merged
+
+
+def summary_estimates(summary):
+    """
+    Tracked keys with lower and upper bounds on their score.
+
+    The upper bound is the smaller of the space-saving count and the
+    Count-Min estimate of the positive part, both of which only
+    overestimate. The lower bound is the space-saving lower bound less the
+    Count-Min estimate of the negative part. The upper bound is kept at or
+    above the lower bound, which the two can cross by rounding.
+    """
+    counters = summary["counters"]
+    if counters.empty:
+        return counters[summary["key_columns"]].assign(lower=0.0, upper=0.0)
+
+    depth, width = summary["sketch"].shape
+    positions = sketch_positions(counters[summary["key_columns"]], width, depth)
+    rows = np.arange(depth)[:, None]
+    positive_estimate = summary["sketch"][rows, positions].min(axis=0)
+    negative_estimate = summary["negative_sketch"][rows, positions].min(axis=0)
+    lower = (counters["count"] - counters["error"]).to_numpy() - negative_estimate
+    upper = np.maximum(np.minimum(counters["count"].to_numpy(), positive_estimate), lower)
+    return counters[summary["key_columns"]].assign(lower=lower, upper=upper)
+
+
+def candidate_keys(summary, k=None):
+    """Tracked keys that can still be in the top k: upper bound >= k-th largest lower bound"""
+    k = k or TOPK_SETTINGS["k"]
+    estimates = summary_estimates(summary)
+    if len(estimates) <= k:
+        return estimates
+    threshold = np.sort(estimates["lower"].to_numpy())[-k]
+    return estimates[estimates["upper"] >= threshold].reset_index(drop=True)
+
+
+def batched_chunks(chunks, columns=None, max_pending_rows=None):
+    """
+    Concatenate consecutive chunks until they hold max_pending_rows rows.
+
+    Many small partitions then cost one group-by or merge per batch rather
+    than one each.
+    """
+    max_pending_rows = max_pending_rows or TOPK_SETTINGS["max_pending_rows"]
+    pending, pending_rows = [], 0
+    for chunk in chunks:
+        pending.append(chunk if columns is None else chunk[columns])
+        pending_rows += len(chunk)
+        if pending_rows >= max_pending_rows:
+            yield pd.concat(pending, ignore_index=True)
+            pending, pending_rows = [], 0
+    if pending:
+        yield pd.concat(pending, ignore_index=True)
+
+
+def exact_totals(chunks, candidates, key_columns, measures, max_pending_rows=None):
+    """Exact measure totals of the candidate keys, read chunk by chunk"""
+    keys = candidates[key_columns].astype(object)
+    partials = []
+    for batch in batched_chunks(chunks, key_columns + measures, max_pending_rows):
+        rows = batch.astype({col: object for col in key_columns}).merge(keys, on=key_columns, how="inner")
+        if not rows.empty:
+            partials.append(rows.groupby(key_columns, sort=False, dropna=False)[measures].sum().reset_index())
+
+    if not partials:
+        return pd.DataFrame(columns=key_columns + measures)
+    return pd.concat(partials, ignore_index=True).groupby(
+        key_columns, sort=False, dropna=False)[measures].sum().reset_index()
+
+
+def streaming_top_k(make_chunks, key_columns, measures, score_column, k=None, ascending=False,
+                    capacity=None, max_pending_rows=None):
+    """
+    Top k keys by a summed score over data too large to group in memory.
+
+    Chunks are read in batches of up to max_pending_rows rows. The first
+    pass builds one heavy-hitter summary per batch and merges them; the
+    second re-reads the batches for the exact totals of the candidate keys
+    only and picks the final k. Memory is bounded by one batch plus the
+    summary capacity. A key can only be missed if its true score does
+    not exceed the merged summary's floor, and keys whose summed score is
+    never positive are not tracked at all.
+
+    Args:
+        make_chunks: Callable returning a fresh iterator of record chunks
+        key_columns: Columns identifying a ranked key
+        measures: Columns summed for the report; score_column must be one
+
+    Returns:
+        DataFrame of key_columns and measures, best first
+    """
+    summaries = (summarize_chunk(batch, key_columns, score_column, capacity, ascending=ascending)
+                 for batch in batched_chunks(make_chunks(), key_columns + [score_column], max_pending_rows))
+    summary = merge_summaries(list(summaries) or [empty_summary(key_columns, capacity)])
+
+    candidates = candidate_keys(summary, k)
+    if candidates.empty:
+        return pd.DataFrame(columns=key_columns + measures)
+
+    totals = exact_totals(make_chunks(), candidates, key_columns, measures, max_pending_rows)
+    return top_k_rows(totals, score_column, k, ascending).reset_index(drop=True)
@@ -1,6 +1,20 @@
 import pandas as pd
 import numpy as np
 from configGCP import CONFIG
+from gcp_warehouse import export_to_warehouse, default_warehouse_path
+from gcp_partitions import write_partitioned_records
+from gcp_cost_cube import build_cost_cube
+from gcp_allocation import allocate_shared_costs
+from gcp_credits import build_credit_table, record_credit_amounts, credit_type_breakdown
+from gcp_topk import top_k_rows
+from gcp_distinct import aggregate_sketches, add_distinct_counts
+from gcp_forecast import write_forecast_reports
+from gcp_anomalies import write_anomaly_reports
+from gcp_scenarios import scenario_projects, write_scenario_reports
+from gcp_budget import project_budgets, write_budget_reports
+from gcp_commitments import write_commitment_reports
+from gcp_rightsizing import write_rightsizing_reports
+from gcp_metrics import add_stages, run_stage, snapshot, stage_metrics, start_run_metrics, write_run_metrics
 from tqdm import tqdm
 import time
 import hashlib
@@ -212,6 +226,14 @@ DATA_VOLUME_SETTINGS = {
     "volatility_factor": 0.02,                # +/- 2% cost volatility by default
 }
 
+# Optional export targets written next to the CSV files
+OUTPUT_SETTINGS = {
+    "warehouse_engine": None,  # None for CSV only, "duckdb" or "sqlite"
+    "partitioned_records": False,  # Also write month partitions with _stats.json sidecars
+    "analysis_reports": False,  # Also write forecast, anomaly, scenario, budget, commitment and rightsizing reports
+    "run_metrics": False,  # Also write per-stage wall time, CPU time and RSS deltas to run_metrics.json
+}
+
 # Tag categories for more realistic labeling (GCP uses labels instead of tags)
 LABEL_CATEGORIES = {
     "Technical": [
@@ -1622,6 +1644,7 @@ def generate_usage_data(project_name, project_data, day_count, start_date, daily
                                 "usage.amount_in_pricing_units": amount_in_pricing_units,
                                 "usage.pricing_unit": pricing_unit,
                                 "credits": json.dumps(credits_info),
+                                "_credits": credits_info,  # Moved to the credit table in main()
                                 "invoice.month": invoice_month,
                                 "cost_type": cost_type,
                                 "adjustment_info.id": adjustment_info["id"] if adjustment_info else "",
@@ -1644,21 +1667,27 @@ def generate_usage_data(project_name, project_data, day_count, start_date, daily
 
 
 def process_project(args):
-    """Process a single project - for parallel execution"""
+    """
+    Process a single project - for parallel execution
+
+    Returns:
+        Tuple of (records, labels, generation stage metrics of this worker)
+    """
     project_name, project_data, day_count, start_date, daily_budget = args
     try:
         start_time = time.time()
+        before = snapshot()
 
         # Validate project data
         if not project_data.get("services"):
             print(
                 f"Warning: Project {project_name} has no services defined. Skipping.")
-            return [], []
+            return [], [], None
 
         if not project_data.get("stages"):
             print(
                 f"Warning: Project {project_name} has no stages defined. Skipping.")
-            return [], []
+            return [], [], None
 
         # Ensure lifecycle is valid
         if project_data.get("lifecycle") not in CONFIG["project_lifecycles"]:
@@ -1671,12 +1700,12 @@ def process_project(args):
         end_time = time.time()
         print(
             f"Generated {len(results)} records for project {project_name} in {end_time - start_time:.2f} seconds")
-        return results, labels
+        return results, labels, stage_metrics("generation", before, project=project_name, records=len(results))
     except Exception as e:
         import traceback
         print(f"Error processing project {project_name}: {e}")
         print(traceback.format_exc())
-        return [], []
+        return [], [], None
 
 
 def generate_project_lifecycle_mapping(selected_projects):
@@ -1715,55 +1744,39 @@ def generate_project_lifecycle_mapping(selected_projects):
     return pd.DataFrame(project_details)
 
 
-def generate_chargeback_reports(df_records, df_labels, output_dir):
+def generate_chargeback_reports(df_records, df_labels, output_dir, cube=None):
     """Generate chargeback and showback reports based on cost data and labels"""
 
-    # First, merge the labels data with the billing data
-    # Extract resource names and convert labels from JSON
-    df_records['resource_name'] = df_records['resource.name']
-
-    # Create a mapping of resource names to chargeback entities
-    resource_to_entity = {}
-    resource_allocation_method = {}
-
-    for _, label in df_labels.iterrows():
-        if label['key'] == 'chargeback-entity':
-            resource_to_entity[label['resource_name']] = label['value']
-        if label['key'] == 'allocation-method':
-            resource_allocation_method[label['resource_name']] = label['value']
-
-    # Apply mapping to get chargeback entity for each record
-    df_records['chargeback_entity'] = df_records['resource_name'].map(
-        resource_to_entity).fillna("Unallocated")
-
-    df_records['allocation_method'] = df_records['resource_name'].map(
-        resource_allocation_method).fillna("direct")
-
-    # Convert invoice month to a simpler format
-    df_records['month'] = df_records['invoice.month']
+    # All reports are rollups of the cost cube (by invoice month); build it
+    # unless main() already did
+    if cube is None:
+        cube = build_cost_cube(df_records, df_labels)
 
     # 1. Direct Chargeback Report - what each entity should be charged
-    chargeback_summary = df_records.groupby(['month', 'chargeback_entity'])[
+    chargeback_summary = cube.groupby(['month', 'chargeback_entity'], observed=True)[
         'cost'].sum().reset_index()
     chargeback_summary.to_csv(
         f"{output_dir}/chargeback_by_entity.csv", index=False)
 
     # 2. Generate by Service and Entity
-    service_entity_summary = df_records.groupby(
-        ['month', 'chargeback_entity', 'service.description'])['cost'].sum().reset_index()
+    service_entity_summary = cube.groupby(
+        ['month', 'chargeback_entity', 'service.description'], observed=True)['cost'].sum().reset_index()
     service_entity_summary.to_csv(
         f"{output_dir}/chargeback_by_service_entity.csv", index=False)
 
-    # 3. Credit Impact Analysis
-    # Extract credits from the JSON string and calculate their impact
-    total_costs = df_records['cost'].sum()
-
     # 4. Allocation Methods Report
-    allocation_summary = df_records.groupby(['month', 'allocation_method'])[
+    allocation_summary = cube.groupby(['month', 'allocation_method'], observed=True)[
         'cost'].sum().reset_index()
     allocation_summary.to_csv(
         f"{output_dir}/cost_by_allocation_method.csv", index=False)
 
+    # 5. Allocated Chargeback Report - shared costs split across receiving entities
+    allocated = allocate_shared_costs(cube, df_labels, COST_ALLOCATION_RULES, ['cost'])
+    allocated_summary = allocated.groupby(['month', 'allocated_entity'], observed=True)[
+        'cost'].sum().reset_index()
+    allocated_summary.to_csv(
+        f"{output_dir}/chargeback_allocated_by_entity.csv", index=False)
+
     return {
         'chargeback_total': chargeback_summary['cost'].sum(),
         'direct_allocation': allocation_summary[allocation_summary['allocation_method'] == 'direct']['cost'].sum(),
@@ -1771,23 +1784,15 @@ def generate_chargeback_reports(df_records, df_labels, output_dir):
     }
 
 
-def analyze_discount_impact(df_records, output_dir):
+def analyze_discount_impact(df_records, output_dir, cube=None):
     """Analyze the impact of discounts and credits on costs"""
 
-    # Extract credits from JSON string
-    df_records['credits_list'] = df_records['credits'].apply(
-        lambda x: json.loads(x) if x and x != '[]' else [])
-
-    # Calculate total credits per record
-    df_records['credit_amount'] = df_records['credits_list'].apply(
-        lambda credits: sum(credit.get('amount', 0) for credit in credits) if credits else 0)
-
-    # Calculate effective cost after credits
-    df_records['effective_cost'] = df_records['cost'] + \
-        df_records['credit_amount']
+    # The cube carries credit_amount and effective_cost (cost after credits)
+    if cube is None:
+        cube = build_cost_cube(df_records)
 
     # Summary by project
-    project_summary = df_records.groupby(['project.id', 'project.name'])[
+    project_summary = cube.groupby(['project.id', 'project.name'], observed=True)[
         ['cost', 'credit_amount', 'effective_cost']].sum().reset_index()
     project_summary['discount_percent'] = (project_summary['credit_amount'] /
                                            project_summary['cost'] * 100).fillna(0)
@@ -1795,7 +1800,7 @@ def analyze_discount_impact(df_records, output_dir):
         f"{output_dir}/discount_impact_by_project.csv", index=False)
 
     # Summary by service
-    service_summary = df_records.groupby(['service.description'])[
+    service_summary = cube.groupby(['service.description'], observed=True)[
         ['cost', 'credit_amount', 'effective_cost']].sum().reset_index()
     service_summary['discount_percent'] = (service_summary['credit_amount'] /
                                            service_summary['cost'] * 100).fillna(0)
@@ -1803,18 +1808,17 @@ def analyze_discount_impact(df_records, output_dir):
         f"{output_dir}/discount_impact_by_service.csv", index=False)
 
     # Find resources with the largest discount amounts
-    resource_summary = df_records.groupby(['resource.name'])[
+    resource_summary = cube.groupby(['resource.name'], observed=True)[
         ['cost', 'credit_amount', 'effective_cost']].sum().reset_index()
-    resource_summary = resource_summary.sort_values(
-        'credit_amount', ascending=True)  # Ascending because credits are negative
-    top_resources = resource_summary.head(20)
+    # Ascending because credits are negative
+    top_resources = top_k_rows(resource_summary, 'credit_amount', ascending=True)
     top_resources.to_csv(
         f"{output_dir}/top_discount_impact_resources.csv", index=False)
 
     # Overall statistics
-    total_cost = df_records['cost'].sum()
-    total_credits = df_records['credit_amount'].sum()
-    total_effective = df_records['effective_cost'].sum()
+    total_cost = cube['cost'].sum()
+    total_credits = cube['credit_amount'].sum()
+    total_effective = cube['effective_cost'].sum()
     percent_discount = (total_credits / total_cost *
                         100) if total_cost > 0 else 0
 
@@ -1833,6 +1837,49 @@ def analyze_discount_impact(df_records, output_dir):
     return summary_stats
 
 
+def generate_cost_reports(cube, df_labels, output_dir, sketches=None):
+    """
+    Write the cost summaries and the chargeback and discount reports from a cost cube.
+
+    With the cube's distinct-count sketches (gcp_distinct), the project and
+    service summaries also get exact distinct resource and approximate SKU counts.
+    """
+    # Create project summary
+    project_summary = cube.groupby(['month', 'project.name'])[
+        'cost'].sum().reset_index()
+    if sketches is not None:
+        add_distinct_counts(project_summary, sketches, ['month', 'project.name'], cube)
+    project_summary.to_csv(
+        f"{output_dir}/cost_summary_by_project.csv", index=False)
+
+    # Generate summary by service
+    service_summary = cube.groupby(['month', 'service.description'])[
+        'cost'].sum().reset_index()
+    if sketches is not None:
+        add_distinct_counts(service_summary, sketches, ['month', 'service.description'], cube)
+    service_summary.to_csv(
+        f"{output_dir}/cost_summary_by_service.csv", index=False)
+
+    # Generate monthly cost summary by business unit
+    bu_summary = cube.groupby(['month', 'business_unit'])[
+        'cost'].sum().reset_index()
+    bu_summary.to_csv(
+        f"{output_dir}/cost_summary_by_business_unit.csv", index=False)
+
+    # Generate chargeback/showback reports
+    chargeback_stats = generate_chargeback_reports(
+        None, df_labels, output_dir, cube)
+    print(
+        f"Generated chargeback/showback reports. Total chargeback: ${chargeback_stats['chargeback_total']:.2f}")
+
+    # Analyze discount impact
+    discount_impact = analyze_discount_impact(None, output_dir, cube)
+    print(f"Analyzed discount impact. Total credits: ${discount_impact['total_credits']:.2f} " +
+          f"({discount_impact['percent_discount']:.2f}%)")
+
+    return chargeback_stats, discount_impact
+
+
 def main():
     print("GCP Billing Data Generator")
     print("Data Volume Settings:")
@@ -1841,6 +1888,10 @@ def main():
 
     start_time = time.time()
 
+    # Opt-in per-stage wall time, CPU time and RSS deltas; run_stage() is a
+    # no-op while metrics is None
+    metrics = start_run_metrics() if OUTPUT_SETTINGS["run_metrics"] else None
+
     # Calculate daily budget
     daily_budget = calculate_daily_budget()
     print(f"Daily budget: ${daily_budget:.2f}")
@@ -1856,17 +1907,18 @@ def main():
     print(
         f"Using volatility factor of {DATA_VOLUME_SETTINGS['volatility_factor']} (±{DATA_VOLUME_SETTINGS['volatility_factor']*100}%)")
 
-    # Pick representative projects with diverse lifecycles
-    selected_projects = pick_representative_projects()
-    print(f"Selected projects: {', '.join(selected_projects)}")
+    with run_stage(metrics, "project_selection"):
+        # Pick representative projects with diverse lifecycles
+        selected_projects = pick_representative_projects()
+        print(f"Selected projects: {', '.join(selected_projects)}")
 
-    # Generate project-lifecycle mapping
-    project_lifecycle_df = generate_project_lifecycle_mapping(
-        selected_projects)
-    print("Generated project lifecycle mapping")
+        # Generate project-lifecycle mapping
+        project_lifecycle_df = generate_project_lifecycle_mapping(
+            selected_projects)
+        print("Generated project lifecycle mapping")
 
-    # Check for missing services
-    missing_services = find_missing_services()
+        # Check for missing services
+        missing_services = find_missing_services()
     if missing_services:
         print(
             f"WARNING: Found services in projects that are not defined in GCP_SERVICES: {', '.join(missing_services)}")
@@ -1882,59 +1934,78 @@ def main():
     all_records = []
     all_labels = []
 
-    with multiprocessing.Pool(processes=min(len(project_args), multiprocessing.cpu_count())) as pool:
-        results = pool.map(process_project, project_args)
+    # The parent's generation stage also covers pickling the workers'
+    # records back; each worker reports its own generation stage
+    with run_stage(metrics, "generation", projects=len(project_args)):
+        with multiprocessing.Pool(processes=min(len(project_args), multiprocessing.cpu_count())) as pool:
+            results = pool.map(process_project, project_args)
+    add_stages(metrics, [worker_stage for _, _, worker_stage in results])
 
-        for records, labels in results:
+    with run_stage(metrics, "concatenation"):
+        for records, labels, _ in results:
             all_records.extend(records)
             all_labels.extend(labels)
 
     print(
         f"Generated {len(all_records)} total records and {len(all_labels)} labels")
 
-    # Convert to DataFrames
-    df_records = pd.DataFrame(all_records)
-    df_labels = pd.DataFrame(all_labels)
+    with run_stage(metrics, "dataframe_build"):
+        # Convert to DataFrames
+        df_records = pd.DataFrame(all_records)
+        df_labels = pd.DataFrame(all_labels)
+
+        # Credits as a columnar fact table keyed by export row, so credit
+        # analysis is a join instead of JSON parsing. Every record also
+        # carries its summed credits as credit_amount, which stays with the
+        # record in the partitions and the warehouse where row positions do not.
+        df_credits = build_credit_table(df_records.pop("_credits") if "_credits" in df_records else [])
+        df_records["credit_amount"] = record_credit_amounts(df_credits, len(df_records))
 
-    # Ensure all columns exist in the DataFrame
-    for col in BIGQUERY_EXPORT_COLUMNS:
-        if col not in df_records.columns:
-            df_records[col] = ""
+        # Ensure all columns exist in the DataFrame
+        for col in BIGQUERY_EXPORT_COLUMNS:
+            if col not in df_records.columns:
+                df_records[col] = ""
 
-    for col in RESOURCE_LABELS_COLUMNS:
-        if col not in df_labels.columns:
-            df_labels[col] = ""
+        for col in RESOURCE_LABELS_COLUMNS:
+            if col not in df_labels.columns:
+                df_labels[col] = ""
 
     # Save to CSV
     output_dir = "output"
     os.makedirs(output_dir, exist_ok=True)
 
-    df_records.to_csv(f"{output_dir}/gcp_billing_export.csv", index=False)
-    df_labels.to_csv(f"{output_dir}/resource_labels.csv", index=False)
+    with run_stage(metrics, "csv_write", file="gcp_billing_export.csv", rows=len(df_records)):
+        df_records.to_csv(f"{output_dir}/gcp_billing_export.csv", index=False)
+    with run_stage(metrics, "csv_write", file="resource_labels.csv", rows=len(df_labels)):
+        df_labels.to_csv(f"{output_dir}/resource_labels.csv", index=False)
+    with run_stage(metrics, "csv_write", file="gcp_billing_credits.csv", rows=len(df_credits)):
+        df_credits.to_csv(f"{output_dir}/gcp_billing_credits.csv", index=False)
 
     # Save the project lifecycle mapping
-    project_lifecycle_df.to_csv(
-        f"{output_dir}/project_lifecycle_mapping.csv", index=False)
+    with run_stage(metrics, "csv_write", file="project_lifecycle_mapping.csv", rows=len(project_lifecycle_df)):
+        project_lifecycle_df.to_csv(
+            f"{output_dir}/project_lifecycle_mapping.csv", index=False)
     print(
         f"Saved project lifecycle mapping to {output_dir}/project_lifecycle_mapping.csv")
 
+    # Optionally load the same frames into a local DuckDB/SQLite warehouse
+    warehouse_engine = OUTPUT_SETTINGS["warehouse_engine"]
+    if warehouse_engine:
+        with run_stage(metrics, "warehouse_export", engine=warehouse_engine):
+            warehouse_path = export_to_warehouse(
+                df_records, df_labels, project_lifecycle_df,
+                path=default_warehouse_path(output_dir, warehouse_engine), engine=warehouse_engine)
+        print(f"Saved warehouse tables to {warehouse_path}")
+
+    # Optionally write the records as pruned-scan partitions
+    if OUTPUT_SETTINGS["partitioned_records"]:
+        dataset_dir = f"{output_dir}/gcp_billing_export"
+        with run_stage(metrics, "partitioned_records"):
+            partitions = write_partitioned_records(df_records, dataset_dir)
+        print(f"Saved {len(partitions)} record partitions to {dataset_dir}")
+
     # Generate a summary per project per month
     if not df_records.empty:
-        # Extract month from invoice.month column
-        df_records['month'] = df_records['invoice.month']
-
-        # Create project summary
-        project_summary = df_records.groupby(['month', 'project.name'])[
-            'cost'].sum().reset_index()
-        project_summary.to_csv(
-            f"{output_dir}/cost_summary_by_project.csv", index=False)
-
-        # Generate summary by service
-        service_summary = df_records.groupby(['month', 'service.description'])[
-            'cost'].sum().reset_index()
-        service_summary.to_csv(
-            f"{output_dir}/cost_summary_by_service.csv", index=False)
-
         # Map project names to business units
         project_to_bu = {}
         for project_name in selected_projects:
@@ -1942,37 +2013,78 @@ def main():
             project_to_bu[project_name] = project_data.get(
                 "business_unit", "Unknown")
 
-        # Create a mapping from project.name to business unit
-        project_name_to_bu = {}
-        for project_name, bu in project_to_bu.items():
-            # Convert project name to the format in project.name
-            for record in df_records['project.name'].unique():
-                if project_name.lower() in record.lower():
-                    project_name_to_bu[record] = bu
-
-        # Apply mapping to get business unit
-        df_records['business_unit'] = df_records['project.name'].map(
-            project_name_to_bu).fillna("Unknown")
-
-        # Generate monthly cost summary by business unit
-        bu_summary = df_records.groupby(['month', 'business_unit'])[
-            'cost'].sum().reset_index()
-        bu_summary.to_csv(
-            f"{output_dir}/cost_summary_by_business_unit.csv", index=False)
-
-        # Generate chargeback/showback reports
-        chargeback_stats = generate_chargeback_reports(
-            df_records, df_labels, output_dir)
-        print(
-            f"Generated chargeback/showback reports. Total chargeback: ${chargeback_stats['chargeback_total']:.2f}")
-
-        # Analyze discount impact
-        discount_impact = analyze_discount_impact(df_records, output_dir)
-        print(f"Analyzed discount impact. Total credits: ${discount_impact['total_credits']:.2f} " +
-              f"({discount_impact['percent_discount']:.2f}%)")
+        # Aggregate once by invoice month; business unit (matched on
+        # project.name), chargeback entity and allocation method are
+        # resolved on the cube
+        with run_stage(metrics, "aggregation", function="build_cost_cube"):
+            cube = build_cost_cube(df_records, df_labels, project_business_units=project_to_bu)
+
+        # Distinct resource and SKU sketches for the same cube cells
+        with run_stage(metrics, "aggregation", function="aggregate_sketches"):
+            sketches = aggregate_sketches(df_records)
+
+        # Write every summary and chargeback report from the cube
+        with run_stage(metrics, "report", function="generate_cost_reports"):
+            generate_cost_reports(cube, df_labels, output_dir, sketches)
+
+        # Credit breakdown by type (CUD, sustained use, spend-based)
+        with run_stage(metrics, "report", function="credit_type_breakdown"):
+            credits_by_type = credit_type_breakdown(df_records, df_credits)
+            credits_by_type.to_csv(f"{output_dir}/credits_by_type.csv", index=False)
+        print(f"Analyzed {len(df_credits)} credits across "
+              f"{credits_by_type['credit_type'].nunique()} credit types")
+
+        # Forecast, anomaly, scenario, budget, commitment and rightsizing reports
+        if OUTPUT_SETTINGS["analysis_reports"]:
+            # Daily cost forecasts per project, service and GCP project,
+            # reconciled up to business units and the org
+            with run_stage(metrics, "report", function="write_forecast_reports"):
+                forecast = write_forecast_reports(df_records, df_labels, project_to_bu, output_dir)
+            print(f"Forecast {forecast['series']} cost series {forecast['horizon_days']} days ahead "
+                  f"in {forecast['fit_seconds']:.2f} seconds. Total: ${forecast['total_forecast']:.2f}")
+
+            # Daily cost anomalies per GCP project and service, from a fresh detector state
+            with run_stage(metrics, "report", function="write_anomaly_reports"):
+                anomalies = write_anomaly_reports(df_records, output_dir, resume=False)
+            print(f"Flagged {anomalies['new_anomalies']} cost anomalies across {anomalies['series']} series")
+
+            # Monte Carlo spend bands of the selected projects over the same days,
+            # each with the daily budget process_project() gives it
+            project_budget = daily_budget / DATA_VOLUME_SETTINGS["maximum_projects_to_be_picked"]
+            with run_stage(metrics, "report", function="write_scenario_reports"):
+                scenario = write_scenario_reports(
+                    scenario_projects(selected_projects, project_budget), start_date, day_count, output_dir,
+                    volatility_factor=DATA_VOLUME_SETTINGS["volatility_factor"])
+            print(f"Simulated {scenario['paths']} spend paths per project in {scenario['simulation_seconds']:.2f} "
+                  f"seconds. Annual spend p50: ${scenario['annual_spend']['p50']:.2f}")
+
+            # Burn rate and projected overrun against the annual budget, from a
+            # fresh tracker state
+            with run_stage(metrics, "report", function="write_budget_reports"):
+                budget = write_budget_reports(
+                    df_records, df_labels, project_to_bu, output_dir,
+                    budgets=project_budgets(selected_projects, project_budget * 365), resume=False)
+            print(f"Projected year-end spend: ${budget['projected_year_end']:.2f} against a budget of "
+                  f"${budget['annual_budget']:.2f} ({budget['new_crossings']} budget threshold crossings)")
+
+            # Savings-maximizing CUD commitment per service, region and GCP project
+            with run_stage(metrics, "report", function="write_commitment_reports"):
+                commitments = write_commitment_reports(df_records, CUD_DISCOUNT_MAPPING, output_dir)
+            print(f"Sized commitments for {commitments['families']} service families in "
+                  f"{commitments['sweep_seconds']:.2f} seconds. Savings: ${commitments['savings']:.2f}")
+
+            # Cheapest catalog machine type fitting each labeled resource's usage
+            with run_stage(metrics, "report", function="write_rightsizing_reports"):
+                rightsizing = write_rightsizing_reports(df_records, df_labels, output_dir)
+            print(f"Rightsized {rightsizing['resources']} resources in {rightsizing['sizing_seconds']:.2f} seconds "
+                  f"({rightsizing['resources_resized']} resized). Savings: ${rightsizing['savings']:.2f}")
 
     end_time = time.time()
     print(f"Generated GCP billing data in {end_time - start_time:.2f} seconds")
+
+    if metrics is not None:
+        metrics_path = write_run_metrics(metrics, output_dir)
+        print(f"Saved run metrics for {len(metrics['stages'])} stages to {metrics_path}")
     print(f"Data saved to {output_dir}/")
 
 
@@ -0,0 +1,77 @@
+import pandas as pd
+
+from gcp_label_resolver import resolve_label_attributes
+
+# Finest grain the reports need. Business unit, chargeback entity and
+# allocation method follow from the resource and project, so they are
+# attached to the cube afterwards instead of being grouped on.
+CUBE_DIMENSIONS = [
+    "month",
+    "project.id",
+    "project.name",
+    "service.description",
+    "resource.name"
+]
+
+CUBE_MEASURES = [
+    "cost",
+    "credit_amount"
+]
+
+# Record columns the cube is built from
+RECORD_COLUMNS = ["invoice.month"] + CUBE_DIMENSIONS[1:] + CUBE_MEASURES
+
+
+def aggregate_records(df_records):
+    """
+    Partial cube of a set of records: CUBE_MEASURES summed by CUBE_DIMENSIONS.
+
+    Partial cubes of different chunks or months combine with combine_cubes().
+    df_records is not modified.
+    """
+    data = df_records[CUBE_DIMENSIONS[1:] + CUBE_MEASURES].assign(
+        month=df_records['invoice.month'])
+
+    cube = data.groupby(CUBE_DIMENSIONS, observed=True, dropna=False, sort=False)[
+        CUBE_MEASURES].sum().reset_index()
+
+    # Rollups group on these again; plain values avoid categorical cross products
+    for col in CUBE_DIMENSIONS:
+        if isinstance(cube[col].dtype, pd.CategoricalDtype):
+            cube[col] = cube[col].astype(object)
+
+    return cube
+
+
+def combine_cubes(cubes):
+    """Merge partial cubes into one, summing measures that share dimensions"""
+    cubes = [cube[CUBE_DIMENSIONS + CUBE_MEASURES] for cube in cubes if len(cube)]
+    if not cubes:
+        return pd.DataFrame(columns=CUBE_DIMENSIONS + CUBE_MEASURES)
+    return pd.concat(cubes, ignore_index=True).groupby(
+        CUBE_DIMENSIONS, dropna=False, sort=False)[CUBE_MEASURES].sum().reset_index()
+
+
+def finish_cube(cube, df_labels=None, project_business_units=None):
+    """Add effective cost and the label attributes to an aggregated cube (in place)"""
+    # Effective cost is additive, so it is derived once at cube grain
+    cube['effective_cost'] = cube['cost'] + cube['credit_amount']
+
+    if df_labels is not None:
+        resolve_label_attributes(cube, df_labels, project_business_units=project_business_units)
+    return cube
+
+
+def build_cost_cube(df_records, df_labels=None, project_business_units=None):
+    """
+    Aggregate the billing records once at month x project x service x resource grain.
+
+    The month is the invoice month. df_records is not modified. With df_labels
+    the cube also carries chargeback_entity and allocation_method (and
+    business_unit when project_business_units is given), so every report is
+    a rollup of the cube.
+
+    Returns:
+        DataFrame with CUBE_DIMENSIONS, the label attributes and summed CUBE_MEASURES
+    """
+    return finish_cube(aggregate_records(df_records), df_labels, project_business_units)
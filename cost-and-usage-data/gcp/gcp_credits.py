@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+# Credit fact table, one row per credit. record_index is the row of the
+# credited record in gcp_billing_export.csv as written, so it does not
+# address the partitioned or warehouse copies; aggregates read the
+# credit_amount column persisted with every record instead. The other
+# columns are the keys of the credit objects in the export's credits JSON.
+CREDIT_COLUMNS = ["record_index", "type", "name", "full_name", "id", "amount"]
+
+
+def build_credit_table(credit_lists):
+    """
+    Flatten per-record credit lists into the columnar credit table.
+
+    Args:
+        credit_lists: Sequence aligned with the export rows, each item the
+            list of credit dicts of that record as generate_credits() returns
+
+    Returns:
+        DataFrame with CREDIT_COLUMNS
+    """
+    credit_lists = list(credit_lists)
+    counts = np.fromiter((len(credits) for credits in credit_lists), dtype=np.int64,
+                         count=len(credit_lists))
+    flat = [credit for credits in credit_lists for credit in credits]
+
+    table = pd.DataFrame.from_records(flat, columns=CREDIT_COLUMNS[1:])
+    table.insert(0, "record_index", np.repeat(np.arange(len(credit_lists)), counts))
+    table["amount"] = table["amount"].astype(float)
+    return table
+
+
+def record_credit_amounts(df_credits, num_records):
+    """Total credit amount of every export row, aggregated from the credit table"""
+    return np.bincount(df_credits["record_index"].to_numpy(dtype=np.int64),
+                       weights=df_credits["amount"].to_numpy(dtype=float),
+                       minlength=num_records)
+
+
+def credit_type_breakdown(df_records, df_credits):
+    """
+    Credit amount and count by invoice month, service and credit type.
+
+    df_records must be the export in its written row order, so record_index
+    addresses its rows by position.
+    """
+    index = df_credits["record_index"].to_numpy(dtype=np.int64)
+    credits = pd.DataFrame({
+        "invoice.month": df_records["invoice.month"].astype(object).to_numpy()[index],
+        "service.description": df_records["service.description"].astype(object).to_numpy()[index],
+        "credit_type": df_credits["type"].astype(object).values,
+        "credit_name": df_credits["name"].astype(object).values,
+        "amount": df_credits["amount"].to_numpy(dtype=float)
+    })
+
+    return credits.groupby(
+        ["invoice.month", "service.description", "credit_type", "credit_name"], sort=True).agg(
+        credit_amount=("amount", "sum"), credit_count=("amount", "size")).reset_index()
@@ -0,0 +1,85 @@
+import os
+import sys
+import pandas as pd
+
+from gcp_loader import TIMESTAMP_FORMAT, load_records, load_labels, load_lifecycle_mapping
+from gcp_label_resolver import pivot_labels
+from gcp_chunked_reports import lifecycle_business_units
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import forecast  # noqa: E402
+
+# Record columns the daily series are built from. The project of a series
+# is the 'project' label and the stage is the GCP project. The business unit
+# follows from the project label, so each project sits under one unit.
+FORECAST_RECORD_COLUMNS = [
+    "usage_start_time",
+    "project.name",
+    "service.description",
+    "resource.name",
+    "cost"
+]
+
+# Label holding the application project of a resource, and its default
+PROJECT_LABEL = ("project", "Unknown")
+
+
+def record_days(dates):
+    """Dates as datetime64[D], from export strings or loader timestamps"""
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates.astype(object), format=TIMESTAMP_FORMAT)
+    elif dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates.to_numpy().astype('datetime64[D]')
+
+
+def daily_cost_series(df_records, df_labels, project_business_units):
+    """
+    Daily cost per business unit, project label, service and GCP project.
+
+    Records are summed per day and resource first, so the labels are
+    resolved once per resource-day instead of once per row.
+
+    Returns:
+        DataFrame of date, SERIES_COLUMNS and cost
+    """
+    resources = pd.DataFrame({
+        'date': record_days(df_records['usage_start_time']),
+        'stage': df_records['project.name'].astype(object).values,
+        'service': df_records['service.description'].astype(object).values,
+        'resource.name': df_records['resource.name'].astype(object).values,
+        'cost': df_records['cost'].to_numpy(dtype=float)
+    }).groupby(['date', 'stage', 'service', 'resource.name'], sort=False)['cost'].sum().reset_index()
+
+    projects = pivot_labels(df_labels, [PROJECT_LABEL[0]])[PROJECT_LABEL[0]]
+    resources['project'] = resources['resource.name'].map(projects).fillna(PROJECT_LABEL[1]).values
+    resources['business_unit'] = resources['project'].map(project_business_units).fillna("Unknown").values
+    return resources.groupby(['date'] + forecast.SERIES_COLUMNS, sort=True)['cost'].sum().reset_index()
+
+
+def write_forecast_reports(df_records, df_labels, project_business_units, output_dir, settings=None):
+    """Write cost_forecast.csv and cost_forecast_summary.json"""
+    daily = daily_cost_series(df_records, df_labels, project_business_units)
+    return forecast.write_forecast_reports(daily, output_dir, settings)
+
+
+def main():
+    """Forecast the daily cost series of an existing output directory"""
+    output_dir = "output"
+
+    df_records = load_records(output_dir, columns=FORECAST_RECORD_COLUMNS)
+    df_labels = load_labels(output_dir, keys=[PROJECT_LABEL[0]])
+    project_to_bu = lifecycle_business_units(load_lifecycle_mapping(output_dir))
+
+    summary = write_forecast_reports(df_records, df_labels, project_to_bu, output_dir)
+    print(f"Forecast {summary['series']} series and {summary['aggregates']} aggregates "
+          f"{summary['horizon_days']} days ahead in {summary['fit_seconds']:.2f} seconds. "
+          f"Total forecast: ${summary['total_forecast']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
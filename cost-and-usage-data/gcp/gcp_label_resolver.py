@@ -0,0 +1,82 @@
+import pandas as pd
+
+# Record columns the labels and business units are keyed on
+RESOURCE_COLUMN = "resource.name"
+PROJECT_NAME_COLUMN = "project.name"
+
+# Record attributes resolved from labels: column -> (label key, default when unlabeled)
+LABEL_ATTRIBUTES = {
+    "chargeback_entity": ("chargeback-entity", "Unallocated"),
+    "allocation_method": ("allocation-method", "direct")
+}
+
+
+def pivot_labels(df_labels, keys):
+    """
+    Pivot long-format labels into one row per resource and one column per key.
+
+    When a resource carries the same key more than once the last value wins,
+    matching the dict-building loops this replaces.
+    """
+    labels = df_labels[df_labels['key'].isin(keys)]
+    labels = pd.DataFrame({
+        'resource_name': labels['resource_name'].astype(object).values,
+        'key': labels['key'].astype(object).values,
+        'value': labels['value'].astype(object).values
+    })
+    labels = labels.drop_duplicates(['resource_name', 'key'], keep='last')
+
+    wide = labels.pivot(index='resource_name', columns='key', values='value')
+    return wide.reindex(columns=list(keys))
+
+
+def project_name_business_units(project_names, project_business_units):
+    """
+    Map export project names to business units by case-insensitive substring match.
+
+    Each config project is matched against the distinct project names at once;
+    later projects win when several match, as in the original nested loop.
+    """
+    names = pd.Series(pd.unique(pd.Series(project_names, dtype=object)), dtype=object)
+    lowered = names.str.lower()
+
+    name_to_bu = {}
+    for project_name, bu in project_business_units.items():
+        matches = names[lowered.str.contains(project_name.lower(), regex=False)]
+        name_to_bu.update(dict.fromkeys(matches, bu))
+    return name_to_bu
+
+
+def resolve_label_attributes(df_records, df_labels, attributes=None, project_business_units=None):
+    """
+    Attach label-derived attributes to the records with a single join.
+
+    Args:
+        df_records: Billing export frame, updated in place
+        df_labels: Labels frame with resource_name, key and value columns
+        attributes: Columns from LABEL_ATTRIBUTES to attach (default: all of them)
+        project_business_units: Optional config project -> business unit dict; adds a
+            'business_unit' column matched on project.name ("Unknown" when unmatched)
+
+    Returns:
+        df_records
+    """
+    attributes = list(attributes or LABEL_ATTRIBUTES)
+
+    wide = pivot_labels(df_labels, [LABEL_ATTRIBUTES[col][0] for col in attributes])
+    wide.columns = attributes
+
+    resources = pd.DataFrame({RESOURCE_COLUMN: df_records[RESOURCE_COLUMN].astype(object).values})
+    resolved = resources.merge(wide, how='left', left_on=RESOURCE_COLUMN, right_index=True,
+                               validate='many_to_one')
+
+    # Unlabeled resources get the defaults
+    for col in attributes:
+        df_records[col] = resolved[col].fillna(LABEL_ATTRIBUTES[col][1]).values
+
+    if project_business_units is not None:
+        project_names = df_records[PROJECT_NAME_COLUMN].astype(object)
+        name_to_bu = project_name_business_units(project_names, project_business_units)
+        df_records['business_unit'] = project_names.map(name_to_bu).fillna("Unknown")
+
+    return df_records
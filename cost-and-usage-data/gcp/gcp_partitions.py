@@ -0,0 +1,269 @@
+import os
+import sys
+import json
+import time
+import datetime
+import shutil
+import pandas as pd
+
+from gcp_loader import (load_outputs, read_typed_csv, record_dtypes, compact_categories,
+                        filter_date_range, RECORD_TIMESTAMP_COLUMNS,
+                        TIMESTAMP_FORMAT, USAGE_DATE_COLUMN)
+
+# Parquet needs pyarrow; without it partitions are written as CSV
+try:
+    import pyarrow  # noqa: F401
+    DEFAULT_FORMAT = "parquet"
+except ImportError:
+    DEFAULT_FORMAT = "csv"
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import partitions  # noqa: E402
+from finops_common.partitions import (STATS_FILE, build_bloom_filter, sorted_distinct,  # noqa: E402
+                                      replace_dataset, read_partition_stats, as_list)
+
+# Partitioning settings - one directory per usage month and project
+PARTITION_SETTINGS = {
+    "format": DEFAULT_FORMAT,
+    "bloom_false_positive_rate": 0.01,  # 1% false positives per partition
+}
+
+# Key columns summarised in each partition's sidecar
+SERVICE_COLUMN = "service.description"
+PROJECT_COLUMN = "project.id"
+PROJECT_NAME_COLUMN = "project.name"
+BILLING_ACCOUNT_COLUMN = "billing_account_id"
+REGION_COLUMN = "location.region"
+RESOURCE_COLUMN = "resource.name"
+COST_COLUMN = "cost"
+
+
+def coerce_record_types(df_records):
+    """Give generator frames the loader dtypes so every partition has one schema"""
+    # Report columns such as 'month' are derived, not stored
+    df = df_records.drop(columns=["month"], errors="ignore").copy()
+    for col in RECORD_TIMESTAMP_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], format=TIMESTAMP_FORMAT)
+    for col, kind in record_dtypes().items():
+        if col in df.columns and kind != "object":
+            df[col] = df[col].astype(kind)
+    return df
+
+
+def partition_stats(df_part, false_positive_rate=0.01):
+    """Stats sidecar for one partition"""
+    usage_dates = df_part[USAGE_DATE_COLUMN]
+    return {
+        "row_count": int(len(df_part)),
+        "min_usage_date": usage_dates.min().isoformat(),
+        "max_usage_date": usage_dates.max().isoformat(),
+        "cost_sum": float(df_part[COST_COLUMN].sum()),
+        "services": sorted_distinct(df_part[SERVICE_COLUMN]),
+        "projects": sorted_distinct(df_part[PROJECT_COLUMN]),
+        "project_names": sorted_distinct(df_part[PROJECT_NAME_COLUMN]),
+        "billing_accounts": sorted_distinct(df_part[BILLING_ACCOUNT_COLUMN]),
+        "regions": sorted_distinct(df_part[REGION_COLUMN]),
+        "resource_bloom": build_bloom_filter(df_part[RESOURCE_COLUMN].astype(object),
+                                             false_positive_rate)
+    }
+
+
+def partition_path(dataset_dir, month, project_id, batch=None):
+    """Directory of one month/project partition, or of one appended batch of it"""
+    part_dir = os.path.join(dataset_dir, f"month={month}", f"project={project_id}")
+    return part_dir if batch is None else os.path.join(part_dir, f"batch={batch}")
+
+
+def write_partitions(df_records, root_dir, file_format=None, batch=None):
+    """Write month/project partitions and their sidecars under root_dir; returns their directories"""
+    file_format = file_format or PARTITION_SETTINGS["format"]
+    false_positive_rate = PARTITION_SETTINGS["bloom_false_positive_rate"]
+
+    df = coerce_record_types(df_records)
+    months = df[USAGE_DATE_COLUMN].dt.strftime('%Y-%m')
+    projects = df[PROJECT_COLUMN].astype(object)
+
+    written = []
+    for (month, project_id), index in df.groupby([months, projects], sort=True).groups.items():
+        df_part = compact_categories(df.loc[index].reset_index(drop=True))
+        part_dir = partition_path(root_dir, month, project_id, batch)
+        os.makedirs(part_dir, exist_ok=True)
+
+        if file_format == "parquet":
+            df_part.to_parquet(os.path.join(part_dir, "part-00000.parquet"), index=False)
+        else:
+            df_part.to_csv(os.path.join(part_dir, "part-00000.csv"), index=False,
+                           date_format=TIMESTAMP_FORMAT)
+
+        stats = partition_stats(df_part, false_positive_rate)
+        stats["month"] = month
+        stats["project"] = project_id
+        stats["format"] = file_format
+        if batch is not None:
+            stats["batch"] = batch
+        with open(os.path.join(part_dir, STATS_FILE), "w") as f:
+            json.dump(stats, f, indent=2)
+
+        written.append(part_dir)
+
+    return written
+
+
+def write_partitioned_records(df_records, dataset_dir, file_format=None):
+    """
+    Write billing records as month/project partitions, each with a _stats.json sidecar.
+
+    Partitions of an earlier run are replaced: the new ones are written to a
+    staging directory that is swapped in once complete.
+
+    Args:
+        df_records: Billing export frame (generator or loader output)
+        dataset_dir: Root directory of the partitioned dataset
+        file_format: "parquet" or "csv", defaults to PARTITION_SETTINGS["format"]
+
+    Returns:
+        List of partition directories written
+    """
+    dataset_dir = os.path.normpath(dataset_dir)
+    staging_dir = f"{dataset_dir}.staging"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
+    written = write_partitions(df_records, staging_dir, file_format)
+    replace_dataset(staging_dir, dataset_dir)
+    return [dataset_dir + part_dir[len(staging_dir):] for part_dir in written]
+
+
+def append_partitioned_records(df_records, dataset_dir, file_format=None):
+    """
+    Add newly arrived billing records to a dataset, leaving its partitions untouched.
+
+    The records are written as a new batch=<id> partition under each
+    month/project directory they fall in, so an append costs O(new data).
+    Readers find the batches through their sidecars like any partition.
+
+    Args:
+        file_format: "parquet" or "csv", defaults to PARTITION_SETTINGS["format"]
+
+    Returns:
+        List of partition directories written
+    """
+    batch = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    return write_partitions(df_records, os.path.normpath(dataset_dir), file_format, batch)
+
+
+def partition_matches(stats, start_date=None, end_date=None, projects=None, services=None,
+                      regions=None, billing_accounts=None, resource_names=None):
+    """
+    Decide from the sidecar alone whether a partition can hold matching rows.
+
+    Dates are half-open [start_date, end_date) like the loader filters.
+    Projects match on either project id or project name.
+    """
+    return partitions.partition_matches(
+        stats, start_date, end_date,
+        values={("projects", "project_names"): projects, "services": services, "regions": regions,
+                "billing_accounts": billing_accounts},
+        blooms={"resource_bloom": resource_names})
+
+
+def prune_partitions(dataset_dir, **filters):
+    """Partition directories that may contain rows matching the filters"""
+    return partitions.prune_partitions(dataset_dir, partition_matches, **filters)
+
+
+def read_partition(part_dir, columns=None):
+    """Read the data file of one partition"""
+    parquet_path = os.path.join(part_dir, "part-00000.parquet")
+    if os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path, columns=columns)
+    return read_typed_csv(os.path.join(part_dir, "part-00000.csv"), record_dtypes(),
+                          columns=columns, timestamp_columns=RECORD_TIMESTAMP_COLUMNS,
+                          timestamp_format=TIMESTAMP_FORMAT)
+
+
+def load_partitioned_records(dataset_dir, columns=None, start_date=None, end_date=None,
+                             projects=None, services=None, regions=None,
+                             billing_accounts=None, resource_names=None):
+    """
+    Load only the partitions that can match, then apply the filters row by row.
+
+    Returns:
+        DataFrame with the loader dtypes
+    """
+    part_dirs = prune_partitions(dataset_dir, start_date=start_date, end_date=end_date,
+                                 projects=projects, services=services, regions=regions,
+                                 billing_accounts=billing_accounts,
+                                 resource_names=resource_names)
+
+    # Filter columns must be read even when not projected
+    filter_columns = {USAGE_DATE_COLUMN: start_date is not None or end_date is not None,
+                      PROJECT_COLUMN: projects is not None,
+                      PROJECT_NAME_COLUMN: projects is not None,
+                      SERVICE_COLUMN: services is not None,
+                      REGION_COLUMN: regions is not None,
+                      BILLING_ACCOUNT_COLUMN: billing_accounts is not None,
+                      RESOURCE_COLUMN: resource_names is not None}
+    read_columns = columns
+    if columns is not None:
+        extra = [col for col, needed in filter_columns.items() if needed and col not in columns]
+        read_columns = list(columns) + extra
+
+    frames = [read_partition(part_dir, read_columns) for part_dir in part_dirs]
+    if not frames:
+        return pd.DataFrame(columns=columns or [])
+    df = pd.concat(frames, ignore_index=True)
+
+    df = filter_date_range(df, USAGE_DATE_COLUMN, start_date, end_date)
+    if projects is not None:
+        projects = as_list(projects)
+        df = df[df[PROJECT_COLUMN].isin(projects) | df[PROJECT_NAME_COLUMN].isin(projects)]
+    for wanted, col in ((services, SERVICE_COLUMN), (regions, REGION_COLUMN),
+                        (billing_accounts, BILLING_ACCOUNT_COLUMN),
+                        (resource_names, RESOURCE_COLUMN)):
+        wanted = as_list(wanted)
+        if wanted is not None:
+            df = df[df[col].isin(wanted)]
+
+    if read_columns is not columns:
+        df = df[list(columns)]
+
+    # Categoricals differ per partition; concat leaves them as objects
+    for col, kind in record_dtypes().items():
+        if col in df.columns and kind == "category":
+            df[col] = df[col].astype("category")
+
+    return compact_categories(df.reset_index(drop=True))
+
+
+def main():
+    """Partition the billing export by month and project and show partition pruning"""
+    output_dir = "output"
+    dataset_dir = f"{output_dir}/gcp_billing_export"
+
+    df_records, _, _ = load_outputs(output_dir)
+
+    start_time = time.time()
+    written = write_partitioned_records(df_records, dataset_dir)
+    print(f"Wrote {len(written)} partitions to {dataset_dir} in {time.time() - start_time:.2f} seconds")
+
+    # Example point and range lookups
+    partitions = read_partition_stats(dataset_dir)
+    sample_stats = partitions[0][1]
+    first_month = sample_stats["month"]
+    month_end = (pd.Timestamp(first_month + "-01") + pd.offsets.MonthBegin(1)).strftime('%Y-%m-%d')
+    sample_resource = df_records[RESOURCE_COLUMN].iloc[0]
+
+    for label, filters in (
+            (f"month {first_month}", {"start_date": first_month + "-01", "end_date": month_end}),
+            (f"resource {sample_resource}", {"resource_names": sample_resource})):
+        matched = prune_partitions(dataset_dir, **filters)
+        print(f"  {label}: {len(matched)} of {len(partitions)} partitions to scan")
+
+
+if __name__ == "__main__":
+    main()
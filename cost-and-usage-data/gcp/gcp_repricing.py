@@ -0,0 +1,154 @@
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from gcp_loader import OUTPUT_FILES
+from gcp_commitments import USAGE_COST_TYPE
+
+# Repricing settings. The alternative mapping has the shape of
+# CUD_DISCOUNT_MAPPING: service -> GCP project -> discount factor.
+REPRICING_SETTINGS = {
+    "mapping_file": "alternative_discount_mapping.json",  # Alternative mapping, in the output directory
+    "records_file": "gcp_billing_export_repriced.csv",  # Repriced export; None to skip writing it
+}
+
+# Discount factors are keyed on service and GCP project. Only regular usage
+# is priced as usage amount times the project's effective price; tax,
+# adjustments, rounding errors and the credit table keep their generated
+# values.
+KEY_COLUMNS = ["service.description", "project.id"]
+
+REPRICED_COLUMNS = ["price.effective_price", "cost"]
+
+DIFF_COLUMNS = KEY_COLUMNS + [
+    "old_factor", "new_factor", "line_items", "old_cost", "new_cost", "cost_delta"]
+
+
+def mapping_factors(keys, discount_mapping):
+    """Discount factor of each row's service and project, 1.0 where unmapped"""
+    mapped = pd.DataFrame(
+        [(service, project, factor) for service, projects in discount_mapping.items()
+         for project, factor in projects.items()],
+        columns=KEY_COLUMNS + ["factor"])
+    factors = keys[KEY_COLUMNS].astype(object).astype(str).merge(
+        mapped, on=KEY_COLUMNS, how='left')["factor"].to_numpy(dtype=float)
+    return np.where(np.isnan(factors), 1.0, factors)
+
+
+def repricing_ratios(df_records, discount_mapping, new_mapping):
+    """
+    Price ratio of every export row.
+
+    The generator's list price is the effective price over the project's
+    factor, so a row reprices by new factor over old factor. Only the
+    distinct service and project pairs are looked up in the mappings; the
+    rows pick their pair's ratio up with one join.
+
+    Returns:
+        Array of ratios, 1.0 for rows that are not regular usage
+    """
+    repriced = (df_records['cost_type'].astype(object) == USAGE_COST_TYPE).to_numpy()
+    keys = pd.DataFrame({col: df_records[col].astype(object).to_numpy() for col in KEY_COLUMNS})
+    pairs = keys.drop_duplicates().reset_index(drop=True)
+    pairs["ratio"] = mapping_factors(pairs, new_mapping) / mapping_factors(pairs, discount_mapping)
+
+    ratios = keys.merge(pairs, on=KEY_COLUMNS, how='left')["ratio"].to_numpy(dtype=float)
+    return np.where(repriced, ratios, 1.0)
+
+
+def reprice_records(df_records, discount_mapping, new_mapping):
+    """
+    Copy of the export with effective prices and costs under the new mapping.
+
+    Usage amounts and every other column are left untouched.
+    """
+    ratios = repricing_ratios(df_records, discount_mapping, new_mapping)
+    repriced = df_records.copy()
+    for col in REPRICED_COLUMNS:
+        repriced[col] = df_records[col].to_numpy(dtype=float) * ratios
+    return repriced
+
+
+def repricing_diff(df_records, repriced, discount_mapping, new_mapping):
+    """
+    Old and new cost per service and project whose factor changed.
+
+    Returns:
+        DataFrame with DIFF_COLUMNS, ranked by cost delta
+    """
+    costs = pd.DataFrame({col: df_records[col].astype(object).to_numpy() for col in KEY_COLUMNS})
+    costs["old_cost"] = df_records["cost"].to_numpy(dtype=float)
+    costs["new_cost"] = repriced["cost"].to_numpy(dtype=float)
+    costs["line_items"] = (df_records['cost_type'].astype(object) == USAGE_COST_TYPE).to_numpy().astype(np.int64)
+
+    diff = costs.groupby(KEY_COLUMNS, sort=False).sum().reset_index()
+    diff["old_factor"] = mapping_factors(diff, discount_mapping)
+    diff["new_factor"] = mapping_factors(diff, new_mapping)
+    diff = diff[(diff["old_factor"] != diff["new_factor"]) & (diff["line_items"] > 0)].copy()
+
+    diff["cost_delta"] = diff["new_cost"] - diff["old_cost"]
+    diff = diff.sort_values(["cost_delta"] + KEY_COLUMNS)
+    return diff[DIFF_COLUMNS].reset_index(drop=True)
+
+
+def write_repricing_reports(df_records, discount_mapping, new_mapping, output_dir, settings=None):
+    """
+    Reprice the export under new_mapping and write repricing_diff.csv and repricing_summary.json.
+
+    The repriced export is written to the settings' records_file.
+    """
+    settings = settings or REPRICING_SETTINGS
+
+    start_time = time.time()
+    repriced = reprice_records(df_records, discount_mapping, new_mapping)
+    diff = repricing_diff(df_records, repriced, discount_mapping, new_mapping)
+    elapsed = time.time() - start_time
+
+    diff.to_csv(f"{output_dir}/repricing_diff.csv", index=False)
+    if settings["records_file"]:
+        repriced.to_csv(f"{output_dir}/{settings['records_file']}", index=False)
+
+    old_cost = float(df_records["cost"].sum())
+    new_cost = float(repriced["cost"].sum())
+    summary_stats = {
+        'line_items': int(len(df_records)),
+        'line_items_repriced': int(diff["line_items"].sum()),
+        'pairs_repriced': int(len(diff)),
+        'old_cost': old_cost,
+        'new_cost': new_cost,
+        'cost_delta': new_cost - old_cost,
+        'repricing_seconds': round(elapsed, 3)
+    }
+    with open(f"{output_dir}/repricing_summary.json", 'w') as f:
+        json.dump(summary_stats, f, indent=2)
+
+    return summary_stats
+
+
+def main():
+    """Reprice an existing output directory under the alternative discount mapping"""
+    from GCP_billing_data_generator import CUD_DISCOUNT_MAPPING
+
+    output_dir = "output"
+
+    mapping_path = os.path.join(output_dir, REPRICING_SETTINGS["mapping_file"])
+    if not os.path.exists(mapping_path):
+        print(f"No alternative discount mapping at {mapping_path}")
+        return
+    with open(mapping_path) as f:
+        new_mapping = json.load(f)
+
+    # The raw export is read as written, so the repriced copy keeps its formats
+    df_records = pd.read_csv(os.path.join(output_dir, OUTPUT_FILES["records"]),
+                             dtype={col: str for col in KEY_COLUMNS}, float_precision="round_trip",
+                             low_memory=False)
+    summary = write_repricing_reports(df_records, CUD_DISCOUNT_MAPPING, new_mapping, output_dir)
+    print(f"Repriced {summary['line_items_repriced']} rows of {summary['pairs_repriced']} service and "
+          f"project pairs in {summary['repricing_seconds']:.2f} seconds. Cost: "
+          f"${summary['old_cost']:.2f} -> ${summary['new_cost']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
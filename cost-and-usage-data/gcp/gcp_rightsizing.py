@@ -0,0 +1,92 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+from configGCP import CONFIG
+from gcp_loader import load_records, load_labels
+from gcp_label_resolver import pivot_labels
+from gcp_commitments import USAGE_COST_TYPE, usage_periods
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common import rightsizing  # noqa: E402
+
+# Label carrying a resource's machine type, and the service catalog key listing the sizes
+SIZE_LABEL = "machine-type"
+CATALOG_KEY = "machine_types"
+
+# A resource is one resource name of one service in one region of one GCP project
+RESOURCE_COLUMNS = ["service.description", "resource.name", "project.id", "location.region"]
+
+# Record columns the usage profiles are built from
+RIGHTSIZING_RECORD_COLUMNS = ["usage_start_time", "cost_type"] + RESOURCE_COLUMNS + ["usage.amount", "cost"]
+
+CATALOG_COLUMNS = ["service.description", "machine_type", "family", "capacity"]
+
+
+def machine_size(machine_type):
+    """
+    Family and vCPU count of a predefined machine type, e.g. ("n2-standard", 4.0) for n2-standard-4.
+
+    Returns (machine_type, NaN) when the name does not end in a vCPU count.
+    """
+    family, _, vcpus = machine_type.rpartition('-')
+    return (family, float(vcpus)) if family and vcpus.isdigit() else (machine_type, np.nan)
+
+
+def size_catalog(services=None):
+    """
+    Machine types of every service with a catalog, with their family and capacity.
+
+    Capacity is the vCPU count; the price of a machine type is taken to be
+    proportional to it within a family.
+    """
+    return rightsizing.size_catalog(services or CONFIG["services"], CATALOG_KEY, machine_size, CATALOG_COLUMNS)
+
+
+def usage_rows(df_records, df_labels, catalog):
+    """
+    Usage cost rows of every resource labeled with a machine type of a catalog service.
+
+    Returns:
+        DataFrame with RESOURCE_COLUMNS, current_type, day, amount and cost
+    """
+    usage = ((df_records['cost_type'].astype(object) == USAGE_COST_TYPE) &
+             df_records['service.description'].astype(object).isin(catalog["service.description"])).to_numpy()
+
+    rows = pd.DataFrame({col: df_records[col].astype(object).to_numpy()[usage] for col in RESOURCE_COLUMNS})
+    rows['day'] = usage_periods(df_records['usage_start_time'], 'D')[usage]
+    rows['amount'] = df_records['usage.amount'].to_numpy(dtype=float)[usage]
+    rows['cost'] = df_records['cost'].to_numpy(dtype=float)[usage]
+
+    sizes = pivot_labels(df_labels, [SIZE_LABEL]).dropna().reset_index()
+    sizes.columns = ["resource.name", "current_type"]
+    return rows.merge(sizes, on="resource.name", how='inner')
+
+
+def write_rightsizing_reports(df_records, df_labels, output_dir, settings=None):
+    """Write rightsizing_recommendations.csv and rightsizing_summary.json"""
+    catalog = size_catalog()
+    return rightsizing.write_rightsizing_reports(usage_rows(df_records, df_labels, catalog), RESOURCE_COLUMNS,
+                                                 catalog, output_dir, settings)
+
+
+def main():
+    """Rightsize the labeled resources of an existing output directory"""
+    output_dir = "output"
+
+    df_records = load_records(output_dir, columns=RIGHTSIZING_RECORD_COLUMNS)
+    df_labels = load_labels(output_dir, keys=[SIZE_LABEL])
+    summary = write_rightsizing_reports(df_records, df_labels, output_dir)
+    print(f"Matched {summary['resources']} resources against {summary['catalog_sizes']} catalog sizes in "
+          f"{summary['sizing_seconds']:.2f} seconds. {summary['resources_downsized']} downsized and "
+          f"{summary['resources_upsized']} upsized, savings: ${summary['savings']:.2f} "
+          f"({summary['savings_percent']:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+
+from gcp_loader import OUTPUT_FILES, load_labels
+from gcp_chunked_reports import iter_csv_chunks, iter_partition_chunks
+
+# Cloud-independent logic lives in finops_common/ at the repository root
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from finops_common.topk import TOPK_SETTINGS, top_k_rows, batched_chunks, streaming_top_k  # noqa: E402
+
+# The generator ranks its summaries with top_k_rows from here
+__all__ = ["TOPK_SETTINGS", "top_k_rows", "label_chunks", "main"]
+
+# Ranked keys and the record columns they are read from
+RESOURCE_KEYS = ["resource.name"]
+LABEL_KEYS = ["key", "value"]
+LABEL_RESOURCE_COLUMN = "resource_name"
+SKU_KEYS = ["service.description", "sku.id", "sku.description"]
+COST_COLUMN = "cost"
+TOPK_COLUMNS = RESOURCE_KEYS + SKU_KEYS + [COST_COLUMN]
+
+
+def label_chunks(chunks, df_labels):
+    """Cost of each record chunk spread onto the labels of its resources"""
+    labels = df_labels[[LABEL_RESOURCE_COLUMN] + LABEL_KEYS].astype(object)
+    for chunk in chunks:
+        costs = chunk[[RESOURCE_KEYS[0], COST_COLUMN]].astype({RESOURCE_KEYS[0]: object})
+        yield costs.merge(labels, left_on=RESOURCE_KEYS[0], right_on=LABEL_RESOURCE_COLUMN, how="inner")
+
+
+def main():
+    """Write the top resources, labels and SKUs by cost, streaming the records"""
+    output_dir = "output"
+    dataset_dir = f"{output_dir}/gcp_billing_export"
+
+    start_time = time.time()
+
+    # Prefer the partitioned records when the generator wrote them, read in
+    # batches so the small partitions are not grouped and merged one by one
+    if os.path.isdir(dataset_dir):
+        source = dataset_dir
+
+        def make_chunks():
+            return batched_chunks(iter_partition_chunks(dataset_dir, TOPK_COLUMNS))
+    else:
+        source = os.path.join(output_dir, OUTPUT_FILES["records"])
+
+        def make_chunks():
+            return iter_csv_chunks(output_dir, columns=TOPK_COLUMNS)
+
+    df_labels = load_labels(output_dir)
+    reports = {
+        "top_resources_by_cost.csv": streaming_top_k(make_chunks, RESOURCE_KEYS, [COST_COLUMN], COST_COLUMN),
+        "top_labels_by_cost.csv": streaming_top_k(lambda: label_chunks(make_chunks(), df_labels),
+                                                  LABEL_KEYS, [COST_COLUMN], COST_COLUMN),
+        "top_skus_by_cost.csv": streaming_top_k(make_chunks, SKU_KEYS, [COST_COLUMN], COST_COLUMN)
+    }
+    for file_name, report in reports.items():
+        report.to_csv(os.path.join(output_dir, file_name), index=False)
+
+    print(f"Wrote {len(reports)} top-{TOPK_SETTINGS['k']} reports from {source} "
+          f"in {time.time() - start_time:.2f} seconds")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import os
+import json
+import time
+import shutil
+import numpy as np
+import pandas as pd
+
+from configGCP import CONFIG
+from gcp_loader import OUTPUT_FILES, TIMESTAMP_FORMAT, load_labels
+from gcp_partitions import DEFAULT_FORMAT
+
+# Normalization settings. Each provider is written under provider=<name>/
+# month=<YYYY-MM>/ of the unified dataset, one part file per chunk and month.
+UNIFIED_SETTINGS = {
+    "chunk_rows": 250000,  # Export rows read and normalized at a time
+    "format": DEFAULT_FORMAT
+}
+
+PROVIDER = "gcp"
+PROVIDER_NAME = "Google Cloud"
+
+# Common schema shared by the AWS, GCP and Azure normalizers, after the FOCUS
+# column names. Tags is a JSON object of the resource's labels.
+UNIFIED_COLUMNS = [
+    "ProviderName", "BillingAccountId", "SubAccountId", "ChargePeriodStart", "ChargeCategory",
+    "ServiceCategory", "ServiceName", "RegionId", "ResourceId", "ConsumedQuantity", "ConsumedUnit",
+    "BilledCost", "EffectiveCost", "BillingCurrency", "Tags"
+]
+UNIFIED_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Export column -> unified column, for the columns copied as they are
+COLUMN_MAPPING = {
+    "billing_account_id": "BillingAccountId",
+    "project.id": "SubAccountId",
+    "service.description": "ServiceName",
+    "location.region": "RegionId",
+    "resource.name": "ResourceId",
+    "usage.amount": "ConsumedQuantity",
+    "usage.unit": "ConsumedUnit",
+    "cost": "BilledCost",
+    "currency": "BillingCurrency"
+}
+
+# Cost type -> FOCUS charge category (anything else is an Adjustment)
+CHARGE_CATEGORIES = {
+    "regular": "Usage",
+    "tax": "Tax",
+    "adjustment": "Adjustment",
+    "rounding_error": "Adjustment"
+}
+
+# GCP_SERVICES category -> FOCUS service category. Services missing from the
+# catalog are added to Management by the generator.
+SERVICE_CATEGORIES = {
+    "Compute": "Compute",
+    "Storage": "Storage",
+    "Database": "Databases",
+    "Analytics": "Analytics",
+    "Networking": "Networking",
+    "MachineLearning": "AI and Machine Learning",
+    "Management": "Management and Governance",
+    "Security": "Security",
+    "Data": "Analytics",
+    "Healthcare": "Other",
+    "Media": "Media",
+    "Location": "Other",
+    "ApplicationServices": "Integration",
+    "DevOps": "Developer Tools",
+    "IoT": "Internet of Things"
+}
+DEFAULT_SERVICE_CATEGORY = SERVICE_CATEGORIES["Management"]
+
+UNIFIED_RECORD_COLUMNS = list(COLUMN_MAPPING) + ["usage_start_time", "cost_type", "credit_amount"]
+FLOAT_COLUMNS = ["usage.amount", "cost", "credit_amount"]
+
+
+def iter_record_chunks(output_dir="output", chunk_rows=None):
+    """Yield the columns the normalizer needs from gcp_billing_export.csv, chunk by chunk"""
+    reader = pd.read_csv(
+        os.path.join(output_dir, OUTPUT_FILES["records"]),
+        usecols=UNIFIED_RECORD_COLUMNS,
+        dtype={col: "float64" if col in FLOAT_COLUMNS else object for col in UNIFIED_RECORD_COLUMNS},
+        keep_default_na=False,
+        na_values={col: [""] for col in FLOAT_COLUMNS},
+        float_precision="round_trip",
+        chunksize=chunk_rows or UNIFIED_SETTINGS["chunk_rows"]
+    )
+    with reader:
+        for chunk in reader:
+            chunk[FLOAT_COLUMNS] = chunk[FLOAT_COLUMNS].fillna(0.0)
+            yield chunk
+
+
+def service_categories(services=None):
+    """FOCUS service category of every catalog service"""
+    services = services or CONFIG["services"]
+    return {service: SERVICE_CATEGORIES.get(category, "Other")
+            for category, details in services.items() for service in details}
+
+
+def resource_label_maps(df_labels):
+    """
+    Labels of every resource as a JSON object string.
+
+    The strings are built once per resource, not per export row; when a
+    resource carries the same key more than once the last value wins.
+    """
+    tags = pd.DataFrame({col: df_labels[col].astype(object).to_numpy() for col in ["resource_name", "key", "value"]})
+    tags = tags.drop_duplicates(["resource_name", "key"], keep="last").sort_values(["resource_name", "key"],
+                                                                                    kind="stable")
+
+    resources, starts = np.unique(tags["resource_name"].to_numpy(dtype=object), return_index=True)
+    keys = tags["key"].to_numpy(dtype=object)
+    values = tags["value"].to_numpy(dtype=object)
+    ends = np.append(starts[1:], len(tags))
+    maps = [json.dumps(dict(zip(keys[start:end], values[start:end]))) for start, end in zip(starts, ends)]
+    return pd.Series(maps, index=resources, dtype=object)
+
+
+def normalize_chunk(chunk, label_maps, categories):
+    """
+    Export rows in the unified schema.
+
+    Every column is mapped with one vectorized operation over the chunk:
+    copies and renames, dictionary lookups for the charge and service
+    categories and the label maps. The effective cost is the cost net of
+    the row's credits, read from the credit_amount column persisted with
+    the record.
+
+    Returns:
+        DataFrame with UNIFIED_COLUMNS
+    """
+    unified = pd.DataFrame({target: chunk[source].to_numpy() for source, target in COLUMN_MAPPING.items()})
+    unified.insert(0, "ProviderName", PROVIDER_NAME)
+    unified["ChargePeriodStart"] = pd.to_datetime(chunk["usage_start_time"].to_numpy(dtype=object),
+                                                  format=TIMESTAMP_FORMAT, utc=True)
+    unified["ChargeCategory"] = chunk["cost_type"].map(CHARGE_CATEGORIES).fillna("Adjustment").to_numpy()
+    unified["ServiceCategory"] = (chunk["service.description"].map(categories)
+                                  .fillna(DEFAULT_SERVICE_CATEGORY).to_numpy())
+    unified["EffectiveCost"] = chunk["cost"].to_numpy(dtype=float) + chunk["credit_amount"].to_numpy(dtype=float)
+    unified["Tags"] = chunk["resource.name"].map(label_maps).fillna("{}").to_numpy()
+    return unified[UNIFIED_COLUMNS]
+
+
+def write_part(df_part, part_dir, part, file_format):
+    """Write one part file of the unified dataset"""
+    os.makedirs(part_dir, exist_ok=True)
+    if file_format == "parquet":
+        df_part.to_parquet(os.path.join(part_dir, f"part-{part:05d}.parquet"), index=False)
+    else:
+        df_part.to_csv(os.path.join(part_dir, f"part-{part:05d}.csv"), index=False,
+                       date_format=UNIFIED_TIMESTAMP_FORMAT)
+
+
+def write_unified_partitions(output_dir, dataset_dir, chunk_rows=None, file_format=None):
+    """
+    Stream the export into the provider=gcp partitions of the unified dataset.
+
+    One chunk is held in memory at a time. Partitions of an earlier run are
+    replaced.
+
+    Returns:
+        Summary dict with rows, parts, months, billed and effective cost
+    """
+    file_format = file_format or UNIFIED_SETTINGS["format"]
+    provider_dir = os.path.join(dataset_dir, f"provider={PROVIDER}")
+    shutil.rmtree(provider_dir, ignore_errors=True)
+
+    start_time = time.time()
+    label_maps = resource_label_maps(load_labels(output_dir))
+    categories = service_categories()
+
+    rows = parts = 0
+    months = set()
+    billed_cost = effective_cost = 0.0
+    for part, chunk in enumerate(iter_record_chunks(output_dir, chunk_rows)):
+        unified = normalize_chunk(chunk, label_maps, categories)
+        chunk_months = unified["ChargePeriodStart"].dt.tz_localize(None).to_numpy().astype("datetime64[M]")
+        for month, index in unified.groupby(chunk_months.astype(str), sort=True).indices.items():
+            write_part(unified.iloc[index], os.path.join(provider_dir, f"month={month}"), part, file_format)
+            months.add(month)
+            parts += 1
+        rows += len(unified)
+        billed_cost += float(unified["BilledCost"].sum())
+        effective_cost += float(unified["EffectiveCost"].sum())
+
+    return {
+        "provider": PROVIDER,
+        "rows": rows,
+        "parts": parts,
+        "months": sorted(months),
+        "billed_cost": billed_cost,
+        "effective_cost": effective_cost,
+        "seconds": round(time.time() - start_time, 3)
+    }
+
+
+def main():
+    """Normalize the billing export into the unified dataset"""
+    output_dir = "output"
+    dataset_dir = f"{output_dir}/unified_cost_dataset"
+
+    summary = write_unified_partitions(output_dir, dataset_dir)
+    print(f"Normalized {summary['rows']} export rows into {summary['parts']} parts under {dataset_dir} "
+          f"in {summary['seconds']:.2f} seconds")
+
+
+if __name__ == "__main__":
+    main()
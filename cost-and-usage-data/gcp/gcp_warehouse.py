@@ -0,0 +1,343 @@
+import os
+import time
+import sqlite3
+import pandas as pd
+
+from gcp_loader import load_outputs, RECORD_TIMESTAMP_COLUMNS, TIMESTAMP_FORMAT
+
+# DuckDB is optional; SQLite ships with Python and is the fallback
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# Table names follow gcp-billing-practical-guide.md
+RECORDS_TABLE = "gcp_billing_export"
+LABELS_TABLE = "resource_labels"
+LIFECYCLE_TABLE = "project_lifecycle_mapping"
+
+# Export columns grouped into BigQuery-style records. In DuckDB these become
+# STRUCT columns so `invoice.month` and `service.description` work as in the
+# guide; SQLite keeps the flat dotted names, which must be quoted there.
+STRUCT_COLUMNS = ["service", "sku", "project", "location", "usage",
+                  "invoice", "adjustment_info", "resource", "price"]
+
+# Sort keys for the fact table. DuckDB keeps min/max zone maps per row group,
+# so sorting on these is what makes month/service/project filters cheap.
+RECORDS_SORT_KEYS = ["invoice.month", "service.description", "project.id", "resource.name"]
+
+# Secondary indexes, SQLite only: DuckDB cannot index STRUCT fields and relies
+# on the sort order above
+RECORDS_INDEXES = {
+    "idx_export_month_service": ["invoice.month", "service.description"],
+    "idx_export_project": ["project.id", "invoice.month"],
+    "idx_export_resource": ["resource.name"]
+}
+
+LABELS_INDEXES = {
+    "idx_labels_resource_key": ["resource_name", "key"],
+    "idx_labels_key_value": ["key", "value"]
+}
+
+# Example queries from gcp-billing-practical-guide.md, per engine
+EXAMPLE_QUERIES = {
+    "duckdb": {
+        "monthly_cost_by_service": """
+            SELECT invoice.month, service.description, SUM(cost) AS total_cost
+            FROM gcp_billing_export
+            GROUP BY invoice.month, service.description
+            ORDER BY invoice.month, total_cost DESC
+        """,
+        "top_projects": """
+            SELECT project.name, SUM(cost) AS total_cost
+            FROM gcp_billing_export
+            WHERE invoice.month = (SELECT MAX(invoice.month) FROM gcp_billing_export)
+            GROUP BY project.name
+            ORDER BY total_cost DESC
+            LIMIT 10
+        """,
+        "credit_analysis": """
+            SELECT invoice.month,
+                   json_extract_string(credit_item, '$.type') AS credit_type,
+                   SUM(CAST(json_extract_string(credit_item, '$.amount') AS DOUBLE)) AS credit_amount
+            FROM gcp_billing_export,
+                 UNNEST(CAST(json(credits) AS JSON[])) AS c(credit_item)
+            GROUP BY invoice.month, credit_type
+            ORDER BY invoice.month, credit_amount
+        """,
+        "cost_by_label": """
+            SELECT invoice.month,
+                   json_extract_string(project.labels, '$.environment') AS environment,
+                   json_extract_string(project.labels, '$."cost-center"') AS cost_center,
+                   SUM(cost) AS total_cost
+            FROM gcp_billing_export
+            WHERE json_extract_string(project.labels, '$.environment') IS NOT NULL
+            GROUP BY invoice.month, environment, cost_center
+            ORDER BY invoice.month, total_cost DESC
+        """,
+        "resource_level_chargeback": """
+            SELECT e.invoice.month, e.project.name,
+                   r1.value AS chargeback_entity, r2.value AS cost_center,
+                   SUM(e.cost) AS total_cost
+            FROM gcp_billing_export e
+            JOIN resource_labels r1
+              ON e.resource.name = r1.resource_name AND r1.key = 'chargeback-entity'
+            LEFT JOIN resource_labels r2
+              ON e.resource.name = r2.resource_name AND r2.key = 'cost-center'
+            GROUP BY ALL
+            ORDER BY 1, total_cost DESC
+        """,
+        "daily_cost_anomalies": """
+            WITH daily AS (
+                SELECT CAST(usage_start_time AS DATE) AS usage_date,
+                       project.name AS project_name, service.description AS service_name,
+                       SUM(cost) AS daily_cost
+                FROM gcp_billing_export
+                GROUP BY ALL
+            ), scored AS (
+                SELECT *, AVG(daily_cost) OVER (
+                           PARTITION BY project_name, service_name ORDER BY usage_date
+                           ROWS BETWEEN 7 PRECEDING AND 1 PRECEDING) AS avg_previous_7_days
+                FROM daily
+            )
+            SELECT *, daily_cost / avg_previous_7_days AS ratio_to_average
+            FROM scored
+            WHERE daily_cost / avg_previous_7_days > 3 AND daily_cost > 100
+            ORDER BY ratio_to_average DESC
+        """
+    },
+    "sqlite": {
+        "monthly_cost_by_service": """
+            SELECT "invoice.month", "service.description", SUM(cost) AS total_cost
+            FROM gcp_billing_export
+            GROUP BY "invoice.month", "service.description"
+            ORDER BY "invoice.month", total_cost DESC
+        """,
+        "top_projects": """
+            SELECT "project.name", SUM(cost) AS total_cost
+            FROM gcp_billing_export
+            WHERE "invoice.month" = (SELECT MAX("invoice.month") FROM gcp_billing_export)
+            GROUP BY "project.name"
+            ORDER BY total_cost DESC
+            LIMIT 10
+        """,
+        "credit_analysis": """
+            SELECT "invoice.month",
+                   json_extract(c.value, '$.type') AS credit_type,
+                   SUM(json_extract(c.value, '$.amount')) AS credit_amount
+            FROM gcp_billing_export, json_each(gcp_billing_export.credits) AS c
+            GROUP BY "invoice.month", credit_type
+            ORDER BY "invoice.month", credit_amount
+        """,
+        "cost_by_label": """
+            SELECT "invoice.month",
+                   json_extract("project.labels", '$.environment') AS environment,
+                   json_extract("project.labels", '$."cost-center"') AS cost_center,
+                   SUM(cost) AS total_cost
+            FROM gcp_billing_export
+            WHERE json_extract("project.labels", '$.environment') IS NOT NULL
+            GROUP BY "invoice.month", environment, cost_center
+            ORDER BY "invoice.month", total_cost DESC
+        """,
+        "resource_level_chargeback": """
+            SELECT e."invoice.month", e."project.name",
+                   r1.value AS chargeback_entity, r2.value AS cost_center,
+                   SUM(e.cost) AS total_cost
+            FROM gcp_billing_export e
+            JOIN resource_labels r1
+              ON e."resource.name" = r1.resource_name AND r1.key = 'chargeback-entity'
+            LEFT JOIN resource_labels r2
+              ON e."resource.name" = r2.resource_name AND r2.key = 'cost-center'
+            GROUP BY 1, 2, 3, 4
+            ORDER BY 1, total_cost DESC
+        """,
+        "daily_cost_anomalies": """
+            WITH daily AS (
+                SELECT DATE(usage_start_time) AS usage_date,
+                       "project.name" AS project_name, "service.description" AS service_name,
+                       SUM(cost) AS daily_cost
+                FROM gcp_billing_export
+                GROUP BY 1, 2, 3
+            ), scored AS (
+                SELECT *, AVG(daily_cost) OVER (
+                           PARTITION BY project_name, service_name ORDER BY usage_date
+                           ROWS BETWEEN 7 PRECEDING AND 1 PRECEDING) AS avg_previous_7_days
+                FROM daily
+            )
+            SELECT *, daily_cost / avg_previous_7_days AS ratio_to_average
+            FROM scored
+            WHERE daily_cost / avg_previous_7_days > 3 AND daily_cost > 100
+            ORDER BY ratio_to_average DESC
+        """
+    }
+}
+
+
+def default_engine():
+    """Use DuckDB when it is installed, otherwise SQLite"""
+    return "duckdb" if duckdb is not None else "sqlite"
+
+
+def default_warehouse_path(output_dir="output", engine=None):
+    """Default warehouse file next to the CSV outputs"""
+    engine = engine or default_engine()
+    extension = "duckdb" if engine == "duckdb" else "sqlite"
+    return os.path.join(output_dir, f"gcp_billing.{extension}")
+
+
+def connect_warehouse(path, engine=None):
+    """Open (or create) a warehouse file and return the connection"""
+    engine = engine or default_engine()
+    if engine == "duckdb":
+        if duckdb is None:
+            raise ImportError("duckdb is not installed; use engine='sqlite'")
+        return duckdb.connect(path)
+    return sqlite3.connect(path)
+
+
+def normalize_frame(df, timestamp_columns=None, timestamp_format=None):
+    """
+    Give a frame warehouse-friendly types.
+
+    Frames straight from the generator carry timestamps as strings; frames
+    from the loader carry categoricals and arrow strings. Both end up as
+    plain object strings, floats and naive UTC datetimes.
+    """
+    df = df.copy()
+    for col in timestamp_columns or []:
+        if col not in df.columns:
+            continue
+        if not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], format=timestamp_format)
+        if df[col].dt.tz is not None:
+            df[col] = df[col].dt.tz_convert("UTC").dt.tz_localize(None)
+
+    for col in df.columns:
+        if isinstance(df[col].dtype, (pd.CategoricalDtype, pd.StringDtype)):
+            df[col] = df[col].astype(object)
+
+    return df
+
+
+def struct_select_list(columns):
+    """Build a DuckDB select list that packs dotted columns into STRUCTs"""
+    select_list = []
+    packed = set()
+    for col in columns:
+        prefix = col.split(".", 1)[0]
+        if "." in col and prefix in STRUCT_COLUMNS:
+            if prefix in packed:
+                continue
+            fields = [c for c in columns if c.startswith(prefix + ".")]
+            members = ", ".join(f'"{c.split(".", 1)[1]}" := "{c}"' for c in fields)
+            select_list.append(f"struct_pack({members}) AS {prefix}")
+            packed.add(prefix)
+        else:
+            select_list.append(f'"{col}"')
+    return ", ".join(select_list)
+
+
+def write_table(con, engine, table_name, df, sort_keys=None, indexes=None, select_list=None):
+    """Replace a warehouse table with the contents of a frame, sorted and indexed"""
+    sort_keys = [key for key in (sort_keys or []) if key in df.columns]
+
+    if engine == "duckdb":
+        select_list = select_list or "*"
+        order_by = ""
+        if sort_keys:
+            order_by = " ORDER BY " + ", ".join(f'"{key}"' for key in sort_keys)
+        con.register("staging_frame", df)
+        con.execute(f"CREATE OR REPLACE TABLE {table_name} AS "
+                    f"SELECT {select_list} FROM staging_frame{order_by}")
+        con.unregister("staging_frame")
+    else:
+        # SQLite: insert in sort order, timestamps as ISO text
+        if sort_keys:
+            df = df.sort_values(sort_keys, kind="stable")
+        for col in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = df[col].dt.strftime("%Y-%m-%d %H:%M:%S")
+        df.to_sql(table_name, con, if_exists="replace", index=False, chunksize=50000)
+
+    for index_name, index_columns in (indexes or {}).items():
+        if all(col in df.columns for col in index_columns):
+            column_list = ", ".join(f'"{col}"' for col in index_columns)
+            con.execute(f"CREATE INDEX IF NOT EXISTS {index_name} "
+                        f"ON {table_name} ({column_list})")
+    con.commit()
+
+
+def export_to_warehouse(df_records, df_labels, df_lifecycle, path=None, engine=None):
+    """
+    Load billing records, resource labels and the lifecycle mapping into a
+    local DuckDB or SQLite file.
+
+    Args:
+        df_records: Billing export frame (generator or loader output)
+        df_labels: Resource labels frame
+        df_lifecycle: Project lifecycle mapping frame
+        path: Warehouse file, defaults to output/gcp_billing.<engine>
+        engine: "duckdb" or "sqlite", defaults to DuckDB when installed
+
+    Returns:
+        Path of the warehouse file
+    """
+    engine = engine or default_engine()
+    path = path or default_warehouse_path(engine=engine)
+
+    df_records = normalize_frame(df_records, RECORD_TIMESTAMP_COLUMNS, TIMESTAMP_FORMAT)
+    # A resource name reused across stages carries its labels once per stage;
+    # keep the last value of each key, as the label resolver does, so joins
+    # on resource and key match a single row
+    df_labels = normalize_frame(df_labels).drop_duplicates(["resource_name", "key"], keep="last")
+    df_lifecycle = normalize_frame(df_lifecycle)
+
+    con = connect_warehouse(path, engine)
+    try:
+        if engine == "duckdb":
+            write_table(con, engine, RECORDS_TABLE, df_records, sort_keys=RECORDS_SORT_KEYS,
+                        select_list=struct_select_list(list(df_records.columns)))
+        else:
+            write_table(con, engine, RECORDS_TABLE, df_records, sort_keys=RECORDS_SORT_KEYS,
+                        indexes=RECORDS_INDEXES)
+        write_table(con, engine, LABELS_TABLE, df_labels,
+                    sort_keys=["resource_name", "key"], indexes=LABELS_INDEXES)
+        write_table(con, engine, LIFECYCLE_TABLE, df_lifecycle)
+    finally:
+        con.close()
+
+    return path
+
+
+def run_query(con, sql):
+    """Run a query against an open warehouse connection and return a DataFrame"""
+    if duckdb is not None and isinstance(con, duckdb.DuckDBPyConnection):
+        return con.execute(sql).fetchdf()
+    return pd.read_sql_query(sql, con)
+
+
+def main():
+    """Build the warehouse from the CSV outputs and time the guide's example queries"""
+    output_dir = "output"
+    engine = default_engine()
+
+    df_records, df_labels, df_lifecycle = load_outputs(output_dir)
+
+    start_time = time.time()
+    path = export_to_warehouse(df_records, df_labels, df_lifecycle,
+                               path=default_warehouse_path(output_dir, engine), engine=engine)
+    print(f"Loaded {len(df_records)} records and {len(df_labels)} labels into {path} "
+          f"({engine}) in {time.time() - start_time:.2f} seconds")
+
+    con = connect_warehouse(path, engine)
+    try:
+        for name, sql in EXAMPLE_QUERIES[engine].items():
+            query_start = time.time()
+            result = run_query(con, sql)
+            print(f"  {name}: {len(result)} rows in {(time.time() - query_start) * 1000:.1f} ms")
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import os
+import sys
+import json
+import time
+import random
+import resource
+import tempfile
+import importlib.util
+import multiprocessing
+import numpy as np
+import pandas as pd
+
+# Benchmark settings. Every size runs once per cloud; a size is a number of
+# projects, days and resources per service, the data volume knobs the
+# generators scale with.
+BENCHMARK_SETTINGS = {
+    "seed": 42,  # random and numpy are reseeded with it before every run
+    "sizes": [
+        {"projects": 1, "days": 30, "resources": 1},
+        {"projects": 2, "days": 90, "resources": 2},
+        {"projects": 4, "days": 180, "resources": 3}
+    ],
+    "output_dir": "benchmark_results",  # Under the repository root
+    "results_file": "benchmark_results.json",
+    "baseline_file": "benchmark_baseline.json",  # Written from the first run when missing
+    "tolerance": 0.2  # Relative slowdown or memory growth reported as a regression
+}
+
+# Cloud -> generator directory, generator file, the tag functions
+# generate_usage_data() calls, the functions that reseed random from the
+# system, the record and tag column constants and the CSV files main() writes
+GENERATORS = {
+    "aws": {
+        "directory": "aws",
+        "file": "aws_cur_data_generator.py",
+        "tag_functions": ["generate_resource_tags"],
+        "reseeding_functions": [],
+        "columns": ("CUR_COLUMNS", "RESOURCE_TAGS_COLUMNS"),
+        "files": {"records": "cost_and_usage_report.csv", "tags": "resource_tags.csv"}
+    },
+    "gcp": {
+        "directory": "gcp",
+        "file": "GCP_billing_data_generator.py",
+        "tag_functions": ["generate_resource_labels", "generate_system_labels"],
+        "reseeding_functions": ["generate_resource_name"],
+        "columns": ("BIGQUERY_EXPORT_COLUMNS", "RESOURCE_LABELS_COLUMNS"),
+        "files": {"records": "gcp_billing_export.csv", "tags": "resource_labels.csv",
+                  "credits": "gcp_billing_credits.csv"}
+    },
+    "azure": {
+        "directory": "azure",
+        "file": "Azure-billing-data-generator.py",
+        "tag_functions": ["generate_tags"],
+        "reseeding_functions": ["generate_resource_name"],
+        "columns": ("COST_MANAGEMENT_COLUMNS", "RESOURCE_TAGS_COLUMNS"),
+        "files": {"records": "azure_cost_management_export.csv", "tags": "resource_tags.csv"}
+    }
+}
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Metric -> True when higher is better
+COMPARED_METRICS = {"records_per_second": True, "peak_rss_mb": False}
+
+
+def case_name(cloud, size):
+    """Key of one benchmark run in the results and the baseline"""
+    return f"{cloud}/{size['projects']}p-{size['days']}d-{size['resources']}r"
+
+
+def load_generator(cloud):
+    """Import a cloud's generator by path, with its directory on the path for its sibling imports"""
+    spec = GENERATORS[cloud]
+    module_dir = os.path.join(ROOT_DIR, spec["directory"])
+    if module_dir not in sys.path:
+        sys.path.insert(0, module_dir)
+    module_spec = importlib.util.spec_from_file_location(
+        os.path.splitext(spec["file"])[0].replace("-", "_"), os.path.join(module_dir, spec["file"]))
+    module = importlib.util.module_from_spec(module_spec)
+    module_spec.loader.exec_module(module)
+    return module
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (ru_maxrss is in KB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def timed(function, timer):
+    """Wrap function so the seconds spent in it are added to timer["seconds"]"""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timer["seconds"] += time.perf_counter() - start
+    return wrapper
+
+
+def reseeded(function, seeds):
+    """
+    Wrap function so random is reseeded from seeds after it returns.
+
+    The wrapped function seeds random from a resource name and then reseeds
+    it from the system; drawing the next seed from the run's own generator
+    instead keeps every later draw of the run fixed by the run's seed.
+    """
+    def wrapper(*args, **kwargs):
+        try:
+            return function(*args, **kwargs)
+        finally:
+            random.seed(seeds.getrandbits(64))
+    return wrapper
+
+
+def benchmark_projects(generator, count):
+    """The first count projects with services and stages, by name, so every run picks the same ones"""
+    projects = [name for name, data in sorted(generator.CONFIG["projects"].items())
+                if data.get("services") and data.get("stages")]
+    return projects[:count]
+
+
+def build_frames(generator, cloud, records, tags):
+    """Record, tag (and GCP credit) DataFrames, built the way the generator's main() builds them"""
+    records_columns, tags_columns = (getattr(generator, name) for name in GENERATORS[cloud]["columns"])
+    frames = {"records": pd.DataFrame(records), "tags": pd.DataFrame(tags)}
+    if "credits" in GENERATORS[cloud]["files"]:
+        df_records = frames["records"]
+        frames["credits"] = generator.build_credit_table(
+            df_records.pop("_credits") if "_credits" in df_records else [])
+
+    for name, columns in [("records", records_columns), ("tags", tags_columns)]:
+        for col in columns:
+            if col not in frames[name].columns:
+                frames[name][col] = ""
+    return frames
+
+
+def run_case(args):
+    """
+    Pool worker: generate, build and write one cloud at one size.
+
+    Each run gets a fresh worker process, so the peak RSS reported is the
+    run's own. Generation is serial over the projects; the seconds spent in
+    the tag functions are counted separately by wrapping them for the run.
+    Functions that reseed random from the system are wrapped to reseed it
+    from the run's seed instead, so runs of the same size and seed generate
+    the same records.
+
+    Returns:
+        Dict of records, tags, stage seconds, records per second and peak RSS
+    """
+    cloud, size, seed = args
+    generator = load_generator(cloud)
+    generator.DATA_VOLUME_SETTINGS.update({
+        "maximum_projects_to_be_picked": size["projects"],
+        "days_to_generate": size["days"],
+        "max_resources_per_service": size["resources"]
+    })
+    tag_timer = {"seconds": 0.0}
+    for name in GENERATORS[cloud]["tag_functions"]:
+        setattr(generator, name, timed(getattr(generator, name), tag_timer))
+    seeds = random.Random(seed)
+    for name in GENERATORS[cloud]["reseeding_functions"]:
+        setattr(generator, name, reseeded(getattr(generator, name), seeds))
+
+    random.seed(seed)
+    np.random.seed(seed)
+    rss_before = peak_rss_mb()
+
+    daily_budget = generator.calculate_daily_budget()
+    start_date = generator.END_DATE - generator.datetime.timedelta(days=size["days"])
+    records, tags = [], []
+    start = time.perf_counter()
+    for project_name in benchmark_projects(generator, size["projects"]):
+        project_records, project_tags = generator.generate_usage_data(
+            project_name, generator.CONFIG["projects"][project_name], size["days"], start_date, daily_budget)
+        records.extend(project_records)
+        tags.extend(project_tags)
+    generation_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frames = build_frames(generator, cloud, records, tags)
+    frame_seconds = time.perf_counter() - start
+
+    write_seconds = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        for name, file_name in GENERATORS[cloud]["files"].items():
+            start = time.perf_counter()
+            frames[name].to_csv(os.path.join(output_dir, file_name), index=False)
+            write_seconds[name] = round(time.perf_counter() - start, 4)
+
+    return {
+        "cloud": cloud,
+        "size": size,
+        "records": len(records),
+        "tags": len(tags),
+        "generation_seconds": round(generation_seconds, 4),
+        "tag_seconds": round(tag_timer["seconds"], 4),
+        "frame_seconds": round(frame_seconds, 4),
+        "write_seconds": write_seconds,
+        "records_per_second": round(len(records) / generation_seconds, 1) if generation_seconds > 0 else 0.0,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "rss_growth_mb": round(peak_rss_mb() - rss_before, 1)
+    }
+
+
+def run_benchmarks(clouds=None, settings=None):
+    """
+    Run every size for every cloud, one fresh worker process per run.
+
+    Runs are sequential so they do not compete for CPU or memory.
+
+    Returns:
+        Dict of case name -> run result
+    """
+    settings = settings or BENCHMARK_SETTINGS
+    cases = [(cloud, size, settings["seed"]) for cloud in (clouds or list(GENERATORS))
+             for size in settings["sizes"]]
+    with multiprocessing.Pool(processes=1, maxtasksperchild=1) as pool:
+        results = pool.map(run_case, cases, chunksize=1)
+    return {case_name(cloud, size): result for (cloud, size, _), result in zip(cases, results)}
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Ratio of every compared metric to its baseline value.
+
+    Returns:
+        DataFrame with one row per case and metric found in both, with a
+        regression flag when the metric moved the wrong way by more than
+        the tolerance
+    """
+    rows = []
+    for case, result in results.items():
+        if case not in baseline:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = baseline[case].get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            regression = ratio < 1 - tolerance if higher_is_better else ratio > 1 + tolerance
+            rows.append((case, metric, old, new, round(ratio, 3), regression))
+    return pd.DataFrame(rows, columns=["case", "metric", "baseline", "current", "ratio", "regression"])
+
+
+def main():
+    """Benchmark the three generators and compare with the stored baseline"""
+    settings = BENCHMARK_SETTINGS
+    output_dir = os.path.join(ROOT_DIR, settings["output_dir"])
+    os.makedirs(output_dir, exist_ok=True)
+
+    results = run_benchmarks(settings=settings)
+    with open(os.path.join(output_dir, settings["results_file"]), "w") as f:
+        json.dump(results, f, indent=2)
+
+    for case, result in results.items():
+        print(f"{case}: {result['records']} records, {result['records_per_second']:.0f} records/s "
+              f"(tags {result['tag_seconds']:.2f}s of {result['generation_seconds']:.2f}s), "
+              f"frames {result['frame_seconds']:.2f}s, CSV {sum(result['write_seconds'].values()):.2f}s, "
+              f"peak RSS {result['peak_rss_mb']:.0f} MB")
+
+    baseline_path = os.path.join(output_dir, settings["baseline_file"])
+    if not os.path.exists(baseline_path):
+        with open(baseline_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Stored the results as the baseline in {baseline_path}")
+        return
+
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    comparison = compare_to_baseline(results, baseline, settings["tolerance"])
+    print(comparison.to_string(index=False))
+    regressions = comparison[comparison["regression"]]
+    print(f"{len(regressions)} regressions beyond {settings['tolerance']:.0%} of the baseline")
+
+
+if __name__ == "__main__":
+    main()
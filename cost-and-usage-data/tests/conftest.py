@@ -0,0 +1,73 @@
+import os
+import sys
+import importlib.util
+
+import pytest
+
+# The cloud modules import their siblings by name, as when run from their own
+# directory; their module names do not collide, so all three can be on the path,
+# next to the repository root for finops_common
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ("", "aws", "gcp", "azure"):
+    path = os.path.join(ROOT_DIR, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# Generator script of each cloud and the module name it is imported under
+GENERATORS = {
+    "aws": ("aws_cur_data_generator.py", "aws_cur_data_generator"),
+    "gcp": ("GCP_billing_data_generator.py", "GCP_billing_data_generator"),
+    "azure": ("Azure-billing-data-generator.py", "azure_billing_data_generator")
+}
+
+# Two projects over 40 days keep a generator run to a second or two
+TEST_VOLUME_SETTINGS = {
+    "maximum_projects_to_be_picked": 2,
+    "days_to_generate": 40,
+    "max_resources_per_service": 1
+}
+
+
+def load_generator(cloud):
+    """
+    Import a cloud's generator script.
+
+    It is registered in sys.modules, so the pool workers can unpickle the
+    functions they run.
+    """
+    file_name, module_name = GENERATORS[cloud]
+    if module_name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(ROOT_DIR, cloud, file_name))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[module_name]
+
+
+def run_generator(cloud, directory, **output_settings):
+    """Run a cloud's generator at test volume in directory; returns its output directory"""
+    generator = load_generator(cloud)
+    with pytest.MonkeyPatch.context() as patch:
+        for name, value in TEST_VOLUME_SETTINGS.items():
+            patch.setitem(generator.DATA_VOLUME_SETTINGS, name, value)
+        for name, value in output_settings.items():
+            patch.setitem(generator.OUTPUT_SETTINGS, name, value)
+        patch.chdir(directory)
+        generator.main()
+    return os.path.join(str(directory), "output")
+
+
+@pytest.fixture(scope="session")
+def generated_output(tmp_path_factory):
+    """
+    Output directory of each cloud's generator, with partitioned records.
+
+    Generated once per session; tests that change the outputs copy them first.
+    """
+    outputs = {}
+
+    def output(cloud):
+        if cloud not in outputs:
+            outputs[cloud] = run_generator(cloud, tmp_path_factory.mktemp(cloud), partitioned_records=True)
+        return outputs[cloud]
+    return output
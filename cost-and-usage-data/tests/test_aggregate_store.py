@@ -0,0 +1,99 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+import aws_aggregate_store
+import gcp_aggregate_store
+import azure_aggregate_store
+from finops_common.partitions import read_partition_stats
+
+# Aggregate store, partitioned dataset directory and cost column of each cloud
+STORES = {
+    "aws": (aws_aggregate_store, "cost_and_usage_report", "lineItem/UnblendedCost"),
+    "gcp": (gcp_aggregate_store, "gcp_billing_export", "cost"),
+    "azure": (azure_aggregate_store, "azure_cost_management_export", "Cost")
+}
+
+
+def stored_cost(store, store_dir, cost_column):
+    manifest = store.read_manifest(store_dir)
+    return sum(store.read_month_cube(store_dir, manifest[month])[cost_column].sum() for month in manifest)
+
+
+@pytest.fixture(params=sorted(STORES))
+def store_case(request, generated_output, tmp_path):
+    store, dataset_name, cost_column = STORES[request.param]
+    dataset_dir = str(tmp_path / dataset_name)
+    shutil.copytree(os.path.join(generated_output(request.param), dataset_name), dataset_dir)
+    return store, dataset_dir, str(tmp_path / "aggregate_store"), cost_column
+
+
+def first_partition(store, dataset_dir):
+    part_dir, _ = read_partition_stats(dataset_dir)[0]
+    return store.read_partition(part_dir)
+
+
+def test_appended_records_survive_a_refresh(store_case):
+    store, dataset_dir, store_dir, cost_column = store_case
+    store.refresh_store(dataset_dir, store_dir)
+    before = stored_cost(store, store_dir, cost_column)
+
+    new_records = first_partition(store, dataset_dir)
+    changed = store.append_records(new_records, dataset_dir, store_dir)
+    assert changed
+    expected = before + new_records[cost_column].sum()
+    assert np.isclose(stored_cost(store, store_dir, cost_column), expected)
+
+    # The appended records are partitions of the dataset, so a refresh keeps them
+    assert store.refresh_store(dataset_dir, store_dir) == ([], [])
+    assert np.isclose(stored_cost(store, store_dir, cost_column), expected)
+
+    # and a store rebuilt from the dataset matches the incrementally updated one
+    rebuilt_dir = store_dir + "_rebuilt"
+    store.refresh_store(dataset_dir, rebuilt_dir)
+    assert np.isclose(stored_cost(store, rebuilt_dir, cost_column), expected)
+    manifest, rebuilt = store.read_manifest(store_dir), store.read_manifest(rebuilt_dir)
+    assert {month: entry["records"] for month, entry in manifest.items()} == \
+        {month: entry["records"] for month, entry in rebuilt.items()}
+
+
+def test_append_reads_only_the_new_partitions(store_case, monkeypatch):
+    store, dataset_dir, store_dir, cost_column = store_case
+    store.refresh_store(dataset_dir, store_dir)
+    new_records = first_partition(store, dataset_dir)
+
+    read = []
+    read_partition = store.read_partition
+    monkeypatch.setattr(store, "read_partition", lambda part_dir, columns=None: read.append(part_dir) or
+                        read_partition(part_dir, columns))
+    store.append_records(new_records, dataset_dir, store_dir)
+    assert read and all("batch=" in part_dir for part_dir in read)
+
+
+def test_append_into_an_empty_store(store_case, tmp_path):
+    store, dataset_dir, store_dir, cost_column = store_case
+    new_records = first_partition(store, dataset_dir)
+    empty_dataset = str(tmp_path / "empty_dataset")
+
+    changed = store.append_records(new_records, empty_dataset, store_dir)
+    assert changed == sorted(store.read_manifest(store_dir))
+    assert store.refresh_store(empty_dataset, store_dir) == ([], [])
+    assert np.isclose(stored_cost(store, store_dir, cost_column), new_records[cost_column].sum())
+
+
+def test_rewritten_dataset_rebuilds_the_store(store_case):
+    store, dataset_dir, store_dir, cost_column = store_case
+    original_dir = dataset_dir + "_original"
+    shutil.copytree(dataset_dir, original_dir)
+    store.refresh_store(dataset_dir, store_dir)
+    before = stored_cost(store, store_dir, cost_column)
+    store.append_records(first_partition(store, dataset_dir), dataset_dir, store_dir)
+
+    # A full rewrite replaces the dataset, appended batches included
+    shutil.rmtree(dataset_dir)
+    shutil.copytree(original_dir, dataset_dir)
+    refreshed, removed = store.refresh_store(dataset_dir, store_dir)
+    assert refreshed and removed == []
+    assert np.isclose(stored_cost(store, store_dir, cost_column), before)
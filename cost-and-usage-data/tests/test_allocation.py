@@ -0,0 +1,72 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import aws_allocation
+from finops_common import allocation
+
+RULES = {
+    "platform": {"services": ["Kubernetes", "Network"], "entities": ["Finance", "Sales", "Engineering"]},
+    "data": {"services": ["Warehouse"], "entities": ["Sales"]}
+}
+
+
+def synthetic_cube():
+    rows = [
+        ("2024-01", "r1", "Compute", "Finance", "direct", 1000.0),
+        ("2024-01", "r2", "Compute", "Sales", "direct", 3000.0),
+        ("2024-01", "r3", "Kubernetes", "Shared", "proportional", 800.0),
+        ("2024-01", "r4", "Network", "Shared", "equal", 300.0),
+        ("2024-01", "r5", "Kubernetes", "Shared", "tiered", 500.0),
+        ("2024-01", "r6", "Warehouse", "Shared", "proportional", 200.0),
+        ("2024-01", "r7", "Network", "Shared", "equal", 90.0),
+        ("2024-02", "r3", "Kubernetes", "Shared", "proportional", 400.0),
+    ]
+    return pd.DataFrame(rows, columns=["month", "resource", "service", "chargeback_entity", "allocation_method",
+                                       "cost"])
+
+
+def allocate(fixed=None):
+    fixed = fixed if fixed is not None else pd.DataFrame(
+        {"resource": ["r7", "r7"], "allocated_entity": ["Finance", "Engineering"], "allocation_share": [0.25, 0.75]})
+    return allocation.allocate_shared_costs(synthetic_cube(), fixed, RULES, ["cost"], "resource", "service")
+
+
+def test_allocated_costs_sum_to_the_input():
+    cube = synthetic_cube()
+    allocated = allocate()
+    assert allocated["cost"].sum() == pytest.approx(cube["cost"].sum())
+    per_resource = allocated.groupby(["month", "resource"])["cost"].sum()
+    expected = cube.groupby(["month", "resource"])["cost"].sum()
+    assert np.allclose(per_resource.loc[expected.index], expected)
+    assert np.allclose(allocated.groupby(["month", "resource"])["allocation_share"].sum(), 1.0)
+
+
+def test_splits_follow_their_method():
+    allocated = allocate().set_index(["month", "resource", "allocated_entity"]).sort_index()["cost"]
+    # Proportional to direct cost of the rule's consuming entities (1000 : 3000)
+    assert allocated.loc[("2024-01", "r3", "Finance")] == pytest.approx(200.0)
+    assert allocated.loc[("2024-01", "r3", "Sales")] == pytest.approx(600.0)
+    # Equal across the consuming entities
+    assert allocated.loc[("2024-01", "r4", "Finance")] == pytest.approx(150.0)
+    # Fixed percentages win over the rule
+    assert allocated.loc[("2024-01", "r7", "Engineering")] == pytest.approx(67.5)
+    # A month without direct cost falls back to the rule's entities, equally
+    assert allocated.loc[("2024-02", "r3")].to_dict() == pytest.approx(
+        {"Finance": 400 / 3, "Sales": 400 / 3, "Engineering": 400 / 3})
+
+
+def test_tiered_usage_applies_marginal_rates():
+    tiers = [(0, 1.0), (10000, 0.8), (50000, 0.6)]
+    usage = allocation.tiered_usage([5000.0, 20000.0, 100000.0], tiers)
+    assert np.allclose(usage, [5000.0, 10000 + 8000.0, 10000 + 32000.0 + 30000.0])
+
+
+def test_aws_allocation_percentages_are_normalized():
+    df_tags = pd.DataFrame({"resourceId": ["r1", "r2"], "key": "AllocationPercentages",
+                            "value": [json.dumps({"Finance": 30, "Sales": 10}), json.dumps({"Sales": 1.0})]})
+    shares = aws_allocation.fixed_allocation_shares(df_tags)
+    assert shares.groupby("lineItem/ResourceId")["allocation_share"].sum().tolist() == [1.0, 1.0]
+    assert shares.loc[shares["allocated_entity"] == "Finance", "allocation_share"].item() == pytest.approx(0.75)
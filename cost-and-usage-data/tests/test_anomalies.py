@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import aws_anomalies
+import azure_anomalies
+import gcp_anomalies
+from finops_common import anomalies
+
+KEYS = ["account", "service"]
+
+
+def synthetic_daily(spike_day=None, num_series=5, num_days=120, seed=3):
+    """Weekly-patterned costs with small noise, optionally tripled on one day of the first series"""
+    rng = np.random.default_rng(seed)
+    days = np.datetime64("2024-01-01") + np.arange(num_days)
+    weekly = np.where(anomalies.day_weekdays(days) >= 5, 0.4, 1.0)
+    noise = rng.normal(1.0, 0.01, (num_series, num_days))
+    costs = 1000.0 * (1 + np.arange(num_series))[:, None] * weekly[None, :] * noise
+    if spike_day is not None:
+        costs[0, spike_day] *= 3.0
+    return pd.DataFrame({
+        "account": "acct",
+        "service": np.repeat([f"svc-{series}" for series in range(num_series)], num_days),
+        "date": np.tile(days, num_series),
+        "cost": costs.ravel()
+    })
+
+
+def test_weekly_pattern_is_not_flagged():
+    _, found, updates = anomalies.detect_anomalies(anomalies.empty_state(KEYS), synthetic_daily())
+    assert updates == 5 * 120
+    assert found.empty
+
+
+def test_injected_spike_is_flagged_once():
+    daily = synthetic_daily(spike_day=90)
+    _, found, _ = anomalies.detect_anomalies(anomalies.empty_state(KEYS), daily)
+    assert found[KEYS + ["date", "direction"]].values.tolist() == [["acct", "svc-0", "2024-03-31", "spike"]]
+    assert list(found.columns) == ["date"] + KEYS + anomalies.ANOMALY_COLUMNS
+
+
+def test_resumed_detection_matches_full_run(tmp_path):
+    daily = synthetic_daily(spike_day=100)
+    full_dir = tmp_path / "full"
+    resumed_dir = tmp_path / "resumed"
+    full_dir.mkdir()
+    resumed_dir.mkdir()
+
+    anomalies.write_anomaly_reports(daily, full_dir, KEYS, resume=False)
+    anomalies.write_anomaly_reports(daily[daily["date"] < np.datetime64("2024-03-15")], resumed_dir, KEYS,
+                                    resume=False)
+    summary = anomalies.write_anomaly_reports(daily, resumed_dir, KEYS)
+
+    assert summary["new_anomalies"] == 1
+    for name in ["anomalies", "state"]:
+        full = pd.read_csv(full_dir / anomalies.ANOMALY_FILES[name])
+        resumed = pd.read_csv(resumed_dir / anomalies.ANOMALY_FILES[name])
+        pd.testing.assert_frame_equal(full, resumed)
+
+
+@pytest.mark.parametrize("module", [aws_anomalies, gcp_anomalies, azure_anomalies])
+def test_pattern_validation_against_generator_patterns(module):
+    validation = module.pattern_validation(num_series=20, num_days=200)
+    assert validation["detection_rate"] >= 0.8
+    assert validation["false_positive_rate"] < 0.01
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from aws_amortization import add_commitment_line_items
+from aws_loader import RECORD_FLOAT_COLUMNS, load_outputs
+
+DISCOUNT_MAPPING = {"EC2": {"111111111111": 0.7, "222222222222": 1.05}, "RDS": {"111111111111": 0.9}}
+
+
+def cur_records():
+    rows = [("111111111111", "EC2", "DiscountedUsage"), ("111111111111", "RDS", "SavingsPlanCoveredUsage"),
+            ("222222222222", "EC2", "DiscountedUsage"), ("222222222222", "EC2", "Usage")]
+    return pd.DataFrame({
+        "bill/InvoiceId": "INV-20240901",
+        "bill/PayerAccountId": "111111111111",
+        "bill/BillingPeriodStartDate": "2024-09-01T00:00:00Z",
+        "bill/BillingPeriodEndDate": "2024-09-30T23:59:59Z",
+        "lineItem/UsageAccountId": [account for account, _, _ in rows],
+        "lineItem/LineItemType": [line_item_type for _, _, line_item_type in rows],
+        "lineItem/UsageStartDate": "2024-09-02T01:00:00Z",
+        "lineItem/ProductCode": [service for _, service, _ in rows],
+        "lineItem/UsageType": "us-east-1-BoxUsage",
+        "lineItem/Operation": "RunInstances",
+        "lineItem/AvailabilityZone": "us-east-1a",
+        "lineItem/ResourceId": ["i-1", "db-1", "i-2", "i-3"],
+        "lineItem/UnblendedRate": 1.0,
+        "lineItem/UnblendedCost": 100.0,
+        "product/servicecode": [service.lower() for _, service, _ in rows],
+        "product/region": "us-east-1",
+        "pricing/publicOnDemandCost": 100.0
+    })
+
+
+def test_discounts_come_from_the_mapping():
+    records = add_commitment_line_items(cur_records(), DISCOUNT_MAPPING)
+    # EC2 in 111111111111 is mapped; 222222222222 pays a premium, so it gets
+    # the mapping's average discount; the Savings Plan the account's average
+    assert np.allclose(records.loc[[0, 2], "reservation/EffectiveCost"], [70.0, 80.0])
+    assert np.isclose(records.loc[1, "savingsPlan/SavingsPlanEffectiveCost"], 80.0)
+
+
+def test_fee_line_items_are_built_from_the_commitment():
+    records = add_commitment_line_items(cur_records(), DISCOUNT_MAPPING)
+    fees = records[records["lineItem/LineItemType"].isin(["RIFee", "SavingsPlanRecurringFee"])]
+    ri_fees = records[records["lineItem/LineItemType"] == "RIFee"]
+    sp_fees = records[records["lineItem/LineItemType"] == "SavingsPlanRecurringFee"]
+
+    assert len(ri_fees) == 2 and len(sp_fees) == 1
+    assert (fees["lineItem/ResourceId"] == "").all()
+    assert (fees["lineItem/AvailabilityZone"] == "").all()
+    assert (ri_fees["lineItem/UsageType"] == "HeavyUsage:AllUpfront").all()
+    assert (ri_fees["lineItem/Operation"] == "RIFee").all()
+    assert ri_fees["lineItem/ProductCode"].tolist() == ["EC2", "EC2"]
+    assert sp_fees["lineItem/UsageType"].tolist() == ["ComputeSP:1yrAllUpfront"]
+    assert sp_fees["lineItem/Operation"].tolist() == ["SavingsPlanRecurringFee"]
+    assert sp_fees["lineItem/ProductCode"].tolist() == ["ComputeSavingsPlans"]
+    assert sp_fees["product/region"].tolist() == [""]
+    assert (fees["lineItem/UnblendedCost"] == 0.0).all()
+
+
+def test_generated_fee_line_items_load(generated_output):
+    output_dir = generated_output("aws")
+    df_records, _, _ = load_outputs(output_dir)
+    fees = df_records[df_records["lineItem/LineItemType"].isin(["RIFee", "SavingsPlanRecurringFee"])]
+
+    assert len(fees)
+    for col in RECORD_FLOAT_COLUMNS:
+        assert df_records[col].dtype == np.float64
+    assert (fees["lineItem/NormalizationFactor"] == 0.0).all()
+    assert (fees["reservation/AmortizedUpfrontFeeForBillingPeriod"] +
+            fees["savingsPlan/AmortizedUpfrontCommitmentForBillingPeriod"] > 0).all()
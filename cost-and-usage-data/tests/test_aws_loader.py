@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import aws_loader
+from aws_amortization import FEE_LINE_ITEM_TYPES
+
+
+@pytest.fixture
+def output_dir(generated_output):
+    return generated_output("aws")
+
+
+def raw_records(output_dir):
+    """The CUR file exactly as written, every value a string"""
+    return pd.read_csv(os.path.join(output_dir, aws_loader.OUTPUT_FILES["records"]), dtype=str,
+                       keep_default_na=False)
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_records_get_the_declared_dtypes(output_dir, engine):
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    records = aws_loader.load_records(output_dir, engine=engine)
+
+    for col in aws_loader.RECORD_FLOAT_COLUMNS:
+        assert records[col].dtype == np.float64, col
+    for col in aws_loader.RECORD_CATEGORY_COLUMNS:
+        assert isinstance(records[col].dtype, pd.CategoricalDtype), col
+    for col in aws_loader.RECORD_TIMESTAMP_COLUMNS:
+        assert str(records[col].dt.tz) == "UTC", col
+    # Fee line items have no resource, zone or tax type: blanks stay ""
+    fees = records[records["lineItem/LineItemType"].isin(list(FEE_LINE_ITEM_TYPES.values()))]
+    assert len(fees)
+    assert (fees["lineItem/ResourceId"] == "").all()
+    assert not fees[aws_loader.RECORD_FLOAT_COLUMNS].isna().any().any()
+
+
+def test_both_engines_load_the_same_records(output_dir):
+    pytest.importorskip("pyarrow")
+    c_records = aws_loader.load_records(output_dir, engine="c")
+    arrow_records = aws_loader.load_records(output_dir, engine="pyarrow")
+    for col in c_records.columns:
+        assert c_records[col].astype(object).tolist() == arrow_records[col].astype(object).tolist(), col
+
+
+def test_records_round_trip_to_the_csv(output_dir):
+    raw = raw_records(output_dir)
+    records = aws_loader.load_records(output_dir)
+
+    assert list(records.columns) == list(raw.columns)
+    for col in aws_loader.RECORD_TIMESTAMP_COLUMNS:
+        assert (records[col].dt.strftime(aws_loader.TIMESTAMP_FORMAT) == raw[col]).all(), col
+    for col in aws_loader.RECORD_FLOAT_COLUMNS:
+        assert np.array_equal(records[col].to_numpy(), raw[col].astype(float).to_numpy()), col
+    for col in aws_loader.RECORD_CATEGORY_COLUMNS + aws_loader.RECORD_STRING_COLUMNS:
+        assert (records[col].astype(str) == raw[col]).all(), col
+
+
+def test_date_filters_are_half_open(output_dir):
+    raw = raw_records(output_dir)
+    dates = pd.to_datetime(raw[aws_loader.USAGE_DATE_COLUMN], format=aws_loader.TIMESTAMP_FORMAT, utc=True)
+    start, end = sorted(dates.unique())[1], sorted(dates.unique())[-1]
+
+    records = aws_loader.load_records(output_dir, columns=["lineItem/UnblendedCost"], start_date=start,
+                                      end_date=end, add_month=True)
+    expected = (dates >= start) & (dates < end)
+    assert len(records) == expected.sum()
+    assert list(records.columns) == ["lineItem/UnblendedCost", "month"]
+    assert np.isclose(records["lineItem/UnblendedCost"].sum(),
+                      raw.loc[expected, "lineItem/UnblendedCost"].astype(float).sum())
+    assert set(records["month"]) == set(dates[expected].dt.strftime("%Y-%m"))
+
+
+def test_outputs_restrict_tags_to_the_loaded_resources(output_dir):
+    raw = raw_records(output_dir)
+    month_start = pd.Timestamp(raw[aws_loader.USAGE_DATE_COLUMN].min()[:7] + "-01")
+    next_month = month_start + pd.offsets.MonthBegin(1)
+
+    records, tags, lifecycle = aws_loader.load_outputs(output_dir, start_date=month_start, end_date=next_month,
+                                                       tag_keys=["Project"])
+    assert set(records["month"]) == {month_start.strftime("%Y-%m")}
+    assert set(tags["key"]) <= {"Project"}
+    assert set(tags["resourceId"]) <= set(records["lineItem/ResourceId"])
+    assert isinstance(tags["resourceId"].dtype, pd.CategoricalDtype)
+    assert len(lifecycle) and set(aws_loader.LIFECYCLE_DTYPES) <= set(lifecycle.columns)
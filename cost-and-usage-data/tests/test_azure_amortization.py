@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from azure_amortization import build_benefit_purchases, order_utilization, write_amortization_reports
+
+SETTINGS = {"quantity": {"Reserved Instance: 1 year": 2}, "daily_unit_price": {"Reserved Instance: 1 year": 50.0}}
+
+
+def export_records(daily_net_cost, days=10):
+    dates = pd.date_range("2024-09-01", periods=days, freq="D").strftime("%Y-%m-%d")
+    return pd.DataFrame({
+        "Date": dates,
+        "ProductOrderId": "RI-Order-1",
+        "BillingAccountId": "ba-1",
+        "SubscriptionId": "sub-1",
+        "SubscriptionName": "Production",
+        "ServiceName": "VirtualMachines",
+        "ProductOrderName": "Annual Reserved Instance Purchase",
+        "BenefitId": "RI-1",
+        "BenefitName": "Reserved Instance: 1 year",
+        "Term": "P1Y",
+        "PricingModel": "reservation",
+        "Cost": daily_net_cost / 0.7,
+        "BenefitAmount": -daily_net_cost / 0.7 * 0.3
+    })
+
+
+def test_purchases_are_sized_from_the_configured_commitment():
+    # Twice the usage does not change what the order cost
+    low, high = (build_benefit_purchases(export_records(cost), SETTINGS) for cost in (40.0, 80.0))
+    assert low["Quantity"].tolist() == high["Quantity"].tolist() == [2.0]
+    assert np.allclose(low["Cost"], 2 * 50.0 * 365)
+    assert np.allclose(high["Cost"], low["Cost"])
+
+
+def test_underused_commitment_is_reported_unused(tmp_path):
+    records = export_records(60.0)
+    purchases = build_benefit_purchases(records, SETTINGS)
+
+    utilization = order_utilization(records, purchases)
+    assert np.isclose(utilization.loc[0, "CommittedCost"], 100.0 * 10)
+    assert np.isclose(utilization.loc[0, "UsedCommitment"], 60.0 * 10)
+    assert np.isclose(utilization.loc[0, "UnusedCommitment"], 40.0 * 10)
+    assert np.isclose(utilization.loc[0, "Utilization"], 0.6)
+
+    summary = write_amortization_reports(records, purchases, tmp_path)
+    assert np.isclose(summary["unused_commitment"], 400.0)
+    assert np.isclose(summary["commitment_utilization"], 0.6)
+    # The amortized view charges the whole daily commitment, used or not
+    assert np.isclose(summary["amortized_cost"], 1000.0)
+    assert (tmp_path / "benefit_utilization_by_order.csv").exists()
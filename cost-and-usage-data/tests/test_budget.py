@@ -0,0 +1,78 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from finops_common import budget
+
+
+def test_merge_burn_without_earlier_rows_does_not_warn():
+    burn = pd.DataFrame({col: ["x"] for col in budget.ENTITY_COLUMNS}).assign(
+        month=["2024-10"], as_of=pd.to_datetime(["2024-10-05"]), month_to_date=[12.5])
+    # A previous file that only holds the replaced month leaves no earlier
+    # rows; read back from CSV, its dates are strings
+    previous = burn.assign(as_of=["2024-10-04"], month_to_date=[3.0])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        merged = budget.merge_burn(previous, burn)
+    assert merged["month_to_date"].tolist() == [12.5]
+
+
+def daily_spend():
+    dates = pd.date_range("2024-01-25", "2024-03-10", freq="D")
+    rows = [(date, unit, project, cost)
+            for date in dates
+            for unit, project, cost in [("bu-a", "p1", 10.0), ("bu-a", "p2", 5.0), ("bu-b", "p3", 20.0)]]
+    return pd.DataFrame(rows, columns=["date", "business_unit", "project", "cost"])
+
+
+def test_entity_spend_rolls_up_projects():
+    daily = daily_spend()
+    budgets = {"p1": 3650.0, "p2": 1825.0, "p3": 7300.0}
+    state, burn, crossings, days = budget.track_budget(budget.empty_state(), daily, budgets, 12775.0)
+
+    assert days == daily["date"].nunique()
+    last = burn[burn["month"] == burn["month"].max()].set_index("level")
+    assert last.loc["org", "year_to_date"] == pytest.approx(daily["cost"].sum())
+    units = last.loc["business_unit"].set_index("business_unit")
+    assert units.loc["bu-a", "year_to_date"] == pytest.approx(daily.loc[daily["business_unit"] == "bu-a", "cost"].sum())
+    assert units.loc["bu-a", "annual_budget"] == pytest.approx(5475.0)
+    # Each threshold is crossed at most once per entity and period
+    assert not crossings.duplicated(["level", "business_unit", "project", "period", "period_start",
+                                     "threshold"]).any()
+
+
+def test_resumed_run_matches_full_run(tmp_path):
+    daily = daily_spend()
+    budgets = {"p1": 1000.0, "p2": 500.0, "p3": 2000.0}
+    full_dir = tmp_path / "full"
+    resumed_dir = tmp_path / "resumed"
+    full_dir.mkdir()
+    resumed_dir.mkdir()
+
+    budget.write_budget_reports(daily, full_dir, budgets, 3500.0, resume=False)
+    cutoff = pd.Timestamp("2024-02-14")
+    budget.write_budget_reports(daily[daily["date"] <= cutoff], resumed_dir, budgets, 3500.0, resume=False)
+    budget.write_budget_reports(daily, resumed_dir, budgets, 3500.0)
+
+    for name in ["burn", "crossings", "state"]:
+        full = pd.read_csv(full_dir / budget.BUDGET_FILES[name], keep_default_na=False)
+        resumed = pd.read_csv(resumed_dir / budget.BUDGET_FILES[name], keep_default_na=False)
+        if name == "crossings":
+            full = full.sort_values(list(full.columns)).reset_index(drop=True)
+            resumed = resumed.sort_values(list(resumed.columns)).reset_index(drop=True)
+        pd.testing.assert_frame_equal(full, resumed, check_exact=False)
+
+
+def test_run_without_new_days_keeps_burn(tmp_path):
+    daily = daily_spend()
+    budgets = {"p1": 1000.0, "p2": 500.0, "p3": 2000.0}
+    budget.write_budget_reports(daily, tmp_path, budgets, 3500.0, resume=False)
+    before = pd.read_csv(tmp_path / budget.BUDGET_FILES["burn"], keep_default_na=False)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        summary = budget.write_budget_reports(daily, tmp_path, budgets, 3500.0)
+    assert summary["days_tracked"] == 0
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / budget.BUDGET_FILES["burn"], keep_default_na=False), before)
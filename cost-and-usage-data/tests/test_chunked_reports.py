@@ -0,0 +1,61 @@
+import importlib
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from finops_common import chunked_reports
+
+# Partitioned dataset directory of each cloud
+DATASETS = {
+    "aws": "cost_and_usage_report",
+    "gcp": "gcp_billing_export",
+    "azure": "azure_cost_management_export"
+}
+
+
+def sorted_cube(cube, dimensions):
+    cube = cube.copy()
+    for col in dimensions:
+        cube[col] = cube[col].astype(str)
+    return cube.sort_values(dimensions).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("cloud", sorted(DATASETS))
+def test_chunked_cube_matches_in_memory_cube(cloud, generated_output):
+    output_dir = generated_output(cloud)
+    cube_module = importlib.import_module(f"{cloud}_cost_cube")
+    chunked = importlib.import_module(f"{cloud}_chunked_reports")
+    loader = importlib.import_module(f"{cloud}_loader")
+
+    records = loader.load_records(output_dir, columns=cube_module.RECORD_COLUMNS)
+    expected = sorted_cube(cube_module.build_cost_cube(records), cube_module.CUBE_DIMENSIONS)
+
+    sources = [
+        chunked.iter_csv_chunks(output_dir, chunk_rows=97),
+        chunked.iter_partition_chunks(os.path.join(output_dir, DATASETS[cloud]))
+    ]
+    for chunks in sources:
+        # A small pending limit combines the partial cubes many times over
+        cube = sorted_cube(chunked.build_cost_cube_chunked(chunks, max_pending_rows=50),
+                           cube_module.CUBE_DIMENSIONS)
+        assert len(cube) == len(expected)
+        assert (cube[cube_module.CUBE_DIMENSIONS] == expected[cube_module.CUBE_DIMENSIONS]).all().all()
+        assert np.allclose(cube[cube_module.CUBE_MEASURES].to_numpy(dtype=float),
+                           expected[cube_module.CUBE_MEASURES].to_numpy(dtype=float))
+
+
+def test_reduce_chunks_combines_every_reducer():
+    chunks = [pd.DataFrame({"key": ["a", "b"], "cost": [1.0, 2.0]}),
+              pd.DataFrame({"key": ["c", "a"], "cost": [1.0, 2.0]}),
+              pd.DataFrame({"key": ["b"], "cost": [1.0]})]
+
+    def combine(parts):
+        return pd.concat(parts).groupby("key", as_index=False)["cost"].sum()
+
+    cube, counts = chunked_reports.reduce_chunks(
+        chunks, [(lambda chunk: combine([chunk]), combine), (lambda chunk: chunk[["key"]], pd.concat)],
+        max_pending_rows=2)
+    assert cube.set_index("key")["cost"].to_dict() == {"a": 1.0 + 2.0, "b": 2.0 + 1.0, "c": 1.0}
+    assert sorted(counts["key"]) == list("aabbc")
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from finops_common import commitments
+
+FAMILY_COLUMNS = ["service", "region", "account"]
+SETTINGS = {"sweep_quantiles": [0.0, 0.5, 1.0]}
+
+
+def brute_force_cost(usage, commitment, discount):
+    """Commitment paid every period plus usage above it on demand"""
+    return commitment * (1 - discount) * len(usage) + np.maximum(usage - commitment, 0.0).sum()
+
+
+def test_sweep_matches_brute_force_costs():
+    rng = np.random.default_rng(11)
+    matrix = rng.gamma(2.0, 50.0, (4, 30))
+    discounts = np.array([0.3, 0.4, 0.5, 0.6])
+    sweep = commitments.sweep_commitments(matrix, discounts)
+
+    for family in range(len(matrix)):
+        for level, commitment in enumerate(sweep["commitment"][family]):
+            expected = brute_force_cost(matrix[family], commitment, discounts[family])
+            assert np.isclose(sweep["total_cost"][family, level], expected)
+
+
+def test_recommendation_is_the_cheapest_level():
+    rng = np.random.default_rng(5)
+    matrix = np.vstack([rng.normal(100.0, 5.0, 60), rng.exponential(100.0, 60), np.zeros(60)])
+    families = pd.DataFrame({"service": ["a", "b", "c"], "region": "r", "account": "1"})
+    discounts = np.full(3, 0.4)
+    recommendations, sweep = commitments.recommend_commitments(families, matrix, discounts, SETTINGS)
+
+    assert list(recommendations.columns) == FAMILY_COLUMNS + commitments.RECOMMENDATION_COLUMNS
+    assert list(sweep.columns) == FAMILY_COLUMNS + commitments.SWEEP_COLUMNS
+    best = recommendations.set_index("service")
+    for family, service in enumerate(families["service"]):
+        candidates = np.r_[0.0, np.unique(matrix[family])]
+        cheapest = min(brute_force_cost(matrix[family], level, 0.4) for level in candidates)
+        assert np.isclose(best.loc[service, "total_cost"], cheapest)
+    # A steady family is worth committing to; a family without usage is not
+    assert best.loc["a", "savings"] > 0
+    assert best.loc["c", "commitment"] == 0.0
+
+
+def test_family_matrix_and_mapped_discounts():
+    rows = pd.DataFrame({"service": ["a", "a", "b"], "region": "r", "account": ["1", "1", "2"],
+                         "period": np.array(["2024-01-01", "2024-01-01", "2024-01-03"], dtype="datetime64[D]"),
+                         "cost": [1.0, 2.0, 5.0]})
+    periods = np.array(["2024-01-01", "2024-01-02", "2024-01-03"], dtype="datetime64[D]")
+    families, matrix = commitments.family_matrix(rows, periods, FAMILY_COLUMNS)
+
+    assert families["service"].tolist() == ["a", "b"]
+    assert matrix.tolist() == [[3.0, 0.0, 0.0], [0.0, 0.0, 5.0]]
+    discounts = commitments.family_discounts(families, {"a": {"1": 0.7}, "b": {"2": 1.0}}, 0.25)
+    assert np.allclose(discounts, [0.3, 0.25])
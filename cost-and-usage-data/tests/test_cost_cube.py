@@ -0,0 +1,84 @@
+import importlib
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from finops_common.chunked_reports import lifecycle_business_units
+
+
+def aws_attributes(records, tags, lifecycle):
+    import aws_tag_resolver
+    return aws_tag_resolver.resolve_tag_attributes(
+        records, tags, project_business_units=lifecycle_business_units(lifecycle))
+
+
+def gcp_attributes(records, labels, lifecycle):
+    import gcp_label_resolver
+    return gcp_label_resolver.resolve_label_attributes(
+        records, labels, project_business_units=lifecycle_business_units(lifecycle))
+
+
+def azure_attributes(records, tags, lifecycle):
+    import azure_tag_resolver
+    return azure_tag_resolver.resolve_tag_attributes(records, tags)
+
+
+# Per cloud: record month, per-record attributes, cost, service and project
+# columns, and the project summary file
+CUBE_REPORTS = {
+    "aws": (lambda df: df["lineItem/UsageStartDate"].dt.strftime("%Y-%m"), aws_attributes,
+            "lineItem/UnblendedCost", "lineItem/ProductCode", "project", "cost_summary_by_project.csv"),
+    "gcp": (lambda df: df["invoice.month"].astype(str), gcp_attributes,
+            "cost", "service.description", "project.name", "cost_summary_by_project.csv"),
+    "azure": (lambda df: df["Date"].dt.strftime("%Y-%m"), azure_attributes,
+              "Cost", "ServiceName", "SubscriptionName", "cost_summary_by_subscription.csv")
+}
+
+
+def assert_report_matches(output_dir, file_name, records, keys, cost):
+    """A report written from the cube equals the same groupby over the records"""
+    report = pd.read_csv(os.path.join(output_dir, file_name), dtype={key: str for key in keys},
+                         keep_default_na=False)
+    expected = records.groupby(keys)[cost].sum()
+    actual = report.set_index(keys)[cost]
+    assert sorted(actual.index) == sorted(expected.index), file_name
+    assert np.allclose(actual.loc[expected.index].to_numpy(), expected.to_numpy()), file_name
+
+
+@pytest.mark.parametrize("cloud", sorted(CUBE_REPORTS))
+def test_cube_reports_match_record_groupbys(cloud, generated_output):
+    month, attributes, cost, service, project, project_file = CUBE_REPORTS[cloud]
+    output_dir = generated_output(cloud)
+    loader = importlib.import_module(f"{cloud}_loader")
+    records, tags, lifecycle = loader.load_outputs(output_dir)
+
+    records = attributes(records.assign(month=month(records)), tags, lifecycle)
+    for col in ["month", service, project, "chargeback_entity", "allocation_method", "business_unit"]:
+        records[col] = records[col].astype(str)
+
+    reports = {
+        "chargeback_by_entity.csv": ["month", "chargeback_entity"],
+        "chargeback_by_service_entity.csv": ["month", "chargeback_entity", service],
+        "cost_by_allocation_method.csv": ["month", "allocation_method"],
+        "cost_summary_by_service.csv": ["month", service],
+        "cost_summary_by_business_unit.csv": ["month", "business_unit"],
+        project_file: ["month", project]
+    }
+    for file_name, keys in reports.items():
+        assert_report_matches(output_dir, file_name, records, keys, cost)
+
+
+@pytest.mark.parametrize("cloud", sorted(CUBE_REPORTS))
+def test_cube_keeps_every_record_cost(cloud, generated_output):
+    cube_module = importlib.import_module(f"{cloud}_cost_cube")
+    loader = importlib.import_module(f"{cloud}_loader")
+    records = loader.load_records(generated_output(cloud), columns=cube_module.RECORD_COLUMNS)
+
+    before = records.copy()
+    cube = cube_module.build_cost_cube(records)
+    pd.testing.assert_frame_equal(records, before)
+    assert len(cube) < len(records)
+    assert np.allclose(cube[cube_module.CUBE_MEASURES].sum().to_numpy(dtype=float),
+                       records[cube_module.CUBE_MEASURES].sum().to_numpy(dtype=float))
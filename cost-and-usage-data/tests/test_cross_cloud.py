@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from aws_cross_cloud import translation_table, translate_records
+from finops_common.cross_cloud import unit_factor
+
+CATALOGS = {
+    "aws": {"Compute": {"EC2": {"unit": "Hrs", "base_rate": 0.10},
+                        "AuditManager": {"unit": "Months", "base_rate": 1.0}},
+            "Storage": {"S3": {"unit": "GB-Month", "base_rate": 0.02}}},
+    "gcp": {"Compute": {"ComputeEngine": {"unit": "hour", "base_rate": 0.08},
+                        "SecurityCommandCenter": {"unit": "asset", "base_rate": 5.0}},
+            "Storage": {"CloudStorage": {"unit": "GiB-month", "base_rate": 0.02}}},
+    "azure": {"Compute": {"VirtualMachines": {"unit": "Minute", "base_rate": 0.001}}}
+}
+AWS_TO_GCP = {"EC2": "ComputeEngine", "S3": "CloudStorage", "AuditManager": "SecurityCommandCenter"}
+GCP_TO_AZURE = {"ComputeEngine": "VirtualMachines"}
+
+
+def test_units_convert_only_within_a_quantity():
+    assert unit_factor("Hrs", "hour") == 1.0
+    assert unit_factor("Hour", "Minute") == 60.0
+    assert np.isclose(unit_factor("GiB-month", "GB-Month"), 1.073741824)
+    assert unit_factor("10000Requests", "Requests") == 10000.0
+    assert np.isnan(unit_factor("asset", "Months"))
+    assert np.isnan(unit_factor("vCPU-seconds", "Hrs"))
+    assert unit_factor("Certificates-Month", "certificates-month") == 1.0
+
+
+def test_usage_is_priced_in_the_target_unit():
+    records = pd.DataFrame({
+        "lineItem/LineItemType": ["Usage", "Usage", "Usage"],
+        "lineItem/ResourceId": ["i-1", "bucket-1", "audit-1"],
+        "lineItem/ProductCode": ["EC2", "S3", "AuditManager"],
+        "lineItem/UsageAmount": [10.0, 100.0, 2.0],
+        "lineItem/UnblendedCost": [1.0, 2.0, 2.0]
+    })
+    tags = pd.DataFrame({"resourceId": ["i-1"], "key": ["Project"], "value": ["Alpha"]})
+    table = translation_table(records["lineItem/ProductCode"].unique(), CATALOGS, AWS_TO_GCP, GCP_TO_AZURE)
+    lines = translate_records(records, tags, table).set_index("aws_service")
+
+    # 10 hours of EC2 is 10 ComputeEngine hours and 600 VirtualMachines minutes
+    assert np.isclose(lines.loc["EC2", "gcp_cost"], 10 * 0.08)
+    assert np.isclose(lines.loc["EC2", "azure_cost"], 600 * 0.001)
+    # 100 GB-months are 93.1 GiB-months
+    assert np.isclose(lines.loc["S3", "gcp_cost"], 100 / 1.073741824 * 0.02)
+    # Asset counts cannot be priced from months: the AWS cost is carried over as unmapped
+    assert lines.loc["AuditManager", "gcp_cost"] == lines.loc["AuditManager", "aws_cost"] == 2.0
+    assert lines.loc["AuditManager", "gcp_unmapped_cost"] == 2.0
+    assert lines.loc["S3", "azure_unmapped_cost"] == lines.loc["S3", "aws_cost"]
+    assert lines.loc["EC2", "project"] == "Alpha"
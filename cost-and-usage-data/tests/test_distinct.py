@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from aws_cost_cube import aggregate_records
+from aws_distinct import aggregate_sketches, add_distinct_counts
+
+
+def test_resource_counts_are_exact_and_usage_types_estimated():
+    rng = np.random.default_rng(3)
+    rows = 30000
+    records = pd.DataFrame({
+        "lineItem/UsageStartDate": "2024-09-01T00:00:00Z",
+        "lineItem/UsageAccountId": "111111111111",
+        "lineItem/ProductCode": rng.choice(["AmazonEC2", "AmazonS3"], rows),
+        "lineItem/ResourceId": rng.integers(0, 5000, rows).astype(str),
+        "lineItem/UsageType": rng.integers(0, 3000, rows).astype(str),
+        "lineItem/UnblendedCost": 1.0,
+        "lineItem/BlendedCost": 1.0
+    })
+    # Blank resource ids (e.g. tax and support rows) are not resources
+    records.loc[:99, "lineItem/ResourceId"] = ""
+
+    cube = aggregate_records(records)
+    summary = cube.groupby(["month", "lineItem/ProductCode"])["lineItem/UnblendedCost"].sum().reset_index()
+    add_distinct_counts(summary, aggregate_sketches(records), ["month", "lineItem/ProductCode"], cube)
+
+    counted = records[records["lineItem/ResourceId"] != ""]
+    expected = counted.groupby("lineItem/ProductCode")["lineItem/ResourceId"].nunique()
+    assert summary["distinct_resources"].tolist() == expected.loc[summary["lineItem/ProductCode"]].tolist()
+
+    usage_types = records.groupby("lineItem/ProductCode")["lineItem/UsageType"].nunique()
+    error = summary["distinct_usage_types"].to_numpy() / usage_types.loc[summary["lineItem/ProductCode"]].to_numpy()
+    assert np.all(np.abs(error - 1) < 0.05)
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from finops_common import forecast
+
+
+def synthetic_daily(num_days=84):
+    """Two projects of one business unit with a weekly pattern, one growing linearly"""
+    days = np.datetime64("2024-01-01") + np.arange(num_days)
+    weekly = np.array([1.0, 1.1, 1.1, 1.0, 0.9, 0.5, 0.5])
+    frames = []
+    for project, base, growth in [("p1", 100.0, 0.0), ("p2", 50.0, 1.0)]:
+        cost = (base + growth * np.arange(num_days)) * weekly[np.arange(num_days) % 7]
+        frames.append(pd.DataFrame({"date": days, "business_unit": "bu", "project": project,
+                                    "service": "compute", "stage": "prod", "cost": cost}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_forecast_follows_weekly_pattern_and_trend():
+    daily = synthetic_daily()
+    result, summary = forecast.forecast_hierarchy(daily)
+    horizon = forecast.FORECAST_SETTINGS["horizon_days"]
+    series = result[result["level"] == "series"]
+
+    p1 = series.loc[series["project"] == "p1", "forecast"].to_numpy()
+    expected = 100.0 * np.array([1.0, 1.1, 1.1, 1.0, 0.9, 0.5, 0.5])[(84 + np.arange(horizon)) % 7]
+    assert np.allclose(p1, expected, rtol=0.05)
+    p2 = series.loc[series["project"] == "p2", "forecast"].to_numpy()
+    assert p2[7:14].sum() > p2[:7].sum()
+    assert summary["in_sample_wape"] < 0.05
+    assert (result["lower"] <= result["forecast"]).all() and (result["forecast"] <= result["upper"]).all()
+
+
+def test_reconciled_levels_add_up():
+    result, summary = forecast.forecast_hierarchy(synthetic_daily())
+    by_level = result.groupby(["level", "date"])["forecast"].sum().unstack("level")
+    assert np.allclose(by_level["series"], by_level["org"])
+    assert np.allclose(by_level["project"], by_level["org"])
+    assert np.isclose(summary["total_forecast"], by_level["org"].sum())
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from gcp_credits import build_credit_table, record_credit_amounts
+from gcp_cost_cube import aggregate_records
+
+
+def test_cube_credits_do_not_depend_on_row_order():
+    credit_lists = [[{"type": "PROMOTION", "name": "p", "full_name": "Promotion", "id": "p-1", "amount": -2.0}],
+                    [],
+                    [{"type": "SUSTAINED_USAGE_DISCOUNT", "name": "s", "full_name": "SUD", "id": "s-1",
+                      "amount": -1.5},
+                     {"type": "PROMOTION", "name": "p", "full_name": "Promotion", "id": "p-2", "amount": -0.5}]]
+    records = pd.DataFrame({
+        "invoice.month": ["202409"] * 3,
+        "project.id": ["a", "b", "c"],
+        "project.name": ["a", "b", "c"],
+        "service.description": ["Compute Engine"] * 3,
+        "resource.name": ["vm-a", "vm-b", "vm-c"],
+        "cost": [10.0, 5.0, 8.0]
+    })
+    records["credit_amount"] = record_credit_amounts(build_credit_table(credit_lists), len(records))
+
+    # Partitions and warehouse copies do not keep the export's row order
+    shuffled = records.iloc[[2, 0, 1]].reset_index(drop=True)
+    cube = aggregate_records(shuffled).set_index("project.id")
+    assert np.allclose(cube.loc[["a", "b", "c"], "credit_amount"], [-2.0, 0.0, -2.0])
@@ -0,0 +1,29 @@
+import pytest
+
+import generator_benchmark
+
+SIZE = {"projects": 2, "days": 20, "resources": 1}
+
+
+@pytest.mark.parametrize("cloud", sorted(generator_benchmark.GENERATORS))
+def test_runs_of_one_case_generate_the_same_records(cloud):
+    first = generator_benchmark.run_case((cloud, SIZE, 7))
+    second = generator_benchmark.run_case((cloud, SIZE, 7))
+
+    assert first["records"] > 0
+    assert (first["records"], first["tags"]) == (second["records"], second["tags"])
+    assert set(first["write_seconds"]) == set(generator_benchmark.GENERATORS[cloud]["files"])
+
+
+def test_regressions_are_flagged_beyond_the_tolerance():
+    baseline = {"aws/1p": {"records_per_second": 1000.0, "peak_rss_mb": 100.0},
+                "gcp/1p": {"records_per_second": 1000.0, "peak_rss_mb": 100.0}}
+    results = {"aws/1p": {"records_per_second": 700.0, "peak_rss_mb": 110.0},
+               "gcp/1p": {"records_per_second": 900.0, "peak_rss_mb": 130.0},
+               "azure/1p": {"records_per_second": 10.0, "peak_rss_mb": 999.0}}
+    comparison = generator_benchmark.compare_to_baseline(results, baseline, 0.2)
+
+    flagged = comparison.set_index(["case", "metric"])["regression"]
+    assert flagged.to_dict() == {
+        ("aws/1p", "records_per_second"): True, ("aws/1p", "peak_rss_mb"): False,
+        ("gcp/1p", "records_per_second"): False, ("gcp/1p", "peak_rss_mb"): True}
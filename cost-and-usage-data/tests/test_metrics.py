@@ -0,0 +1,63 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import TEST_VOLUME_SETTINGS, run_generator
+from finops_common import metrics
+
+
+def test_run_stage_records_every_block():
+    run = metrics.start_run_metrics()
+    with metrics.run_stage(run, "build", rows=3):
+        sum(range(10000))
+    with pytest.raises(ValueError):
+        with metrics.run_stage(run, "failing"):
+            raise ValueError("stage failed")
+
+    assert [stage["stage"] for stage in run["stages"]] == ["build", "failing"]
+    assert run["stages"][0]["rows"] == 3
+    assert all(set(metrics.STAGE_FIELDS) <= set(stage) for stage in run["stages"])
+    assert run["stages"][0]["wall_seconds"] >= 0
+
+
+def test_disabled_metrics_record_nothing(tmp_path):
+    with metrics.run_stage(None, "build"):
+        pass
+    metrics.add_stages(None, [{"stage": "generation"}])
+
+    run = metrics.start_run_metrics()
+    metrics.add_stages(run, [{"stage": "generation"}, None])
+    path = metrics.write_run_metrics(run, str(tmp_path))
+    with open(path) as f:
+        written = json.load(f)
+    assert written["stages"] == [{"stage": "generation"}]
+    assert set(written["total"]) == set(metrics.STAGE_FIELDS)
+
+
+@pytest.mark.parametrize("cloud", ["aws", "gcp", "azure"])
+def test_generator_writes_run_metrics(cloud, tmp_path, generated_output):
+    assert not os.path.exists(os.path.join(generated_output(cloud), metrics.RUN_METRICS_FILE))
+
+    output_dir = run_generator(cloud, tmp_path, run_metrics=True)
+    with open(os.path.join(output_dir, metrics.RUN_METRICS_FILE)) as f:
+        run = json.load(f)
+
+    names = [stage["stage"] for stage in run["stages"]]
+    # One generation stage per project, measured in the worker that ran it
+    generation = [stage for stage in run["stages"] if stage["stage"] == "generation" and "project" in stage]
+    assert len(generation) == TEST_VOLUME_SETTINGS["maximum_projects_to_be_picked"]
+    assert "dataframe_build" in names and "report" in names
+    assert all(set(metrics.STAGE_FIELDS) <= set(stage) for stage in run["stages"])
+
+    writes = [stage for stage in run["stages"] if stage["stage"] == "csv_write"]
+    assert writes
+    for stage in writes:
+        rows = len(pd.read_csv(os.path.join(output_dir, stage["file"]), usecols=[0]))
+        assert stage["rows"] == rows
+
+    # Stages measured in this process run one after another within the total
+    own = [stage["wall_seconds"] for stage in run["stages"] if stage["pid"] == os.getpid()]
+    assert sum(own) <= run["total"]["wall_seconds"] + 1e-3
+    assert run["peak_rss_mb"] > 0
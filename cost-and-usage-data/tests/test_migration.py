@@ -0,0 +1,101 @@
+import importlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Per cloud: the tag or label loader, its scope keys constant and the cost column
+MIGRATION = {
+    "aws": ("load_tags", "SCOPE_TAGS", "lineItem/UnblendedCost"),
+    "gcp": ("load_labels", "SCOPE_LABELS", "cost"),
+    "azure": ("load_tags", "SCOPE_TAGS", "Cost")
+}
+
+FACTORS = {"cheap": 0.5, "base": 1.0, "dear": 1.5}
+
+
+def brute_force_delta(module, cube, plan, regional_factors):
+    """Moved cost and delta of a plan, one move and one cube row at a time"""
+    moved, delta = 0.0, 0.0
+    for move in plan["moves"]:
+        ratio = regional_factors.get(move["to_region"], 1.0) / regional_factors.get(move["from_region"], 1.0)
+        for _, row in cube.iterrows():
+            if row[module.REGION_COLUMN] != move["from_region"]:
+                continue
+            if any(key in move and str(move[key]) != str(row[col]) for key, col in module.MOVE_SCOPES.items()):
+                continue
+            moved += row["cost"]
+            delta += row["cost"] * (ratio - 1.0)
+    return moved, delta
+
+
+def synthetic_cube(module):
+    scope_column = list(module.MOVE_SCOPES.values())[2]
+    return pd.DataFrame({
+        "month": ["2026-01", "2026-01", "2026-02", "2026-02", "2026-02"],
+        "project": ["A", "A", "A", "B", "B"],
+        "environment": ["prod", "dev", "prod", "prod", "prod"],
+        scope_column: ["1", "1", "1", "2", "2"],
+        module.REGION_COLUMN: ["dear", "dear", "dear", "dear", "unfactored"],
+        "cost": [100.0, 10.0, 200.0, 40.0, 7.0]
+    })
+
+
+@pytest.mark.parametrize("cloud", sorted(MIGRATION))
+def test_plans_match_brute_force(cloud):
+    module = importlib.import_module(f"{cloud}_migration")
+    scope_key = list(module.MOVE_SCOPES)[2]
+    cube = synthetic_cube(module)
+    plans = [
+        {"name": "A prod", "moves": [{"project": "A", "environment": "prod",
+                                       "from_region": "dear", "to_region": "cheap"}]},
+        {"name": "all dear", "moves": [{"from_region": "dear", "to_region": "base"}]},
+        {"name": "two moves", "moves": [{scope_key: "2", "from_region": "dear", "to_region": "cheap"},
+                                        {"from_region": "unfactored", "to_region": "dear"}]},
+        {"name": "nothing there", "moves": [{"project": "C", "from_region": "dear", "to_region": "cheap"}]}
+    ]
+    deltas, ranking = module.evaluate_plans(cube, plans, FACTORS)
+
+    assert list(deltas.columns) == module.DELTA_COLUMNS
+    assert list(ranking.columns) == module.RANKING_COLUMNS
+    ranked = ranking.set_index("plan")
+    for plan in plans:
+        moved, delta = brute_force_delta(module, cube, plan, FACTORS)
+        assert np.isclose(ranked.loc[plan["name"], "moved_cost"], moved)
+        assert np.isclose(ranked.loc[plan["name"], "delta"], delta)
+        monthly = deltas[deltas["plan"] == plan["name"]]
+        assert np.isclose(monthly["delta"].sum(), delta)
+        assert np.allclose(monthly["migrated_cost"], monthly["moved_cost"] + monthly["delta"])
+
+    # Moving A's production from 1.5 to 0.5 saves two thirds of it
+    assert np.isclose(ranked.loc["A prod", "delta"], -300.0 * 2 / 3)
+    assert ranked.loc["nothing there", "moved_cost"] == 0.0
+    assert ranking["plan"].iloc[0] == "A prod"
+    assert list(ranking["rank"]) == list(range(1, len(plans) + 1))
+    assert list(ranking["delta"]) == sorted(ranking["delta"])
+
+
+@pytest.mark.parametrize("cloud", sorted(MIGRATION))
+def test_candidate_plans_on_generated_output(cloud, generated_output):
+    module = importlib.import_module(f"{cloud}_migration")
+    loader = importlib.import_module(f"{cloud}_loader")
+    load_tags, scope_tags, cost_column = MIGRATION[cloud]
+    output_dir = generated_output(cloud)
+    records = loader.load_records(output_dir, columns=module.MIGRATION_RECORD_COLUMNS)
+    tags = getattr(loader, load_tags)(output_dir, keys=[key for key, _ in getattr(module, scope_tags).values()])
+
+    cube = module.placement_cube(records, tags)
+    assert np.isclose(cube["cost"].sum(), records[cost_column].to_numpy(dtype=float).sum())
+
+    regions = sorted(cube[module.REGION_COLUMN].unique())[:3]
+    factors = {region: 1.0 + i * 0.25 for i, region in enumerate(regions)}
+    plans = module.candidate_plans(cube, list(factors))
+    assert plans and all(move["from_region"] != move["to_region"] for plan in plans for move in plan["moves"])
+
+    _, ranking = module.evaluate_plans(cube, plans, factors)
+    assert ranking["moved_cost"].gt(0).any()
+    ranked = ranking.set_index("plan")
+    for plan in plans:
+        moved, delta = brute_force_delta(module, cube, plan, factors)
+        assert np.isclose(ranked.loc[plan["name"], "moved_cost"], moved)
+        assert np.isclose(ranked.loc[plan["name"], "delta"], delta)
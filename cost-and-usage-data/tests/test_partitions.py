@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+
+import aws_partitions
+import gcp_partitions
+import azure_partitions
+from finops_common import partitions as finops_partitions
+
+
+def aws_records(month):
+    return pd.DataFrame({
+        "lineItem/UsageStartDate": [f"{month}-01T00:00:00Z", f"{month}-02T00:00:00Z", f"{month}-03T00:00:00Z"],
+        "lineItem/UsageAccountId": ["111111111111", "111111111111", "222222222222"],
+        "lineItem/ProductCode": ["AmazonEC2", "AmazonS3", "AmazonEC2"],
+        "product/region": ["us-east-1", "us-east-1", "eu-west-1"],
+        "lineItem/ResourceId": ["i-1", "bucket-1", "i-2"],
+        "lineItem/UnblendedCost": [1.0, 2.0, 3.0]
+    })
+
+
+def gcp_records(month):
+    return pd.DataFrame({
+        "usage_start_time": [f"{month}-01T00:00:00", f"{month}-02T00:00:00", f"{month}-03T00:00:00"],
+        "service.description": ["Compute Engine", "Cloud Storage", "Compute Engine"],
+        "project.id": ["project-a", "project-a", "project-b"],
+        "project.name": ["Project A", "Project A", "Project B"],
+        "billing_account_id": ["0000-AAAA", "0000-AAAA", "0000-AAAA"],
+        "location.region": ["us-central1", "us-central1", "europe-west1"],
+        "resource.name": ["vm-1", "bucket-1", "vm-2"],
+        "cost": [1.0, 2.0, 3.0]
+    })
+
+
+def azure_records(month):
+    return pd.DataFrame({
+        "Date": [f"{month}-01", f"{month}-02", f"{month}-03"],
+        "ServiceName": ["Virtual Machines", "Storage", "Virtual Machines"],
+        "SubscriptionId": ["sub-a", "sub-a", "sub-b"],
+        "ResourceLocation": ["eastus", "eastus", "westeurope"],
+        "ResourceId": ["/vm-1", "/storage-1", "/vm-2"],
+        "Cost": [1.0, 2.0, 3.0]
+    })
+
+
+@pytest.mark.parametrize("partitions, records", [
+    (aws_partitions, aws_records),
+    (gcp_partitions, gcp_records),
+    (azure_partitions, azure_records)
+])
+def test_rewrite_replaces_earlier_partitions(tmp_path, partitions, records):
+    dataset_dir = str(tmp_path / "dataset")
+    partitions.write_partitioned_records(records("2024-09"), dataset_dir, file_format="csv")
+    written = partitions.write_partitioned_records(records("2024-10"), dataset_dir, file_format="csv")
+
+    stats = partitions.read_partition_stats(dataset_dir)
+    assert [part_dir for part_dir, _ in stats] == sorted(written)
+    assert {partition["month"] for _, partition in stats} == {"2024-10"}
+    assert sum(partition["row_count"] for _, partition in stats) == 3
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["dataset"]
+
+
+@pytest.mark.parametrize("partitions, records, filters, expected", [
+    (aws_partitions, aws_records, {"accounts": "222222222222"}, ["222222222222"]),
+    (aws_partitions, aws_records, {"resource_ids": "bucket-1"}, ["111111111111"]),
+    (gcp_partitions, gcp_records, {"projects": "Project B"}, ["project-b"]),
+    (gcp_partitions, gcp_records, {"resource_names": ["vm-1", "vm-2"]}, ["project-a", "project-b"]),
+    (azure_partitions, azure_records, {"regions": "westeurope"}, ["sub-b"]),
+    (azure_partitions, azure_records, {"end_date": "2024-09-01"}, [])
+])
+def test_pruning_keeps_matching_partitions(tmp_path, partitions, records, filters, expected):
+    dataset_dir = str(tmp_path / "dataset")
+    partitions.write_partitioned_records(records("2024-09"), dataset_dir, file_format="csv")
+
+    matched = partitions.prune_partitions(dataset_dir, **filters)
+    assert [part_dir.rsplit("=", 1)[1] for part_dir in matched] == expected
+
+
+def test_bloom_filter_has_no_false_negatives():
+    values = [f"resource-{i}" for i in range(1000)]
+    bloom = finops_partitions.build_bloom_filter(values, false_positive_rate=0.01)
+
+    assert all(finops_partitions.bloom_might_contain(bloom, value) for value in values)
+    misses = sum(finops_partitions.bloom_might_contain(bloom, f"other-{i}") for i in range(1000))
+    assert misses < 50
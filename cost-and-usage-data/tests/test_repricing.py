@@ -0,0 +1,77 @@
+import copy
+import importlib
+
+import numpy as np
+import pytest
+
+from conftest import load_generator
+
+# Per cloud: the generator's discount mapping, the column telling repriced
+# rows apart, and the cost column every repriced row scales
+REPRICING = {
+    "aws": ("RI_DISCOUNT_MAPPING", "lineItem/LineItemType", "lineItem/UnblendedCost"),
+    "gcp": ("CUD_DISCOUNT_MAPPING", "cost_type", "cost"),
+    "azure": ("BENEFIT_DISCOUNT_MAPPING", "ChargeType", "Cost")
+}
+
+
+def repriced_columns(module):
+    return getattr(module, "REPRICED_COLUMNS", None) or module.UNBLENDED_COLUMNS + module.BLENDED_COLUMNS
+
+
+def repriced_rows(cloud, module, records):
+    _, type_column, _ = REPRICING[cloud]
+    types = records[type_column].astype(object)
+    if cloud == "aws":
+        return types.isin(module.REPRICED_LINE_ITEM_TYPES).to_numpy()
+    if cloud == "gcp":
+        return (types == importlib.import_module("gcp_commitments").USAGE_COST_TYPE).to_numpy()
+    return (types == importlib.import_module("azure_commitments").USAGE_CHARGE_TYPE).to_numpy()
+
+
+def load(cloud, generated_output):
+    module = importlib.import_module(f"{cloud}_repricing")
+    records = importlib.import_module(f"{cloud}_loader").load_records(generated_output(cloud))
+    mapping = getattr(load_generator(cloud), REPRICING[cloud][0])
+    return module, records, mapping
+
+
+@pytest.mark.parametrize("cloud", sorted(REPRICING))
+def test_unchanged_mapping_is_the_identity(cloud, generated_output, tmp_path):
+    module, records, mapping = load(cloud, generated_output)
+    settings = dict(module.REPRICING_SETTINGS, records_file=None)
+    summary = module.write_repricing_reports(records, mapping, copy.deepcopy(mapping), str(tmp_path), settings)
+
+    repriced = module.reprice_records(records, mapping, copy.deepcopy(mapping))
+    for col in repriced_columns(module):
+        assert np.array_equal(repriced[col].to_numpy(dtype=float), records[col].to_numpy(dtype=float))
+    assert module.repricing_diff(records, repriced, mapping, mapping).empty
+    assert summary["pairs_repriced"] == 0 and summary["line_items_repriced"] == 0
+
+
+@pytest.mark.parametrize("cloud", sorted(REPRICING))
+def test_changed_factor_scales_only_its_repriced_rows(cloud, generated_output):
+    module, records, mapping = load(cloud, generated_output)
+    cost_column = REPRICING[cloud][2]
+    repriced_mask = repriced_rows(cloud, module, records)
+
+    # Halve the factor of the first repriced row's service and account
+    service, account = (str(value) for value in records.loc[repriced_mask, module.KEY_COLUMNS].iloc[0])
+    new_mapping = copy.deepcopy(mapping)
+    old_factor = mapping.get(service, {}).get(account, 1.0)
+    new_mapping.setdefault(service, {})[account] = old_factor * 0.5
+
+    repriced = module.reprice_records(records, mapping, new_mapping)
+    keys = records[module.KEY_COLUMNS].astype(object).astype(str)
+    changed = (keys.iloc[:, 0] == service).to_numpy() & (keys.iloc[:, 1] == account).to_numpy() & repriced_mask
+
+    old_cost = records[cost_column].to_numpy(dtype=float)
+    new_cost = repriced[cost_column].to_numpy(dtype=float)
+    assert np.allclose(new_cost[changed], old_cost[changed] * 0.5)
+    assert np.array_equal(new_cost[~changed], old_cost[~changed])
+
+    diff = module.repricing_diff(records, repriced, mapping, new_mapping)
+    assert list(diff.columns) == module.DIFF_COLUMNS
+    assert len(diff) == 1 and diff["line_items"].iloc[0] == changed.sum()
+    delta = [col for col in module.DIFF_COLUMNS if col.endswith("delta")][0]
+    assert np.isclose(diff[delta].iloc[0], new_cost.sum() - old_cost.sum())
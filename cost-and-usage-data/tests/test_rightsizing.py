@@ -0,0 +1,98 @@
+import importlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from finops_common import rightsizing
+
+RESOURCE_COLUMNS = ["service", "resource"]
+
+CATALOG = pd.DataFrame({
+    "service": ["EC2"] * 4 + ["RDS"],
+    "size": ["m5.large", "m5.xlarge", "m5.2xlarge", "m5.4xlarge", "db.m5.large"],
+    "family": ["m5"] * 4 + ["db.m5"],
+    "capacity": [4.0, 8.0, 16.0, 32.0, 4.0]
+})
+
+
+def usage_rows(usage_by_resource, days=10):
+    """Flat daily usage hours for each (resource, current size)"""
+    return pd.DataFrame([
+        {"service": "EC2", "resource": resource, "current_type": size, "day": np.datetime64("2026-01-01") + day,
+         "amount": hours, "cost": hours * 0.05}
+        for (resource, size), hours in usage_by_resource.items() for day in range(days)])
+
+
+def recommend(rows):
+    resources = rightsizing.usage_profiles(rows, RESOURCE_COLUMNS, CATALOG)
+    return rightsizing.recommend_sizes(resources, CATALOG, RESOURCE_COLUMNS).set_index("resource")
+
+
+def test_load_is_measured_against_the_current_capacity():
+    # A 2xlarge provides 16 * 24 usage hours a day
+    recommendations = recommend(usage_rows({
+        ("idle", "m5.2xlarge"): 16 * 24 * 0.2,
+        ("half", "m5.2xlarge"): 16 * 24 * 0.5,
+        ("full", "m5.2xlarge"): 16 * 24 * 0.9,
+        ("over", "m5.2xlarge"): 16 * 24 * 1.5,
+        ("beyond", "m5.xlarge"): 8 * 24 * 5.0
+    }))
+
+    assert np.allclose(recommendations.loc[["idle", "half", "full", "over", "beyond"], "load"],
+                       [0.2, 0.5, 0.9, 1.5, 5.0])
+    # Steady usage well below capacity is downsized; none of it was when
+    # the load was measured against each resource's busiest day
+    assert recommendations.loc["idle", "recommended_type"] == "m5.large"
+    assert recommendations.loc["half", "recommended_type"] == "m5.xlarge"
+    assert recommendations.loc["full", "recommended_type"] == "m5.2xlarge"
+    assert recommendations.loc["over", "recommended_type"] == "m5.4xlarge"
+    # No size fits: several instances, kept at their size
+    assert recommendations.loc["beyond", "recommended_type"] == "m5.xlarge"
+    assert recommendations.loc["beyond", "savings"] == 0.0
+
+    assert np.allclose(recommendations.loc["half", "savings_percent"], 50.0)
+    assert recommendations.loc["full", "savings"] == 0.0
+    assert recommendations.loc["over", "savings"] < 0
+    assert list(recommendations["savings"]) == sorted(recommendations["savings"], reverse=True)
+
+
+def test_quantile_and_min_days():
+    rows = usage_rows({("spiky", "m5.4xlarge"): 32 * 24 * 0.1, ("short", "m5.4xlarge"): 1.0}, days=40)
+    # One busy day in forty stays above the 95th percentile
+    rows.loc[rows["resource"].eq("spiky") & rows["day"].eq(np.datetime64("2026-01-05")), "amount"] = 32 * 24
+    rows = rows[~(rows["resource"].eq("short") & (rows["day"] >= np.datetime64("2026-01-07")))]
+
+    recommendations = recommend(rows)
+    assert list(recommendations.index) == ["spiky"]
+    assert recommendations.loc["spiky", "recommended_type"] == "m5.large"
+    assert recommendations.loc["spiky", "days"] == 40
+
+
+# Per cloud: the tag or label loader, and the module constant naming the size key
+SIZE_TAGS = {"aws": ("load_tags", "SIZE_TAG"), "gcp": ("load_labels", "SIZE_LABEL"), "azure": ("load_tags", "SIZE_TAG")}
+
+
+@pytest.mark.parametrize("cloud", sorted(SIZE_TAGS))
+def test_reports_on_generated_output(cloud, generated_output, tmp_path):
+    module = importlib.import_module(f"{cloud}_rightsizing")
+    loader = importlib.import_module(f"{cloud}_loader")
+    load_tags, size_tag = SIZE_TAGS[cloud]
+    output_dir = generated_output(cloud)
+    records = loader.load_records(output_dir, columns=module.RIGHTSIZING_RECORD_COLUMNS)
+    tags = getattr(loader, load_tags)(output_dir, keys=[getattr(module, size_tag)])
+
+    catalog = module.size_catalog()
+    assert catalog["capacity"].gt(0).all() and len(catalog)
+    summary = module.write_rightsizing_reports(records, tags, str(tmp_path), dict(
+        rightsizing.RIGHTSIZING_SETTINGS, min_days=1))
+
+    recommendations = pd.read_csv(os.path.join(str(tmp_path), "rightsizing_recommendations.csv"))
+    assert list(recommendations.columns) == module.RESOURCE_COLUMNS + rightsizing.RECOMMENDATION_COLUMNS
+    assert summary["resources"] == len(recommendations)
+    assert summary["resources_downsized"] + summary["resources_upsized"] <= summary["resources_resized"]
+    assert np.isclose(summary["savings"], recommendations["savings"].sum())
+    with open(os.path.join(str(tmp_path), "rightsizing_summary.json")) as f:
+        assert json.load(f)["resources"] == summary["resources"]
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from finops_common import scenarios
+from aws_config import CONFIG
+
+SETTINGS = dict(scenarios.SCENARIO_SETTINGS, paths=400)
+
+
+@pytest.fixture
+def projects():
+    return scenarios.scenario_projects(CONFIG, list(CONFIG["projects"])[:6], daily_budget=1000.0)
+
+
+def simulate(projects, settings=SETTINGS):
+    return scenarios.simulate_spend(projects, "2026-01-15", 90, CONFIG["configurables"], settings)
+
+
+def test_same_seed_gives_the_same_bands(projects):
+    first, second = simulate(projects), simulate(projects)
+    for a, b in zip(first, second):
+        pd.testing.assert_frame_equal(a, b)
+
+    other = simulate(projects, dict(SETTINGS, seed=SETTINGS["seed"] + 1))
+    assert not np.allclose(other[0]["mean"], first[0]["mean"])
+
+
+def test_bands_are_ordered_and_means_add_up(projects):
+    project_bands, unit_bands, org = simulate(projects)
+    band_columns = [f"p{p}" for p in SETTINGS["percentiles"]]
+
+    for bands in (project_bands, unit_bands, org):
+        assert (np.diff(bands[band_columns].to_numpy(), axis=1) >= 0).all()
+        assert bands["mean"].gt(0).all()
+
+    # Means are additive across projects, units and the organisation
+    periods = ["2026-01", "2026-02", "2026-03", "2026-04", "annual"]
+    assert list(org["period"]) == periods
+    by_unit = project_bands.groupby(["business_unit", "period"])["mean"].sum()
+    assert np.allclose(unit_bands.set_index(["business_unit", "period"])["mean"].loc[by_unit.index], by_unit)
+    assert np.allclose(org.set_index("period")["mean"],
+                       project_bands.groupby("period")["mean"].sum().loc[periods])
+
+
+def test_steady_state_spend_stays_near_the_budget():
+    days = scenarios.calendar_days("2026-01-05", 28)
+    rng = np.random.default_rng(0)
+    params = scenarios.sample_parameters("steady_state", 2000, 0.0, rng, dict(
+        CONFIG["configurables"], usage_growth_rate={"steady_state": 1.0}), dict(
+        scenarios.PARAMETER_SPREADS, usage_growth_rate=0.0))
+    daily = scenarios.lifecycle_trajectories("steady_state", params, days, rng).mean(axis=0)
+
+    # Expected multiplier of each day: its weekday range and weekend
+    # reduction, and the month-end spike over the last days of each month
+    low, high = np.array(scenarios.WEEKDAY_RANGES).T
+    weekday_means = (low + high) / 2 * np.where(np.arange(7) >= 5, scenarios.WEEKEND_REDUCTION, 1.0)
+    dates = pd.DatetimeIndex(days)
+    month_end = ((dates + pd.offsets.MonthBegin(1)) - dates).days.to_numpy() <= scenarios.MONTH_END_DAYS
+    expected = weekday_means[dates.weekday] * np.where(
+        month_end, np.mean(scenarios.MONTH_END_RANGE), 1.0)
+    assert np.allclose(daily, expected, rtol=0.01)
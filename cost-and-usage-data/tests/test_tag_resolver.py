@@ -0,0 +1,83 @@
+import importlib
+
+import pandas as pd
+import pytest
+
+from finops_common.chunked_reports import lifecycle_business_units
+
+# Per cloud: resolver module, resolve function, attribute table and the tag
+# frame's resource column
+RESOLVERS = {
+    "aws": ("aws_tag_resolver", "resolve_tag_attributes", "TAG_ATTRIBUTES", "resourceId"),
+    "gcp": ("gcp_label_resolver", "resolve_label_attributes", "LABEL_ATTRIBUTES", "resource_name"),
+    "azure": ("azure_tag_resolver", "resolve_tag_attributes", "TAG_ATTRIBUTES", "resource_id")
+}
+
+
+def loop_attributes(df_records, df_tags, resource_column, tag_resource, attributes):
+    """The resource -> value dicts the report stages built with iterrows()"""
+    resolved = {}
+    for col, (key, default) in attributes.items():
+        values = {}
+        for _, tag in df_tags.iterrows():
+            if tag['key'] == key:
+                values[tag[tag_resource]] = tag['value']
+        resolved[col] = df_records[resource_column].astype(object).map(values).fillna(default)
+    return resolved
+
+
+def resolver(cloud):
+    module_name, function, attributes, tag_resource = RESOLVERS[cloud]
+    module = importlib.import_module(module_name)
+    return module, getattr(module, function), getattr(module, attributes), tag_resource
+
+
+@pytest.mark.parametrize("cloud", sorted(RESOLVERS))
+def test_resolver_matches_the_tag_loops(cloud, generated_output):
+    module, resolve, attributes, tag_resource = resolver(cloud)
+    loader = importlib.import_module(f"{cloud}_loader")
+    records, tags, _ = loader.load_outputs(generated_output(cloud))
+
+    expected = loop_attributes(records, tags, module.RESOURCE_COLUMN, tag_resource, attributes)
+    resolved = resolve(records.copy(), tags)
+    for col, values in expected.items():
+        assert resolved[col].tolist() == values.tolist(), col
+    assert (resolved["chargeback_entity"] != attributes["chargeback_entity"][1]).any()
+
+
+@pytest.mark.parametrize("cloud", sorted(RESOLVERS))
+def test_last_duplicate_tag_wins(cloud):
+    module, resolve, attributes, tag_resource = resolver(cloud)
+    key = attributes["chargeback_entity"][0]
+    tags = pd.DataFrame({tag_resource: ["r1", "r1", "r2"], "key": [key, key, "other"],
+                         "value": ["first", "last", "ignored"]})
+    records = pd.DataFrame({module.RESOURCE_COLUMN: ["r1", "r2", "r1"]})
+
+    resolved = resolve(records, tags, attributes=["chargeback_entity"])
+    assert resolved["chargeback_entity"].tolist() == ["last", "Unallocated", "last"]
+
+
+def test_aws_business_units_follow_the_project_tag(generated_output):
+    import aws_tag_resolver
+    import aws_loader
+    records, tags, lifecycle = aws_loader.load_outputs(generated_output("aws"))
+    project_business_units = lifecycle_business_units(lifecycle)
+
+    resolved = aws_tag_resolver.resolve_tag_attributes(records.copy(), tags,
+                                                       project_business_units=project_business_units)
+    expected = resolved["project"].map(project_business_units).fillna("Unknown")
+    assert resolved["business_unit"].tolist() == expected.tolist()
+    assert (resolved["business_unit"] != "Unknown").any()
+
+
+def test_gcp_business_units_match_the_substring_loop():
+    import gcp_label_resolver
+    names = pd.Series(["Data Lake (prod)", "data lake analytics", "ML Platform", "Other"] * 2)
+    project_business_units = {"Data Lake": "Analytics", "Data Lake Analytics": "Research", "ml platform": "AI"}
+
+    expected = {}
+    for project_name, bu in project_business_units.items():
+        for record in names.unique():
+            if project_name.lower() in record.lower():
+                expected[record] = bu
+    assert gcp_label_resolver.project_name_business_units(names, project_business_units) == expected
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+import aws_topk
+from finops_common.topk import summarize_chunk, merge_summaries, summary_estimates
+
+
+def test_top_k_rows_puts_nan_scores_last():
+    df = pd.DataFrame({"key": ["a", "b", "c", "d"], "cost": [1.0, np.nan, 3.0, 2.0]})
+    assert aws_topk.top_k_rows(df, "cost", k=3)["key"].tolist() == ["c", "d", "a"]
+    assert aws_topk.top_k_rows(df, "cost", k=4, ascending=True)["key"].tolist() == ["a", "d", "c", "b"]
+
+
+def test_score_bounds_hold_with_negative_scores():
+    chunks = [pd.DataFrame({"key": ["a", "b", "c"], "cost": [10.0, 5.0, 4.0]}),
+              pd.DataFrame({"key": ["a", "b", "c"], "cost": [-8.0, 1.0, -6.0]})]
+    summary = merge_summaries(summarize_chunk(chunk, ["key"], "cost") for chunk in chunks)
+    estimates = summary_estimates(summary).set_index("key")
+    totals = pd.concat(chunks).groupby("key")["cost"].sum()
+    for key, total in totals.items():
+        assert estimates.loc[key, "lower"] <= total <= estimates.loc[key, "upper"]
+
+
+def test_streaming_top_k_matches_exact_totals_over_small_batches():
+    rng = np.random.default_rng(7)
+    records = pd.DataFrame({"key": rng.integers(0, 300, 20000).astype(str),
+                            "cost": rng.normal(1.0, 5.0, 20000)})
+    chunks = [records.iloc[start:start + 500] for start in range(0, len(records), 500)]
+
+    report = aws_topk.streaming_top_k(lambda: iter(chunks), ["key"], ["cost"], "cost", k=10,
+                                      capacity=100, max_pending_rows=2000)
+    expected = records.groupby("key")["cost"].sum().nlargest(10)
+    assert report["key"].tolist() == expected.index.tolist()
+    assert np.allclose(report["cost"], expected.to_numpy())
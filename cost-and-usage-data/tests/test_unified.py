@@ -0,0 +1,87 @@
+import importlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import unified_dataset
+from finops_common.cross_cloud import unit_quantity
+
+PROVIDER_NAMES = {"aws": "AWS", "gcp": "Google Cloud", "azure": "Microsoft Azure"}
+
+
+def source_costs(provider, records):
+    """Billed and effective cost of the provider's records, computed from the source columns"""
+    if provider == "aws":
+        amortized = importlib.import_module("aws_amortization").amortized_costs(records)
+        return records["lineItem/UnblendedCost"].to_numpy(dtype=float), amortized
+    if provider == "gcp":
+        cost = records["cost"].to_numpy(dtype=float)
+        return cost, cost + records["credit_amount"].to_numpy(dtype=float)
+    net_cost = records["Cost"].to_numpy(dtype=float) + records["BenefitAmount"].to_numpy(dtype=float)
+    commitment_mask = importlib.import_module("azure_amortization").commitment_mask
+    return np.where(commitment_mask(records), 0.0, net_cost), net_cost
+
+
+@pytest.fixture(scope="module")
+def unified(generated_output, tmp_path_factory):
+    """Unified dataset of every provider's generated output, in several parts per provider"""
+    output_dirs = {provider: generated_output(provider) for provider in PROVIDER_NAMES}
+    dataset_dir = str(tmp_path_factory.mktemp("unified"))
+    settings = dict(unified_dataset.UNIFIED_SETTINGS, processes=1, chunk_rows=400)
+    manifest = unified_dataset.build_unified_dataset(output_dirs, dataset_dir, settings)
+    return output_dirs, dataset_dir, manifest
+
+
+@pytest.mark.parametrize("provider", sorted(PROVIDER_NAMES))
+def test_provider_totals_match_the_source(provider, unified):
+    output_dirs, dataset_dir, manifest = unified
+    module = unified_dataset.import_provider(provider)
+    records = pd.concat(list(module.iter_record_chunks(output_dirs[provider])), ignore_index=True)
+    df = unified_dataset.load_unified(dataset_dir, providers=[provider])
+
+    assert list(df.columns) == module.UNIFIED_COLUMNS
+    assert (df["ProviderName"] == PROVIDER_NAMES[provider]).all()
+    summary = manifest["providers"][provider]
+    assert summary["rows"] == len(df) == len(records)
+    assert summary["parts"] > len(summary["months"])
+
+    billed, effective = source_costs(provider, records)
+    assert np.isclose(df["BilledCost"].sum(), billed.sum())
+    assert np.isclose(df["EffectiveCost"].sum(), effective.sum())
+    assert np.isclose(summary["billed_cost"], billed.sum())
+    assert np.isclose(summary["effective_cost"], effective.sum())
+    assert sorted(df["ChargePeriodStart"].dt.strftime("%Y-%m").unique()) == summary["months"]
+    assert all(isinstance(json.loads(tags), dict) for tags in df["Tags"].unique())
+
+    month = summary["months"][0]
+    pruned = unified_dataset.load_unified(dataset_dir, providers=[provider], months=[month])
+    assert len(pruned) == (df["ChargePeriodStart"].dt.strftime("%Y-%m") == month).sum()
+
+
+def test_providers_share_one_schema_and_unit_quantities(unified):
+    _, dataset_dir, _ = unified
+    modules = {provider: unified_dataset.import_provider(provider) for provider in PROVIDER_NAMES}
+    assert all(module.UNIFIED_COLUMNS == modules["aws"].UNIFIED_COLUMNS for module in modules.values())
+
+    df = unified_dataset.load_unified(dataset_dir)
+    assert sorted(df["ProviderName"].unique()) == sorted(PROVIDER_NAMES.values())
+    usage = df[df["ChargeCategory"] == "Usage"]
+    quantities = {}
+    for provider, module in modules.items():
+        # Usage stays in the unit of its service's catalog entry, so a
+        # cross-cloud query converts it with the catalog units
+        catalog_units = {service: details.get("unit") for category in module.CONFIG["services"].values()
+                         for service, details in category.items()}
+        rows = usage[usage["ProviderName"] == PROVIDER_NAMES[provider]]
+        expected = rows["ServiceName"].map(catalog_units)
+        assert len(rows) and (expected.isna() | (expected == rows["ConsumedUnit"])).all()
+        quantities[provider] = {unit_quantity(unit)[0] for unit in rows["ConsumedUnit"].unique()}
+
+    # Running hours are billed in "Hrs", "hour" and "Hour"; all three are one quantity
+    assert all("hour" in provider_quantities for provider_quantities in quantities.values())
+    hours = usage[[unit_quantity(unit)[0] == "hour" for unit in usage["ConsumedUnit"]]]
+    assert set(hours["ConsumedUnit"].str.lower()) >= {"hrs", "hour"}
+    assert os.path.exists(os.path.join(dataset_dir, "_manifest.json"))
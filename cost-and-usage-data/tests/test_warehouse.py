@@ -0,0 +1,83 @@
+import importlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+# Per cloud: month of a record, service and cost columns, then the resource
+# column, tag frame resource column and tag key of the chargeback query
+WAREHOUSE_COLUMNS = {
+    "aws": (lambda df: df["lineItem/UsageStartDate"].dt.strftime("%Y-%m"), "lineItem/ProductCode",
+            "lineItem/UnblendedCost", "lineItem/ResourceId", "resourceId", "ChargebackEntity"),
+    "gcp": (lambda df: df["invoice.month"].astype(str), "service.description",
+            "cost", "resource.name", "resource_name", "chargeback-entity"),
+    "azure": (lambda df: df["Date"].dt.strftime("%Y-%m"), "ServiceName",
+              "Cost", "ResourceId", "resource_id", "chargeback-entity")
+}
+
+
+def example_queries(warehouse, engine):
+    """GCP keeps one set of queries per engine, the other clouds one set for both"""
+    queries = warehouse.EXAMPLE_QUERIES
+    return queries.get(engine, queries)
+
+
+@pytest.mark.parametrize("engine", ["duckdb", "sqlite"])
+@pytest.mark.parametrize("cloud", sorted(WAREHOUSE_COLUMNS))
+def test_warehouse_queries_match_the_records(cloud, engine, generated_output, tmp_path):
+    warehouse = importlib.import_module(f"{cloud}_warehouse")
+    month, service, cost, resource, tag_resource, entity_key = WAREHOUSE_COLUMNS[cloud]
+    records, tags, lifecycle = warehouse.load_outputs(generated_output(cloud))
+
+    path = warehouse.export_to_warehouse(records, tags, lifecycle, path=str(tmp_path / f"warehouse.{engine}"),
+                                         engine=engine)
+    con = warehouse.connect_warehouse(path, engine)
+    try:
+        results = {name: warehouse.run_query(con, sql)
+                   for name, sql in example_queries(warehouse, engine).items()}
+        record_count = warehouse.run_query(con, f"SELECT COUNT(*) AS n FROM {warehouse.RECORDS_TABLE}")
+    finally:
+        con.close()
+    assert record_count["n"].iloc[0] == len(records)
+
+    # Monthly cost by service, columns by position: struct fields lose their prefix in DuckDB
+    by_service = results["monthly_cost_by_service"]
+    by_service = by_service.set_axis(["month", "service", "total_cost"], axis=1)
+    expected = (records.assign(month=month(records), service=records[service].astype(str))
+                .groupby(["month", "service"])[cost].sum())
+    actual = by_service.set_index(["month", "service"])["total_cost"].astype(float)
+    assert sorted(actual.index) == sorted(expected.index)
+    assert np.allclose(actual.loc[expected.index].to_numpy(), expected.to_numpy())
+
+    # Chargeback: the cost of every resource carrying an entity tag
+    entity_tags = tags[tags["key"].astype(str) == entity_key]
+    tagged = records[resource].astype(str).isin(set(entity_tags[tag_resource].astype(str)))
+    assert tagged.any()
+    assert np.isclose(results["resource_level_chargeback"]["total_cost"].sum(), records.loc[tagged, cost].sum())
+
+
+@pytest.mark.parametrize("engine", ["duckdb", "sqlite"])
+def test_duplicate_tags_do_not_fan_out_joins(engine, tmp_path):
+    import aws_warehouse
+    records = pd.DataFrame({
+        "lineItem/UsageStartDate": ["2026-01-01T00:00:00Z", "2026-01-02T00:00:00Z"],
+        "lineItem/ProductCode": ["EC2", "EC2"],
+        "lineItem/UsageAccountId": ["111", "111"],
+        "lineItem/ResourceId": ["r1", "r2"],
+        "lineItem/UnblendedCost": [10.0, 5.0]
+    })
+    # r1 is tagged once per stage it was reused in; the last tags win
+    tags = pd.DataFrame({"resourceId": ["r1"] * 4 + ["r2"],
+                         "key": ["ChargebackEntity", "CostCenter", "ChargebackEntity", "CostCenter", "Project"],
+                         "value": ["A", "A-1", "B", "B-1", "P"]})
+
+    path = aws_warehouse.export_to_warehouse(records, tags, pd.DataFrame({"project_name": ["P"]}),
+                                             path=str(tmp_path / f"warehouse.{engine}"), engine=engine)
+    con = aws_warehouse.connect_warehouse(path, engine)
+    try:
+        chargeback = aws_warehouse.run_query(con, aws_warehouse.EXAMPLE_QUERIES["resource_level_chargeback"])
+    finally:
+        con.close()
+    assert chargeback[["chargeback_entity", "cost_center", "total_cost"]].values.tolist() == [["B", "B-1", 10.0]]
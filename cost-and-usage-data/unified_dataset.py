@@ -0,0 +1,141 @@
+import os
+import sys
+import json
+import time
+import importlib
+import multiprocessing
+import pandas as pd
+
+# Unified dataset settings. Each provider's outputs are normalized by its own
+# <provider>_unified module, in a process of its own.
+UNIFIED_SETTINGS = {
+    "dataset_dir": "unified_cost_dataset",  # Under the repository root
+    "processes": 3,  # Providers normalized at once
+    "chunk_rows": 250000  # Rows read and normalized at a time per provider
+}
+
+# Provider -> (directory holding its modules and output, normalizer module)
+PROVIDERS = {
+    "aws": ("aws", "aws_unified"),
+    "gcp": ("gcp", "gcp_unified"),
+    "azure": ("azure", "azure_unified")
+}
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Unified columns that need a type when the parts are CSV
+FLOAT_COLUMNS = ["ConsumedQuantity", "BilledCost", "EffectiveCost"]
+TIMESTAMP_COLUMN = "ChargePeriodStart"
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def import_provider(provider):
+    """Import a provider's normalizer, with its directory on the path for its sibling imports"""
+    directory, module_name = PROVIDERS[provider]
+    module_dir = os.path.join(ROOT_DIR, directory)
+    if module_dir not in sys.path:
+        sys.path.insert(0, module_dir)
+    return importlib.import_module(module_name)
+
+
+def normalize_provider(args):
+    """Pool worker: write one provider's partitions and return its summary"""
+    provider, output_dir, dataset_dir, chunk_rows = args
+    return import_provider(provider).write_unified_partitions(output_dir, dataset_dir, chunk_rows=chunk_rows)
+
+
+def build_unified_dataset(output_dirs, dataset_dir, settings=None):
+    """
+    Normalize every provider's outputs into one partitioned dataset.
+
+    Providers run in parallel, each streaming its records chunk by chunk,
+    so memory is bounded by one chunk per process. The dataset is laid out
+    as provider=<name>/month=<YYYY-MM>/part-<chunk> files with a common
+    schema, and _manifest.json records what each provider wrote.
+
+    Args:
+        output_dirs: Provider -> output directory of its generator
+        dataset_dir: Root directory of the unified dataset
+
+    Returns:
+        Manifest dict
+    """
+    settings = settings or UNIFIED_SETTINGS
+    os.makedirs(dataset_dir, exist_ok=True)
+
+    jobs = [(provider, output_dir, dataset_dir, settings["chunk_rows"])
+            for provider, output_dir in output_dirs.items()]
+    start_time = time.time()
+    processes = min(len(jobs), settings["processes"], multiprocessing.cpu_count())
+    if processes > 1:
+        with multiprocessing.Pool(processes=processes) as pool:
+            summaries = pool.map(normalize_provider, jobs)
+    else:
+        summaries = [normalize_provider(job) for job in jobs]
+
+    manifest = {
+        "providers": {summary["provider"]: summary for summary in summaries},
+        "seconds": round(time.time() - start_time, 3)
+    }
+    with open(os.path.join(dataset_dir, "_manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def dataset_parts(dataset_dir, providers=None, months=None):
+    """Part files of the dataset, pruned on the provider and month directory names"""
+    parts = []
+    for root, _, files in os.walk(dataset_dir):
+        partition = dict(name.split("=", 1) for name in os.path.relpath(root, dataset_dir).split(os.sep)
+                         if "=" in name)
+        if providers is not None and partition.get("provider") not in providers:
+            continue
+        if months is not None and partition.get("month") not in months:
+            continue
+        parts.extend(os.path.join(root, name) for name in files if name.startswith("part-"))
+    return sorted(parts)
+
+
+def read_part(path, columns=None):
+    """Read one part file in the unified schema"""
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, columns=columns)
+    df = pd.read_csv(path, usecols=columns, keep_default_na=False, na_values={col: [""] for col in FLOAT_COLUMNS},
+                     dtype={col: "float64" for col in FLOAT_COLUMNS}, float_precision="round_trip")
+    if TIMESTAMP_COLUMN in df.columns:
+        df[TIMESTAMP_COLUMN] = pd.to_datetime(df[TIMESTAMP_COLUMN], format=TIMESTAMP_FORMAT, utc=True)
+    return df
+
+
+def load_unified(dataset_dir, columns=None, providers=None, months=None):
+    """
+    Load the unified dataset, or the providers and months asked for.
+
+    Returns:
+        DataFrame with the unified schema (or the columns asked for)
+    """
+    frames = [read_part(path, columns) for path in dataset_parts(dataset_dir, providers, months)]
+    if not frames:
+        return pd.DataFrame(columns=columns or [])
+    return pd.concat(frames, ignore_index=True)
+
+
+def main():
+    """Normalize the aws/, gcp/ and azure/ outputs into one dataset and report cost by provider"""
+    output_dirs = {provider: os.path.join(ROOT_DIR, directory, "output")
+                   for provider, (directory, _) in PROVIDERS.items()}
+    output_dirs = {provider: path for provider, path in output_dirs.items() if os.path.isdir(path)}
+    dataset_dir = os.path.join(ROOT_DIR, UNIFIED_SETTINGS["dataset_dir"])
+
+    manifest = build_unified_dataset(output_dirs, dataset_dir)
+    rows = sum(summary["rows"] for summary in manifest["providers"].values())
+    print(f"Normalized {rows} rows from {len(manifest['providers'])} providers into {dataset_dir} "
+          f"in {manifest['seconds']:.2f} seconds")
+
+    # Cross-cloud reports are one query over the unified columns
+    df = load_unified(dataset_dir, columns=["ProviderName", "ServiceCategory", "BilledCost", "EffectiveCost"])
+    print(df.groupby(["ProviderName", "ServiceCategory"])[["BilledCost", "EffectiveCost"]].sum().round(2))
+
+
+if __name__ == "__main__":
+    main()